@@ -11,6 +11,7 @@ Mission: 단순함이 핵심이다
 Protocol v1.0:
 1. HELLO (node_id + signature) → HELLO_ACK
 2. HEARTBEAT (30초) → HEARTBEAT_ACK + pending commands
+   (디바이스: HELLO 직후 / 주기적 전체 스냅샷, 그 외 seq 기반 델타)
 3. COMMAND 실행 → RESULT
 
 "복잡한 생각은 버려라." - Orion
@@ -18,17 +19,23 @@ Protocol v1.0:
 
 import asyncio
 import base64
+import bisect
 import hashlib
 import hmac
 import json
 import logging
+import math
 import os
 import platform
+import random
 import subprocess
 import sys
+import threading
+import time
 import uuid
+from collections import deque
 from datetime import datetime, timezone
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 try:
     import websockets
@@ -44,6 +51,13 @@ try:
 except ImportError:
     PSUTIL_AVAILABLE = False
 
+try:
+    import msgpack
+
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
 
 # ============================================================
 # Configuration
@@ -65,8 +79,11 @@ class Config:
     # Protocol
     PROTOCOL_VERSION = "1.0"
     HEARTBEAT_INTERVAL = 30  # 초
+    FULL_SNAPSHOT_EVERY = 10  # 델타 HEARTBEAT 10회마다 전체 디바이스 스냅샷 (약 5분)
     COMMAND_TIMEOUT = 300  # 초
     HELLO_TIMEOUT = 10  # 초
+    # 프레임 인코딩 선호 순서 (HELLO에서 Gateway와 협상, json = Protocol v1.0 기본)
+    FRAME_ENCODINGS = os.getenv("NODE_FRAME_ENCODINGS", "msgpack,json").split(",")
 
     # Reconnection
     RECONNECT_MIN_DELAY = 1  # 초
@@ -77,6 +94,15 @@ class Config:
 
     # Concurrency
     MAX_ACTIVE_TASKS = 10  # BUSY 상태 판단 임계값
+    COMMAND_WORKERS = int(os.getenv("NODE_COMMAND_WORKERS", "4"))  # 동시 실행 명령 수
+    COMMAND_QUEUE_SIZE = int(os.getenv("NODE_COMMAND_QUEUE_SIZE", "100"))  # 대기열 상한
+    COMMAND_STATS_WINDOW = 200  # 대기 / 실행 시간 통계 표본 수
+
+    # Resource Sampling (백그라운드 스레드)
+    RESOURCE_SAMPLE_INTERVAL = 1.0  # 초
+    RESOURCE_DISK_EVERY = 30  # 디스크는 N 샘플마다 갱신
+    RESOURCE_PROCESS_SCAN_EVERY = 10  # 프로세스 목록은 N 샘플마다 재탐색
+    RESOURCE_PROCESSES = {"laixi": ("touping", "laixi"), "adb": ("adb",)}  # 이름 포함 매칭
 
 
 # ============================================================
@@ -112,20 +138,68 @@ else:
 # ============================================================
 
 
-def generate_signature(payload: dict, secret_key: str) -> str:
-    """HMAC-SHA256 서명 생성"""
-    # 키 정렬하여 JSON 직렬화 (서버와 동일 방식)
-    payload_str = json.dumps(payload, sort_keys=True, separators=(",", ":"))
-
-    # Base64 디코딩 시도 - 실패 시 UTF-8 인코딩
+def secret_key_bytes(secret_key: str) -> bytes:
+    """시크릿 키 → HMAC 키 바이트 (Base64 디코딩 시도 - 실패 시 UTF-8 인코딩)"""
     try:
-        key_bytes = base64.b64decode(secret_key)
+        return base64.b64decode(secret_key)
     except Exception:
-        key_bytes = secret_key.encode("utf-8")
+        return secret_key.encode("utf-8")
+
+
+class FrameSigner:
+    """
+    프레임 HMAC-SHA256 (전송 바이트 그대로 서명 → 재직렬화 없음, 서버와 동일 방식)
+
+    - 텍스트 프레임: JSON 객체 끝에 "mac" 필드 → '{...,"mac":"<hex>"}'
+    - 바이너리 프레임 (msgpack): 본문 뒤에 32바이트 MAC
+    - HELLO: 노드 시크릿으로 서명
+    - HELLO_ACK session_mac 이후: 세션 키 (시크릿 + session_id + nonce, 방향별 분리)
+    """
+
+    _PREFIX = ',"mac":"'
+    _TEXT_TAIL = len(_PREFIX) + 64 + 2
+    DIGEST_SIZE = 32
+
+    def __init__(self, key: bytes):
+        self._hmac = hmac.new(key, digestmod=hashlib.sha256)
+
+    @classmethod
+    def for_session(
+        cls, secret_key: str, session_id: str, nonce: str, direction: str
+    ) -> "FrameSigner":
+        """세션 키 파생 (direction: "node" = 노드 → Gateway, "gateway" = Gateway → 노드)"""
+        label = f"doai-session:{direction}:{session_id}:{nonce}".encode("utf-8")
+        return cls(hmac.new(secret_key_bytes(secret_key), label, hashlib.sha256).digest())
+
+    def digest(self, data: bytes) -> bytes:
+        mac = self._hmac.copy()
+        mac.update(data)
+        return mac.digest()
+
+    def sign_text(self, body: str) -> str:
+        return f'{body[:-1]}{self._PREFIX}{self.digest(body.encode("utf-8")).hex()}"}}'
+
+    def verify_text(self, frame: str) -> Optional[str]:
+        tail = frame[-self._TEXT_TAIL :]
+        if len(frame) <= self._TEXT_TAIL or not tail.startswith(self._PREFIX):
+            return None
+        body = frame[: -self._TEXT_TAIL] + "}"
+        try:
+            received = bytes.fromhex(tail[len(self._PREFIX) : -2])
+        except ValueError:
+            return None
+        if not hmac.compare_digest(received, self.digest(body.encode("utf-8"))):
+            return None
+        return body
 
-    # HMAC-SHA256
-    signature = hmac.new(key_bytes, payload_str.encode("utf-8"), hashlib.sha256).hexdigest()
-    return signature
+    def sign_bytes(self, body: bytes) -> bytes:
+        return body + self.digest(body)
+
+    def verify_bytes(self, frame: bytes) -> Optional[bytes]:
+        body, received = frame[: -self.DIGEST_SIZE], frame[-self.DIGEST_SIZE :]
+        if len(frame) <= self.DIGEST_SIZE or not hmac.compare_digest(received, self.digest(body)):
+            return None
+        return body
 
 
 # ============================================================
@@ -133,21 +207,123 @@ def generate_signature(payload: dict, secret_key: str) -> str:
 # ============================================================
 
 
-def get_system_resources() -> dict:
-    """시스템 리소스 정보 수집"""
-    if not PSUTIL_AVAILABLE:
-        return {}
+class ResourceSampler:
+    """
+    백그라운드 리소스 샘플러 (daemon 스레드)
 
-    try:
-        return {
-            "cpu_percent": psutil.cpu_percent(interval=0.1),
+    - RESOURCE_SAMPLE_INTERVAL마다 CPU / 메모리 / 네트워크 / Laixi·ADB 프로세스 샘플
+      (cpu_percent(interval=None): 직전 샘플 이후 평균 → sleep 없음)
+    - 디스크는 RESOURCE_DISK_EVERY 샘플마다, 프로세스 목록은 RESOURCE_PROCESS_SCAN_EVERY마다 갱신
+    - 최근 window초 CPU로 평균 / p95 계산 후 요약 dict를 통째로 교체
+      → HEARTBEAT(이벤트 루프)는 snapshot()으로 O(1) 읽기, 블로킹 syscall 없음
+    """
+
+    def __init__(self, interval: float = None, window: float = None):
+        self.interval = interval or Config.RESOURCE_SAMPLE_INTERVAL
+        window = window or Config.HEARTBEAT_INTERVAL
+        self._cpu = deque(maxlen=max(1, int(window / self.interval)))
+        self._summary: dict = {}
+        self._samples = 0
+        self._disk_free_gb: Optional[float] = None
+        self._net: Optional[tuple] = None  # (시각, bytes_sent, bytes_recv)
+        self._processes: Dict[int, tuple] = {}  # pid → (그룹, psutil.Process)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """샘플링 스레드 시작 (psutil 없으면 무시)"""
+        if not PSUTIL_AVAILABLE or (self._thread and self._thread.is_alive()):
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="resource-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        psutil.cpu_percent(interval=None)  # 기준점 (첫 호출은 항상 0.0)
+        while not self._stop.wait(self.interval):
+            try:
+                self.sample()
+            except Exception as e:
+                logger.warning(f"리소스 수집 실패: {e}")
+
+    def sample(self):
+        """샘플 1회 수집 + 요약 갱신"""
+        now = time.monotonic()
+        self._cpu.append(psutil.cpu_percent(interval=None))
+
+        if self._disk_free_gb is None or self._samples % Config.RESOURCE_DISK_EVERY == 0:
+            self._disk_free_gb = round(psutil.disk_usage("/").free / (1024**3), 1)
+        if self._samples % Config.RESOURCE_PROCESS_SCAN_EVERY == 0:
+            self._scan_processes()
+        self._samples += 1
+
+        net = psutil.net_io_counters()
+        sent_kbps = recv_kbps = 0.0
+        if self._net and now > self._net[0]:
+            elapsed = now - self._net[0]
+            sent_kbps = (net.bytes_sent - self._net[1]) * 8 / 1000 / elapsed
+            recv_kbps = (net.bytes_recv - self._net[2]) * 8 / 1000 / elapsed
+        self._net = (now, net.bytes_sent, net.bytes_recv)
+
+        cpu = sorted(self._cpu)
+        self._summary = {
+            "cpu_percent": round(sum(cpu) / len(cpu), 1),  # window 평균
+            "cpu_p95": cpu[max(0, math.ceil(len(cpu) * 0.95) - 1)],
+            "cpu_last": self._cpu[-1],
             "memory_percent": psutil.virtual_memory().percent,
-            "disk_free_gb": round(psutil.disk_usage("/").free / (1024**3), 1),
+            "disk_free_gb": self._disk_free_gb,
+            "net_sent_kbps": round(sent_kbps, 1),
+            "net_recv_kbps": round(recv_kbps, 1),
+            "processes": self._sample_processes(),
             "network_ok": True,
         }
-    except Exception as e:
-        logger.warning(f"리소스 수집 실패: {e}")
+
+    def _scan_processes(self):
+        """Laixi / ADB 프로세스 탐색 (기존 Process 객체 유지 → cpu_percent 연속 측정)"""
+        found = {}
+        for proc in psutil.process_iter(["name"]):
+            name = (proc.info.get("name") or "").lower()
+            for group, patterns in Config.RESOURCE_PROCESSES.items():
+                if any(pattern in name for pattern in patterns):
+                    found[proc.pid] = self._processes.get(proc.pid, (group, proc))
+                    break
+        self._processes = found
+
+    def _sample_processes(self) -> dict:
+        stats = {
+            group: {"count": 0, "cpu_percent": 0.0, "memory_mb": 0.0}
+            for group in Config.RESOURCE_PROCESSES
+        }
+        for pid, (group, proc) in list(self._processes.items()):
+            try:
+                with proc.oneshot():
+                    cpu = proc.cpu_percent(interval=None)
+                    rss = proc.memory_info().rss
+            except psutil.Error:
+                self._processes.pop(pid, None)  # 종료된 프로세스
+                continue
+            entry = stats[group]
+            entry["count"] += 1
+            entry["cpu_percent"] = round(entry["cpu_percent"] + cpu, 1)
+            entry["memory_mb"] = round(entry["memory_mb"] + rss / (1024**2), 1)
+        return stats
+
+    def snapshot(self) -> dict:
+        """최신 요약 (O(1), 이벤트 루프에서 호출)"""
+        return dict(self._summary)
+
+
+resource_sampler = ResourceSampler()
+
+
+def get_system_resources() -> dict:
+    """시스템 리소스 정보 (백그라운드 샘플러 최신 요약)"""
+    if not PSUTIL_AVAILABLE:
         return {}
+    return resource_sampler.snapshot()
 
 
 def get_hostname() -> str:
@@ -174,6 +350,38 @@ def get_ip_address() -> str:
 # ============================================================
 
 
+def supported_encodings() -> List[str]:
+    """HELLO로 제안할 프레임 인코딩 (json은 항상 포함)"""
+    encodings = [e for e in Config.FRAME_ENCODINGS if e != "msgpack" or MSGPACK_AVAILABLE]
+    return encodings if "json" in encodings else encodings + ["json"]
+
+
+def encode_frame(message: dict, encoding: str, signer: FrameSigner = None):
+    """메시지 → WebSocket 프레임 (json = 텍스트, msgpack = 바이너리, signer 있으면 MAC 추가)"""
+    if encoding == "msgpack":
+        frame = msgpack.packb(message, use_bin_type=True)
+        return signer.sign_bytes(frame) if signer else frame
+    frame = json.dumps(message, separators=(",", ":"), ensure_ascii=False)
+    return signer.sign_text(frame) if signer else frame
+
+
+def decode_frame(frame, signer: FrameSigner = None) -> dict:
+    """WebSocket 프레임 → 메시지 (프레임 종류로 판별, signer 있으면 MAC 검증)"""
+    if isinstance(frame, bytes):
+        if not MSGPACK_AVAILABLE:
+            raise ValueError("binary frame received but msgpack is not installed")
+        if signer:
+            frame = signer.verify_bytes(frame)
+            if frame is None:
+                raise ValueError("invalid session MAC")
+        return msgpack.unpackb(frame, raw=False)
+    if signer:
+        frame = signer.verify_text(frame)
+        if frame is None:
+            raise ValueError("invalid session MAC")
+    return json.loads(frame)
+
+
 def build_message(msg_type: str, payload: dict) -> dict:
     """프로토콜 v1.0 메시지 빌드"""
     return {
@@ -185,17 +393,23 @@ def build_message(msg_type: str, payload: dict) -> dict:
     }
 
 
-def build_hello(node_id: str, secret_key: str = None) -> dict:
-    """HELLO 메시지 빌드 (서명 포함)"""
+def build_hello(node_id: str, secret_key: str = None, resume_session_id: str = None) -> dict:
+    """HELLO 메시지 빌드 (서명은 전송 시 encode_frame에서 프레임 바이트에 추가)"""
     payload = {
         "hostname": get_hostname(),
         "ip_address": get_ip_address(),
         "runner_version": "2.0.0",
         "capabilities": ["youtube", "tiktok", "adb", "tap", "swipe"],
         "device_count": 0,  # 나중에 업데이트
+        "encodings": supported_encodings(),  # HELLO_ACK encoding으로 확정
+        "session_mac": bool(secret_key),  # HELLO 이후 프레임 세션 MAC 요청
     }
 
-    message = {
+    # Gateway 재시작 전 세션 재개 요청 (일치하면 DB 재등록 생략)
+    if resume_session_id:
+        payload["resume_session_id"] = resume_session_id
+
+    return {
         "version": Config.PROTOCOL_VERSION,
         "timestamp": datetime.now(timezone.utc).isoformat() + "Z",
         "message_id": str(uuid.uuid4()),
@@ -204,27 +418,86 @@ def build_hello(node_id: str, secret_key: str = None) -> dict:
         "payload": payload,
     }
 
-    # HMAC-SHA256 서명 추가
-    if secret_key:
-        message["signature"] = generate_signature(payload, secret_key)
-
-    return message
-
 
 def build_heartbeat(
-    status: str, device_snapshot: list, resources: dict, active_tasks: int = 0, queue_depth: int = 0
+    status: str,
+    device_state: dict,
+    resources: dict,
+    active_tasks: int = 0,
+    queue_depth: int = 0,
+    executor: dict = None,
 ) -> dict:
-    """HEARTBEAT 메시지 빌드"""
-    return build_message(
-        "HEARTBEAT",
-        {
-            "status": status,
-            "device_snapshot": device_snapshot,
-            "resources": resources,
-            "active_tasks": active_tasks,
-            "queue_depth": queue_depth,
-        },
-    )
+    """HEARTBEAT 메시지 빌드 (device_state: DeviceSnapshotTracker.build() 결과)"""
+    payload = {
+        "status": status,
+        **device_state,
+        "resources": resources,
+        "active_tasks": active_tasks,
+        "queue_depth": queue_depth,
+    }
+    if executor:
+        payload["executor"] = executor  # 대기 / 실행 시간 통계
+    return build_message("HEARTBEAT", payload)
+
+
+class DeviceSnapshotTracker:
+    """
+    HEARTBEAT 디바이스 스냅샷 (전체 / 델타)
+
+    - HELLO 직후, FULL_SNAPSHOT_EVERY회마다, Gateway resync 요청 시 전체 스냅샷
+    - 그 외에는 직전 HEARTBEAT 대비 added / changed / removed(serial)만 전송
+      → HEARTBEAT 크기와 DB 쓰기가 디바이스 수가 아닌 변경 수에 비례
+    - snapshot_seq는 HEARTBEAT마다 1 증가, 델타의 base_seq = 직전 seq
+      (전송 실패로 seq가 빠지면 Gateway가 resync 요청)
+    - Gateway가 델타를 지원하지 않으면 (HELLO_ACK device_delta 없음) 항상 전체 스냅샷
+    """
+
+    def __init__(self, full_every: int = None):
+        self.full_every = full_every or Config.FULL_SNAPSHOT_EVERY
+        self.delta_enabled = False
+        self._seq = 0
+        self._sent: Dict[str, dict] = {}  # serial → 마지막 전송 상태
+        self._deltas_since_full = 0
+        self._full_pending = True
+
+    def reset(self, delta_enabled: bool):
+        """새 세션 (HELLO_ACK) → 다음 HEARTBEAT는 전체 스냅샷"""
+        self.delta_enabled = delta_enabled
+        self._full_pending = True
+
+    def request_full(self):
+        """Gateway resync 요청 → 다음 HEARTBEAT는 전체 스냅샷"""
+        self._full_pending = True
+
+    def build(self, devices: List[dict]) -> dict:
+        """HEARTBEAT 페이로드의 디바이스 필드"""
+        current = {d["serial"]: dict(d) for d in devices}
+        base_seq = self._seq
+        self._seq += 1
+
+        if (
+            not self.delta_enabled
+            or self._full_pending
+            or self._deltas_since_full >= self.full_every
+        ):
+            self._full_pending = False
+            self._deltas_since_full = 0
+            self._sent = current
+            return {"snapshot_seq": self._seq, "device_snapshot": list(current.values())}
+
+        delta = {
+            "base_seq": base_seq,
+            "added": [d for serial, d in current.items() if serial not in self._sent],
+            "changed": [
+                d
+                for serial, d in current.items()
+                if serial in self._sent and self._sent[serial] != d
+            ],
+            "removed": [serial for serial in self._sent if serial not in current],
+        }
+        self._deltas_since_full += 1
+        self._sent = current
+        return {"snapshot_seq": self._seq, "device_delta": delta}
 
 
 def build_result(
@@ -408,6 +681,210 @@ async def restart_laixi():
         return False
 
 
+# ============================================================
+# Command Executor (우선순위 + 디바이스 상호 배제)
+# ============================================================
+
+
+class CommandExecutor:
+    """
+    우선순위 명령 실행기
+
+    - 대기열: (우선순위, 도착 순) 정렬 리스트, 상한 max_queue (초과 시 REJECTED 보고)
+    - 동시 실행 최대 workers개, 실행 중인 명령과 대상 디바이스가 겹치는 명령은 대기
+      (SPECIFIC_DEVICES = 지정 슬롯, 그 외 = 전체 디바이스, PING / GET_DEVICES = 디바이스 없음)
+    - 막힌 명령의 디바이스는 예약 → 뒤의 낮은 우선순위 명령이 계속 추월하지 못함 (기아 방지)
+    - 폴링 없음: submit / 완료 / 취소 시점에만 배치
+    - cancel(command_id): 대기 중이면 제거, 실행 중이면 태스크 취소 → CANCELLED 보고
+    - 대기 시간 / 실행 시간 통계 → HEARTBEAT
+    """
+
+    PRIORITY_RANK = {"URGENT": 0, "HIGH": 1, "NORMAL": 2, "LOW": 3}
+    NO_DEVICE_COMMANDS = ("PING", "GET_DEVICES")
+    ALL_DEVICES = None  # 전체 디바이스 점유 표시
+
+    def __init__(self, execute, report, workers: int = None, max_queue: int = None):
+        """
+        Args:
+            execute: async (command) → None (RESULT 전송 포함)
+            report: async (command, status, reason) → None (실행 없이 끝난 명령 보고)
+        """
+        self._execute = execute
+        self._report = report
+        self.workers = workers or Config.COMMAND_WORKERS
+        self.max_queue = max_queue or Config.COMMAND_QUEUE_SIZE
+
+        self._seq = 0
+        self._queue: List[tuple] = []  # (rank, seq, command, devices, enqueued_at)
+        self._running: Dict[str, tuple] = {}  # command_id → (task, devices)
+        self._paused = False
+
+        # 통계
+        self._wait_ms = deque(maxlen=Config.COMMAND_STATS_WINDOW)
+        self._exec_ms = deque(maxlen=Config.COMMAND_STATS_WINDOW)
+        self.completed = 0
+        self.cancelled = 0
+        self.rejected = 0
+
+    @property
+    def queued(self) -> int:
+        return len(self._queue)
+
+    @property
+    def running(self) -> int:
+        return len(self._running)
+
+    def _devices(self, command: dict) -> Optional[frozenset]:
+        """명령이 점유하는 디바이스 슬롯 (ALL_DEVICES = 전체)"""
+        if command.get("command_type") in self.NO_DEVICE_COMMANDS:
+            return frozenset()
+        target = command.get("target") or {}
+        if target.get("type") == "SPECIFIC_DEVICES":
+            return frozenset(target.get("device_slots") or [])
+        return self.ALL_DEVICES
+
+    @staticmethod
+    def _overlaps(devices: Optional[frozenset], busy: set, busy_all: bool) -> bool:
+        if devices is None:
+            return busy_all or bool(busy)
+        return bool(devices) and (busy_all or not devices.isdisjoint(busy))
+
+    async def submit(self, command: dict) -> bool:
+        """명령 추가 (대기열이 가득 차면 REJECTED 보고 후 False)"""
+        command_id = command.get("command_id")
+        if command_id in self._running or any(
+            e[2].get("command_id") == command_id for e in self._queue
+        ):
+            return True  # 중복 수신 (HEARTBEAT_ACK 재전송)
+        if len(self._queue) >= self.max_queue:
+            self.rejected += 1
+            logger.warning(f"명령 대기열 가득 참 ({self.max_queue}) → 거부: {command_id}")
+            await self._report(command, "REJECTED", "node command queue full")
+            return False
+
+        self._seq += 1
+        rank = self.PRIORITY_RANK.get(command.get("priority", "NORMAL"), 2)
+        bisect.insort(
+            self._queue, (rank, self._seq, command, self._devices(command), time.monotonic())
+        )
+        self._dispatch()
+        return True
+
+    def _dispatch(self):
+        """여유 워커만큼 실행 가능한 명령 시작"""
+        if self._paused:
+            return
+        busy, busy_all = set(), False
+        for _, devices in self._running.values():
+            if devices is None:
+                busy_all = True
+            else:
+                busy |= devices
+
+        index = 0
+        while index < len(self._queue) and len(self._running) < self.workers:
+            entry = self._queue[index]
+            devices = entry[3]
+            if self._overlaps(devices, busy, busy_all):
+                # 막힌 명령의 디바이스 예약 (뒤 명령이 추월하지 못하게)
+                if devices is None:
+                    busy_all = True
+                else:
+                    busy |= devices
+                index += 1
+                continue
+
+            self._queue.pop(index)
+            command_id = entry[2].get("command_id")
+            task = asyncio.create_task(self._run(entry))
+            self._running[command_id] = (task, devices)
+            # 시작 전에 취소된 태스크는 _run이 실행되지 않으므로 정리는 완료 콜백에서
+            task.add_done_callback(lambda t, cid=command_id: self._finished(cid, t))
+            if devices is None:
+                busy_all = True
+            else:
+                busy |= devices
+
+    async def _run(self, entry: tuple):
+        command = entry[2]
+        started = time.monotonic()
+        self._wait_ms.append((started - entry[4]) * 1000)
+        try:
+            await self._execute(command)
+            self.completed += 1
+        finally:
+            self._exec_ms.append((time.monotonic() - started) * 1000)
+
+    def _finished(self, command_id: str, task: asyncio.Task):
+        """태스크 종료 (완료 / 실패 / 취소 모두) → 워커 반환 후 다음 명령 배치"""
+        running = self._running.get(command_id)
+        if running and running[0] is task:
+            del self._running[command_id]
+        self._dispatch()
+
+    async def cancel(self, command_id: str) -> Optional[str]:
+        """명령 취소 → "queued" / "running" (없으면 None)"""
+        for index, entry in enumerate(self._queue):
+            if entry[2].get("command_id") == command_id:
+                self._queue.pop(index)
+                self.cancelled += 1
+                await self._report(entry[2], "CANCELLED", "cancelled before start")
+                self._dispatch()
+                return "queued"
+
+        running = self._running.get(command_id)
+        if not running:
+            return None
+        task = running[0]
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        self.cancelled += 1
+        await self._report({"command_id": command_id}, "CANCELLED", "cancelled while running")
+        return "running"
+
+    def pause(self):
+        """연결 해제 → 새 명령 배치 중단 (대기열 유지)"""
+        self._paused = True
+
+    def resume(self):
+        """재연결 → 대기열 배치 재개"""
+        self._paused = False
+        self._dispatch()
+
+    async def abort_running(self):
+        """실행 중인 명령 취소 (연결 해제 시, 결과 보고 없음)"""
+        tasks = [task for task, _ in self._running.values()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    @staticmethod
+    def _summary(values: deque) -> dict:
+        if not values:
+            return {"avg": 0, "p95": 0}
+        ordered = sorted(values)
+        return {
+            "avg": int(sum(ordered) / len(ordered)),
+            "p95": int(ordered[max(0, math.ceil(len(ordered) * 0.95) - 1)]),
+        }
+
+    def get_stats(self) -> dict:
+        """HEARTBEAT용 통계 (최근 COMMAND_STATS_WINDOW개 기준, ms)"""
+        return {
+            "workers": self.workers,
+            "running": self.running,
+            "queued": self.queued,
+            "completed": self.completed,
+            "cancelled": self.cancelled,
+            "rejected": self.rejected,
+            "queue_wait_ms": self._summary(self._wait_ms),
+            "execution_ms": self._summary(self._exec_ms),
+        }
+
+
 # ============================================================
 # NodeRunner (Protocol v1.0)
 # ============================================================
@@ -433,14 +910,20 @@ class NodeRunner:
         self._ws = None
         self._connected = False
         self._session_id = None
+        self._encoding = "json"  # HELLO_ACK 이후 송신 프레임 인코딩
+        self._signer_out: Optional[FrameSigner] = None  # 세션 MAC (노드 → Gateway)
+        self._signer_in: Optional[FrameSigner] = None  # 세션 MAC (Gateway → 노드)
+        self._resume_session_id = None  # 마지막 세션 (재접속 시 재개 요청)
         self._reconnect_delay = Config.RECONNECT_MIN_DELAY
+        self._reconnect_hint: Optional[float] = None  # Gateway가 안내한 재접속 지연 (초)
         self._should_run = True
 
         # 상태
         self._status = "READY"  # READY, BUSY, DEGRADED
         self._active_tasks = 0
         self._active_tasks_lock = asyncio.Lock()  # _active_tasks 동기화용 락
-        self._task_queue: asyncio.Queue = asyncio.Queue()  # 스레드-세이프 큐
+        self._executor = CommandExecutor(self._execute_command, self._report_unexecuted)
+        self._snapshots = DeviceSnapshotTracker()  # HEARTBEAT 디바이스 전체 / 델타
 
         # Self-Healing
         self._laixi_failures = 0
@@ -450,6 +933,7 @@ class NodeRunner:
         logger.info(f"🚀 NodeRunner 시작: {self.node_id}")
         logger.info(f"📡 Gateway: {self.gateway_url}")
         logger.info(f"🔐 서명 모드: {'활성' if self.secret_key else '비활성'}")
+        resource_sampler.start()
 
         while self._should_run:
             try:
@@ -458,11 +942,19 @@ class NodeRunner:
                 logger.error(f"연결 에러: {e}")
 
             if self._should_run:
-                logger.info(f"⏳ {self._reconnect_delay}초 후 재접속...")
-                await asyncio.sleep(self._reconnect_delay)
+                if self._reconnect_hint is not None:
+                    # Gateway 드레인: 노드별로 분산된 지연 후 재접속
+                    delay = self._reconnect_hint
+                    self._reconnect_hint = None
+                else:
+                    # Exponential Backoff + Jitter (동시 재접속 분산)
+                    delay = random.uniform(self._reconnect_delay / 2, self._reconnect_delay)
+                    self._reconnect_delay = min(
+                        self._reconnect_delay * 2, Config.RECONNECT_MAX_DELAY
+                    )
 
-                # Exponential Backoff
-                self._reconnect_delay = min(self._reconnect_delay * 2, Config.RECONNECT_MAX_DELAY)
+                logger.info(f"⏳ {delay:.1f}초 후 재접속...")
+                await asyncio.sleep(delay)
 
     async def _connect_and_run(self):
         """Gateway 연결 및 메시지 루프"""
@@ -474,9 +966,12 @@ class NodeRunner:
                 ping_interval=20,
                 ping_timeout=10,
                 max_size=10 * 1024 * 1024,  # 10MB
+                compression="deflate",  # permessage-deflate (Gateway가 거절하면 비압축)
             ) as ws:
                 self._ws = ws
                 self._connected = True
+                self._encoding = "json"
+                self._signer_out = self._signer_in = None
                 self._reconnect_delay = Config.RECONNECT_MIN_DELAY
 
                 # Phase 1: HELLO Handshake
@@ -488,16 +983,17 @@ class NodeRunner:
 
                 # Phase 2: HEARTBEAT + Message Loop
                 heartbeat_task = asyncio.create_task(self._heartbeat_loop())
-                command_task = asyncio.create_task(self._command_processor())
+                self._executor.resume()
 
                 try:
                     await self._message_loop()
                 finally:
                     heartbeat_task.cancel()
-                    command_task.cancel()
+                    # 대기열은 재접속 후 이어서 실행, 실행 중이던 명령은 중단
+                    self._executor.pause()
+                    await self._executor.abort_running()
                     try:
                         await heartbeat_task
-                        await command_task
                     except asyncio.CancelledError:
                         pass
 
@@ -516,25 +1012,44 @@ class NodeRunner:
         await self.laixi.connect()
 
         # HELLO 메시지 생성
-        hello = build_hello(self.node_id, self.secret_key)
+        hello = build_hello(self.node_id, self.secret_key, self._resume_session_id)
         hello["payload"]["device_count"] = self.laixi.device_count
 
-        await self._ws.send(json.dumps(hello))
+        # HMAC-SHA256: 전송할 프레임 바이트 그대로 서명
+        signer = FrameSigner(secret_key_bytes(self.secret_key)) if self.secret_key else None
+        await self._ws.send(encode_frame(hello, "json", signer))
         logger.debug("→ HELLO 전송")
 
         # HELLO_ACK 대기
         try:
             response_text = await asyncio.wait_for(self._ws.recv(), timeout=Config.HELLO_TIMEOUT)
-            response = json.loads(response_text)
+            response = decode_frame(response_text)
         except asyncio.TimeoutError:
             logger.error("❌ HELLO_ACK 타임아웃")
             return False
 
         if response.get("type") == "HELLO_ACK":
-            self._session_id = response.get("payload", {}).get("session_id")
-            logger.info(f"✅ Gateway 연결 성공 (session={self._session_id})")
+            ack_payload = response.get("payload", {})
+            self._session_id = ack_payload.get("session_id")
+            self._resume_session_id = self._session_id
+            self._snapshots.reset(delta_enabled=ack_payload.get("device_delta", False))
+            self._encoding = ack_payload.get("encoding", "json")
+            session_mac = ack_payload.get("session_mac")
+            if session_mac and self.secret_key:
+                nonce = session_mac["nonce"]
+                sid = self._session_id
+                self._signer_out = FrameSigner.for_session(self.secret_key, sid, nonce, "node")
+                self._signer_in = FrameSigner.for_session(self.secret_key, sid, nonce, "gateway")
+            resumed = " (세션 재개)" if ack_payload.get("resumed") else ""
+            logger.info(f"✅ Gateway 연결 성공 (session={self._session_id}){resumed}")
             return True
 
+        elif response.get("type") == "RECONNECT":
+            # Gateway 드레인 중
+            self._reconnect_hint = response.get("payload", {}).get("reconnect_after_ms", 0) / 1000
+            logger.info(f"← RECONNECT: {self._reconnect_hint:.1f}초 후 재접속")
+            return False
+
         elif response.get("type") == "ERROR":
             error = response.get("payload", {})
             logger.error(f"❌ HELLO 실패: {error.get('error_code')} - {error.get('error_message')}")
@@ -571,13 +1086,14 @@ class NodeRunner:
                 # HEARTBEAT 메시지 생성
                 heartbeat = build_heartbeat(
                     status=self._status,
-                    device_snapshot=self.laixi.get_device_snapshot(),
+                    device_state=self._snapshots.build(self.laixi.get_device_snapshot()),
                     resources=get_system_resources(),
                     active_tasks=self._active_tasks,
-                    queue_depth=self._task_queue.qsize(),
+                    queue_depth=self._executor.queued,
+                    executor=self._executor.get_stats(),
                 )
 
-                await self._ws.send(json.dumps(heartbeat))
+                await self._send(heartbeat)
                 logger.debug(f"→ HEARTBEAT ({self.laixi.device_count}대, {self._status})")
 
             except asyncio.CancelledError:
@@ -589,22 +1105,39 @@ class NodeRunner:
         """메시지 수신 및 처리"""
         async for message in self._ws:
             try:
-                data = json.loads(message)
+                data = decode_frame(message, self._signer_in)
                 msg_type = data.get("type")
                 msg_payload = data.get("payload", {})
 
                 # HEARTBEAT_ACK (Pull-based Push)
                 if msg_type == "HEARTBEAT_ACK":
+                    if msg_payload.get("resync"):
+                        logger.info("← HEARTBEAT_ACK resync: 다음 HEARTBEAT에 전체 스냅샷")
+                        self._snapshots.request_full()
                     commands = msg_payload.get("commands", [])
                     if commands:
                         logger.info(f"← HEARTBEAT_ACK + {len(commands)}개 명령")
                         for cmd in commands:
-                            await self._task_queue.put(cmd)
+                            await self._executor.submit(cmd)
 
                 # COMMAND (직접 Push)
                 elif msg_type == "COMMAND":
                     logger.info(f"← COMMAND: {msg_payload.get('command_type')}")
-                    await self._task_queue.put(msg_payload)
+                    await self._executor.submit(msg_payload)
+
+                # CANCEL (command_id 기준 대기 / 실행 중 명령 취소)
+                elif msg_type == "CANCEL":
+                    command_id = msg_payload.get("command_id")
+                    state = await self._executor.cancel(command_id)
+                    logger.info(f"← CANCEL: {command_id} ({state or 'not found'})")
+
+                # RECONNECT (Gateway 드레인 → 안내된 지연 후 세션 재개)
+                elif msg_type == "RECONNECT":
+                    self._reconnect_hint = msg_payload.get("reconnect_after_ms", 0) / 1000
+                    logger.info(
+                        f"← RECONNECT: {self._reconnect_hint:.1f}초 후 재접속 "
+                        f"({msg_payload.get('reason', '')})"
+                    )
 
                 # ERROR
                 elif msg_type == "ERROR":
@@ -619,26 +1152,20 @@ class NodeRunner:
                 else:
                     logger.warning(f"알 수 없는 메시지: {msg_type}")
 
-            except json.JSONDecodeError:
-                logger.error("JSON 파싱 실패")
+            except ValueError as e:
+                logger.error(f"메시지 디코딩 실패: {e}")
 
-    async def _command_processor(self):
-        """명령 큐 처리 (순차 실행)"""
-        while self._connected:
-            try:
-                # asyncio.Queue.get()은 타임아웃과 함께 사용하여 취소 가능하게 함
-                try:
-                    command = await asyncio.wait_for(self._task_queue.get(), timeout=0.5)
-                    await self._execute_command(command)
-                    self._task_queue.task_done()
-                except asyncio.TimeoutError:
-                    # 큐가 비어있으면 계속 대기
-                    continue
+    async def _send(self, message: dict):
+        """Gateway로 메시지 전송 (협상된 프레임 인코딩)"""
+        await self._ws.send(encode_frame(message, self._encoding, self._signer_out))
 
-            except asyncio.CancelledError:
-                break
-            except Exception as e:
-                logger.error(f"명령 처리 에러: {e}")
+    async def _report_unexecuted(self, command: dict, status: str, reason: str):
+        """실행 없이 끝난 명령 (REJECTED / CANCELLED) RESULT 전송"""
+        summary = {"total_devices": 0, "success_count": 0, "fail_count": 0, "execution_time_ms": 0}
+        result = build_result(command.get("command_id"), status, summary, error_message=reason)
+        if self._connected and self._ws:
+            await self._send(result)
+            logger.info(f"→ RESULT: {status} ({command.get('command_id')}, {reason})")
 
     async def _execute_command(self, command: dict):
         """명령 실행 → Laixi → RESULT 전송"""
@@ -728,7 +1255,7 @@ class NodeRunner:
         )
 
         if self._connected and self._ws:
-            await self._ws.send(json.dumps(result))
+            await self._send(result)
             logger.info(
                 f"→ RESULT: {result_status} ({summary['success_count']}/{summary['total_devices']})"
             )
@@ -839,6 +1366,7 @@ class NodeRunner:
     def stop(self):
         """종료"""
         self._should_run = False
+        resource_sampler.stop()
 
 
 # ============================================================
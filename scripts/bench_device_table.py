@@ -0,0 +1,152 @@
+"""
+DeviceInfo Storage Benchmark
+
+10k 디바이스 기준 표현 방식별 메모리 / 변환 시간 비교
+
+- dataclass: 기존 DeviceInfo (slots 없음, 인스턴스별 __dict__)
+- slots: DeviceInfo(slots=True) + device_info_from_row()
+- table: DeviceTable 열 지향 저장소 (인턴 코드 + epoch 배열, DeviceRow 뷰)
+
+실행 방법:
+    python scripts/bench_device_table.py                  # 10k 디바이스
+    python scripts/bench_device_table.py --devices 50000  # 디바이스 수 지정
+    python scripts/bench_device_table.py --repeat 10      # 반복 횟수 지정
+"""
+
+import argparse
+import gc
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Optional
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from shared.device_registry import device_info_from_row  # noqa: E402
+from shared.device_table import DeviceTable  # noqa: E402
+
+
+@dataclass
+class LegacyDeviceInfo:
+    """변경 전 DeviceInfo (slots 없음)"""
+
+    id: str
+    serial_number: str
+    hierarchy_id: str
+    workstation_id: str
+    phoneboard_id: str
+    slot_number: int
+    device_group: str
+    status: str
+    model: Optional[str] = None
+    last_heartbeat: Optional[datetime] = None
+
+
+def legacy_from_row(data: dict) -> LegacyDeviceInfo:
+    return LegacyDeviceInfo(
+        id=data["id"],
+        serial_number=data["serial_number"],
+        hierarchy_id=data.get("hierarchy_id", ""),
+        workstation_id=data.get("workstation_id", ""),
+        phoneboard_id=data.get("phoneboard_id", ""),
+        slot_number=data.get("slot_number", 0),
+        device_group=data.get("device_group", "A"),
+        status=data["status"],
+        model=data.get("model"),
+        last_heartbeat=(
+            datetime.fromisoformat(data["last_heartbeat"]) if data.get("last_heartbeat") else None
+        ),
+    )
+
+
+def build_rows(count: int) -> list:
+    """Supabase 응답과 같은 형태의 합성 행 (JSON 디코딩 결과처럼 문자열은 행마다 별도 객체)"""
+    now = datetime.now(timezone.utc)
+    statuses = ["idle", "idle", "idle", "busy", "offline"]
+    rows = []
+    for i in range(count):
+        ws = f"WS{i // 600 + 1:02d}"
+        board = i // 20 % 30 + 1
+        slot = i % 20 + 1
+        rows.append(
+            {
+                "id": f"{i:08x}-0000-4000-8000-{i:012x}",
+                "serial_number": f"R58M{i:08d}",
+                "hierarchy_id": f"{ws}-PB{board:02d}-S{slot:02d}",
+                "workstation_id": "".join(ws),
+                "phoneboard_id": "".join(f"{ws}-PB{board:02d}"),
+                "slot_number": slot,
+                "device_group": "".join("A" if slot % 2 else "B"),
+                "status": "".join(statuses[i % len(statuses)]),
+                "model": "".join("SM-G960N"),
+                "last_heartbeat": (now - timedelta(seconds=i % 300)).isoformat(),
+            }
+        )
+    return rows
+
+
+def measure(build, rows, repeat: int):
+    """(유지 메모리 바이트, 최소 변환 시간 초)"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build(rows)
+    retained = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del result
+
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        build(rows)
+        best = min(best, time.perf_counter() - start)
+    return retained, best
+
+
+def scan(devices) -> int:
+    """전체 순회 (hierarchy_id + status 읽기)"""
+    return sum(1 for d in devices if d.status == "idle" and d.hierarchy_id)
+
+
+def bench(count: int, repeat: int) -> None:
+    rows = build_rows(count)
+    builders = {
+        "dataclass": lambda rs: [legacy_from_row(r) for r in rs],
+        "slots": lambda rs: [device_info_from_row(r) for r in rs],
+        "table": DeviceTable.from_rows,
+    }
+
+    print(f"\n{count} devices")
+    baseline = None
+    for name, build in builders.items():
+        retained, elapsed = measure(build, rows, repeat)
+        devices = build(rows)
+        devices = list(devices.rows()) if isinstance(devices, DeviceTable) else devices
+
+        start = time.perf_counter()
+        scan(devices)
+        scanned = time.perf_counter() - start
+
+        baseline = baseline or retained
+        print(
+            f"  {name:<10} | memory {retained / 1024 / 1024:6.2f} MiB "
+            f"({retained / baseline:4.0%}) | build {elapsed * 1000:7.1f} ms | "
+            f"scan {scanned * 1000:6.1f} ms"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DeviceInfo storage benchmark")
+    parser.add_argument("--devices", type=int, nargs="*", default=[10_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for count in args.devices:
+        bench(count, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
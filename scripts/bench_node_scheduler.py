@@ -0,0 +1,197 @@
+"""
+Cloud Gateway Node Scheduler Benchmark
+
+부하가 치우친 노드 풀에서 노드 선택 정책별 큐 대기 시간 비교 (이산 이벤트 시뮬레이션)
+
+- first: 기존 방식 (HEARTBEAT 기준 active_tasks < 상한인 첫 노드)
+- stale-least: HEARTBEAT active_tasks 최소 노드 (최대 30초 지연된 값)
+- least / p2c: NodeScheduler (배치 후 미완료 집계 + 자원/지연 점수)
+
+노드는 상한(MAX_TASKS_PER_NODE)만큼 동시 처리하고 초과분은 노드 로컬 큐에서 대기.
+여유 노드가 없으면 Gateway 중앙 큐에서 대기 후 명령 완료 시 재배치.
+
+실행 방법:
+    python scripts/bench_node_scheduler.py                      # 20 노드, 부하 0.7 / 0.9
+    python scripts/bench_node_scheduler.py --nodes 100          # 노드 수 지정
+    python scripts/bench_node_scheduler.py --load 0.5 0.8 0.95  # 부하율 지정
+"""
+
+import argparse
+import heapq
+import importlib.util
+import logging
+import random
+from collections import deque
+from pathlib import Path
+
+GATEWAY_MAIN = Path(__file__).parent.parent / "services" / "cloud-gateway" / "main.py"
+
+POLICIES = ("first", "stale-least", "least", "p2c")
+
+
+def load_gateway():
+    """services/cloud-gateway/main.py 로드 (디렉터리명에 하이픈이 있어 경로로 임포트)"""
+    spec = importlib.util.spec_from_file_location("cloud_gateway_main", GATEWAY_MAIN)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class SimNode:
+    """시뮬레이션 노드 (실제 부하 + HEARTBEAT로 보고된 부하)"""
+
+    def __init__(self, node_id: str, speed: float, capacity: int):
+        self.node_id = node_id
+        self.speed = speed
+        self.capacity = capacity
+        self.running = 0
+        self.local_queue = deque()
+        self.busy_time = 0.0
+        self.last_change = 0.0
+        # Gateway가 보는 값 (HEARTBEAT 시점 갱신)
+        self.view = {
+            "node_id": node_id,
+            "status": "READY",
+            "active_tasks": 0,
+            "device_count": capacity,
+            "resources": {"cpu_percent": 0.0, "memory_percent": 30.0},
+        }
+
+    def account(self, now: float):
+        self.busy_time += self.running / self.capacity * (now - self.last_change)
+        self.last_change = now
+
+    def heartbeat(self, now: float, interval: float):
+        self.account(now)
+        self.view["active_tasks"] = self.running + len(self.local_queue)
+        self.view["resources"]["cpu_percent"] = min(100.0, 100.0 * self.busy_time / interval)
+        self.busy_time = 0.0
+
+
+def simulate(gateway, policy: str, count: int, load: float, commands: int, seed: int) -> list:
+    """명령별 대기 시간 (도착 → 실행 시작) 목록"""
+    rng = random.Random(seed)
+    capacity = gateway.Config.MAX_TASKS_PER_NODE
+    interval = float(gateway.Config.HEARTBEAT_INTERVAL)
+    mean_service = 20.0  # 기준 속도 노드의 평균 처리 시간 (초)
+
+    # 약 25%는 4배 느린 노드 (구형 PC / 디바이스 불량)
+    nodes = [
+        SimNode(f"node-{i:03d}", 0.25 if rng.random() < 0.25 else 1.0, capacity)
+        for i in range(count)
+    ]
+    by_id = {node.node_id: node for node in nodes}
+    throughput = sum(node.speed * capacity for node in nodes) / mean_service
+    arrival_rate = load * throughput
+
+    clock = [0.0]
+    scheduler = gateway.NodeScheduler(
+        policy=policy if policy in ("least", "p2c") else "least",
+        max_tasks=capacity,
+        rng=random.Random(seed + 1),
+        clock=lambda: clock[0],
+    )
+
+    def choose():
+        views = [node.view for node in nodes]
+        if policy == "first":
+            for view in views:
+                if view["active_tasks"] < capacity:
+                    return by_id[view["node_id"]]
+            return None
+        if policy == "stale-least":
+            view = min(views, key=lambda v: v["active_tasks"])
+            return by_id[view["node_id"]] if view["active_tasks"] < capacity else None
+        chosen = scheduler.select(views)
+        return by_id[chosen["node_id"]] if chosen else None
+
+    events = []  # (time, seq, kind, payload)
+    seq = 0
+
+    def push(at, kind, payload=None):
+        nonlocal seq
+        seq += 1
+        heapq.heappush(events, (at, seq, kind, payload))
+
+    def start(node, command_id, arrived):
+        now = clock[0]
+        node.account(now)
+        node.running += 1
+        waits.append(now - arrived)
+        push(now + rng.expovariate(node.speed / mean_service), "done", (node, command_id))
+
+    def dispatch(command_id, arrived) -> bool:
+        node = choose()
+        if node is None:
+            return False
+        scheduler.assigned(command_id, node.node_id)
+        if node.running < node.capacity:
+            start(node, command_id, arrived)
+        else:
+            node.local_queue.append((command_id, arrived))
+        return True
+
+    waits = []
+    central = deque()
+    t = 0.0
+    for i in range(commands):
+        t += rng.expovariate(arrival_rate)
+        push(t, "arrive", i)
+    for k in range(int(t / interval) + 2):
+        push(k * interval, "heartbeat")
+
+    while events and len(waits) < commands:
+        clock[0], _, kind, payload = heapq.heappop(events)
+        if kind == "arrive":
+            if central or not dispatch(payload, clock[0]):
+                central.append((payload, clock[0]))
+        elif kind == "heartbeat":
+            for node in nodes:
+                node.heartbeat(clock[0], interval)
+                scheduler.observe(node.node_id, node.view["active_tasks"])
+        else:
+            node, command_id = payload
+            node.account(clock[0])
+            node.running -= 1
+            scheduler.completed(command_id, node.node_id)
+            if node.local_queue:
+                start(node, *node.local_queue.popleft())
+            while central and dispatch(*central[0]):
+                central.popleft()
+    return waits
+
+
+def percentile(sorted_values: list, p: float) -> float:
+    index = min(len(sorted_values) - 1, int(round(p / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def bench(gateway, count: int, load: float, commands: int, seed: int) -> None:
+    print(f"\n{count} nodes, load {load:.2f}, {commands} commands")
+    for policy in POLICIES:
+        waits = sorted(simulate(gateway, policy, count, load, commands, seed))
+        mean = sum(waits) / len(waits)
+        print(
+            f"  {policy:<12} | wait mean {mean:7.1f}s | "
+            f"p95 {percentile(waits, 95):7.1f}s | p99 {percentile(waits, 99):7.1f}s"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cloud Gateway node scheduler benchmark")
+    parser.add_argument("--nodes", type=int, nargs="*", default=[20])
+    parser.add_argument("--load", type=float, nargs="*", default=[0.7, 0.9])
+    parser.add_argument("--commands", type=int, default=20_000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    gateway = load_gateway()
+
+    for count in args.nodes:
+        for load in args.load:
+            bench(gateway, count, load, args.commands, args.seed)
+
+
+if __name__ == "__main__":
+    main()
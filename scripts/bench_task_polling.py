@@ -0,0 +1,164 @@
+"""
+Task API Polling Storm Benchmark
+
+폰 수백 대가 동시에 GET /api/tasks/next를 폴링할 때 처리량 / 지연 / 이벤트 루프 지연 비교
+
+각 클라이언트는 --interval 간격으로 폴링 (시작 시점은 클라이언트별로 분산),
+지연은 예정 시각부터 응답까지 (루프가 막혀 늦게 시작된 시간 포함)
+
+- legacy: 요청마다 sqlite3.connect + BEGIN IMMEDIATE, async 핸들러에서 직접 실행 (기존)
+- pooled: services/api/main.py (SQLitePool + WAL, 동기 핸들러 → 스레드풀)
+
+시나리오:
+- empty: 대기 작업 없음 (대부분의 폴링)
+- drain: 폴링 수의 절반만큼 작업 등록 후 소진
+
+실행 방법:
+    python scripts/bench_task_polling.py                   # 300 클라이언트 x 20회
+    python scripts/bench_task_polling.py --clients 100 500 # 클라이언트 수 지정
+    python scripts/bench_task_polling.py --polls 50        # 클라이언트당 폴링 수
+    python scripts/bench_task_polling.py --interval 0.05   # 폴링 간격 (초)
+"""
+
+import argparse
+import asyncio
+import importlib.util
+import os
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from starlette.concurrency import run_in_threadpool
+
+API_MAIN = Path(__file__).parent.parent / "services" / "api" / "main.py"
+
+
+def load_api(db_path: str):
+    os.environ["DB_PATH"] = db_path
+    spec = importlib.util.spec_from_file_location("task_api_main", API_MAIN)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    module.init_db()
+    return module
+
+
+def legacy_next_task(db_path: str, device_id: str):
+    """변경 전 /api/tasks/next (연결 생성 + BEGIN IMMEDIATE + SELECT / UPDATE)"""
+    conn = sqlite3.connect(db_path, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        row = conn.execute(
+            """
+            SELECT id, keyword, title, youtube_url, priority
+            FROM tasks
+            WHERE status = 'pending'
+            ORDER BY priority DESC, created_at ASC
+            LIMIT 1
+            """
+        ).fetchone()
+        if row:
+            conn.execute(
+                "UPDATE tasks SET status = 'assigned', device_id = ?, "
+                "assigned_at = CURRENT_TIMESTAMP WHERE id = ?",
+                (device_id, row["id"]),
+            )
+            conn.execute(
+                "INSERT INTO devices (device_id, last_seen) VALUES (?, CURRENT_TIMESTAMP) "
+                "ON CONFLICT(device_id) DO UPDATE SET last_seen = CURRENT_TIMESTAMP",
+                (device_id,),
+            )
+        conn.commit()
+        return row
+    finally:
+        conn.close()
+
+
+def reset(api, tasks: int) -> None:
+    with api.db_transaction() as conn:
+        conn.execute("DELETE FROM tasks")
+        conn.execute("DELETE FROM devices")
+        conn.executemany(
+            "INSERT INTO tasks (keyword, title, priority) VALUES (?, ?, ?)",
+            [(f"kw{i}", f"video {i}", i % 10 + 1) for i in range(tasks)],
+        )
+
+
+async def storm(poll, clients: int, polls: int, interval: float):
+    """(초당 요청, p50 ms, p99 ms, 최대 루프 지연 ms)"""
+    latencies = []
+    lag = 0.0
+    done = asyncio.Event()
+
+    async def ticker():
+        nonlocal lag
+        while not done.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(0.005)
+            lag = max(lag, time.perf_counter() - start - 0.005)
+
+    async def client(n: int):
+        for i in range(polls):
+            due = origin + (i + n / clients) * interval
+            await asyncio.sleep(max(0.0, due - time.perf_counter()))
+            await poll(f"device-{n:03d}")
+            latencies.append(time.perf_counter() - due)
+
+    tick = asyncio.create_task(ticker())
+    start = origin = time.perf_counter()
+    await asyncio.gather(*(client(n) for n in range(clients)))
+    elapsed = time.perf_counter() - start
+    done.set()
+    await tick
+
+    latencies.sort()
+    return (
+        len(latencies) / elapsed,
+        statistics.median(latencies) * 1000,
+        latencies[int(len(latencies) * 0.99) - 1] * 1000,
+        lag * 1000,
+    )
+
+
+def bench(api, clients: int, polls: int, interval: float) -> None:
+    async def legacy(device_id):
+        # 기존 async 핸들러: 이벤트 루프에서 직접 실행
+        legacy_next_task(api.DB_PATH, device_id)
+
+    async def pooled(device_id):
+        # 동기 핸들러: FastAPI와 같은 스레드풀 경로
+        await run_in_threadpool(api.get_next_task, device_id)
+
+    print(f"\n{clients} clients x {polls} polls (every {interval * 1000:.0f} ms)")
+    for scenario, tasks in (("empty", 0), ("drain", clients * polls // 2)):
+        print(f"  {scenario}")
+        for name, poll in (("legacy", legacy), ("pooled", pooled)):
+            reset(api, tasks)
+            rps, p50, p99, lag = asyncio.run(storm(poll, clients, polls, interval))
+            print(
+                f"    {name:<7} | {rps:8.0f} req/s | p50 {p50:7.2f} ms | "
+                f"p99 {p99:7.2f} ms | loop lag {lag:7.2f} ms"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Task API polling storm benchmark")
+    parser.add_argument("--clients", type=int, nargs="*", default=[300])
+    parser.add_argument("--polls", type=int, default=20)
+    parser.add_argument("--interval", type=float, default=0.1)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        api = load_api(str(Path(tmp) / "bench.db"))
+        try:
+            for clients in args.clients:
+                bench(api, clients, args.polls, args.interval)
+        finally:
+            api.db_pool.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,215 @@
+"""
+Node WebSocket Framing Benchmark
+
+Gateway ⇄ NodeRunner 메시지의 프레임 인코딩별 크기 / CPU 비교
+
+- json: Protocol v1.0 텍스트 프레임 (기존)
+- json+deflate: permessage-deflate (websockets 기본값: window 12비트, memLevel 5, context takeover)
+- msgpack: HELLO에서 협상한 바이너리 프레임 (msgpack 설치 시)
+- msgpack+deflate: 바이너리 프레임 + permessage-deflate
+
+메시지는 같은 연결에서 연속 전송되는 것처럼 압축 컨텍스트를 유지하며 측정
+(timestamp / message_id / 배터리 등 일부 값은 메시지마다 변경)
+
+실행 방법:
+    python scripts/bench_ws_framing.py                  # 노드당 600 디바이스
+    python scripts/bench_ws_framing.py --devices 100    # 디바이스 수 지정
+    python scripts/bench_ws_framing.py --messages 500   # 메시지 수 지정
+"""
+
+import argparse
+import json
+import random
+import time
+import uuid
+import zlib
+from datetime import datetime, timezone
+
+try:
+    import msgpack
+
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+WINDOW_BITS = 12  # websockets 기본 client/server_max_window_bits
+MEM_LEVEL = 5  # websockets 기본 compress_settings
+
+
+def envelope(msg_type: str, payload: dict) -> dict:
+    return {
+        "version": "1.0",
+        "timestamp": datetime.now(timezone.utc).isoformat() + "Z",
+        "message_id": str(uuid.uuid4()),
+        "type": msg_type,
+        "payload": payload,
+    }
+
+
+def device(rng: random.Random, slot: int) -> dict:
+    return {
+        "slot": slot,
+        "serial": f"R58M{slot:08d}",
+        "status": rng.choice(["idle", "idle", "idle", "busy"]),
+        "battery_level": rng.randint(20, 100),
+    }
+
+
+def resources(rng: random.Random) -> dict:
+    return {
+        "cpu_percent": round(rng.uniform(5, 90), 1),
+        "cpu_p95": round(rng.uniform(30, 100), 1),
+        "memory_percent": round(rng.uniform(30, 80), 1),
+        "disk_free_gb": 120.5,
+        "net_sent_kbps": round(rng.uniform(0, 500), 1),
+        "net_recv_kbps": round(rng.uniform(0, 500), 1),
+        "network_ok": True,
+    }
+
+
+def full_heartbeat(rng: random.Random, devices: int, seq: int) -> dict:
+    return envelope(
+        "HEARTBEAT",
+        {
+            "status": "READY",
+            "snapshot_seq": seq,
+            "device_snapshot": [device(rng, slot) for slot in range(1, devices + 1)],
+            "resources": resources(rng),
+            "active_tasks": rng.randint(0, 5),
+            "queue_depth": rng.randint(0, 10),
+        },
+    )
+
+
+def delta_heartbeat(rng: random.Random, devices: int, seq: int) -> dict:
+    changed = [device(rng, rng.randint(1, devices)) for _ in range(5)]
+    return envelope(
+        "HEARTBEAT",
+        {
+            "status": "READY",
+            "snapshot_seq": seq,
+            "device_delta": {"base_seq": seq - 1, "added": [], "changed": changed, "removed": []},
+            "resources": resources(rng),
+            "active_tasks": rng.randint(0, 5),
+            "queue_depth": rng.randint(0, 10),
+        },
+    )
+
+
+def result(rng: random.Random, devices: int, seq: int) -> dict:
+    return envelope(
+        "RESULT",
+        {
+            "command_id": str(uuid.uuid4()),
+            "status": "SUCCESS",
+            "summary": {
+                "total_devices": devices,
+                "success_count": devices,
+                "fail_count": 0,
+                "execution_time_ms": rng.randint(1000, 60000),
+            },
+            "device_results": [
+                {
+                    "slot": slot,
+                    "serial": f"R58M{slot:08d}",
+                    "status": "SUCCESS",
+                    "duration_ms": rng.randint(500, 60000),
+                }
+                for slot in range(1, devices + 1)
+            ],
+        },
+    )
+
+
+def heartbeat_ack(rng: random.Random, devices: int, seq: int) -> dict:
+    commands = [
+        {
+            "command_id": str(uuid.uuid4()),
+            "command_type": "WATCH_VIDEO",
+            "priority": "NORMAL",
+            "target": {"type": "IDLE_DEVICES", "max_count": 10},
+            "params": {"video_url": f"https://youtu.be/{uuid.uuid4().hex[:11]}"},
+            "timeout_seconds": 300,
+        }
+        for _ in range(rng.randint(1, 5))
+    ]
+    return envelope("HEARTBEAT_ACK", {"status": "OK", "commands": commands})
+
+
+PAYLOADS = {
+    "heartbeat full": full_heartbeat,
+    "heartbeat delta": delta_heartbeat,
+    "result": result,
+    "heartbeat_ack": heartbeat_ack,
+}
+
+
+def codecs() -> dict:
+    """이름 → (encode, decode)"""
+    result = {"json": (lambda m: json.dumps(m).encode(), lambda b: json.loads(b))}
+    if MSGPACK_AVAILABLE:
+        result["msgpack"] = (
+            lambda m: msgpack.packb(m, use_bin_type=True),
+            lambda b: msgpack.unpackb(b, raw=False),
+        )
+    return result
+
+
+def run(messages: list, encode, decode, deflate: bool):
+    """(메시지당 평균 바이트, 메시지당 인코딩+디코딩 µs)"""
+    compressor = zlib.compressobj(
+        zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -WINDOW_BITS, MEM_LEVEL
+    )
+    decompressor = zlib.decompressobj(-WINDOW_BITS)
+
+    total_bytes = 0
+    start = time.perf_counter()
+    for message in messages:
+        frame = encode(message)
+        if deflate:
+            # permessage-deflate: 메시지마다 SYNC_FLUSH 후 끝 4바이트 제거
+            frame = compressor.compress(frame) + compressor.flush(zlib.Z_SYNC_FLUSH)
+            frame = frame[:-4]
+            total_bytes += len(frame)
+            frame = decompressor.decompress(frame + b"\x00\x00\xff\xff")
+        else:
+            total_bytes += len(frame)
+        decode(frame)
+    elapsed = time.perf_counter() - start
+    return total_bytes / len(messages), elapsed / len(messages) * 1e6
+
+
+def bench(devices: int, count: int, seed: int) -> None:
+    print(f"\n{devices} devices / node, {count} messages per type")
+    if not MSGPACK_AVAILABLE:
+        print("  (msgpack not installed: pip install msgpack)")
+
+    for name, build in PAYLOADS.items():
+        rng = random.Random(seed)
+        messages = [build(rng, devices, seq) for seq in range(1, count + 1)]
+        baseline = None
+        print(f"  {name}")
+        for codec, (encode, decode) in codecs().items():
+            for deflate in (False, True):
+                size, cpu = run(messages, encode, decode, deflate)
+                baseline = baseline or size
+                label = f"{codec}+deflate" if deflate else codec
+                print(
+                    f"    {label:<16} | {size:9.0f} B ({size / baseline:5.1%}) | "
+                    f"encode+decode {cpu:8.1f} µs"
+                )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Node WebSocket framing benchmark")
+    parser.add_argument("--devices", type=int, nargs="*", default=[600])
+    parser.add_argument("--messages", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    for devices in args.devices:
+        bench(devices, args.messages, args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -8,11 +8,13 @@ Supabase 연동 및 CRUD 작업 처리
 - 싱글톤 패턴으로 연결 풀 관리
 """
 
+import time
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional
 
 from loguru import logger
 
+from shared.monitoring.device_metrics import get_device_metrics
 from supabase import Client, create_client
 
 try:
@@ -88,11 +90,54 @@ class DeviceRepository:
     - pc_id: INT (워크스테이션 ID)
     - status: VARCHAR(20) DEFAULT 'idle'
     - last_seen: TIMESTAMP
+    - workstation_id: VARCHAR(10) (계층 스키마, 선택 → workstations.vlan_id로 VLAN 조회)
     """
 
+    # 미등록 워크스테이션이 보이면 workstations 테이블 재조회 (최소 간격)
+    WORKSTATION_REFRESH_SEC = 300
+
     def __init__(self):
         self.client = get_supabase_client()
         self.table = "devices"
+        self._workstation_vlans: Dict[str, Any] = {}
+        self._workstation_vlans_loaded_at: Optional[float] = None
+
+    def _workstation_vlan(self, workstation_id: Optional[Any]) -> Optional[Any]:
+        """워크스테이션이 속한 VLAN (workstations 테이블, 없으면 None)"""
+        if workstation_id is None:
+            return None
+
+        key = str(workstation_id)
+        loaded_at = self._workstation_vlans_loaded_at
+        if key not in self._workstation_vlans and (
+            loaded_at is None or time.monotonic() - loaded_at > self.WORKSTATION_REFRESH_SEC
+        ):
+            self._workstation_vlans_loaded_at = time.monotonic()
+            try:
+                result = self.client.table("workstations").select("id, vlan_id").execute()
+                self._workstation_vlans = {
+                    str(row["id"]): row.get("vlan_id") for row in result.data or []
+                }
+            except Exception as e:
+                logger.debug(f"워크스테이션 VLAN 조회 실패: {e}")
+
+        return self._workstation_vlans.get(key)
+
+    def _update_metrics(self, serial_number: str, row: Dict[str, Any], **fields) -> None:
+        """
+        기기 메트릭 테이블 갱신
+
+        DB가 돌려준 기기 행에서 노드(pc_id) / 워크스테이션 / VLAN 소속을 함께 반영
+        (행에 없는 값은 기존 값 유지)
+        """
+        workstation_id = row.get("workstation_id")
+        get_device_metrics().update(
+            serial_number,
+            node_id=row.get("pc_id"),
+            workstation_id=workstation_id,
+            vlan_id=self._workstation_vlan(workstation_id),
+            **fields,
+        )
 
     async def upsert(
         self, serial_number: str, pc_id: int, status: str = "idle", model: Optional[str] = None
@@ -136,6 +181,7 @@ class DeviceRepository:
             )
 
             if result.data and len(result.data) > 0:
+                self._update_metrics(serial_number, result.data[0], status=status)
                 logger.info(f"기기 Upsert 성공: {serial_number} (PC: {pc_id})")
                 return result.data[0]
 
@@ -170,6 +216,7 @@ class DeviceRepository:
             success = result.data is not None and len(result.data) > 0
 
             if success:
+                self._update_metrics(serial_number, result.data[0], status=status)
                 logger.debug(f"기기 상태 업데이트: {serial_number} → {status}")
             else:
                 logger.warning(f"기기 상태 업데이트 실패 (존재하지 않음?): {serial_number}")
@@ -208,7 +255,21 @@ class DeviceRepository:
                 .execute()
             )
 
-            return result.data is not None and len(result.data) > 0
+            if not result.data:
+                return False
+
+            # 배터리/온도는 DB 대신 메모리 내 기기 메트릭 테이블에 반영
+            # (등록되지 않은 시리얼은 메트릭 테이블에도 추가하지 않음)
+            health_data = health_data or {}
+            self._update_metrics(
+                serial_number,
+                result.data[0],
+                status="idle",
+                battery_level=health_data.get("battery_level"),
+                battery_temp=health_data.get("battery_temp"),
+            )
+
+            return True
 
         except Exception as e:
             logger.error(f"기기 하트비트 실패: {serial_number} - {e}")
@@ -412,9 +473,49 @@ class JobRepository:
     - created_at: TIMESTAMP
     """
 
+    # 기기 메트릭의 태스크 유형 (jobs는 모두 YouTube 시청)
+    TASK_TYPE = "youtube_watch"
+
     def __init__(self):
         self.client = get_supabase_client()
         self.table = "jobs"
+        self._device_serials: Dict[int, str] = {}
+
+    def _device_serial(self, device_id: Optional[int]) -> Optional[str]:
+        """jobs.device_id → 시리얼 번호 (변하지 않으므로 캐시)"""
+        if device_id is None:
+            return None
+
+        serial = self._device_serials.get(device_id)
+        if serial is None:
+            result = (
+                self.client.table("devices").select("serial_number").eq("id", device_id).execute()
+            )
+            if result.data:
+                serial = self._device_serials[device_id] = result.data[0]["serial_number"]
+        return serial
+
+    def _record_task(self, job: Dict[str, Any], status: str) -> None:
+        """
+        작업 결과를 기기 메트릭에 기록 (기기가 속한 노드 단위로 집계)
+
+        메트릭 기록 실패가 작업 상태 갱신 결과에 영향을 주지 않도록 예외는 삼킴
+        """
+        try:
+            serial = self._device_serial(job.get("device_id"))
+            if serial is None:
+                return
+
+            duration = None
+            if job.get("started_at") and job.get("completed_at"):
+                duration = (
+                    datetime.fromisoformat(job["completed_at"])
+                    - datetime.fromisoformat(job["started_at"])
+                ).total_seconds()
+
+            get_device_metrics().record_task(serial, self.TASK_TYPE, status, duration_sec=duration)
+        except Exception as e:
+            logger.debug(f"작업 메트릭 기록 실패: {job.get('id')} - {e}")
 
     async def create(self, video_id: int, device_id: int) -> Dict[str, Any]:
         """작업 생성"""
@@ -468,6 +569,7 @@ class JobRepository:
             result = self.client.table(self.table).update(update_data).eq("id", job_id).execute()
 
             if result.data and len(result.data) > 0:
+                self._record_task(result.data[0], "success")
                 logger.info(f"작업 완료: {job_id} (시청: {watch_time}초)")
                 return True
 
@@ -490,6 +592,7 @@ class JobRepository:
             )
 
             if result.data and len(result.data) > 0:
+                self._record_task(result.data[0], "failure")
                 logger.warning(f"작업 실패: {job_id} - {error_message}")
                 return True
 
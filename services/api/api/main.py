@@ -17,6 +17,13 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
 from shared.cache import CacheKey, get_cache
+from shared.device_registry import start_device_registry, stop_device_registry
+from shared.monitoring.network import get_network_health_checker
+from shared.monitoring.runbook import (
+    forward_network_alerts,
+    get_alert_manager,
+    get_incident_tracker,
+)
 
 # 라우터 임포트 (Docker/standalone 호환)
 try:
@@ -31,8 +38,14 @@ try:
         youtube,
         youtube_channels,
     )
+    from .routers.oob import (
+        get_health_collector,
+        get_recovery_dispatcher,
+        warm_recovery_connections,
+    )
     from .routers.oob import router as oob_router
     from .services.nocturne_scheduler import start_nocturne_scheduler, stop_nocturne_scheduler
+    from .services.oob import close_all_box_sessions
     from .services.youtube_monitor import (
         start_youtube_monitor_scheduler,
         stop_youtube_monitor_scheduler,
@@ -49,8 +62,14 @@ except ImportError:
         youtube,
         youtube_channels,
     )
+    from routers.oob import (
+        get_health_collector,
+        get_recovery_dispatcher,
+        warm_recovery_connections,
+    )
     from routers.oob import router as oob_router
     from services.nocturne_scheduler import start_nocturne_scheduler, stop_nocturne_scheduler
+    from services.oob import close_all_box_sessions
     from services.youtube_monitor import (
         start_youtube_monitor_scheduler,
         stop_youtube_monitor_scheduler,
@@ -85,9 +104,31 @@ async def lifespan(app: FastAPI):
     asyncio.create_task(start_youtube_monitor_scheduler(interval_minutes=30))
     logger.info("📺 YouTube Monitor Scheduler 시작됨")
 
+    # OOB 메트릭 배치 저장 시작
+    await get_health_collector().start()
+
+    # 노드 목록 동기화 + 복구용 SSH 연결 미리 수립 (백그라운드)
+    asyncio.create_task(warm_recovery_connections())
+
+    # 알림 파이프라인 시작 (중복 제거 / 그룹핑 / 전송률 제한)
+    await get_alert_manager().start()
+    forward_network_alerts(get_network_health_checker())
+
+    # 인시던트 저장소 복원 + write-behind 시작 (INCIDENT_DB_PATH 설정 시)
+    await get_incident_tracker().start()
+
+    # 디바이스 캐시 로드 + Realtime 구독 (DEVICE_REGISTRY_CACHE=true 시)
+    await start_device_registry()
+
     yield
 
     # 종료 처리
+    await stop_device_registry()
+    await get_incident_tracker().stop()
+    await get_alert_manager().stop()
+    await get_health_collector().stop()
+    await get_recovery_dispatcher().close_connections()
+    await close_all_box_sessions()
     await stop_youtube_monitor_scheduler()
     logger.info("📺 YouTube Monitor Scheduler 종료됨")
     await stop_nocturne_scheduler()
@@ -235,6 +276,7 @@ async def api_info():
                 "GET /api/oob/nodes": "모든 노드 건강 상태",
                 "GET /api/oob/evaluate/{node_id}": "노드 상태 평가",
                 "POST /api/oob/recover": "복구 실행",
+                "POST /api/oob/recover/batch": "여러 노드 복구 동시 실행",
                 "POST /api/oob/box/test": "박스 프로토콜 테스트",
                 "POST /api/oob/box/command": "박스 명령 실행",
             },
@@ -7,6 +7,9 @@ DoAi.Me 모니터링 라우터
 - GET /api/monitoring/summary - 시스템 요약
 - GET /api/monitoring/alerts - 알림 목록
 - POST /api/monitoring/alerts - 알림 전송
+- GET /api/monitoring/devices - 기기별 메트릭 목록
+- GET /api/monitoring/devices/groups - 노드/워크스테이션/VLAN 집계
+- GET /api/monitoring/devices/{serial_number} - 기기 메트릭 상세
 - GET /api/monitoring/logs - 로그 검색
 - POST /api/monitoring/logs - 로그 저장
 - GET /api/monitoring/logs/stats - 로그 통계
@@ -17,10 +20,9 @@ import time
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional
 
-from fastapi import APIRouter, Query
-from fastapi.responses import PlainTextResponse
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import PlainTextResponse, Response
 from loguru import logger
-from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 from pydantic import BaseModel
 
 from shared.monitoring import (
@@ -28,14 +30,15 @@ from shared.monitoring import (
     HealthStatus,
     check_disk,
     check_memory,
+    get_device_metrics,
     get_log_collector,
     get_log_stats,
+    get_metrics_exposition,
     search_logs,
 )
 from shared.monitoring.metrics import (
     active_agents,
     agent_tasks_total,
-    device_status,
     queue_size,
     system_info,
 )
@@ -207,6 +210,16 @@ class LogResponse(BaseModel):
 
 _server_start_time = time.time()
 
+# 시스템 정보는 프로세스 수명 동안 변하지 않으므로 한 번만 설정
+system_info.info(
+    {
+        "version": "2.0.0",
+        "environment": "production",
+        "python_version": platform.python_version(),
+        "platform": platform.system(),
+    }
+)
+
 
 def _get_uptime() -> float:
     """서버 업타임 (초)"""
@@ -219,26 +232,29 @@ def _get_uptime() -> float:
 
 
 @router.get("/metrics", response_class=PlainTextResponse)
-async def prometheus_metrics():
+async def prometheus_metrics(request: Request):
     """
     Prometheus 메트릭 엔드포인트
 
     Prometheus가 스크래핑하는 표준 /metrics 엔드포인트
-    텍스트 포맷으로 모든 메트릭 반환
+    - 렌더링 결과를 METRICS_CACHE_TTL_SEC 동안 공유 (이벤트 루프 밖에서 렌더링)
+    - Accept: application/openmetrics-text 이면 OpenMetrics 포맷
+    - Accept-Encoding: gzip 이면 압축 응답
     """
-    # 시스템 정보 업데이트
-    system_info.info(
-        {
-            "version": "2.0.0",
-            "environment": "production",
-            "python_version": platform.python_version(),
-            "platform": platform.system(),
-        }
-    )
+    openmetrics = "application/openmetrics-text" in request.headers.get("accept", "")
+    rendered = await get_metrics_exposition().render(openmetrics=openmetrics)
+
+    if "gzip" in request.headers.get("accept-encoding", ""):
+        return Response(
+            content=rendered.gzip_body,
+            media_type=rendered.content_type,
+            headers={"Content-Encoding": "gzip", "Vary": "Accept, Accept-Encoding"},
+        )
 
-    return PlainTextResponse(
-        content=generate_latest().decode("utf-8"),
-        media_type=CONTENT_TYPE_LATEST,
+    return Response(
+        content=rendered.body,
+        media_type=rendered.content_type,
+        headers={"Vary": "Accept, Accept-Encoding"},
     )
 
 
@@ -510,6 +526,53 @@ async def network_health():
         }
 
 
+# =============================================================================
+# 기기 메트릭 엔드포인트
+# =============================================================================
+
+
+@router.get("/api/monitoring/devices")
+async def list_device_metrics(
+    node_id: Optional[str] = Query(None, description="노드 필터"),
+    status: Optional[str] = Query(None, description="상태 필터: online, idle, busy, offline, error"),
+    limit: int = Query(100, ge=1, le=1000, description="최대 결과 수"),
+    offset: int = Query(0, ge=0, description="오프셋"),
+):
+    """
+    기기별 메트릭 목록
+
+    Prometheus에는 그룹 집계만 노출하므로 기기 단위 상세는 여기서 조회
+    """
+    metrics = get_device_metrics()
+    devices = metrics.list_devices(node_id=node_id, status=status, limit=limit, offset=offset)
+
+    return {
+        "total": len(metrics),
+        "count": len(devices),
+        "devices": devices,
+    }
+
+
+@router.get("/api/monitoring/devices/groups")
+async def device_metric_groups(
+    scope: str = Query("node", pattern="^(node|workstation|vlan)$", description="집계 단위"),
+):
+    """노드 / 워크스테이션 / VLAN 단위 기기 집계"""
+    return {
+        "scope": scope,
+        "groups": get_device_metrics().summarize(scope),
+    }
+
+
+@router.get("/api/monitoring/devices/{serial_number}")
+async def get_device_metric(serial_number: str):
+    """기기 메트릭 상세"""
+    device = get_device_metrics().get_device(serial_number)
+    if device is None:
+        raise HTTPException(status_code=404, detail=f"Device not found: {serial_number}")
+    return device
+
+
 # =============================================================================
 # 로그 엔드포인트 (M3)
 # =============================================================================
@@ -13,24 +13,31 @@ from fastapi import APIRouter, BackgroundTasks, HTTPException
 from pydantic import BaseModel, Field
 
 from shared.cache import CacheKey, get_cache
+from shared.monitoring.runbook import get_alert_manager
 
 try:
+    from ..db import get_supabase_client
     from ..services.oob import (
         BoxClient,
         HealthCollector,
         NodeHealth,
         RecoveryAction,
         RecoveryDispatcher,
+        RecoveryTarget,
         RuleEngine,
     )
+    from ..services.oob.box_client import get_box_session_stats
 except ImportError:
+    from db import get_supabase_client
     from services.oob import (
         BoxClient,
         HealthCollector,
         RecoveryAction,
         RecoveryDispatcher,
+        RecoveryTarget,
         RuleEngine,
     )
+    from services.oob.box_client import get_box_session_stats
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/oob", tags=["OOB Management"])
@@ -65,9 +72,20 @@ _recovery_dispatcher: Optional[RecoveryDispatcher] = None
 
 
 def get_health_collector() -> HealthCollector:
+    """
+    HealthCollector 싱글톤 반환
+
+    Supabase 클라이언트를 넘겨 MetricsPersister(node_health_logs 적재)를 활성화
+    Supabase 설정이 없으면 메트릭 적재 없이 메모리 수집만 수행
+    """
     global _health_collector
     if _health_collector is None:
-        _health_collector = HealthCollector()
+        try:
+            supabase = get_supabase_client()
+        except ValueError as e:
+            logger.warning(f"Supabase not configured, health metrics will not be persisted: {e}")
+            supabase = None
+        _health_collector = HealthCollector(supabase_client=supabase)
     return _health_collector
 
 
@@ -81,10 +99,30 @@ def get_rule_engine() -> RuleEngine:
 def get_recovery_dispatcher() -> RecoveryDispatcher:
     global _recovery_dispatcher
     if _recovery_dispatcher is None:
-        _recovery_dispatcher = RecoveryDispatcher()
+        _recovery_dispatcher = RecoveryDispatcher(alert_manager=get_alert_manager())
     return _recovery_dispatcher
 
 
+async def warm_recovery_connections() -> Dict[str, bool]:
+    """
+    DB 노드 목록 동기화 후 알려진 Tailscale IP로 SSH ControlMaster 연결 미리 수립
+    (장애 시 첫 복구 명령의 연결 수립 지연 제거, API 시작 시 백그라운드 실행)
+    """
+    collector = get_health_collector()
+    await collector.sync_from_database()
+
+    dispatcher = get_recovery_dispatcher()
+    ips = sorted(
+        {node.tailscale_ip for node in collector.get_all_nodes().values() if node.tailscale_ip}
+    )
+    if not ips or dispatcher.control_persist_sec <= 0:
+        return {}
+
+    results = await dispatcher.warm_connections(ips)
+    logger.info(f"Warmed recovery SSH connections: {sum(results.values())}/{len(results)}")
+    return results
+
+
 # === Request/Response Models ===
 
 
@@ -100,6 +138,12 @@ class NodeMetricsUpdate(BaseModel):
     box_tcp_ok: bool = False
 
 
+class HeartbeatTimeoutNotice(BaseModel):
+    """HEARTBEAT 타임아웃 통보 (Cloud Gateway)"""
+
+    node_id: str
+
+
 class NodeHealthResponse(BaseModel):
     """노드 건강 상태 응답"""
 
@@ -127,6 +171,17 @@ class RecoveryRequest(BaseModel):
     slot_number: Optional[int] = None  # box 복구 시 특정 슬롯
 
 
+class BatchRecoveryRequest(BaseModel):
+    """일괄 복구 실행 요청 (soft/restart)"""
+
+    node_ids: List[str]
+    action: str = Field(..., description="soft or restart")
+    dry_run: bool = False
+    rack_ids: Dict[str, str] = Field(
+        default_factory=dict, description="node_id -> rack_id (랙별 동시 실행 제한)"
+    )
+
+
 class RecoveryResponse(BaseModel):
     """복구 실행 응답"""
 
@@ -138,6 +193,8 @@ class RecoveryResponse(BaseModel):
     stderr: Optional[str] = None
     error_message: Optional[str] = None
     duration_sec: float = 0.0
+    queue_wait_sec: float = 0.0
+    time_to_recover_sec: Optional[float] = None
 
 
 class BoxTestRequest(BaseModel):
@@ -154,9 +211,14 @@ class BoxCommandRequest(BaseModel):
     box_ip: str
     box_port: int = 56666
     command: str = Field(
-        ..., description="all_power_on, all_power_off, power_cycle, slot_power_on, slot_power_off"
+        ...,
+        description=(
+            "all_power_on, all_power_off, power_cycle, slot_power_on, slot_power_off, "
+            "slots_power_cycle"
+        ),
     )
     slot_number: Optional[int] = None
+    slot_numbers: Optional[List[int]] = None  # slots_power_cycle 대상
 
 
 class EvaluationResponse(BaseModel):
@@ -183,6 +245,7 @@ async def update_node_metrics(update: NodeMetricsUpdate):
     node = await collector.update_node_metrics(
         node_id=update.node_id, metrics_data=update.model_dump()
     )
+    await collector.persist_metrics(update.node_id)
 
     # M4: Cache node health
     cache = get_cache()
@@ -207,6 +270,27 @@ async def update_node_metrics(update: NodeMetricsUpdate):
     )
 
 
+@router.post("/heartbeat-timeout", response_model=NodeHealthResponse)
+async def report_heartbeat_timeout(notice: HeartbeatTimeoutNotice):
+    """
+    HEARTBEAT 타임아웃 통보 (Cloud Gateway가 마감 만료 즉시 호출)
+    """
+    collector = get_health_collector()
+    await collector.mark_heartbeat_timeout(notice.node_id)
+    node = collector.get_node(notice.node_id)
+
+    if not node:
+        raise HTTPException(status_code=404, detail=f"Node {notice.node_id} not found")
+
+    # 캐시된 CONNECTED 상태가 남지 않도록 갱신
+    cache = get_cache()
+    await cache.set(
+        CacheKey.NODE_HEALTH, notice.node_id, _node_to_dict(node), ttl=NODE_HEALTH_CACHE_TTL
+    )
+
+    return NodeHealthResponse(**_node_to_dict(node))
+
+
 @router.get("/nodes", response_model=List[NodeHealthResponse])
 async def get_all_nodes():
     """모든 노드 건강 상태 조회"""
@@ -294,6 +378,31 @@ async def evaluate_node(node_id: str):
     )
 
 
+@router.get("/evaluate", response_model=List[EvaluationResponse])
+async def evaluate_fleet():
+    """
+    전체 노드 일괄 평가
+
+    RuleEngine.evaluate_batch로 fleet 전체를 한 번에 평가
+    """
+    collector = get_health_collector()
+    rule_engine = get_rule_engine()
+
+    results = rule_engine.evaluate_batch(collector.get_all_nodes().values())
+
+    return [
+        EvaluationResponse(
+            node_id=result.node_id,
+            failure_level=result.failure_level.value,
+            recommended_action=result.recommended_action.value,
+            reasons=result.reasons,
+            can_execute=result.can_execute,
+            cooldown_remaining_sec=result.cooldown_remaining_sec,
+        )
+        for result in results
+    ]
+
+
 @router.get("/unhealthy", response_model=List[EvaluationResponse])
 async def get_unhealthy_nodes():
     """비정상 노드 목록 및 평가 결과"""
@@ -311,8 +420,7 @@ async def get_unhealthy_nodes():
             can_execute=result.can_execute,
             cooldown_remaining_sec=result.cooldown_remaining_sec,
         )
-        for node in unhealthy
-        for result in [rule_engine.evaluate(node)]
+        for result in rule_engine.evaluate_batch(unhealthy)
     ]
 
 
@@ -412,6 +520,74 @@ async def execute_recovery(request: RecoveryRequest, background_tasks: Backgroun
     )
 
 
+@router.post("/recover/batch", response_model=List[RecoveryResponse])
+async def execute_batch_recovery(request: BatchRecoveryRequest):
+    """
+    여러 노드 복구 동시 실행 (랙 단위 장애 대응)
+
+    전체/랙별 동시 실행 제한 안에서 병렬 실행.
+    쿨다운 중이거나 Tailscale IP가 없는 노드는 제외.
+    """
+    collector = get_health_collector()
+    rule_engine = get_rule_engine()
+    dispatcher = get_recovery_dispatcher()
+
+    action_map = {"soft": RecoveryAction.SOFT, "restart": RecoveryAction.RESTART}
+    action = action_map.get(request.action)
+    if not action:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid action: {request.action}. Must be soft or restart",
+        )
+
+    cooldown_minutes = {"soft": 3, "restart": 15}[request.action]
+    targets = []
+    for node_id in request.node_ids:
+        node = collector.get_node(node_id)
+        if not node or not node.tailscale_ip:
+            logger.warning(f"Batch recovery: skipping {node_id} (unknown node or no Tailscale IP)")
+            continue
+
+        can_execute = await collector.can_execute_recovery(
+            node_id=node_id, recovery_type=request.action, cooldown_minutes=cooldown_minutes
+        )
+        if not can_execute and not request.dry_run:
+            logger.warning(f"Batch recovery: skipping {node_id} (cooldown active)")
+            continue
+
+        targets.append(
+            RecoveryTarget(
+                node_id=node_id,
+                tailscale_ip=node.tailscale_ip,
+                action=action,
+                rack_id=request.rack_ids.get(node_id),
+            )
+        )
+
+    results = await dispatcher.execute_recoveries(targets, dry_run=request.dry_run)
+
+    if not request.dry_run:
+        for target in targets:
+            await collector.record_recovery(target.node_id, request.action)
+            rule_engine.record_recovery_attempt(target.node_id, action)
+
+    return [
+        RecoveryResponse(
+            node_id=r.node_id,
+            action=r.action.value,
+            status=r.status.value,
+            exit_code=r.exit_code,
+            stdout=r.stdout,
+            stderr=r.stderr,
+            error_message=r.error_message,
+            duration_sec=r.duration_sec,
+            queue_wait_sec=r.queue_wait_sec,
+            time_to_recover_sec=r.time_to_recover_sec,
+        )
+        for r in results
+    ]
+
+
 @router.get("/recovery/history", response_model=List[RecoveryResponse])
 async def get_recovery_history(node_id: Optional[str] = None, limit: int = 20):
     """복구 히스토리 조회"""
@@ -460,8 +636,9 @@ async def execute_box_command(request: BoxCommandRequest):
     - power_cycle: 전체 전원 순환 (OFF -> 5초 -> ON)
     - slot_power_on: 특정 슬롯 전원 ON (slot_number 필요)
     - slot_power_off: 특정 슬롯 전원 OFF (slot_number 필요)
+    - slots_power_cycle: 여러 슬롯 일괄 전원 순환 (slot_numbers 필요)
     """
-    client = BoxClient(request.box_ip, request.box_port)
+    client = BoxClient(request.box_ip, request.box_port, persistent=True)
 
     success = False
     message = ""
@@ -491,6 +668,16 @@ async def execute_box_command(request: BoxCommandRequest):
             success = await client.slot_power_off(request.slot_number)
             message = f"Slot {request.slot_number} power OFF command sent"
 
+        elif request.command == "slots_power_cycle":
+            if not request.slot_numbers:
+                raise HTTPException(status_code=400, detail="slot_numbers required")
+            slot_results = await client.power_cycle_slots(request.slot_numbers)
+            success = all(slot_results.values())
+            failed = [slot for slot, ok in slot_results.items() if not ok]
+            message = f"Power cycle completed for {len(slot_results)} slots" + (
+                f" (failed: {failed})" if failed else ""
+            )
+
         else:
             raise HTTPException(status_code=400, detail=f"Unknown command: {request.command}")
 
@@ -522,6 +709,12 @@ async def test_box_connection(box_ip: str, box_port: int = 56666):
     return {"connected": connected, "box_ip": box_ip, "box_port": box_port}
 
 
+@router.get("/box/sessions")
+async def get_box_sessions():
+    """박스 영속 세션 상태 및 명령 지연시간 통계"""
+    return {"sessions": get_box_session_stats()}
+
+
 # === M4: Cached Stats Endpoint ===
 
 
@@ -3,24 +3,30 @@
 #
 # 구성요소:
 # - HealthCollector: 노드 상태 메트릭 수집
+# - MetricsPersister: 메트릭 배치 저장 (백그라운드)
 # - RuleEngine: Threshold 기반 장애 판단
 # - RecoveryDispatcher: Tailscale SSH를 통한 복구 실행
-# - BoxClient: TCP를 통한 박스 전원 제어
+# - BoxClient: TCP를 통한 박스 전원 제어 (BoxSession: 영속 연결)
 
-from .box_client import BoxClient, BoxCommand
+from .box_client import BoxClient, BoxCommand, BoxSession, close_all_box_sessions
 from .health_collector import HealthCollector, NodeHealth, NodeMetrics
-from .recovery_dispatcher import RecoveryDispatcher, RecoveryResult
+from .metrics_persister import MetricsPersister
+from .recovery_dispatcher import RecoveryDispatcher, RecoveryResult, RecoveryTarget
 from .rule_engine import FailureLevel, RecoveryAction, RuleEngine
 
 __all__ = [
     "HealthCollector",
     "NodeHealth",
     "NodeMetrics",
+    "MetricsPersister",
     "RuleEngine",
     "FailureLevel",
     "RecoveryAction",
     "RecoveryDispatcher",
     "RecoveryResult",
+    "RecoveryTarget",
     "BoxClient",
     "BoxCommand",
+    "BoxSession",
+    "close_all_box_sessions",
 ]
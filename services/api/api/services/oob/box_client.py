@@ -13,9 +13,11 @@ Strategos Security Design v1
 
 import asyncio
 import logging
-from dataclasses import dataclass
+import time
+from collections import deque
+from dataclasses import dataclass, field
 from enum import Enum
-from typing import Optional
+from typing import Deque, Dict, Iterable, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -80,6 +82,266 @@ class BoxResponse:
     error: Optional[str] = None
 
 
+@dataclass
+class BoxCommandStats:
+    """박스 명령 지연시간 통계"""
+
+    commands: int = 0
+    failures: int = 0
+    reconnects: int = 0
+    latencies_ms: Deque[float] = field(default_factory=lambda: deque(maxlen=256))
+
+    def record(self, latency_ms: float, success: bool):
+        self.commands += 1
+        if not success:
+            self.failures += 1
+        self.latencies_ms.append(latency_ms)
+
+    def to_dict(self) -> dict:
+        latencies = sorted(self.latencies_ms)
+        return {
+            "commands": self.commands,
+            "failures": self.failures,
+            "reconnects": self.reconnects,
+            "avg_ms": round(sum(latencies) / len(latencies), 2) if latencies else 0.0,
+            "p95_ms": round(latencies[int(len(latencies) * 0.95)], 2) if latencies else 0.0,
+            "max_ms": round(latencies[-1], 2) if latencies else 0.0,
+        }
+
+
+class BoxSession:
+    """
+    박스 TCP 영속 세션
+
+    - 연결 1개를 유지하며 끊기면 자동 재연결
+    - 명령 큐: 대기 중인 명령을 연속으로 write 후 drain 1회 (파이프라이닝)
+    - 응답을 기다리는 명령은 단독으로 처리 (응답 매칭 보장)
+    - 명령별 지연시간 통계 (큐 대기 + 전송)
+    """
+
+    STALE_READ_TIMEOUT_SEC = 0.05  # 응답을 읽지 않은 명령의 늦은 응답 대기
+
+    def __init__(
+        self,
+        host: str,
+        port: int = 56666,
+        timeout_sec: float = 5.0,
+        max_reconnect_attempts: int = 3,
+    ):
+        self.host = host
+        self.port = port
+        self.timeout_sec = timeout_sec
+        self.max_reconnect_attempts = max_reconnect_attempts
+        self.stats = BoxCommandStats()
+
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._queue: "asyncio.Queue[Tuple[bytes, bool, float, asyncio.Future]]" = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+        self._closed = False
+        self._unread_replies = 0  # 응답을 읽지 않은 명령 수 (현재 연결 기준)
+
+    @property
+    def connected(self) -> bool:
+        # 박스가 연결을 닫은 경우(EOF) 다음 명령 전에 재연결
+        return (
+            self._writer is not None
+            and not self._writer.is_closing()
+            and not (self._reader is not None and self._reader.at_eof())
+        )
+
+    async def send(self, cmd_bytes: bytes, expect_response: bool = False) -> BoxResponse:
+        """명령을 큐에 넣고 전송 완료(또는 응답)까지 대기"""
+        if self._closed:
+            return BoxResponse(success=False, error="Box session closed")
+
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((cmd_bytes, expect_response, time.perf_counter(), future))
+        return await future
+
+    async def close(self):
+        """세션 종료 (대기 / 처리 중인 명령은 실패 처리)"""
+        self._closed = True
+
+        if self._task:
+            # 처리 중이던 batch는 _run()의 finally에서 실패 처리
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        while not self._queue.empty():
+            self._fail([self._queue.get_nowait()], "Box session closed")
+
+        await self._disconnect()
+
+    @staticmethod
+    def _fail(items: Iterable[Tuple[bytes, bool, float, asyncio.Future]], error: str):
+        """아직 결과가 없는 명령 future를 실패로 완료"""
+        for _, _, _, future in items:
+            if not future.done():
+                future.set_result(BoxResponse(success=False, error=error))
+
+    async def _connect(self):
+        self._reader, self._writer = await asyncio.wait_for(
+            asyncio.open_connection(self.host, self.port), timeout=self.timeout_sec
+        )
+        self._unread_replies = 0
+        logger.debug(f"Box session connected: {self.host}:{self.port}")
+
+    async def _disconnect(self):
+        if self._writer:
+            self._writer.close()
+            try:
+                await self._writer.wait_closed()
+            except Exception:
+                pass
+        self._reader = None
+        self._writer = None
+
+    async def _run(self):
+        """명령 큐 처리 루프"""
+        batch: List[Tuple[bytes, bool, float, asyncio.Future]] = []
+        lookahead: Optional[Tuple[bytes, bool, float, asyncio.Future]] = None
+        try:
+            while not self._closed:
+                batch = [lookahead or await self._queue.get()]
+                lookahead = None
+
+                # 응답 대기 명령이 아니면 큐에 쌓인 명령을 함께 전송 (파이프라인)
+                if not batch[0][1]:
+                    while not self._queue.empty():
+                        item = self._queue.get_nowait()
+                        if item[1]:
+                            # 응답 대기 명령은 다음 batch에서 단독 처리
+                            lookahead = item
+                            break
+                        batch.append(item)
+
+                await self._process(batch)
+                batch = []
+        finally:
+            # 취소(close) 시 큐에서 이미 꺼낸 명령도 응답 대기 상태로 남지 않도록 완료
+            self._fail([*batch, *([lookahead] if lookahead else [])], "Box session closed")
+
+    async def _process(self, batch: List[Tuple[bytes, bool, float, asyncio.Future]]):
+        """batch 전송 (실패 시 재연결 후 재시도)"""
+        error: Optional[str] = None
+        raw_response: Optional[bytes] = None
+
+        for attempt in range(self.max_reconnect_attempts + 1):
+            try:
+                if not self.connected:
+                    if attempt > 0 or self.stats.commands > 0:
+                        self.stats.reconnects += 1
+                    await self._connect()
+
+                if batch[0][1]:
+                    await self._discard_stale()
+
+                for cmd_bytes, _, _, _ in batch:
+                    self._writer.write(cmd_bytes)
+                await asyncio.wait_for(self._writer.drain(), timeout=self.timeout_sec)
+
+                if batch[0][1]:
+                    try:
+                        raw_response = await asyncio.wait_for(self._reader.read(1024), timeout=1.0)
+                        if not raw_response:
+                            # 연결 종료형 박스: 다음 명령에서 재연결
+                            await self._disconnect()
+                    except asyncio.TimeoutError:
+                        self._unread_replies += 1  # 늦게 도착하면 다음 응답 전에 버림
+                        logger.debug("No response from box (timeout)")
+                else:
+                    self._unread_replies += len(batch)
+
+                error = None
+                break
+
+            except Exception as e:
+                error = f"Box session error {self.host}:{self.port}: {e!r}"
+                logger.warning(f"{error} (attempt {attempt + 1})")
+                await self._disconnect()
+                if attempt < self.max_reconnect_attempts:
+                    await asyncio.sleep(min(0.2 * 2**attempt, 2.0))
+
+        now = time.perf_counter()
+        for _, _, enqueued_at, future in batch:
+            self.stats.record((now - enqueued_at) * 1000, error is None)
+            if not future.done():
+                if error:
+                    future.set_result(BoxResponse(success=False, error=error))
+                else:
+                    future.set_result(BoxResponse(success=True, raw_data=raw_response))
+
+    async def _discard_stale(self):
+        """
+        응답 대기 전 이전 명령의 늦은 응답 등 남은 바이트 버림 (응답 매칭)
+
+        응답을 읽지 않은 명령이 있을 때만 짧은 timeout으로 더 이상 읽을 것이 없을 때까지 읽음
+        """
+        if not self._unread_replies:
+            return
+
+        discarded = 0
+        while True:
+            try:
+                stale = await asyncio.wait_for(
+                    self._reader.read(1024), timeout=self.STALE_READ_TIMEOUT_SEC
+                )
+            except asyncio.TimeoutError:
+                break
+            if not stale:
+                # 연결 종료형 박스: 재연결 후 전송
+                await self._disconnect()
+                await self._connect()
+                break
+            discarded += len(stale)
+
+        self._unread_replies = 0
+        if discarded:
+            logger.debug(f"Discarded {discarded} stale bytes from box {self.host}")
+
+    def get_stats(self) -> dict:
+        return {
+            "host": self.host,
+            "port": self.port,
+            "connected": self.connected,
+            **self.stats.to_dict(),
+        }
+
+
+# (host, port) -> BoxSession
+_sessions: Dict[Tuple[str, int], BoxSession] = {}
+
+
+def get_box_session(host: str, port: int = 56666, timeout_sec: float = 5.0) -> BoxSession:
+    """박스별 공유 세션 반환 (없으면 생성)"""
+    key = (host, port)
+    session = _sessions.get(key)
+    if session is None or session._closed:
+        session = BoxSession(host, port, timeout_sec=timeout_sec)
+        _sessions[key] = session
+    return session
+
+
+def get_box_session_stats() -> List[dict]:
+    """모든 공유 세션 통계"""
+    return [session.get_stats() for session in _sessions.values()]
+
+
+async def close_all_box_sessions():
+    """모든 공유 세션 종료 (애플리케이션 종료 시 호출)"""
+    for session in list(_sessions.values()):
+        await session.close()
+    _sessions.clear()
+
+
 class BoxClient:
     """
     박스 TCP 제어 클라이언트
@@ -89,6 +351,10 @@ class BoxClient:
         success = await client.power_off_all()
         await asyncio.sleep(5)
         success = await client.power_on_all()
+
+        # 영속 세션 (명령마다 TCP 연결을 새로 열지 않음)
+        client = BoxClient("192.168.50.1", 56666, persistent=True)
+        results = await client.power_cycle_slots(range(1, 21))
     """
 
     def __init__(
@@ -97,11 +363,21 @@ class BoxClient:
         port: int = 56666,
         config: Optional[BoxConfig] = None,
         timeout_sec: float = 5.0,
+        persistent: bool = False,
     ):
+        """
+        Args:
+            host: 박스 IP
+            port: 박스 TCP 포트
+            config: HEX 명령 설정
+            timeout_sec: 연결/전송 타임아웃
+            persistent: True면 박스별 공유 BoxSession으로 전송
+        """
         self.host = host
         self.port = port
         self.config = config or BoxConfig()
         self.timeout_sec = timeout_sec
+        self.persistent = persistent
 
     @staticmethod
     def hex_to_bytes(hex_str: str) -> bytes:
@@ -127,6 +403,13 @@ class BoxClient:
             cmd_bytes = self.hex_to_bytes(hex_command)
             logger.debug(f"Sending to box {self.host}:{self.port}: {hex_command}")
 
+            if self.persistent:
+                session = get_box_session(self.host, self.port, self.timeout_sec)
+                result = await session.send(cmd_bytes, expect_response=expect_response)
+                if not result.success:
+                    logger.error(result.error)
+                return result
+
             # TCP 연결 및 전송
             reader, writer = await asyncio.wait_for(
                 asyncio.open_connection(self.host, self.port), timeout=self.timeout_sec
@@ -247,6 +530,40 @@ class BoxClient:
         on_result = await self.slot_power_on(slot)
         return on_result
 
+    async def power_cycle_slots(
+        self, slots: Iterable[int], delay_sec: float = 3.0, stagger_sec: float = 0.2
+    ) -> Dict[int, bool]:
+        """
+        여러 슬롯 일괄 전원 순환
+
+        OFF 명령은 동시에 전송하고, 대기 후 ON 명령은 stagger_sec 간격으로
+        순차 전송하여 돌입 전류(in-rush)를 분산한다.
+
+        Returns:
+            Dict[int, bool]: 슬롯별 성공 여부 (OFF 실패 슬롯은 ON 생략)
+        """
+        slot_list = list(dict.fromkeys(slots))
+        logger.info(f"Starting power cycle for {len(slot_list)} slots on box {self.host}")
+
+        off_results = await asyncio.gather(*(self.slot_power_off(slot) for slot in slot_list))
+        results = dict(zip(slot_list, off_results))
+
+        if any(off_results):
+            await asyncio.sleep(delay_sec)
+
+        for i, slot in enumerate(s for s in slot_list if results[s]):
+            if i > 0 and stagger_sec > 0:
+                await asyncio.sleep(stagger_sec)
+            results[slot] = await self.slot_power_on(slot)
+
+        return results
+
+    def get_stats(self) -> Optional[dict]:
+        """영속 세션 지연시간 통계 (persistent=False면 None)"""
+        if not self.persistent:
+            return None
+        return get_box_session(self.host, self.port, self.timeout_sec).get_stats()
+
     # === 연결 테스트 ===
 
     async def test_connection(self) -> bool:
@@ -10,7 +10,9 @@ import logging
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
-from typing import Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional
+
+from .metrics_persister import MetricsPersister
 
 logger = logging.getLogger(__name__)
 
@@ -128,11 +130,16 @@ class HealthCollector:
     - RuleEngine에 데이터 제공
     """
 
-    def __init__(self, supabase_client=None):
+    def __init__(self, supabase_client=None, persister: Optional[MetricsPersister] = None):
         self._nodes: Dict[str, NodeHealth] = {}
         self._supabase = supabase_client
         self._lock = asyncio.Lock()
 
+        # 메트릭 저장은 백그라운드 배치로 처리 (persist_metrics는 버퍼 적재만)
+        if persister is None and supabase_client is not None:
+            persister = MetricsPersister(supabase_client)
+        self._persister = persister
+
         # 설정
         self.heartbeat_timeout_sec = 45  # 하트비트 타임아웃
         self.metrics_retention_hours = 24  # 메트릭 보관 시간
@@ -154,6 +161,40 @@ class HealthCollector:
         async with self._lock:
             return self._register_node_unsafe(node_id, expected_devices, tailscale_ip)
 
+    async def register_nodes(self, nodes: Iterable[Dict[str, Any]]) -> int:
+        """
+        노드 일괄 등록 (락 1회 획득)
+
+        Args:
+            nodes: {"node_id", "expected_devices", "tailscale_ip"} 딕셔너리 목록
+
+        Returns:
+            int: 등록(또는 기존) 노드 수
+        """
+        count = 0
+        async with self._lock:
+            for node_data in nodes:
+                node_id = node_data.get("node_id")
+                if not node_id:
+                    continue
+                self._register_node_unsafe(
+                    node_id,
+                    node_data.get("expected_devices", 0),
+                    node_data.get("tailscale_ip"),
+                )
+                count += 1
+        return count
+
+    async def start(self):
+        """백그라운드 메트릭 저장 시작"""
+        if self._persister:
+            await self._persister.start()
+
+    async def stop(self):
+        """백그라운드 메트릭 저장 중지 (잔여 버퍼 flush)"""
+        if self._persister:
+            await self._persister.stop()
+
     async def update_node_metrics(self, node_id: str, metrics_data: dict) -> NodeHealth:
         """
         노드 메트릭 업데이트
@@ -265,40 +306,45 @@ class HealthCollector:
                 .execute()
             )
 
-            for node_data in result.data or []:
-                node_id = node_data.get("node_id")
-                if node_id:
-                    await self.register_node(
-                        node_id=node_id,
-                        expected_devices=node_data.get("capacity", 0),
-                        tailscale_ip=node_data.get("tailscale_ip"),
-                    )
+            count = await self.register_nodes(
+                {
+                    "node_id": node_data.get("node_id"),
+                    "expected_devices": node_data.get("capacity", 0),
+                    "tailscale_ip": node_data.get("tailscale_ip"),
+                }
+                for node_data in result.data or []
+            )
 
-            logger.info(f"Synced {len(result.data or [])} nodes from database")
+            logger.info(f"Synced {count} nodes from database")
 
         except Exception as e:
             logger.error(f"Failed to sync nodes from database: {e}")
 
     async def persist_metrics(self, node_id: str):
-        """메트릭을 DB에 저장 (선택적)"""
-        if not self._supabase:
+        """
+        메트릭을 DB에 저장 (선택적)
+
+        행은 MetricsPersister 버퍼에 적재되고 백그라운드에서 bulk insert 된다.
+        """
+        if not self._persister:
             return
 
         node = self._nodes.get(node_id)
         if not node:
             return
 
-        try:
-            self._supabase.table("node_health_logs").insert(
-                {
-                    "node_id": node_id,
-                    "status": node.status.value,
-                    "device_count_adb": node.metrics.device_count_adb,
-                    "device_count_expected": node.metrics.device_count_expected,
-                    "adb_server_ok": node.metrics.adb_server_ok,
-                    "unauthorized_count": node.metrics.unauthorized_count,
-                    "collected_at": node.metrics.collected_at.isoformat(),
-                }
-            ).execute()
-        except Exception as e:
-            logger.error(f"Failed to persist metrics for {node_id}: {e}")
+        self._persister.enqueue(
+            {
+                "node_id": node_id,
+                "status": node.status.value,
+                "device_count_adb": node.metrics.device_count_adb,
+                "device_count_expected": node.metrics.device_count_expected,
+                "adb_server_ok": node.metrics.adb_server_ok,
+                "unauthorized_count": node.metrics.unauthorized_count,
+                "collected_at": node.metrics.collected_at.isoformat(),
+            }
+        )
+
+    def get_persister_stats(self) -> Optional[Dict[str, int]]:
+        """메트릭 저장 통계 (persister 미설정 시 None)"""
+        return self._persister.get_stats() if self._persister else None
@@ -0,0 +1,208 @@
+"""
+DoAi.Me OOB - Metrics Persister
+노드 메트릭 배치 저장 (백그라운드)
+
+Strategos Security Design v1
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class MetricsPersister:
+    """
+    node_health_logs 배치 저장기
+
+    역할:
+    - 메트릭 행을 메모리 버퍼에 적재 (enqueue는 I/O 없음)
+    - 크기(batch_size) 또는 시간(flush_interval_sec) 조건에서 bulk insert
+    - 실패 시 지수 백오프 재시도, 최종 실패 행은 버퍼 앞쪽으로 복귀
+    - 주기적으로 다운샘플링 RPC 호출 (raw 1시간 / 1분 롤업 24시간)
+    """
+
+    def __init__(
+        self,
+        supabase_client,
+        table: str = "node_health_logs",
+        batch_size: int = 500,
+        flush_interval_sec: float = 5.0,
+        max_buffer: int = 20000,
+        max_retries: int = 3,
+        retry_backoff_sec: float = 0.5,
+        rollup_interval_sec: Optional[float] = 300.0,
+        rollup_rpc: str = "rollup_node_health_logs",
+    ):
+        """
+        Args:
+            supabase_client: Supabase 클라이언트 (동기 API)
+            table: 대상 테이블
+            batch_size: 한 번에 insert할 최대 행 수 (도달 시 즉시 flush)
+            flush_interval_sec: 최대 flush 간격
+            max_buffer: 버퍼 최대 크기 (초과 시 가장 오래된 행 폐기)
+            max_retries: batch당 재시도 횟수
+            retry_backoff_sec: 첫 재시도 대기 시간 (매회 2배)
+            rollup_interval_sec: 다운샘플링 RPC 호출 간격 (None이면 비활성)
+            rollup_rpc: 다운샘플링 RPC 함수명
+        """
+        self._supabase = supabase_client
+        self.table = table
+        self.batch_size = batch_size
+        self.flush_interval_sec = flush_interval_sec
+        self.max_buffer = max_buffer
+        self.max_retries = max_retries
+        self.retry_backoff_sec = retry_backoff_sec
+        self.rollup_interval_sec = rollup_interval_sec
+        self.rollup_rpc = rollup_rpc
+
+        self._buffer: Deque[Dict[str, Any]] = deque()
+        self._flush_event = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._running = False
+        self._task: Optional[asyncio.Task] = None
+        self._last_rollup = time.monotonic()
+
+        # 통계
+        self.rows_enqueued = 0
+        self.rows_written = 0
+        self.rows_dropped = 0
+        self.batches_written = 0
+        self.batch_failures = 0
+
+    @property
+    def pending(self) -> int:
+        """flush 대기 중인 행 수"""
+        return len(self._buffer)
+
+    def enqueue(self, row: Dict[str, Any]) -> None:
+        """메트릭 행 적재 (논블로킹)"""
+        if len(self._buffer) >= self.max_buffer:
+            self._buffer.popleft()
+            self.rows_dropped += 1
+
+        self._buffer.append(row)
+        self.rows_enqueued += 1
+
+        if len(self._buffer) >= self.batch_size:
+            self._flush_event.set()
+
+    async def start(self):
+        """백그라운드 flush 루프 시작"""
+        if self._running:
+            return
+
+        self._running = True
+        self._task = asyncio.create_task(self._run_loop())
+        logger.info(
+            f"MetricsPersister started (batch_size={self.batch_size}, "
+            f"interval={self.flush_interval_sec}s)"
+        )
+
+    async def stop(self):
+        """루프 중지 및 잔여 버퍼 flush"""
+        self._running = False
+
+        if self._task:
+            # 진행 중인 batch가 유실되지 않도록 cancel 대신 루프 종료를 기다림
+            self._flush_event.set()
+            await self._task
+            self._task = None
+
+        await self.flush()
+        logger.info(f"MetricsPersister stopped (pending={self.pending})")
+
+    async def flush(self) -> int:
+        """
+        버퍼를 batch 단위로 저장
+
+        Returns:
+            int: 저장된 행 수
+        """
+        written = 0
+
+        async with self._flush_lock:
+            while self._buffer:
+                count = min(self.batch_size, len(self._buffer))
+                batch = [self._buffer.popleft() for _ in range(count)]
+
+                if not await self._write_batch(batch):
+                    # 실패한 batch는 순서를 유지하여 버퍼 앞쪽으로 복귀
+                    keep = max(0, min(len(batch), self.max_buffer - len(self._buffer)))
+                    self.rows_dropped += len(batch) - keep
+                    self._buffer.extendleft(reversed(batch[len(batch) - keep :]))
+                    break
+
+                written += len(batch)
+
+        return written
+
+    async def _write_batch(self, rows: List[Dict[str, Any]]) -> bool:
+        """bulk insert (재시도 포함)"""
+        delay = self.retry_backoff_sec
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                await asyncio.to_thread(
+                    lambda: self._supabase.table(self.table).insert(rows).execute()
+                )
+                self.rows_written += len(rows)
+                self.batches_written += 1
+                return True
+            except Exception as e:
+                if attempt >= self.max_retries:
+                    self.batch_failures += 1
+                    logger.error(f"Failed to persist {len(rows)} metric rows: {e}")
+                    return False
+
+                logger.warning(
+                    f"Metric batch insert failed (attempt {attempt + 1}), retrying in {delay}s: {e}"
+                )
+                await asyncio.sleep(delay)
+                delay *= 2
+
+        return False
+
+    async def rollup(self) -> bool:
+        """다운샘플링 RPC 호출 (raw -> 1분 롤업, 보관 기간 초과분 삭제)"""
+        try:
+            await asyncio.to_thread(lambda: self._supabase.rpc(self.rollup_rpc).execute())
+            return True
+        except Exception as e:
+            logger.error(f"Failed to roll up node health logs: {e}")
+            return False
+
+    async def _run_loop(self):
+        """메인 flush 루프"""
+        while self._running:
+            try:
+                await asyncio.wait_for(self._flush_event.wait(), timeout=self.flush_interval_sec)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_event.clear()
+
+            try:
+                await self.flush()
+
+                if (
+                    self.rollup_interval_sec is not None
+                    and time.monotonic() - self._last_rollup >= self.rollup_interval_sec
+                ):
+                    self._last_rollup = time.monotonic()
+                    await self.rollup()
+            except Exception as e:
+                logger.error(f"MetricsPersister loop error: {e}")
+
+    def get_stats(self) -> Dict[str, int]:
+        """저장 통계"""
+        return {
+            "pending": self.pending,
+            "rows_enqueued": self.rows_enqueued,
+            "rows_written": self.rows_written,
+            "rows_dropped": self.rows_dropped,
+            "batches_written": self.batches_written,
+            "batch_failures": self.batch_failures,
+        }
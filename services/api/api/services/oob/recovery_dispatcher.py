@@ -7,13 +7,21 @@ Strategos Security Design v1
 
 import asyncio
 import logging
+import os
+import tempfile
+import time
 from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
-from typing import List, Optional
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, Optional
+
+from shared.monitoring.runbook import AlertLevel
 
 from .rule_engine import RecoveryAction
 
+if TYPE_CHECKING:
+    from shared.monitoring.runbook import AlertManager
+
 logger = logging.getLogger(__name__)
 
 
@@ -42,11 +50,29 @@ class RecoveryResult:
     completed_at: datetime = None
     duration_sec: float = 0.0
 
+    # 일괄 복구 시: 동시성 제한 대기 시간 / 배치 시작부터 완료까지 시간
+    queue_wait_sec: float = 0.0
+    time_to_recover_sec: Optional[float] = None
+
     def __post_init__(self):
         if self.started_at and self.completed_at:
             self.duration_sec = (self.completed_at - self.started_at).total_seconds()
 
 
+@dataclass
+class RecoveryTarget:
+    """일괄 복구 대상"""
+
+    node_id: str
+    tailscale_ip: str
+    action: RecoveryAction
+    rack_id: Optional[str] = None  # 같은 랙 동시 복구 제한용
+
+
+# (node_id, stream, line) - stream은 "stdout" 또는 "stderr"
+OutputCallback = Callable[[str, str, str], None]
+
+
 class RecoveryDispatcher:
     """
     원격 복구 실행기
@@ -55,6 +81,9 @@ class RecoveryDispatcher:
     - Tailscale SSH를 통해 노드에 접속
     - recover.sh 스크립트 실행
     - 실행 결과 수집 및 보고
+
+    SSH 연결은 OpenSSH ControlMaster로 노드별로 유지되어 (ControlPersist)
+    이후 복구 명령은 TCP/키 교환 없이 기존 세션을 재사용한다.
     """
 
     def __init__(
@@ -62,17 +91,74 @@ class RecoveryDispatcher:
         ssh_user: str = "doaiops",
         ssh_timeout_sec: int = 30,
         script_path: str = "/opt/doai/bin/recover.sh",
+        control_dir: Optional[str] = None,
+        control_persist_sec: int = 600,
+        max_concurrency: int = 32,
+        per_rack_limit: int = 4,
+        alert_manager: Optional["AlertManager"] = None,
     ):
+        """
+        Args:
+            ssh_user: SSH 사용자
+            ssh_timeout_sec: SSH 연결 타임아웃
+            script_path: 노드의 복구 스크립트 경로
+            control_dir: ControlMaster 소켓 디렉토리 (None이면 임시 디렉토리)
+            control_persist_sec: 마스터 연결 유지 시간 (0이면 ControlMaster 비활성)
+            max_concurrency: 일괄 복구 전체 동시 실행 수
+            per_rack_limit: 일괄 복구 랙별 동시 실행 수
+            alert_manager: 복구 결과 알림 (None이면 알림 없음)
+        """
         self.ssh_user = ssh_user
         self.ssh_timeout_sec = ssh_timeout_sec
         self.script_path = script_path
+        self.control_dir = control_dir or os.path.join(tempfile.gettempdir(), "doai-oob-ssh")
+        self.control_persist_sec = control_persist_sec
+        self.max_concurrency = max_concurrency
+        self.per_rack_limit = per_rack_limit
+        self.alert_manager = alert_manager
+
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._rack_semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._warm_hosts: set = set()
 
         # 실행 히스토리
         self._history: List[RecoveryResult] = []
         self._max_history = 100
 
+    def _ssh_args(self, tailscale_ip: str, connect_timeout: Optional[int] = None) -> List[str]:
+        """공통 SSH 인자 (ControlMaster 포함)"""
+        args = [
+            "ssh",
+            "-o",
+            "StrictHostKeyChecking=no",
+            "-o",
+            "UserKnownHostsFile=/dev/null",
+            "-o",
+            f"ConnectTimeout={connect_timeout or self.ssh_timeout_sec}",
+            "-o",
+            "BatchMode=yes",
+        ]
+
+        if self.control_persist_sec > 0:
+            os.makedirs(self.control_dir, mode=0o700, exist_ok=True)
+            args += [
+                "-o",
+                "ControlMaster=auto",
+                "-o",
+                f"ControlPath={os.path.join(self.control_dir, '%C')}",
+                "-o",
+                f"ControlPersist={self.control_persist_sec}",
+            ]
+
+        return args + [f"{self.ssh_user}@{tailscale_ip}"]
+
     async def execute_recovery(
-        self, node_id: str, tailscale_ip: str, action: RecoveryAction, dry_run: bool = False
+        self,
+        node_id: str,
+        tailscale_ip: str,
+        action: RecoveryAction,
+        dry_run: bool = False,
+        on_output: Optional[OutputCallback] = None,
     ) -> RecoveryResult:
         """
         복구 스크립트 실행
@@ -82,6 +168,7 @@ class RecoveryDispatcher:
             tailscale_ip: Tailscale IP (100.x.x.x)
             action: 복구 액션 타입
             dry_run: True면 실제 실행 없이 명령만 로깅
+            on_output: stdout/stderr 라인 단위 콜백 (스트리밍)
 
         Returns:
             RecoveryResult: 실행 결과
@@ -97,17 +184,7 @@ class RecoveryDispatcher:
         mode = mode_map.get(action, "soft")
 
         # SSH 명령 구성
-        ssh_cmd = [
-            "ssh",
-            "-o",
-            "StrictHostKeyChecking=no",
-            "-o",
-            "UserKnownHostsFile=/dev/null",
-            "-o",
-            f"ConnectTimeout={self.ssh_timeout_sec}",
-            f"{self.ssh_user}@{tailscale_ip}",
-            f"sudo {self.script_path} {mode}",
-        ]
+        ssh_cmd = self._ssh_args(tailscale_ip) + [f"sudo {self.script_path} {mode}"]
 
         logger.info(f"Executing recovery: {node_id} ({tailscale_ip}) -> {action.value}")
         logger.debug(f"SSH command: {' '.join(ssh_cmd)}")
@@ -129,9 +206,20 @@ class RecoveryDispatcher:
                 *ssh_cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
             )
 
+            stdout_lines: List[str] = []
+            stderr_lines: List[str] = []
+
             try:
-                stdout, stderr = await asyncio.wait_for(
-                    process.communicate(),
+                await asyncio.wait_for(
+                    asyncio.gather(
+                        self._read_stream(
+                            process.stdout, node_id, "stdout", stdout_lines, on_output
+                        ),
+                        self._read_stream(
+                            process.stderr, node_id, "stderr", stderr_lines, on_output
+                        ),
+                        process.wait(),
+                    ),
                     timeout=self.ssh_timeout_sec + 30,  # 스크립트 실행 시간 여유
                 )
             except asyncio.TimeoutError:
@@ -143,19 +231,22 @@ class RecoveryDispatcher:
                     node_id=node_id,
                     action=action,
                     status=RecoveryStatus.FAILED,
+                    stdout="\n".join(stdout_lines),
+                    stderr="\n".join(stderr_lines),
                     error_message="SSH command timed out",
                     started_at=started_at,
                     completed_at=completed_at,
                 )
-                self._record_result(result)
+                await self._record_result(result)
                 return result
 
             completed_at = datetime.utcnow()
+            self._warm_hosts.add(tailscale_ip)
 
             # 결과 처리
             exit_code = process.returncode
-            stdout_str = stdout.decode("utf-8", errors="replace").strip()
-            stderr_str = stderr.decode("utf-8", errors="replace").strip()
+            stdout_str = "\n".join(stdout_lines).strip()
+            stderr_str = "\n".join(stderr_lines).strip()
 
             status = RecoveryStatus.SUCCESS if exit_code == 0 else RecoveryStatus.FAILED
 
@@ -177,7 +268,7 @@ class RecoveryDispatcher:
                     f"Recovery failed: {node_id} ({action.value}) - exit={exit_code}, stderr={stderr_str}"
                 )
 
-            self._record_result(result)
+            await self._record_result(result)
             return result
 
         except Exception as e:
@@ -192,25 +283,156 @@ class RecoveryDispatcher:
                 started_at=started_at,
                 completed_at=completed_at,
             )
-            self._record_result(result)
+            await self._record_result(result)
+            return result
+
+    async def _read_stream(
+        self,
+        stream: Optional[asyncio.StreamReader],
+        node_id: str,
+        name: str,
+        lines: List[str],
+        on_output: Optional[OutputCallback],
+    ):
+        """subprocess 출력을 라인 단위로 수집 (콜백으로 실시간 전달)"""
+        if stream is None:
+            return
+
+        while True:
+            raw = await stream.readline()
+            if not raw:
+                break
+
+            line = raw.decode("utf-8", errors="replace").rstrip("\r\n")
+            lines.append(line)
+
+            if on_output:
+                try:
+                    on_output(node_id, name, line)
+                except Exception as e:
+                    logger.warning(f"Recovery output callback error ({node_id}): {e}")
+
+    def _get_rack_semaphore(self, rack_id: str) -> asyncio.Semaphore:
+        """랙별 동시 실행 제한 세마포어"""
+        if rack_id not in self._rack_semaphores:
+            self._rack_semaphores[rack_id] = asyncio.Semaphore(self.per_rack_limit)
+        return self._rack_semaphores[rack_id]
+
+    async def execute_recoveries(
+        self,
+        targets: Iterable[RecoveryTarget],
+        dry_run: bool = False,
+        on_output: Optional[OutputCallback] = None,
+    ) -> List[RecoveryResult]:
+        """
+        여러 노드 복구 동시 실행
+
+        전체 동시 실행 수(max_concurrency)와 랙별 동시 실행 수(per_rack_limit)
+        제한 안에서 병렬로 실행한다. 각 결과의 time_to_recover_sec은
+        배치 시작부터 해당 노드 복구 완료까지의 시간.
+
+        Returns:
+            List[RecoveryResult]: 입력 순서와 동일한 실행 결과
+        """
+        target_list = list(targets)
+        batch_started = time.monotonic()
+
+        async def run(target: RecoveryTarget) -> RecoveryResult:
+            rack = self._get_rack_semaphore(target.rack_id) if target.rack_id else None
+
+            if rack:
+                await rack.acquire()
+            try:
+                async with self._semaphore:
+                    queue_wait = time.monotonic() - batch_started
+                    result = await self.execute_recovery(
+                        node_id=target.node_id,
+                        tailscale_ip=target.tailscale_ip,
+                        action=target.action,
+                        dry_run=dry_run,
+                        on_output=on_output,
+                    )
+            finally:
+                if rack:
+                    rack.release()
+
+            result.queue_wait_sec = round(queue_wait, 3)
+            result.time_to_recover_sec = round(time.monotonic() - batch_started, 3)
             return result
 
+        results = list(await asyncio.gather(*(run(t) for t in target_list)))
+
+        if results:
+            succeeded = sum(1 for r in results if r.status == RecoveryStatus.SUCCESS)
+            logger.info(
+                f"Batch recovery completed: {succeeded}/{len(results)} succeeded, "
+                f"time_to_recover={max(r.time_to_recover_sec for r in results):.1f}s"
+            )
+
+        return results
+
+    async def warm_connections(self, tailscale_ips: Iterable[str]) -> Dict[str, bool]:
+        """
+        ControlMaster 연결 미리 수립 (장애 발생 전 호출)
+
+        Returns:
+            Dict[str, bool]: IP별 연결 성공 여부
+        """
+        ips = list(tailscale_ips)
+
+        async def warm(ip: str) -> bool:
+            async with self._semaphore:
+                return await self.test_ssh_connection(ip)
+
+        results = await asyncio.gather(*(warm(ip) for ip in ips))
+        return dict(zip(ips, results))
+
+    async def close_connections(self):
+        """유지 중인 ControlMaster 연결 종료"""
+        if self.control_persist_sec <= 0:
+            return
+
+        for ip in list(self._warm_hosts):
+            try:
+                process = await asyncio.create_subprocess_exec(
+                    *self._ssh_args(ip)[:-1],
+                    "-O",
+                    "exit",
+                    f"{self.ssh_user}@{ip}",
+                    stdout=asyncio.subprocess.DEVNULL,
+                    stderr=asyncio.subprocess.DEVNULL,
+                )
+                await asyncio.wait_for(process.wait(), timeout=5)
+            except Exception as e:
+                logger.debug(f"Failed to close SSH master for {ip}: {e}")
+
+        self._warm_hosts.clear()
+
     async def execute_box_reset(
-        self, node_id: str, box_ip: str, box_port: int, slot_number: Optional[int] = None
+        self,
+        node_id: str,
+        box_ip: str,
+        box_port: int,
+        slot_number: Optional[int] = None,
+        slot_numbers: Optional[List[int]] = None,
     ) -> RecoveryResult:
         """
         박스 전원 제어 (BoxClient 연계)
 
-        이 메서드는 BoxClient를 통해 실행됨
+        이 메서드는 BoxClient를 통해 실행됨 (박스별 영속 세션 사용)
         """
         from .box_client import BoxClient
 
         started_at = datetime.utcnow()
 
         try:
-            client = BoxClient(box_ip, box_port)
+            client = BoxClient(box_ip, box_port, persistent=True)
 
-            if slot_number:
+            if slot_numbers:
+                # 여러 슬롯 일괄 리셋 (ON은 돌입 전류 분산을 위해 순차)
+                slot_results = await client.power_cycle_slots(slot_numbers)
+                success = all(slot_results.values())
+            elif slot_number:
                 # 특정 슬롯만 리셋
                 success = await client.slot_power_cycle(slot_number)
             else:
@@ -228,11 +450,13 @@ class RecoveryDispatcher:
             )
 
             if success:
-                logger.info(f"Box reset successful: {node_id} (slot={slot_number or 'all'})")
+                logger.info(
+                    f"Box reset successful: {node_id} (slot={slot_numbers or slot_number or 'all'})"
+                )
             else:
                 logger.error(f"Box reset failed: {node_id}")
 
-            self._record_result(result)
+            await self._record_result(result)
             return result
 
         except Exception as e:
@@ -247,14 +471,43 @@ class RecoveryDispatcher:
                 started_at=started_at,
                 completed_at=completed_at,
             )
-            self._record_result(result)
+            await self._record_result(result)
             return result
 
-    def _record_result(self, result: RecoveryResult):
-        """결과 히스토리 기록"""
+    async def _record_result(self, result: RecoveryResult):
+        """결과 히스토리 기록 + 알림"""
         self._history.append(result)
         if len(self._history) > self._max_history:
             self._history = self._history[-self._max_history :]
+        await self._notify_result(result)
+
+    async def _notify_result(self, result: RecoveryResult):
+        """복구 성공/실패 알림 (알림 파이프라인 경유: 중복 제거 / 그룹핑)"""
+        if self.alert_manager is None or result.status == RecoveryStatus.SKIPPED:
+            return
+
+        if result.status == RecoveryStatus.SUCCESS:
+            title = f"OOB recovery succeeded: {result.node_id}"
+            level = AlertLevel.INFO
+        else:
+            title = f"OOB recovery failed: {result.node_id}"
+            level = AlertLevel.ERROR
+
+        fields = {"Node": result.node_id, "Action": result.action.value}
+        if result.exit_code is not None:
+            fields["Exit code"] = str(result.exit_code)
+
+        fingerprint = f"oob_recovery:{result.node_id}:{result.action.value}:{result.status.value}"
+        try:
+            await self.alert_manager.notify(
+                title,
+                result.error_message or result.stderr or result.status.value,
+                level,
+                fields,
+                fingerprint=fingerprint,
+            )
+        except Exception as e:
+            logger.error(f"Recovery alert failed: {result.node_id} - {e}")
 
     def get_history(self, node_id: Optional[str] = None, limit: int = 20) -> List[RecoveryResult]:
         """복구 히스토리 조회"""
@@ -266,17 +519,7 @@ class RecoveryDispatcher:
     async def test_ssh_connection(self, tailscale_ip: str) -> bool:
         """SSH 연결 테스트"""
         try:
-            cmd = [
-                "ssh",
-                "-o",
-                "StrictHostKeyChecking=no",
-                "-o",
-                "UserKnownHostsFile=/dev/null",
-                "-o",
-                "ConnectTimeout=5",
-                f"{self.ssh_user}@{tailscale_ip}",
-                "echo ok",
-            ]
+            cmd = self._ssh_args(tailscale_ip, connect_timeout=5) + ["echo ok"]
 
             process = await asyncio.create_subprocess_exec(
                 *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
@@ -284,7 +527,10 @@ class RecoveryDispatcher:
 
             stdout, _ = await asyncio.wait_for(process.communicate(), timeout=10)
 
-            return process.returncode == 0 and b"ok" in stdout
+            ok = process.returncode == 0 and b"ok" in stdout
+            if ok:
+                self._warm_hosts.add(tailscale_ip)
+            return ok
 
         except Exception as e:
             logger.warning(f"SSH test failed for {tailscale_ip}: {e}")
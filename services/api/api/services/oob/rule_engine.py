@@ -9,7 +9,7 @@ import logging
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from enum import Enum
-from typing import Callable, List, Optional
+from typing import Callable, Iterable, List, Optional
 
 from .health_collector import NodeHealth, NodeMetrics
 
@@ -81,6 +81,104 @@ class RuleEngineResult:
             self.evaluated_at = datetime.utcnow()
 
 
+@dataclass
+class FleetMetricColumns:
+    """
+    전체 노드 메트릭 컬럼 (struct-of-arrays)
+
+    노드별 히스토리를 한 번만 역순 스캔하여 P0/P1 판단에 필요한
+    연속 실패 횟수를 컬럼 단위로 미리 계산해 둔다.
+    (evaluate()는 조건마다 히스토리를 다시 스캔)
+    """
+
+    nodes: List[NodeHealth]
+    heartbeat_streak: List[int]
+    device_loss_streak: List[int]
+    adb_streak: List[int]
+    unauthorized_streak: List[int]
+    warning_since: List[Optional[datetime]]  # P1 디바이스 감소 조건 시작 시각
+
+    # 현재 메트릭 (node.metrics) 기준 컬럼
+    device_loss_pct: List[float]
+    ws_connected: List[bool]
+
+    @classmethod
+    def from_nodes(
+        cls, nodes: Iterable[NodeHealth], config: ThresholdConfig
+    ) -> "FleetMetricColumns":
+        """노드 목록에서 컬럼 생성 (노드당 히스토리 1회 스캔)"""
+        heartbeat_timeout = config.heartbeat_timeout_sec
+        loss_threshold = config.device_loss_threshold_pct
+        unauthorized_threshold = config.unauthorized_threshold
+        warning_threshold = config.device_warning_threshold_pct
+
+        node_list = list(nodes)
+        heartbeat_streak: List[int] = []
+        device_loss_streak: List[int] = []
+        adb_streak: List[int] = []
+        unauthorized_streak: List[int] = []
+        warning_since: List[Optional[datetime]] = []
+        device_loss_pct: List[float] = []
+        ws_connected: List[bool] = []
+
+        for node in node_list:
+            hb = dl = adb = ua = 0
+            hb_run = dl_run = adb_run = ua_run = warn_run = True
+            since = None
+
+            for m in reversed(node.metrics_history):
+                expected = m.device_count_expected
+                loss = 0.0 if expected == 0 else 1.0 - (m.device_count_adb / expected)
+
+                if hb_run:
+                    if m.node_heartbeat_age_sec > heartbeat_timeout:
+                        hb += 1
+                    else:
+                        hb_run = False
+                if dl_run:
+                    if loss >= loss_threshold:
+                        dl += 1
+                    else:
+                        dl_run = False
+                if adb_run:
+                    if not m.adb_server_ok:
+                        adb += 1
+                    else:
+                        adb_run = False
+                if ua_run:
+                    if m.unauthorized_count >= unauthorized_threshold:
+                        ua += 1
+                    else:
+                        ua_run = False
+                if warn_run:
+                    if loss >= warning_threshold:
+                        since = m.collected_at
+                    else:
+                        warn_run = False
+
+                if not (hb_run or dl_run or adb_run or ua_run or warn_run):
+                    break
+
+            heartbeat_streak.append(hb)
+            device_loss_streak.append(dl)
+            adb_streak.append(adb)
+            unauthorized_streak.append(ua)
+            warning_since.append(since)
+            device_loss_pct.append(node.metrics.device_loss_pct)
+            ws_connected.append(node.metrics.ws_connected)
+
+        return cls(
+            nodes=node_list,
+            heartbeat_streak=heartbeat_streak,
+            device_loss_streak=device_loss_streak,
+            adb_streak=adb_streak,
+            unauthorized_streak=unauthorized_streak,
+            warning_since=warning_since,
+            device_loss_pct=device_loss_pct,
+            ws_connected=ws_connected,
+        )
+
+
 class RuleEngine:
     """
     Threshold 기반 장애 감지 및 복구 결정 엔진
@@ -96,13 +194,18 @@ class RuleEngine:
         self.config = config or ThresholdConfig()
         self._last_recovery: dict = {}  # node_id -> {action, timestamp}
 
-    def evaluate(self, node: NodeHealth) -> RuleEngineResult:
+    def evaluate(self, node: NodeHealth, now: Optional[datetime] = None) -> RuleEngineResult:
         """
         노드 상태 평가 및 복구 결정
 
+        Args:
+            node: 평가할 노드
+            now: 기준 시각 (None이면 현재 UTC)
+
         Returns:
             RuleEngineResult: 평가 결과 및 추천 액션
         """
+        now = now or datetime.utcnow()
         reasons = []
         failure_level = FailureLevel.NONE
         recommended_action = RecoveryAction.NONE
@@ -147,7 +250,9 @@ class RuleEngine:
             if node.metrics.device_loss_pct >= self.config.device_warning_threshold_pct:
                 # 히스토리에서 지속 시간 확인
                 duration = self._calculate_condition_duration(
-                    node, lambda m: m.device_loss_pct >= self.config.device_warning_threshold_pct
+                    node,
+                    lambda m: m.device_loss_pct >= self.config.device_warning_threshold_pct,
+                    now,
                 )
                 if duration >= self.config.device_warning_duration_sec:
                     failure_level = FailureLevel.P1_WARNING
@@ -162,10 +267,12 @@ class RuleEngine:
 
         # === 복구 액션 결정 ===
         if failure_level == FailureLevel.P0_CRITICAL:
-            recommended_action = self._determine_recovery_action(node)
+            recommended_action = self._determine_recovery_action(node, now)
 
         # === 쿨다운 체크 ===
-        can_execute, cooldown_remaining = self._check_cooldown(node.node_id, recommended_action)
+        can_execute, cooldown_remaining = self._check_cooldown(
+            node.node_id, recommended_action, now
+        )
 
         result = RuleEngineResult(
             node_id=node.node_id,
@@ -174,6 +281,7 @@ class RuleEngine:
             reasons=reasons,
             can_execute=can_execute,
             cooldown_remaining_sec=cooldown_remaining,
+            evaluated_at=now,
         )
 
         if failure_level != FailureLevel.NONE:
@@ -184,7 +292,111 @@ class RuleEngine:
 
         return result
 
-    def _determine_recovery_action(self, node: NodeHealth) -> RecoveryAction:
+    def evaluate_batch(
+        self, nodes: Iterable[NodeHealth], now: Optional[datetime] = None
+    ) -> List[RuleEngineResult]:
+        """
+        전체 노드 일괄 평가 (fleet-wide)
+
+        evaluate()와 동일한 결과를 반환하지만, 메트릭을 컬럼으로 변환한 뒤
+        한 번의 패스로 P0/P1 분류를 계산한다. 에스컬레이션/쿨다운은
+        복구 액션이 필요한 P0 노드에 대해서만 계산.
+
+        Args:
+            nodes: 평가할 노드 목록
+            now: 기준 시각 (None이면 현재 UTC, 모든 노드에 동일하게 적용)
+
+        Returns:
+            List[RuleEngineResult]: 입력 순서와 동일한 평가 결과
+        """
+        now = now or datetime.utcnow()
+        config = self.config
+        columns = FleetMetricColumns.from_nodes(nodes, config)
+
+        heartbeat_min = config.heartbeat_consecutive_failures
+        device_loss_min = config.device_loss_consecutive_failures
+        adb_min = config.adb_failure_consecutive
+        unauthorized_min = config.unauthorized_consecutive
+        warning_threshold = config.device_warning_threshold_pct
+        warning_duration = config.device_warning_duration_sec
+
+        results: List[RuleEngineResult] = []
+        p0_count = 0
+        p1_count = 0
+
+        for i, node in enumerate(columns.nodes):
+            hb = columns.heartbeat_streak[i]
+            dl = columns.device_loss_streak[i]
+            adb = columns.adb_streak[i]
+            ua = columns.unauthorized_streak[i]
+
+            is_p0 = hb >= heartbeat_min or dl >= device_loss_min or adb >= adb_min or (
+                ua >= unauthorized_min
+            )
+
+            if is_p0:
+                reasons = []
+                if hb >= heartbeat_min:
+                    reasons.append(f"Heartbeat timeout ({hb} consecutive)")
+                if dl >= device_loss_min:
+                    reasons.append(
+                        f"Device loss >={config.device_loss_threshold_pct*100}% ({dl} consecutive)"
+                    )
+                if adb >= adb_min:
+                    reasons.append(f"ADB server failure ({adb} consecutive)")
+                if ua >= unauthorized_min:
+                    reasons.append(
+                        f"Too many unauthorized devices ({node.metrics.unauthorized_count})"
+                    )
+
+                action = self._determine_recovery_action(node, now)
+                can_execute, cooldown_remaining = self._check_cooldown(node.node_id, action, now)
+                p0_count += 1
+                results.append(
+                    RuleEngineResult(
+                        node_id=node.node_id,
+                        failure_level=FailureLevel.P0_CRITICAL,
+                        recommended_action=action,
+                        reasons=reasons,
+                        can_execute=can_execute,
+                        cooldown_remaining_sec=cooldown_remaining,
+                        evaluated_at=now,
+                    )
+                )
+                continue
+
+            reasons = []
+            if columns.device_loss_pct[i] >= warning_threshold:
+                since = columns.warning_since[i]
+                duration = int((now - since).total_seconds()) if since else 0
+                if duration >= warning_duration:
+                    reasons.append(f"Device loss >={warning_threshold*100}% for {duration}s")
+            if not columns.ws_connected[i]:
+                reasons.append("WebSocket disconnected")
+
+            if reasons:
+                p1_count += 1
+            results.append(
+                RuleEngineResult(
+                    node_id=node.node_id,
+                    failure_level=FailureLevel.P1_WARNING if reasons else FailureLevel.NONE,
+                    recommended_action=RecoveryAction.NONE,
+                    reasons=reasons,
+                    can_execute=True,
+                    evaluated_at=now,
+                )
+            )
+
+        if p0_count or p1_count:
+            logger.warning(
+                f"Fleet evaluation: {p0_count} P0, {p1_count} P1 of {len(results)} nodes"
+            )
+
+        return results
+
+    def _determine_recovery_action(
+        self, node: NodeHealth, now: Optional[datetime] = None
+    ) -> RecoveryAction:
         """
         에스컬레이션 경로에 따라 복구 액션 결정
 
@@ -198,7 +410,7 @@ class RuleEngine:
             # 첫 복구 -> Soft
             return RecoveryAction.SOFT
 
-        elapsed = datetime.utcnow() - last_recovery["timestamp"]
+        elapsed = (now or datetime.utcnow()) - last_recovery["timestamp"]
         last_action = last_recovery["action"]
 
         # Soft 후 5분 내 회복 실패 -> Restart
@@ -227,7 +439,9 @@ class RuleEngine:
 
         return RecoveryAction.SOFT
 
-    def _check_cooldown(self, node_id: str, action: RecoveryAction) -> tuple[bool, Optional[int]]:
+    def _check_cooldown(
+        self, node_id: str, action: RecoveryAction, now: Optional[datetime] = None
+    ) -> tuple[bool, Optional[int]]:
         """쿨다운 체크"""
         if action == RecoveryAction.NONE:
             return True, None
@@ -244,7 +458,7 @@ class RuleEngine:
         }
 
         cooldown_minutes = cooldown_map.get(action, 3)
-        elapsed = datetime.utcnow() - last_recovery["timestamp"]
+        elapsed = (now or datetime.utcnow()) - last_recovery["timestamp"]
         cooldown_delta = timedelta(minutes=cooldown_minutes)
 
         if elapsed < cooldown_delta:
@@ -254,7 +468,10 @@ class RuleEngine:
         return True, None
 
     def _calculate_condition_duration(
-        self, node: NodeHealth, condition: Callable[[NodeMetrics], bool]
+        self,
+        node: NodeHealth,
+        condition: Callable[[NodeMetrics], bool],
+        now: Optional[datetime] = None,
     ) -> int:
         """조건이 지속된 시간(초) 계산"""
         if not node.metrics_history:
@@ -269,7 +486,7 @@ class RuleEngine:
                 break
 
         if duration_start:
-            return int((datetime.utcnow() - duration_start).total_seconds())
+            return int(((now or datetime.utcnow()) - duration_start).total_seconds())
         return 0
 
     def record_recovery_attempt(self, node_id: str, action: RecoveryAction):
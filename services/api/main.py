@@ -14,7 +14,9 @@ PRD 기준 MVP 버전
 """
 
 import os
+import queue
 import sqlite3
+import threading
 from contextlib import contextmanager
 from datetime import datetime
 from typing import List, Optional
@@ -37,13 +39,90 @@ app.add_middleware(
 
 # ==================== 데이터베이스 ====================
 DB_PATH = os.getenv("DB_PATH", "youtube_farm.db")
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "8"))
+DB_BUSY_TIMEOUT = float(os.getenv("DB_BUSY_TIMEOUT", "5"))  # 초 (쓰기 잠금 대기)
 
 
+class SQLitePool:
+    """
+    SQLite 연결 풀
+
+    - 연결은 필요할 때 생성해 최대 size개까지 재사용 (요청마다 connect/close 없음)
+    - WAL: 읽기가 쓰기 잠금을 기다리지 않음 / synchronous=NORMAL: 커밋마다 fsync 생략
+    - sqlite3 문장 캐시가 연결 단위라 재사용 연결에서 같은 SQL은 다시 준비(prepare)하지 않음
+    - 엔드포인트는 동기 함수 → FastAPI 스레드풀에서 실행 (이벤트 루프 블로킹 없음)
+    """
+
+    def __init__(self, path: str, size: int = DB_POOL_SIZE, timeout: float = DB_BUSY_TIMEOUT):
+        self.path = path
+        self.size = size
+        self.timeout = timeout
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.path, timeout=self.timeout, check_same_thread=False, cached_statements=256
+        )
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def acquire(self) -> sqlite3.Connection:
+        """유휴 연결 반환 (없으면 생성, 상한이면 반납 대기)"""
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            create = self._created < self.size
+            if create:
+                self._created += 1
+        if create:
+            try:
+                return self._connect()
+            except Exception:
+                with self._lock:
+                    self._created -= 1
+                raise
+
+        try:
+            return self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            raise HTTPException(503, "DB 연결 대기 시간 초과") from None
+
+    def release(self, conn: sqlite3.Connection) -> None:
+        """연결 반납 (열린 트랜잭션은 롤백)"""
+        if conn.in_transaction:
+            conn.rollback()
+        self._idle.put(conn)
+
+    def close(self) -> None:
+        """유휴 연결 모두 닫기"""
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+            with self._lock:
+                self._created -= 1
+
+
+db_pool = SQLitePool(DB_PATH)
+
+
+@contextmanager
 def get_db():
-    """SQLite 연결 생성"""
-    conn = sqlite3.connect(DB_PATH, check_same_thread=False)
-    conn.row_factory = sqlite3.Row
-    return conn
+    """풀에서 SQLite 연결 대여"""
+    conn = db_pool.acquire()
+    try:
+        yield conn
+    finally:
+        db_pool.release(conn)
 
 
 @contextmanager
@@ -53,18 +132,16 @@ def db_transaction(immediate: bool = False):
 
     immediate: True일 경우 BEGIN IMMEDIATE로 즉시 쓰기 잠금 획득
     """
-    conn = get_db()
-    try:
-        if immediate:
-            # SQLite 즉시 쓰기 잠금 획득 (동시성 처리용)
-            conn.execute("BEGIN IMMEDIATE")
-        yield conn
-        conn.commit()
-    except Exception as e:
-        conn.rollback()
-        raise e
-    finally:
-        conn.close()
+    with get_db() as conn:
+        try:
+            if immediate:
+                # SQLite 즉시 쓰기 잠금 획득 (동시성 처리용)
+                conn.execute("BEGIN IMMEDIATE")
+            yield conn
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            raise e
 
 
 def init_db():
@@ -121,9 +198,15 @@ def init_db():
             );
             
             -- 인덱스
-            CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks(status);
+            -- /api/tasks/next: status 일치 + priority DESC, created_at ASC 순서 그대로 스캔
+            DROP INDEX IF EXISTS idx_tasks_status;
+            CREATE INDEX IF NOT EXISTS idx_tasks_status_priority
+                ON tasks(status, priority DESC, created_at);
             CREATE INDEX IF NOT EXISTS idx_tasks_priority ON tasks(priority DESC);
             CREATE INDEX IF NOT EXISTS idx_devices_device_id ON devices(device_id);
+            CREATE INDEX IF NOT EXISTS idx_task_results_task ON task_results(task_id);
+            CREATE INDEX IF NOT EXISTS idx_task_results_device
+                ON task_results(device_id, created_at);
         """
         )
 
@@ -177,6 +260,34 @@ class StatusSummary(BaseModel):
     failed: int
 
 
+# ==================== 작업 할당 쿼리 ====================
+# 폴링 경로 SQL은 상수로 고정 → 연결별 문장 캐시 적중
+
+SQL_HAS_PENDING = "SELECT 1 FROM tasks WHERE status = 'pending' LIMIT 1"
+
+SQL_CLAIM_NEXT = """
+    UPDATE tasks
+    SET status = 'assigned',
+        device_id = ?,
+        assigned_at = CURRENT_TIMESTAMP
+    WHERE id = (
+        SELECT id
+        FROM tasks
+        WHERE status = 'pending'
+        ORDER BY priority DESC, created_at ASC
+        LIMIT 1
+    )
+    RETURNING id, keyword, title, youtube_url, priority
+"""
+
+SQL_TOUCH_DEVICE = """
+    INSERT INTO devices (device_id, last_seen)
+    VALUES (?, CURRENT_TIMESTAMP)
+    ON CONFLICT(device_id) DO UPDATE SET
+        last_seen = CURRENT_TIMESTAMP
+"""
+
+
 # ==================== API 엔드포인트 ====================
 
 
@@ -186,11 +297,17 @@ async def startup():
     init_db()
 
 
+@app.on_event("shutdown")
+async def shutdown():
+    """서버 종료 시 풀 연결 정리"""
+    db_pool.close()
+
+
 # ----- 작업 관리 -----
 
 
 @app.post("/api/tasks", tags=["Tasks"])
-async def create_task(task: TaskCreate):
+def create_task(task: TaskCreate):
     """
     작업 등록
 
@@ -214,7 +331,7 @@ async def create_task(task: TaskCreate):
 
 
 @app.post("/api/tasks/bulk", tags=["Tasks"])
-async def create_tasks_bulk(tasks: List[TaskCreate]):
+def create_tasks_bulk(tasks: List[TaskCreate]):
     """
     작업 일괄 등록
 
@@ -240,7 +357,7 @@ async def create_tasks_bulk(tasks: List[TaskCreate]):
 
 
 @app.get("/api/tasks/next", tags=["Tasks"])
-async def get_next_task(device_id: str = Query(..., description="기기 식별자")):
+def get_next_task(device_id: str = Query(..., description="기기 식별자")):
     """
     다음 작업 가져오기 (가장 중요!)
 
@@ -250,47 +367,21 @@ async def get_next_task(device_id: str = Query(..., description="기기 식별
     - device_id에 할당
 
     동시성 처리: SQLite의 BEGIN IMMEDIATE로 잠금
+    (대기 작업이 없으면 WAL 읽기만 하고 쓰기 잠금을 잡지 않음)
     """
+    with get_db() as conn:
+        if conn.execute(SQL_HAS_PENDING).fetchone() is None:
+            return {"success": True, "task": None, "message": "대기 중인 작업 없음"}
+
     with db_transaction(immediate=True) as conn:
-        # 가장 높은 우선순위의 pending 작업 선택
-        cursor = conn.execute(
-            """
-            SELECT id, keyword, title, youtube_url, priority
-            FROM tasks
-            WHERE status = 'pending'
-            ORDER BY priority DESC, created_at ASC
-            LIMIT 1
-            """
-        )
-        row = cursor.fetchone()
+        # 가장 높은 우선순위의 pending 작업을 assigned로 변경 (선택 + 할당 1문장)
+        row = conn.execute(SQL_CLAIM_NEXT, (device_id,)).fetchone()
 
         if not row:
             return {"success": True, "task": None, "message": "대기 중인 작업 없음"}
 
-        task_id = row["id"]
-
-        # assigned로 상태 변경
-        conn.execute(
-            """
-            UPDATE tasks
-            SET status = 'assigned',
-                device_id = ?,
-                assigned_at = CURRENT_TIMESTAMP
-            WHERE id = ?
-            """,
-            (device_id, task_id),
-        )
-
         # 기기 정보 업데이트/등록
-        conn.execute(
-            """
-            INSERT INTO devices (device_id, last_seen)
-            VALUES (?, CURRENT_TIMESTAMP)
-            ON CONFLICT(device_id) DO UPDATE SET
-                last_seen = CURRENT_TIMESTAMP
-            """,
-            (device_id,),
-        )
+        conn.execute(SQL_TOUCH_DEVICE, (device_id,))
 
     return {
         "success": True,
@@ -305,7 +396,7 @@ async def get_next_task(device_id: str = Query(..., description="기기 식별
 
 
 @app.post("/api/tasks/{task_id}/complete", tags=["Tasks"])
-async def complete_task(task_id: int, request: CompleteRequest):
+def complete_task(task_id: int, request: CompleteRequest):
     """
     작업 완료 보고
 
@@ -407,7 +498,7 @@ async def complete_task(task_id: int, request: CompleteRequest):
 
 
 @app.get("/api/tasks/status", tags=["Tasks"])
-async def get_task_status():
+def get_task_status():
     """
     현황 요약
 
@@ -440,7 +531,7 @@ async def get_task_status():
 
 
 @app.get("/api/tasks", tags=["Tasks"])
-async def list_tasks(status: Optional[str] = None, limit: int = Query(50, le=100)):
+def list_tasks(status: Optional[str] = None, limit: int = Query(50, le=100)):
     """
     작업 목록 조회
     """
@@ -478,7 +569,7 @@ async def list_tasks(status: Optional[str] = None, limit: int = Query(50, le=100
 
 
 @app.get("/api/devices", tags=["Devices"])
-async def list_devices():
+def list_devices():
     """
     기기 목록 조회
 
@@ -499,7 +590,7 @@ async def list_devices():
 
 
 @app.get("/api/devices/{device_id}", tags=["Devices"])
-async def get_device(device_id: str):
+def get_device(device_id: str):
     """
     기기 상세 조회
     """
@@ -531,7 +622,7 @@ async def get_device(device_id: str):
 
 
 @app.get("/api/stats/today", tags=["Stats"])
-async def get_today_stats():
+def get_today_stats():
     """
     오늘 통계
     """
@@ -583,7 +674,7 @@ async def get_today_stats():
 
 
 @app.post("/api/tasks/reset-stuck", tags=["Admin"])
-async def reset_stuck_tasks(minutes: int = 30):
+def reset_stuck_tasks(minutes: int = 30):
     """
     막힌 작업 복구
 
@@ -605,7 +696,7 @@ async def reset_stuck_tasks(minutes: int = 30):
 
 
 @app.delete("/api/tasks/clear-completed", tags=["Admin"])
-async def clear_completed_tasks():
+def clear_completed_tasks():
     """
     완료된 작업 정리
 
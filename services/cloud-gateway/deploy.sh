@@ -28,7 +28,11 @@ if ! command -v docker-compose &> /dev/null; then
     sudo chmod +x /usr/local/bin/docker-compose
 fi
 
-# 3. 이전 컨테이너 정리
+# 3. 이전 컨테이너 드레인 + 정리
+# 드레인: 진행 중 명령 대기 → 세션 스냅샷 저장 → 노드별 분산 재접속 안내
+echo "기존 게이트웨이 드레인..."
+docker-compose exec -T gateway python -c "import urllib.request; urllib.request.urlopen(urllib.request.Request('http://localhost:8000/api/admin/drain', method='POST'), timeout=60)" 2>/dev/null || true
+
 echo "기존 컨테이너 정리..."
 docker-compose down --remove-orphans 2>/dev/null || true
 
@@ -10,6 +10,7 @@ Mission: 단순함이 전부다.
 Protocol v1.0:
 - HELLO → HELLO_ACK (연결 + 인증)
 - HEARTBEAT → HEARTBEAT_ACK + 명령 Push (Pull-based Push)
+  (디바이스: 전체 스냅샷 또는 seq 기반 델타, seq 누락 시 ACK의 resync로 전체 요청)
 - COMMAND → RESULT (명령 실행)
 
 "복잡한 생각은 버려라." - Orion
@@ -18,11 +19,17 @@ Protocol v1.0:
 import asyncio
 import base64
 import binascii
+import functools
 import hashlib
 import hmac
 import json
 import logging
+import math
 import os
+import random
+import secrets
+import socket
+import time
 import uuid
 from datetime import datetime, timedelta, timezone
 
@@ -32,7 +39,7 @@ from dotenv import load_dotenv
 load_dotenv()
 import pathlib
 from contextlib import asynccontextmanager
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
@@ -50,6 +57,24 @@ except ImportError:
     create_client = None
     logging.warning("supabase-py not installed. DB operations will be mocked.")
 
+# Redis (선택 - 상태 스냅샷 / 멀티 인스턴스 라우팅)
+try:
+    import redis.asyncio as redis_asyncio
+
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+    redis_asyncio = None
+
+# msgpack (선택 - 노드 WebSocket 바이너리 프레임)
+try:
+    import msgpack
+
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+    msgpack = None
+
 
 # ============================================================
 # 로깅 설정
@@ -68,6 +93,18 @@ logger = logging.getLogger(__name__)
 # ============================================================
 
 
+def _instance_id() -> str:
+    """
+    인스턴스 ID (노드 소유권 / 인스턴스 채널 키이므로 워커마다 고유해야 함)
+
+    GATEWAY_INSTANCE_ID를 지정해도 GATEWAY_WORKERS > 1이면 워커 pid를 붙임
+    """
+    base = os.getenv("GATEWAY_INSTANCE_ID")
+    if base and int(os.getenv("GATEWAY_WORKERS", "1")) <= 1:
+        return base
+    return f"{base or socket.gethostname()}-{os.getpid()}"
+
+
 class Config:
     """서버 설정"""
 
@@ -84,6 +121,27 @@ class Config:
     VERIFY_SIGNATURE = os.getenv("VERIFY_SIGNATURE", "true").lower() == "true"
     CORS_ORIGINS = os.getenv("CORS_ALLOWED_ORIGINS", "*").split(",")
 
+    # Warm Restart (상태 스냅샷 + 드레인)
+    SNAPSHOT_PATH = os.getenv("GATEWAY_SNAPSHOT_PATH", "data/gateway_snapshot.json")
+    SNAPSHOT_REDIS_URL = os.getenv("GATEWAY_SNAPSHOT_REDIS_URL", os.getenv("GATEWAY_REDIS_URL", ""))
+    SNAPSHOT_INTERVAL = 30  # 주기적 스냅샷 (비정상 종료 대비)
+    SESSION_RESUME_TTL = int(os.getenv("GATEWAY_SESSION_RESUME_TTL", "300"))  # 세션 재개 허용 시간
+    DRAIN_TIMEOUT = int(os.getenv("GATEWAY_DRAIN_TIMEOUT", "30"))  # 진행 중 명령 대기 시간
+    RECONNECT_MIN_DELAY = 1  # 재접속 힌트 최소 지연 (초)
+    RECONNECT_JITTER = int(os.getenv("GATEWAY_RECONNECT_JITTER", "30"))  # 재접속 분산 구간 (초)
+
+    # Scale-out (설정 시 Redis로 노드 소유권 공유 + 인스턴스 간 라우팅)
+    REDIS_URL = os.getenv("GATEWAY_REDIS_URL", "")
+    INSTANCE_ID = _instance_id()
+    WORKERS = int(os.getenv("GATEWAY_WORKERS", "1"))
+    ROUTE_TIMEOUT = 5  # 다른 인스턴스로 전달한 메시지 응답 대기 (초)
+
+    # Scheduler (명령 배치 정책: p2c = power-of-two-choices, least = 최저 부하)
+    SCHEDULER_POLICY = os.getenv("GATEWAY_SCHEDULER_POLICY", "p2c")
+
+    # Node Frame Encoding (HELLO에서 협상, 선호 순서 / json은 항상 허용)
+    FRAME_ENCODINGS = os.getenv("GATEWAY_FRAME_ENCODINGS", "msgpack,json").split(",")
+
 
 # ============================================================
 # Supabase Client
@@ -109,6 +167,70 @@ def get_supabase() -> Optional[Any]:
 # ============================================================
 
 
+def negotiate_encoding(offered: list) -> str:
+    """HELLO encodings 중 Gateway 선호 순서로 첫 지원 인코딩 (없으면 json = Protocol v1.0)"""
+    for encoding in Config.FRAME_ENCODINGS:
+        if encoding == "msgpack" and not MSGPACK_AVAILABLE:
+            continue
+        if encoding in (offered or []):
+            return encoding
+    return "json"
+
+
+class NodeSocket:
+    """
+    노드 WebSocket 프레임 인코딩 래퍼
+
+    - 송신: 협상된 인코딩 (json = 텍스트 프레임, msgpack = 바이너리 프레임)
+    - 수신: 프레임 종류로 판별 → 협상 전후 / 혼재 프레임 모두 처리
+    - permessage-deflate는 WebSocket 확장으로 별도 협상 (uvicorn ws_per_message_deflate)
+    - 세션 MAC 협상 시 송신 프레임 서명 / 수신 프레임 검증 (FrameSigner)
+    """
+
+    def __init__(self, websocket: WebSocket, encoding: str = "json"):
+        self.websocket = websocket
+        self.encoding = encoding
+        # 세션 MAC (HELLO_ACK 이후 설정, FrameSigner)
+        self.signer_out: Optional["FrameSigner"] = None  # Gateway → 노드
+        self.signer_in: Optional["FrameSigner"] = None  # 노드 → Gateway
+
+    async def send_json(self, message: dict):
+        if self.encoding == "msgpack":
+            frame = msgpack.packb(message, use_bin_type=True)
+            if self.signer_out:
+                frame = self.signer_out.sign_bytes(frame)
+            await self.websocket.send_bytes(frame)
+        else:
+            frame = json.dumps(message, separators=(",", ":"), ensure_ascii=False)
+            if self.signer_out:
+                frame = self.signer_out.sign_text(frame)
+            await self.websocket.send_text(frame)
+
+    async def receive_json(self) -> dict:
+        message = await self.websocket.receive()
+        if message["type"] == "websocket.disconnect":
+            raise WebSocketDisconnect(message.get("code", 1000), message.get("reason"))
+        if message.get("bytes") is not None:
+            if not MSGPACK_AVAILABLE:
+                raise ValueError("binary frame received but msgpack is not installed")
+            frame = message["bytes"]
+            if self.signer_in:
+                frame = self.signer_in.verify_bytes(frame)
+                if frame is None:
+                    raise FrameAuthError("invalid session MAC")
+            return msgpack.unpackb(frame, raw=False)
+
+        frame = message["text"]
+        if self.signer_in:
+            frame = self.signer_in.verify_text(frame)
+            if frame is None:
+                raise FrameAuthError("invalid session MAC")
+        return json.loads(frame)
+
+    async def close(self, code: int = 1000, reason: str = None):
+        await self.websocket.close(code=code, reason=reason)
+
+
 class NodeConnection:
     """노드 연결 정보"""
 
@@ -128,21 +250,197 @@ class NodeConnection:
         self.resources: Dict = {}
         self.runner_version = ""
         self.secret_key: Optional[str] = None
+        self.devices = DeviceSnapshotState()
+
+    def to_snapshot(self) -> dict:
+        """스냅샷용 직렬화 (웹소켓/시크릿 제외)"""
+        return {
+            "node_id": self.node_id,
+            "node_uuid": self.node_uuid,
+            "session_id": self.session_id,
+            "connected_at": self.connected_at.isoformat(),
+            "device_count": self.device_count,
+            "status": self.status,
+            "active_tasks": self.active_tasks,
+            "hostname": self.hostname,
+            "ip_address": self.ip_address,
+            "capabilities": self.capabilities,
+            "runner_version": self.runner_version,
+        }
+
+
+class DeviceSnapshotState:
+    """
+    노드별 디바이스 상태 (HEARTBEAT 전체 스냅샷 / 델타 적용)
+
+    - 전체 스냅샷 (HELLO 직후 + 주기적): 현재 상태와 비교해 바뀐 디바이스만 DB로 전달
+    - 델타 (snapshot_seq + device_delta): base_seq가 마지막 seq와 같을 때만 순서대로 적용
+    - seq 누락 / 상태 없음 (재접속, Gateway 재시작) → 적용 가능한 항목만 반영 후 resync 요청
+      → 노드가 다음 HEARTBEAT에 전체 스냅샷 전송
+    - 제거된 디바이스는 status=disconnected 레코드로 전달 (DB upsert 키: node + slot)
+    """
+
+    def __init__(self):
+        self.seq: Optional[int] = None
+        self.devices: Dict[str, dict] = {}  # serial → 디바이스
+
+    def __len__(self) -> int:
+        return len(self.devices)
+
+    def apply(self, payload: dict) -> Tuple[list, bool]:
+        """
+        HEARTBEAT 페이로드 반영
+
+        Returns:
+            (DB에 쓸 변경 레코드, resync 필요 여부)
+        """
+        seq = payload.get("snapshot_seq")
+        delta = payload.get("device_delta")
+
+        if delta is None:
+            # 전체 스냅샷 (seq 없는 이전 NodeRunner 포함)
+            current = {d.get("serial"): d for d in payload.get("device_snapshot") or []}
+            changes = [d for serial, d in current.items() if self.devices.get(serial) != d]
+            changes += self._removed(serial for serial in self.devices if serial not in current)
+            self.devices = current
+            self.seq = seq
+            return changes, False
+
+        if seq is not None and self.seq is not None and seq <= self.seq:
+            return [], False  # 이미 적용한 델타 (재전송)
+
+        in_order = self.seq is not None and delta.get("base_seq") == self.seq
+        changes = self._removed(delta.get("removed") or [])
+        for serial in delta.get("removed") or []:
+            self.devices.pop(serial, None)
+        for device in (delta.get("added") or []) + (delta.get("changed") or []):
+            self.devices[device.get("serial")] = device
+            changes.append(device)
+
+        self.seq = seq if in_order else None
+        return changes, not in_order
+
+    def _removed(self, serials) -> list:
+        return [
+            {**self.devices[serial], "status": "disconnected"}
+            for serial in serials
+            if serial in self.devices
+        ]
+
+
+class HeartbeatWheel:
+    """
+    HEARTBEAT 마감 시각 관리 (hashed timing wheel)
+
+    - touch(): 마감 시각만 갱신 → HEARTBEAT당 O(1), 슬롯 이동 없음
+    - advance(): 지난 tick의 슬롯만 확인 → 마감이 미뤄진 노드는 새 슬롯으로 이동 (분할 상환 O(1))
+    - tick(기본 1초) 단위로 확인하므로 마감 후 약 1 tick 안에 만료
+    """
+
+    def __init__(self, timeout: float, tick: float = 1.0, slots: int = 128, clock=time.monotonic):
+        self.timeout = timeout
+        self.tick = tick
+        self._clock = clock
+        self._slots: List[set] = [set() for _ in range(slots)]
+        self._deadline: Dict[str, int] = {}  # node_id → 마감 tick
+        self._slot_of: Dict[str, int] = {}  # node_id → 현재 슬롯
+        self._current = self._now_tick()  # 마지막으로 처리한 tick
+
+    def _now_tick(self) -> int:
+        return int(self._clock() / self.tick)
+
+    def _place(self, node_id: str, deadline: int):
+        slot = deadline % len(self._slots)
+        self._slots[slot].add(node_id)
+        self._slot_of[node_id] = slot
+
+    def touch(self, node_id: str):
+        """HEARTBEAT 수신 → 마감 시각 연장 (처음이면 슬롯 등록)"""
+        deadline = math.ceil((self._clock() + self.timeout) / self.tick)
+        self._deadline[node_id] = deadline
+        if node_id not in self._slot_of:
+            self._place(node_id, deadline)
+
+    def discard(self, node_id: str):
+        """연결 해제 → 추적 중지"""
+        self._deadline.pop(node_id, None)
+        slot = self._slot_of.pop(node_id, None)
+        if slot is not None:
+            self._slots[slot].discard(node_id)
+
+    def advance(self) -> List[str]:
+        """현재 시각까지 tick 진행 → 마감이 지난 node_id 목록 (추적에서 제거됨)"""
+        now = self._now_tick()
+        expired = []
+        # 루프가 한 바퀴 이상 밀렸으면 모든 슬롯을 한 번씩만 확인
+        for tick in range(max(self._current + 1, now - len(self._slots) + 1), now + 1):
+            slot = tick % len(self._slots)
+            for node_id in list(self._slots[slot]):
+                deadline = self._deadline[node_id]
+                if deadline <= now:
+                    self.discard(node_id)
+                    expired.append(node_id)
+                elif deadline % len(self._slots) != slot:
+                    self._slots[slot].discard(node_id)
+                    self._place(node_id, deadline)
+        self._current = max(self._current, now)
+        return expired
+
+    def __len__(self) -> int:
+        return len(self._deadline)
 
 
 class ConnectionPool:
-    """노드 연결 풀 관리"""
+    """
+    노드 연결 풀 관리
+
+    - 읽기(get / list / send)는 잠금 없이 현재 스냅샷 dict 참조
+    - 연결 추가/제거만 쓰기 잠금 아래에서 새 dict로 교체 (copy-on-write)
+    - 하트비트/상태 갱신은 NodeConnection 객체를 직접 수정 (전역 잠금 없음)
+    - READY 노드는 남은 작업 슬롯별 버킷으로 색인 → 전체 순회 없이 여유 노드 선택
+    - HEARTBEAT 마감 시각은 HeartbeatWheel로 추적 (expired()로 타임아웃 노드 조회)
+    """
 
     def __init__(self):
         self._nodes: Dict[str, NodeConnection] = {}
-        self._lock = asyncio.Lock()
+        self._write_lock = asyncio.Lock()
+        self.deadlines = HeartbeatWheel(Config.HEARTBEAT_TIMEOUT)
+
+        # _ready[free] = 남은 슬롯이 free개인 READY 노드 (free = 1..MAX_TASKS_PER_NODE)
+        self._ready: List[Dict[str, NodeConnection]] = [
+            {} for _ in range(Config.MAX_TASKS_PER_NODE + 1)
+        ]
+        self._ready_slot: Dict[str, int] = {}  # node_id → 현재 버킷
+
+    # ─── READY 색인 ───
+
+    def _reindex(self, conn: NodeConnection):
+        free = 0
+        if conn.status == "READY":
+            free = max(0, min(Config.MAX_TASKS_PER_NODE - conn.active_tasks, len(self._ready) - 1))
+
+        current = self._ready_slot.get(conn.node_id, 0)
+        if current == free and (free == 0 or self._ready[free].get(conn.node_id) is conn):
+            return
+
+        self._ready[current].pop(conn.node_id, None)
+        if free:
+            self._ready[free][conn.node_id] = conn
+            self._ready_slot[conn.node_id] = free
+        else:
+            self._ready_slot.pop(conn.node_id, None)
+
+    def _unindex(self, node_id: str):
+        self._ready[self._ready_slot.pop(node_id, 0)].pop(node_id, None)
+
+    # ─── 연결 추가 / 제거 (copy-on-write) ───
 
     async def add(self, node_id: str, websocket: WebSocket, session_id: str) -> NodeConnection:
         """노드 연결 추가"""
-        async with self._lock:
+        async with self._write_lock:
             # 기존 연결이 있으면 끊기
-            if node_id in self._nodes:
-                old = self._nodes[node_id]
+            old = self._nodes.get(node_id)
+            if old:
                 try:
                     await old.websocket.close()
                 except Exception:
@@ -150,19 +448,40 @@ class ConnectionPool:
                 logger.warning(f"[{node_id}] 기존 연결 대체")
 
             conn = NodeConnection(node_id, websocket, session_id)
-            self._nodes[node_id] = conn
+            self._nodes = {**self._nodes, node_id: conn}
+            self._reindex(conn)
+            self.deadlines.touch(node_id)
             logger.info(f"[{node_id}] 연결됨 (총 {len(self._nodes)}개 노드)")
             return conn
 
-    async def remove(self, node_id: str):
-        """노드 연결 제거"""
-        async with self._lock:
-            if node_id in self._nodes:
-                del self._nodes[node_id]
+    async def remove(
+        self, node_id: str, mark_disconnected: bool = True, websocket: WebSocket = None
+    ) -> bool:
+        """
+        노드 연결 제거
+
+        Args:
+            mark_disconnected: False면 DB 연결 해제 표시 생략 (드레인 중 세션 이관)
+            websocket: 지정하면 이 웹소켓의 연결일 때만 제거
+                (이미 새 연결로 대체됐거나 HELLO 전에 끊긴 경우 현재 연결을 건드리지 않음)
+
+        Returns:
+            제거 여부
+        """
+        async with self._write_lock:
+            conn = self._nodes.get(node_id)
+            if websocket is not None and (conn is None or conn.websocket is not websocket):
+                return False
+
+            if conn:
+                self._nodes = {k: v for k, v in self._nodes.items() if k != node_id}
+                self._unindex(node_id)
+                self.deadlines.discard(node_id)
                 logger.info(f"[{node_id}] 연결 해제 (총 {len(self._nodes)}개 노드)")
 
         # DB 연결 해제 표시
-        await db_disconnect_node(node_id)
+        if mark_disconnected:
+            await db_disconnect_node(node_id)
 
         # 대시보드에 노드 연결 해제 알림 (전역 함수 호출)
         # 참고: 이 메서드가 호출될 때 broadcast_to_dashboards가 아직 정의되지 않았을 수 있음
@@ -170,32 +489,43 @@ class ConnectionPool:
             await broadcast_to_dashboards({"type": "NODE_DISCONNECTED", "node_id": node_id})
         except NameError:
             pass
+        return True
+
+    # ─── 읽기 / 노드별 갱신 (잠금 없음) ───
 
     async def get(self, node_id: str) -> Optional[NodeConnection]:
         """노드 연결 조회"""
-        async with self._lock:
-            return self._nodes.get(node_id)
+        return self._nodes.get(node_id)
+
+    def expired(self) -> List[NodeConnection]:
+        """HEARTBEAT 마감이 지난 연결 (한 번만 반환)"""
+        return [conn for conn in map(self._nodes.get, self.deadlines.advance()) if conn]
+
+    def connections(self) -> List[NodeConnection]:
+        """현재 연결 스냅샷 (순회 중 추가/제거와 무관)"""
+        return list(self._nodes.values())
 
     async def update_heartbeat(self, node_id: str, device_count: int = 0, status: str = "READY"):
         """하트비트 업데이트"""
-        async with self._lock:
-            if node_id in self._nodes:
-                self._nodes[node_id].last_heartbeat = datetime.now(timezone.utc)
-                self._nodes[node_id].device_count = device_count
-                self._nodes[node_id].status = status
+        conn = self._nodes.get(node_id)
+        if conn:
+            conn.last_heartbeat = datetime.now(timezone.utc)
+            conn.device_count = device_count
+            conn.status = status
+            self._reindex(conn)
+            self.deadlines.touch(node_id)
 
     async def update_status(self, node_id: str, status: str, active_tasks: int = 0):
         """상태 업데이트"""
-        async with self._lock:
-            if node_id in self._nodes:
-                self._nodes[node_id].status = status
-                self._nodes[node_id].active_tasks = active_tasks
+        conn = self._nodes.get(node_id)
+        if conn:
+            conn.status = status
+            conn.active_tasks = active_tasks
+            self._reindex(conn)
 
     async def send_to_node(self, node_id: str, message: dict) -> bool:
         """특정 노드에 메시지 전송"""
-        async with self._lock:
-            conn = self._nodes.get(node_id)
-
+        conn = self._nodes.get(node_id)
         if not conn:
             return False
 
@@ -208,10 +538,7 @@ class ConnectionPool:
 
     async def broadcast(self, message: dict):
         """모든 노드에 브로드캐스트"""
-        async with self._lock:
-            node_ids = list(self._nodes.keys())
-
-        for node_id in node_ids:
+        for node_id in list(self._nodes):
             await self.send_to_node(node_id, message)
 
     def list_nodes(self) -> list:
@@ -233,13 +560,24 @@ class ConnectionPool:
             for conn in self._nodes.values()
         ]
 
-    def get_ready_nodes(self) -> List[NodeConnection]:
-        """READY 상태의 노드들 반환"""
-        return [
-            conn
-            for conn in self._nodes.values()
-            if conn.status == "READY" and conn.active_tasks < Config.MAX_TASKS_PER_NODE
-        ]
+    def get_ready_nodes(self, limit: int = 0) -> List[NodeConnection]:
+        """
+        READY 상태이고 슬롯이 남은 노드 (남은 슬롯이 많은 순)
+
+        Args:
+            limit: 최대 개수 (0이면 전체). 색인에서 바로 꺼내므로 전체 노드를 순회하지 않음
+        """
+        result: List[NodeConnection] = []
+        for free in range(len(self._ready) - 1, 0, -1):
+            for conn in self._ready[free].values():
+                result.append(conn)
+                if limit and len(result) >= limit:
+                    return result
+        return result
+
+    def ready_count(self) -> int:
+        """READY 노드 수"""
+        return len(self._ready_slot)
 
 
 # Connection Pool 싱글톤
@@ -249,6 +587,826 @@ pool = ConnectionPool()
 pending_commands: Dict[str, asyncio.Future] = {}
 
 
+# ============================================================
+# Node Scheduler (용량 기반 명령 배치)
+# ============================================================
+
+
+class NodeScheduler:
+    """
+    용량 기반 노드 선택
+
+    부하 점수 (낮을수록 우선):
+        max(active_tasks, 배치 후 미완료 수) / 노드 상한
+        + CPU / 메모리 사용률 가중치 (HEARTBEAT resources)
+        + 최근 명령 지연 EWMA 가중치
+        + 디바이스 없는 노드 페널티
+
+    - 상한(max_tasks)에 도달한 노드는 후보에서 제외
+    - p2c: 후보 중 무작위 2개 비교 → O(1), 같은 노드로 몰리는 현상 방지
+    - least: 전체 후보 중 최저 점수
+    - HEARTBEAT의 active_tasks는 최대 HEARTBEAT_INTERVAL만큼 늦으므로
+      그 사이 배치한 명령은 직접 집계 (RESULT 수신 시 해제)
+    - observe(): HEARTBEAT 시점에 이 스케줄러가 모르는 작업 수(큐 Pull 등)만 따로 기억
+      → 이미 끝난 작업이 남은 오래된 active_tasks로 빈 노드를 가득 찬 것으로 보지 않음
+
+    후보는 NodeConnection 또는 Fleet 요약 dict (멀티 인스턴스 모드)
+    """
+
+    CPU_WEIGHT = 0.25
+    MEMORY_WEIGHT = 0.15
+    LATENCY_WEIGHT = 0.25
+    LATENCY_REF_SEC = 60.0  # 지연 정규화 기준 (latency / (latency + ref))
+    NO_DEVICE_PENALTY = 1.0
+
+    def __init__(
+        self,
+        policy: str = None,
+        max_tasks: int = None,
+        latency_alpha: float = 0.2,
+        rng: random.Random = None,
+        clock=time.monotonic,
+    ):
+        self.policy = policy or Config.SCHEDULER_POLICY
+        self.max_tasks = max_tasks or Config.MAX_TASKS_PER_NODE
+        self.latency_alpha = latency_alpha
+        self._rng = rng or random.Random()
+        self._clock = clock
+
+        self._inflight: Dict[str, int] = {}  # node_id → 배치 후 미완료 명령 수
+        self._external: Dict[str, int] = {}  # node_id → HEARTBEAT 기준 외부 작업 수
+        self._latency: Dict[str, float] = {}  # node_id → 명령 지연 EWMA (초)
+        self._placed: Dict[Tuple[str, str], float] = {}  # (command_id, node_id) → 배치 시각
+
+        # 통계
+        self.placements = 0
+        self.rejections = 0
+
+    @staticmethod
+    def _field(node, name: str, default=None):
+        if isinstance(node, dict):
+            return node.get(name, default)
+        return getattr(node, name, default)
+
+    def _load(self, node) -> int:
+        node_id = self._field(node, "node_id")
+        inflight = self._inflight.get(node_id, 0)
+        external = self._external.get(node_id)
+        if external is None:
+            return max(self._field(node, "active_tasks", 0) or 0, inflight)
+        return inflight + external
+
+    def observe(self, node_id: str, active_tasks: int):
+        """HEARTBEAT 수신 → 보고된 작업 중 이 스케줄러가 배치하지 않은 수 기록"""
+        self._external[node_id] = max(0, active_tasks - self._inflight.get(node_id, 0))
+
+    def free_slots(self, node) -> int:
+        """남은 동시 처리 슬롯 (READY가 아니면 0)"""
+        if self._field(node, "status") != "READY":
+            return 0
+        return max(0, self.max_tasks - self._load(node))
+
+    def score(self, node) -> float:
+        """부하 점수"""
+        resources = self._field(node, "resources") or {}
+        latency = self._latency.get(self._field(node, "node_id"), 0.0)
+
+        score = self._load(node) / self.max_tasks
+        score += self.CPU_WEIGHT * (resources.get("cpu_percent") or 0) / 100
+        score += self.MEMORY_WEIGHT * (resources.get("memory_percent") or 0) / 100
+        score += self.LATENCY_WEIGHT * latency / (latency + self.LATENCY_REF_SEC)
+        if not self._field(node, "device_count"):
+            score += self.NO_DEVICE_PENALTY
+        return score
+
+    def pick(self, candidates: list, count: int = 1) -> list:
+        """
+        서로 다른 노드 최대 count개 선택
+
+        Args:
+            candidates: 후보 노드 (NodeConnection 또는 Fleet dict)
+            count: 선택 수 (0이면 여유 있는 후보 전체, 부하 낮은 순)
+        """
+        eligible = [node for node in candidates if self.free_slots(node) > 0]
+        if not eligible:
+            self.rejections += 1
+            return []
+
+        if count <= 0 or count >= len(eligible) or self.policy == "least":
+            eligible.sort(key=self.score)
+            return eligible[:count] if count > 0 else eligible
+
+        chosen = []
+        for _ in range(count):
+            if len(eligible) == 1:
+                index = 0
+            else:
+                i, j = self._rng.sample(range(len(eligible)), 2)
+                index = i if self.score(eligible[i]) <= self.score(eligible[j]) else j
+            chosen.append(eligible[index])
+            eligible[index] = eligible[-1]
+            eligible.pop()
+        return chosen
+
+    def select(self, candidates: list):
+        """노드 1개 선택 (여유 노드가 없으면 None)"""
+        chosen = self.pick(candidates, 1)
+        return chosen[0] if chosen else None
+
+    def assigned(self, command_id: str, node_id: str):
+        """명령 배치 기록"""
+        self._inflight[node_id] = self._inflight.get(node_id, 0) + 1
+        self._placed[(command_id, node_id)] = self._clock()
+        self.placements += 1
+
+    def completed(self, command_id: str, node_id: str) -> Optional[float]:
+        """RESULT 수신 → 미완료 수 해제 + 지연 EWMA 갱신 (배치 기록이 없으면 None)"""
+        placed_at = self._placed.pop((command_id, node_id), None)
+        if placed_at is None:
+            return None
+
+        self._inflight[node_id] = max(0, self._inflight.get(node_id, 0) - 1)
+        latency = self._clock() - placed_at
+        previous = self._latency.get(node_id)
+        self._latency[node_id] = (
+            latency if previous is None else previous + self.latency_alpha * (latency - previous)
+        )
+        return latency
+
+    def expire(self, max_age: float) -> int:
+        """RESULT 없이 max_age초가 지난 배치 기록 해제 (유실된 RESULT로 슬롯이 묶이는 것 방지)"""
+        cutoff = self._clock() - max_age
+        expired = [key for key, placed_at in self._placed.items() if placed_at < cutoff]
+        for key in expired:
+            del self._placed[key]
+            node_id = key[1]
+            self._inflight[node_id] = max(0, self._inflight.get(node_id, 0) - 1)
+        return len(expired)
+
+    def forget(self, node_id: str):
+        """노드 연결 해제 시 미완료 배치 기록 정리 (지연 이력은 재접속 후에도 유지)"""
+        self._inflight.pop(node_id, None)
+        self._external.pop(node_id, None)
+        for key in [key for key in self._placed if key[1] == node_id]:
+            del self._placed[key]
+
+    def get_stats(self) -> dict:
+        return {
+            "policy": self.policy,
+            "placements": self.placements,
+            "rejections": self.rejections,
+            "inflight": sum(self._inflight.values()),
+            "latency_ewma_sec": {k: round(v, 3) for k, v in self._latency.items()},
+        }
+
+
+scheduler = NodeScheduler()
+
+
+# ============================================================
+# Warm Restart (상태 스냅샷 + 드레인)
+# ============================================================
+
+
+class FileSnapshotStore:
+    """로컬 파일 스냅샷 저장소 (임시 파일 → 원자적 교체)"""
+
+    def __init__(self, path: str):
+        self.path = pathlib.Path(path)
+
+    def _write(self, data: str):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        tmp.write_text(data, encoding="utf-8")
+        os.replace(tmp, self.path)
+
+    def _read(self) -> Optional[str]:
+        if not self.path.exists():
+            return None
+        return self.path.read_text(encoding="utf-8")
+
+    async def save(self, state: dict):
+        await asyncio.to_thread(self._write, json.dumps(state))
+
+    async def load(self) -> Optional[dict]:
+        raw = await asyncio.to_thread(self._read)
+        return json.loads(raw) if raw else None
+
+
+class RedisSnapshotStore:
+    """
+    Redis 스냅샷 저장소 (여러 배포 호스트 / 워커 간 공유)
+
+    노드·명령별 해시 필드로 저장하므로 여러 인스턴스가 각자 스냅샷을 써도
+    서로 덮어쓰지 않는다. 필드마다 saved_at을 기록해 TTL이 지난 항목은 로드 시 제외.
+    """
+
+    NODES_KEY = "gateway:snapshot:nodes"
+    COMMANDS_KEY = "gateway:snapshot:commands"
+
+    def __init__(self, url: str, ttl_seconds: int):
+        self._redis = redis_asyncio.from_url(url)
+        self.ttl_seconds = ttl_seconds
+
+    async def save(self, state: dict):
+        saved_at = state["saved_at"]
+        pipe = self._redis.pipeline()
+        for entry in state["nodes"]:
+            pipe.hset(self.NODES_KEY, entry["node_id"], json.dumps({**entry, "saved_at": saved_at}))
+        for command_id, entry in state["inflight_commands"].items():
+            pipe.hset(self.COMMANDS_KEY, command_id, json.dumps({**entry, "saved_at": saved_at}))
+        pipe.expire(self.NODES_KEY, self.ttl_seconds)
+        pipe.expire(self.COMMANDS_KEY, self.ttl_seconds)
+        await pipe.execute()
+
+    async def _load_fresh(self, key: str, cutoff: datetime) -> Dict[str, dict]:
+        fresh, expired = {}, []
+        for field, raw in (await self._redis.hgetall(key)).items():
+            entry = json.loads(raw)
+            if datetime.fromisoformat(entry["saved_at"]) < cutoff:
+                expired.append(field)
+            else:
+                fresh[field.decode() if isinstance(field, bytes) else field] = entry
+        if expired:
+            await self._redis.hdel(key, *expired)
+        return fresh
+
+    async def load(self) -> Optional[dict]:
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=self.ttl_seconds)
+        nodes = await self._load_fresh(self.NODES_KEY, cutoff)
+        commands = await self._load_fresh(self.COMMANDS_KEY, cutoff)
+        if not nodes and not commands:
+            return None
+
+        saved_at = max(entry["saved_at"] for entry in [*nodes.values(), *commands.values()])
+        return {
+            "saved_at": saved_at,
+            "nodes": list(nodes.values()),
+            "inflight_commands": commands,
+        }
+
+
+def create_snapshot_store():
+    """설정에 따른 스냅샷 저장소 (Redis URL이 있으면 Redis, 아니면 파일)"""
+    if Config.SNAPSHOT_REDIS_URL:
+        if REDIS_AVAILABLE:
+            return RedisSnapshotStore(Config.SNAPSHOT_REDIS_URL, Config.SESSION_RESUME_TTL)
+        logger.warning("redis 패키지 없음 - 파일 스냅샷 사용")
+    return FileSnapshotStore(Config.SNAPSHOT_PATH)
+
+
+class WarmRestart:
+    """
+    게이트웨이 재시작 시 노드 세션 유지
+
+    배포 시 모든 노드가 동시에 재접속하면 HELLO 폭주가
+    db_register_node_connection에 몰린다. 이를 피하기 위해:
+
+    1. 드레인: 새 연결/명령 거부 → 진행 중 명령 대기 → 스냅샷 저장
+       → 노드별로 분산된 재접속 지연(RECONNECT)을 보내고 연결 종료
+       (DB 연결 해제 표시는 생략 - 세션은 다음 인스턴스로 이관)
+    2. 재시작: 스냅샷 로드 → HELLO의 resume_session_id가 일치하면
+       DB 재등록 없이 세션 재개
+    3. 비정상 종료 대비 SNAPSHOT_INTERVAL마다 스냅샷 저장
+    4. SESSION_RESUME_TTL 안에 돌아오지 않은 세션은 DB에 연결 해제 표시
+    5. 배포 중단 시 undrain()으로 연결 / 명령 수락 재개
+    """
+
+    def __init__(self, store=None):
+        self.store = store or create_snapshot_store()
+        self.draining = False
+
+        self._resumable: Dict[str, dict] = {}  # node_id → 스냅샷 노드 정보
+        self._resumable_since: Optional[datetime] = None
+        self._inflight: Dict[str, dict] = {}  # command_id → {node_id, sent_at}
+        self._orphaned: Dict[str, dict] = {}  # 재시작 전 응답을 기다리던 명령
+        self._snapshot_task: Optional[asyncio.Task] = None
+
+        # 통계
+        self.sessions_resumed = 0
+        self.sessions_registered = 0
+        self.orphaned_results = 0
+
+    # ─── 진행 중 명령 추적 ───
+
+    def track_command(self, command_id: str, node_id: str):
+        self._inflight[command_id] = {
+            "node_id": node_id,
+            "sent_at": datetime.now(timezone.utc).isoformat(),
+        }
+
+    def untrack_command(self, command_id: str):
+        self._inflight.pop(command_id, None)
+
+    def claim_orphaned_result(self, command_id: str) -> Optional[dict]:
+        """재시작 전에 보낸 명령의 RESULT인지 확인 (있으면 제거 후 반환)"""
+        entry = self._orphaned.pop(command_id, None)
+        if entry:
+            self.orphaned_results += 1
+        return entry
+
+    # ─── 스냅샷 ───
+
+    def build_snapshot(self) -> dict:
+        """현재 상태 스냅샷 (아직 재접속하지 않은 이전 세션 포함)"""
+        nodes = {node_id: entry for node_id, entry in self._resumable.items()}
+        for conn in pool.connections():
+            nodes[conn.node_id] = conn.to_snapshot()
+
+        return {
+            "saved_at": datetime.now(timezone.utc).isoformat(),
+            "nodes": list(nodes.values()),
+            "inflight_commands": {**self._orphaned, **self._inflight},
+        }
+
+    async def save(self):
+        try:
+            await self.store.save(self.build_snapshot())
+        except Exception as e:
+            logger.error(f"스냅샷 저장 실패: {e}")
+
+    async def restore(self) -> int:
+        """스냅샷 로드 (재개 가능 세션 수 반환)"""
+        try:
+            snapshot = await self.store.load()
+        except Exception as e:
+            logger.error(f"스냅샷 로드 실패: {e}")
+            return 0
+
+        if not snapshot:
+            return 0
+
+        # 만료된 스냅샷도 보관 → expire_sessions()가 DB 연결 해제 표시
+        saved_at = datetime.fromisoformat(snapshot["saved_at"])
+        self._resumable = {entry["node_id"]: entry for entry in snapshot.get("nodes", [])}
+        self._resumable_since = saved_at
+        if self._sessions_expired():
+            logger.info("스냅샷 만료 - 전체 재등록")
+            return 0
+
+        self._orphaned = dict(snapshot.get("inflight_commands", {}))
+        logger.info(
+            f"♻️ 스냅샷 복원: 세션 {len(self._resumable)}개, 진행 중 명령 {len(self._orphaned)}개"
+        )
+        return len(self._resumable)
+
+    def claim_session(self, node_id: str, session_id: Optional[str]) -> Optional[dict]:
+        """스냅샷 세션 재개 (node_id + session_id 일치, TTL 이내일 때 1회)"""
+        entry = self._resumable.get(node_id)
+        if not entry or not session_id or entry.get("session_id") != session_id:
+            return None
+
+        if self._sessions_expired():
+            return None
+
+        del self._resumable[node_id]
+        self.sessions_resumed += 1
+        return entry
+
+    def _sessions_expired(self) -> bool:
+        if self._resumable_since is None:
+            return False
+        age = datetime.now(timezone.utc) - self._resumable_since
+        return age > timedelta(seconds=Config.SESSION_RESUME_TTL)
+
+    async def expire_sessions(self) -> int:
+        """
+        SESSION_RESUME_TTL 안에 재개되지 않은 세션을 DB에서 연결 해제 표시
+
+        드레인은 DB 연결 해제 표시를 생략하므로 돌아오지 않은 노드는 여기서 정리
+        (드레인 중이면 다음 인스턴스가 처리, 다시 연결된 노드는 제외)
+
+        Returns:
+            연결 해제 표시한 노드 수
+        """
+        if self.draining or not self._resumable or not self._sessions_expired():
+            return 0
+
+        node_ids, self._resumable = list(self._resumable), {}
+        disconnected = 0
+        for node_id in node_ids:
+            if await pool.get(node_id) or await cluster.get_node(node_id):
+                continue
+            await db_disconnect_node(node_id)
+            disconnected += 1
+
+        if disconnected:
+            logger.info(f"♻️ 재개되지 않은 세션 {disconnected}개 연결 해제")
+        return disconnected
+
+    async def _snapshot_loop(self):
+        while True:
+            try:
+                await asyncio.sleep(Config.SNAPSHOT_INTERVAL)
+                await self.save()
+            except asyncio.CancelledError:
+                break
+
+    def start(self):
+        if self._snapshot_task is None:
+            self._snapshot_task = asyncio.create_task(self._snapshot_loop())
+
+    async def stop(self):
+        if self._snapshot_task:
+            self._snapshot_task.cancel()
+            try:
+                await self._snapshot_task
+            except asyncio.CancelledError:
+                pass
+            self._snapshot_task = None
+
+    # ─── 드레인 ───
+
+    def reconnect_hint(self) -> dict:
+        """노드별 재접속 지연 (RECONNECT_JITTER 구간에 균등 분산)"""
+        delay = Config.RECONNECT_MIN_DELAY + random.uniform(0, Config.RECONNECT_JITTER)
+        return {"reconnect_after_ms": int(delay * 1000), "resume": True}
+
+    async def drain(self, reason: str = "deploy") -> dict:
+        """
+        드레인 후 노드에 재접속 힌트 전송
+
+        Returns:
+            드레인 결과 (대기한 명령 수, 재접속 안내한 노드 수)
+        """
+        self.draining = True
+        logger.info(f"🚰 드레인 시작 ({reason}): 진행 중 명령 {len(pending_commands)}개")
+
+        # 진행 중인 동기 명령 응답 대기
+        waiting = [f for f in pending_commands.values() if not f.done()]
+        if waiting:
+            await asyncio.wait(waiting, timeout=Config.DRAIN_TIMEOUT)
+        unfinished = len([f for f in waiting if not f.done()])
+
+        # 대기 중 undrain()으로 취소됐으면 노드를 내보내지 않음
+        if not self.draining:
+            return {
+                "draining": False,
+                "nodes_notified": 0,
+                "commands_waited": len(waiting),
+                "commands_unfinished": unfinished,
+            }
+
+        # 이관할 세션은 연결이 끊긴 뒤에도 이후 스냅샷에 남도록 보관
+        conns = pool.connections()
+        self._resumable.update({conn.node_id: conn.to_snapshot() for conn in conns})
+        self._resumable_since = datetime.now(timezone.utc)
+        await self.save()
+
+        for conn in conns:
+            hint = self.reconnect_hint()
+            try:
+                await conn.websocket.send_json(
+                    build_message(
+                        "RECONNECT",
+                        {**hint, "session_id": conn.session_id, "reason": reason},
+                    )
+                )
+                await conn.websocket.close(code=4010, reason="Gateway draining")
+            except Exception:
+                pass
+
+        logger.info(f"🚰 드레인 완료: 노드 {len(conns)}개, 미완료 명령 {unfinished}개")
+        return {
+            "draining": True,
+            "nodes_notified": len(conns),
+            "commands_waited": len(waiting),
+            "commands_unfinished": unfinished,
+        }
+
+    def undrain(self) -> bool:
+        """
+        드레인 취소 (배포 중단 / 롤백 시) → 새 연결 / 동기 명령 수락 재개
+
+        이미 RECONNECT를 받은 노드는 돌아오면 스냅샷 세션으로 재개
+        (SESSION_RESUME_TTL이 지나도 돌아오지 않으면 expire_sessions()가 정리)
+        """
+        if not self.draining:
+            return False
+        self.draining = False
+        logger.info("🚰 드레인 취소 - 연결 / 명령 수락 재개")
+        return True
+
+    def get_stats(self) -> dict:
+        return {
+            "draining": self.draining,
+            "store": type(self.store).__name__,
+            "resumable_sessions": len(self._resumable),
+            "sessions_resumed": self.sessions_resumed,
+            "sessions_registered": self.sessions_registered,
+            "inflight_commands": len(self._inflight),
+            "orphaned_commands": len(self._orphaned),
+            "orphaned_results": self.orphaned_results,
+        }
+
+
+warm_restart = WarmRestart()
+
+
+# ============================================================
+# Scale-out: 멀티 인스턴스 라우팅 (Redis)
+# ============================================================
+
+
+class ClusterRouter:
+    """
+    멀티 인스턴스 라우팅
+
+    노드 웹소켓은 연결된 인스턴스(워커)만 가지고 있으므로:
+    - 노드별 소유 인스턴스와 요약 정보를 Redis 해시(FLEET_KEY)에 기록
+    - 다른 인스턴스 소유 노드로 가는 메시지는 소유 인스턴스 채널로 전달 (pub/sub)
+    - 전달된 동기 명령의 RESULT는 요청 인스턴스로 되돌려 pending_commands를 해결
+    - 대시보드 이벤트 / 드레인은 모든 인스턴스로 팬아웃
+
+    GATEWAY_REDIS_URL이 없으면 비활성 (단일 인스턴스 동작 그대로)
+    """
+
+    FLEET_KEY = "gateway:fleet"
+    DASHBOARD_CHANNEL = "gateway:dashboard"
+    CONTROL_CHANNEL = "gateway:control"
+
+    def __init__(self, redis_client=None, instance_id: str = None):
+        self._redis = redis_client
+        self.instance_id = instance_id or Config.INSTANCE_ID
+
+        self._replies: Dict[str, asyncio.Future] = {}  # request_id → 전달 응답 대기
+        # command_id → (요청 인스턴스, 노드, 만료 시각)
+        # RESULT 전달 / 노드 연결 해제 / 요청 측 대기 시간 초과 시 제거
+        self._remote_commands: Dict[str, Tuple[str, str, float]] = {}
+        self._pubsub = None
+        self._listener: Optional[asyncio.Task] = None
+
+        # 통계
+        self.routed_out = 0
+        self.routed_in = 0
+        self.results_forwarded = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self._redis is not None
+
+    @staticmethod
+    def instance_channel(instance_id: str) -> str:
+        return f"gateway:instance:{instance_id}"
+
+    async def _publish(self, channel: str, message: dict):
+        await self._redis.publish(channel, json.dumps(message))
+
+    # ─── 노드 소유권 / Fleet 뷰 ───
+
+    async def register(self, conn: NodeConnection):
+        """노드 소유권 + 요약 기록 (HELLO / HEARTBEAT마다 갱신)"""
+        if not self.enabled:
+            return
+        entry = {
+            **conn.to_snapshot(),
+            "last_heartbeat": conn.last_heartbeat.isoformat(),
+            "resources": conn.resources,
+            "instance_id": self.instance_id,
+        }
+        await self._redis.hset(self.FLEET_KEY, conn.node_id, json.dumps(entry))
+
+    async def release(self, node_id: str):
+        """소유권 해제 (다른 인스턴스가 이미 가져갔으면 유지) + 노드에 전달했던 명령 기록 정리"""
+        self._remote_commands = {
+            command_id: entry
+            for command_id, entry in self._remote_commands.items()
+            if entry[1] != node_id
+        }
+        if not self.enabled:
+            return
+        entry = await self.get_node(node_id)
+        if entry and entry["instance_id"] == self.instance_id:
+            await self._redis.hdel(self.FLEET_KEY, node_id)
+
+    def _is_stale(self, entry: dict) -> bool:
+        last = datetime.fromisoformat(entry["last_heartbeat"])
+        return datetime.now(timezone.utc) - last > timedelta(seconds=Config.HEARTBEAT_TIMEOUT)
+
+    async def get_node(self, node_id: str) -> Optional[dict]:
+        """Fleet 노드 조회 (HEARTBEAT_TIMEOUT 지난 항목은 없는 것으로 취급)"""
+        if not self.enabled:
+            return None
+        raw = await self._redis.hget(self.FLEET_KEY, node_id)
+        if not raw:
+            return None
+        entry = json.loads(raw)
+        return None if self._is_stale(entry) else entry
+
+    async def list_nodes(self) -> List[dict]:
+        """전체 인스턴스의 노드 목록 (죽은 인스턴스가 남긴 항목은 정리)"""
+        entries, stale = [], []
+        for node_id, raw in (await self._redis.hgetall(self.FLEET_KEY)).items():
+            entry = json.loads(raw)
+            if self._is_stale(entry):
+                stale.append(node_id)
+            else:
+                entries.append(entry)
+        if stale:
+            await self._redis.hdel(self.FLEET_KEY, *stale)
+        return entries
+
+    # ─── 인스턴스 간 전달 ───
+
+    async def send(self, node_id: str, message: dict, track_result: bool = False) -> bool:
+        """
+        다른 인스턴스 소유 노드에 메시지 전달
+
+        Args:
+            track_result: True면 해당 COMMAND의 RESULT를 이 인스턴스로 되돌려 받음
+        """
+        entry = await self.get_node(node_id)
+        if not entry or entry["instance_id"] == self.instance_id:
+            return False
+
+        request_id = str(uuid.uuid4())
+        future = asyncio.get_event_loop().create_future()
+        self._replies[request_id] = future
+        try:
+            await self._publish(
+                self.instance_channel(entry["instance_id"]),
+                {
+                    "op": "send",
+                    "request_id": request_id,
+                    "origin": self.instance_id,
+                    "node_id": node_id,
+                    "message": message,
+                    "track_result": track_result,
+                },
+            )
+            self.routed_out += 1
+            reply = await asyncio.wait_for(future, timeout=Config.ROUTE_TIMEOUT)
+            return reply.get("ok", False)
+        except asyncio.TimeoutError:
+            logger.warning(f"[{node_id}] 인스턴스 {entry['instance_id']} 응답 없음")
+            return False
+        finally:
+            self._replies.pop(request_id, None)
+
+    async def forward_result(self, command_id: str, payload: dict, node_id: str = None) -> bool:
+        """다른 인스턴스가 요청한 명령의 RESULT면 요청 인스턴스로 전달"""
+        entry = self._remote_commands.pop(command_id, None)
+        if not entry:
+            return False
+        await self._publish(
+            self.instance_channel(entry[0]),
+            {"op": "result", "command_id": command_id, "node_id": node_id, "payload": payload},
+        )
+        self.results_forwarded += 1
+        return True
+
+    async def publish_dashboard(self, message: dict):
+        if self.enabled:
+            await self._publish(
+                self.DASHBOARD_CHANNEL,
+                {"op": "dashboard", "origin": self.instance_id, "message": message},
+            )
+
+    async def publish_drain(self, reason: str):
+        if self.enabled:
+            await self._publish(
+                self.CONTROL_CHANNEL, {"op": "drain", "origin": self.instance_id, "reason": reason}
+            )
+
+    async def publish_undrain(self):
+        if self.enabled:
+            await self._publish(self.CONTROL_CHANNEL, {"op": "undrain", "origin": self.instance_id})
+
+    def _track_remote_command(self, message: dict):
+        """전달받은 명령의 요청 인스턴스 기록 (만료된 기록은 함께 정리)"""
+        now = time.monotonic()
+        self._remote_commands = {
+            command_id: entry
+            for command_id, entry in self._remote_commands.items()
+            if entry[2] > now
+        }
+
+        payload = message["message"].get("payload", {})
+        # 요청 인스턴스는 명령 timeout까지만 기다리므로 그 뒤의 RESULT는 전달할 필요 없음
+        timeout = payload.get("timeout_seconds") or 300
+        self._remote_commands[payload.get("command_id")] = (
+            message["origin"],
+            message["node_id"],
+            now + timeout + Config.ROUTE_TIMEOUT,
+        )
+
+    async def handle(self, message: dict):
+        """수신 메시지 처리"""
+        op = message.get("op")
+
+        if op == "send":
+            self.routed_in += 1
+            ok = await pool.send_to_node(message["node_id"], message["message"])
+            if ok and message.get("track_result"):
+                self._track_remote_command(message)
+            await self._publish(
+                self.instance_channel(message["origin"]),
+                {"op": "reply", "request_id": message["request_id"], "ok": ok},
+            )
+
+        elif op == "reply":
+            future = self._replies.get(message["request_id"])
+            if future and not future.done():
+                future.set_result(message)
+
+        elif op == "result":
+            scheduler.completed(message["command_id"], message.get("node_id"))
+            future = pending_commands.get(message["command_id"])
+            if future and not future.done():
+                future.set_result(message["payload"])
+
+        elif op == "dashboard":
+            if message["origin"] != self.instance_id:
+                await send_to_local_dashboards(message["message"])
+
+        elif op == "drain":
+            if message["origin"] != self.instance_id and not warm_restart.draining:
+                asyncio.create_task(warm_restart.drain(message.get("reason", "deploy")))
+
+        elif op == "undrain":
+            if message["origin"] != self.instance_id:
+                warm_restart.undrain()
+
+    async def _listen(self):
+        async for raw in self._pubsub.listen():
+            if raw.get("type") != "message":
+                continue
+            try:
+                await self.handle(json.loads(raw["data"]))
+            except Exception as e:
+                logger.error(f"클러스터 메시지 처리 실패: {e}")
+
+    async def start(self):
+        if not self.enabled or self._listener:
+            return
+        self._pubsub = self._redis.pubsub()
+        await self._pubsub.subscribe(
+            self.instance_channel(self.instance_id), self.DASHBOARD_CHANNEL, self.CONTROL_CHANNEL
+        )
+        self._listener = asyncio.create_task(self._listen())
+        logger.info(f"🛰️ 멀티 인스턴스 모드 (instance={self.instance_id})")
+
+    async def stop(self):
+        if not self._listener:
+            return
+        self._listener.cancel()
+        try:
+            await self._listener
+        except asyncio.CancelledError:
+            pass
+        self._listener = None
+        await self._pubsub.unsubscribe()
+
+        # 이 인스턴스 소유 노드 정리
+        for node_id in list(pool._nodes):
+            await self.release(node_id)
+
+    def get_stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "instance_id": self.instance_id,
+            "routed_out": self.routed_out,
+            "routed_in": self.routed_in,
+            "results_forwarded": self.results_forwarded,
+            "remote_commands": len(self._remote_commands),
+        }
+
+
+def create_cluster_router() -> ClusterRouter:
+    """설정에 따른 라우터 (GATEWAY_REDIS_URL 없으면 비활성)"""
+    if Config.REDIS_URL:
+        if REDIS_AVAILABLE:
+            return ClusterRouter(redis_asyncio.from_url(Config.REDIS_URL))
+        logger.warning("redis 패키지 없음 - 단일 인스턴스 모드")
+    return ClusterRouter()
+
+
+cluster = create_cluster_router()
+
+
+async def send_to_any_node(node_id: str, message: dict, track_result: bool = False) -> bool:
+    """로컬 노드면 직접 전송, 다른 인스턴스 소유 노드면 소유 인스턴스로 전달"""
+    if await pool.get(node_id):
+        return await pool.send_to_node(node_id, message)
+    if cluster.enabled:
+        return await cluster.send(node_id, message, track_result=track_result)
+    return False
+
+
+async def schedulable_nodes() -> list:
+    """명령 배치 후보 (멀티 인스턴스 모드면 전체 인스턴스의 Fleet 요약)"""
+    if cluster.enabled:
+        return await cluster.list_nodes()
+    return pool.get_ready_nodes()
+
+
+async def fleet_nodes() -> List[dict]:
+    """노드 목록 (멀티 인스턴스 모드면 전체 인스턴스)"""
+    if cluster.enabled:
+        return await cluster.list_nodes()
+    return pool.list_nodes()
+
+
 # ============================================================
 # Database Operations (Supabase RPC)
 # ============================================================
@@ -425,28 +1583,94 @@ async def db_enqueue_command(
 # ============================================================
 
 
-def generate_signature(payload: dict, secret_key: str) -> str:
-    """HMAC-SHA256 서명 생성"""
-    # 키 정렬하여 JSON 직렬화
-    payload_str = json.dumps(payload, sort_keys=True, separators=(",", ":"))
-
-    # Base64 디코딩 - 실패 시 UTF-8 인코딩으로 폴백
+@functools.lru_cache(maxsize=1024)
+def secret_key_bytes(secret_key: str) -> bytes:
+    """시크릿 키 → HMAC 키 바이트 (Base64 디코딩 - 실패 시 UTF-8 인코딩으로 폴백)"""
     try:
-        key_bytes = base64.b64decode(secret_key)
+        return base64.b64decode(secret_key)
     except (binascii.Error, ValueError):
-        key_bytes = secret_key.encode("utf-8")
+        return secret_key.encode("utf-8")
 
-    # HMAC-SHA256
-    signature = hmac.new(key_bytes, payload_str.encode("utf-8"), hashlib.sha256).hexdigest()
-    return signature
+
+def generate_signature(payload: dict, secret_key: str) -> str:
+    """HMAC-SHA256 서명 생성 (이전 방식: payload를 키 정렬 JSON으로 재직렬화)"""
+    payload_str = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hmac.new(
+        secret_key_bytes(secret_key), payload_str.encode("utf-8"), hashlib.sha256
+    ).hexdigest()
 
 
 def verify_signature(payload: dict, signature: str, secret_key: str) -> bool:
-    """서명 검증"""
+    """서명 검증 (이전 방식 HELLO signature)"""
     expected = generate_signature(payload, secret_key)
     return hmac.compare_digest(expected, signature)
 
 
+class FrameSigner:
+    """
+    프레임 HMAC-SHA256 (전송 바이트 그대로 서명 → 재직렬화 없음)
+
+    - 텍스트 프레임: JSON 객체 끝에 "mac" 필드를 덧붙임 → '{...,"mac":"<hex>"}'
+      검증은 받은 문자열에서 꼬리를 떼어낸 원본 바이트로 수행 (키 순서 / 공백 무관)
+    - 바이너리 프레임 (msgpack): 본문 뒤에 32바이트 MAC
+    - 키 설정된 HMAC 객체를 복사해 사용 (메시지마다 키 패딩 재계산 없음)
+    - for_session(): HELLO 이후 세션 키 (노드 시크릿 + session_id + nonce, 방향별 분리)
+      → 세션 중에는 DB 시크릿 조회 없이 모든 프레임 검증
+    """
+
+    FIELD = "mac"
+    _PREFIX = ',"mac":"'
+    _TEXT_TAIL = len(_PREFIX) + 64 + 2  # ,"mac":"<64 hex>"}
+    DIGEST_SIZE = 32
+
+    def __init__(self, key: bytes):
+        self._hmac = hmac.new(key, digestmod=hashlib.sha256)
+
+    @classmethod
+    def for_session(
+        cls, secret_key: str, session_id: str, nonce: str, direction: str
+    ) -> "FrameSigner":
+        """세션 키 파생 (direction: "node" = 노드 → Gateway, "gateway" = Gateway → 노드)"""
+        label = f"doai-session:{direction}:{session_id}:{nonce}".encode("utf-8")
+        return cls(hmac.new(secret_key_bytes(secret_key), label, hashlib.sha256).digest())
+
+    def digest(self, data: bytes) -> bytes:
+        mac = self._hmac.copy()
+        mac.update(data)
+        return mac.digest()
+
+    def sign_text(self, body: str) -> str:
+        """JSON 객체 문자열 → MAC 필드를 덧붙인 프레임"""
+        return f'{body[:-1]}{self._PREFIX}{self.digest(body.encode("utf-8")).hex()}"}}'
+
+    def verify_text(self, frame: str) -> Optional[str]:
+        """MAC이 맞으면 MAC을 뗀 원본 JSON 문자열, 아니면 None"""
+        tail = frame[-self._TEXT_TAIL :]
+        if len(frame) <= self._TEXT_TAIL or not tail.startswith(self._PREFIX):
+            return None
+        body = frame[: -self._TEXT_TAIL] + "}"
+        try:
+            received = bytes.fromhex(tail[len(self._PREFIX) : -2])
+        except ValueError:
+            return None
+        if not hmac.compare_digest(received, self.digest(body.encode("utf-8"))):
+            return None
+        return body
+
+    def sign_bytes(self, body: bytes) -> bytes:
+        return body + self.digest(body)
+
+    def verify_bytes(self, frame: bytes) -> Optional[bytes]:
+        body, received = frame[: -self.DIGEST_SIZE], frame[-self.DIGEST_SIZE :]
+        if len(frame) <= self.DIGEST_SIZE or not hmac.compare_digest(received, self.digest(body)):
+            return None
+        return body
+
+
+class FrameAuthError(Exception):
+    """세션 MAC 검증 실패"""
+
+
 # ============================================================
 # Message Builders (Protocol v1.0)
 # ============================================================
@@ -463,29 +1687,46 @@ def build_message(msg_type: str, payload: dict) -> dict:
     }
 
 
-def build_hello_ack(session_id: str, server_time: str = None) -> dict:
-    """HELLO_ACK 메시지 빌드"""
-    return {
+def build_hello_ack(
+    session_id: str,
+    server_time: str = None,
+    resumed: bool = False,
+    encoding: str = "json",
+    session_mac: dict = None,
+) -> dict:
+    """HELLO_ACK 메시지 빌드 (session_mac: 이후 프레임 세션 MAC nonce)"""
+    message = {
         "type": "HELLO_ACK",
         "version": Config.PROTOCOL_VERSION,
         "timestamp": server_time or (datetime.now(timezone.utc).isoformat() + "Z"),
         "message_id": str(uuid.uuid4()),
         "payload": {
             "session_id": session_id,
+            "resumed": resumed,
             "heartbeat_interval": Config.HEARTBEAT_INTERVAL,
             "max_tasks": Config.MAX_TASKS_PER_NODE,
+            "device_delta": True,  # HEARTBEAT 디바이스 델타 지원
+            "encoding": encoding,  # 이후 프레임 인코딩 (json / msgpack)
         },
     }
+    if session_mac:
+        message["payload"]["session_mac"] = session_mac
+    return message
 
 
-def build_heartbeat_ack(server_time: str = None, pending_commands: list = None) -> dict:
-    """HEARTBEAT_ACK 메시지 빌드 (Pull-based Push 포함)"""
+def build_heartbeat_ack(
+    server_time: str = None, pending_commands: list = None, resync: bool = False
+) -> dict:
+    """HEARTBEAT_ACK 메시지 빌드 (Pull-based Push 포함, resync: 전체 디바이스 스냅샷 요청)"""
+    payload = {"status": "OK", "commands": pending_commands or []}
+    if resync:
+        payload["resync"] = True
     return {
         "type": "HEARTBEAT_ACK",
         "version": Config.PROTOCOL_VERSION,
         "timestamp": server_time or (datetime.now(timezone.utc).isoformat() + "Z"),
         "message_id": str(uuid.uuid4()),
-        "payload": {"status": "OK", "commands": pending_commands or []},
+        "payload": payload,
     }
 
 
@@ -548,6 +1789,13 @@ async def lifespan(app: FastAPI):
     else:
         logger.warning("⚠️ Supabase 연결 없음 (Mock 모드)")
 
+    # 이전 인스턴스 스냅샷 복원 (세션 재개용)
+    await warm_restart.restore()
+    warm_restart.start()
+
+    # 멀티 인스턴스 라우팅 (GATEWAY_REDIS_URL 설정 시)
+    await cluster.start()
+
     # Background task: 비활성 노드 정리
     cleanup_task = asyncio.create_task(cleanup_stale_connections())
 
@@ -560,33 +1808,46 @@ async def lifespan(app: FastAPI):
     except asyncio.CancelledError:
         pass
 
+    # 드레인 (이미 /api/admin/drain으로 드레인했으면 스냅샷만 갱신)
+    await warm_restart.stop()
+    if warm_restart.draining:
+        await warm_restart.save()
+    else:
+        await warm_restart.drain("shutdown")
+    await cluster.stop()
+
     logger.info("🧠 Cloud Gateway 종료")
 
 
+async def expire_connection(conn: NodeConnection):
+    """HEARTBEAT 타임아웃 노드 연결 해제 + OOB 통보"""
+    node_id = conn.node_id
+    logger.warning(f"[{node_id}] HEARTBEAT 타임아웃 - 연결 해제")
+    try:
+        await conn.websocket.close(code=4008, reason="Heartbeat timeout")
+    except Exception:
+        pass
+    if await pool.remove(node_id, websocket=conn.websocket):
+        scheduler.forget(node_id)
+        await cluster.release(node_id)
+    await forward_heartbeat_timeout_to_oob(node_id)
+
+
 async def cleanup_stale_connections():
-    """비활성 연결 정리 (Background Task)"""
+    """비활성 연결 정리 (Background Task, 1 tick마다 HEARTBEAT 마감 확인)"""
+    last_expire = time.monotonic()
     while True:
         try:
-            await asyncio.sleep(60)  # 1분마다 체크
+            await asyncio.sleep(pool.deadlines.tick)
 
-            now = datetime.now(timezone.utc)
-            timeout = timedelta(seconds=Config.HEARTBEAT_TIMEOUT)
+            for conn in pool.expired():
+                await expire_connection(conn)
 
-            # 스냅샷을 통해 순회 중 딕셔너리 변경 에러 방지
-            nodes_snapshot = list(pool._nodes.values())
-            stale_nodes = []
+            await warm_restart.expire_sessions()
 
-            for node in nodes_snapshot:
-                if now - node.last_heartbeat > timeout:
-                    stale_nodes.append((node.node_id, node))
-
-            for node_id, conn in stale_nodes:
-                logger.warning(f"[{node_id}] HEARTBEAT 타임아웃 - 연결 해제")
-                try:
-                    await conn.websocket.close(code=4008, reason="Heartbeat timeout")
-                except Exception:
-                    pass
-                await pool.remove(node_id)
+            if time.monotonic() - last_expire >= 60:
+                scheduler.expire(Config.COMMAND_TIMEOUT * 2)
+                last_expire = time.monotonic()
 
         except asyncio.CancelledError:
             break
@@ -647,12 +1908,21 @@ async def websocket_node(websocket: WebSocket):
     node_id = None
     session_id = str(uuid.uuid4())[:8]
 
+    # 드레인 중이면 재접속 힌트만 주고 종료
+    if warm_restart.draining:
+        await websocket.send_json(build_message("RECONNECT", warm_restart.reconnect_hint()))
+        await websocket.close(code=4010, reason="Gateway draining")
+        return
+
     try:
         # ═══════════════════════════════════════════════════════════════════
         # Phase 1: HELLO Handshake
         # ═══════════════════════════════════════════════════════════════════
         try:
-            hello = await asyncio.wait_for(websocket.receive_json(), timeout=Config.HELLO_TIMEOUT)
+            hello_frame = await asyncio.wait_for(
+                websocket.receive_text(), timeout=Config.HELLO_TIMEOUT
+            )
+            hello = json.loads(hello_frame)
         except asyncio.TimeoutError:
             await websocket.send_json(build_error("AUTH_FAILED", "HELLO timeout"))
             await websocket.close(code=4001, reason="HELLO timeout")
@@ -674,13 +1944,23 @@ async def websocket_node(websocket: WebSocket):
             await websocket.close(code=4003, reason="Missing node_id")
             return
 
-        # ═══ HMAC-SHA256 서명 검증 ═══
+        # ═══ HMAC-SHA256 서명 검증 (DB 시크릿 조회는 HELLO 1회) ═══
+        secret = None
         if Config.VERIFY_SIGNATURE:
             secret = await db_get_node_secret(node_id)
 
             if not secret:
                 # 새 노드: 서명 없이 연결 허용 (DB에서 키 생성)
                 logger.info(f"[{node_id}] 새 노드 - 시크릿 키 생성 예정")
+            elif FrameSigner.FIELD in hello:
+                # 전송 바이트 그대로 서명된 HELLO 프레임
+                if not FrameSigner(secret_key_bytes(secret)).verify_text(hello_frame):
+                    logger.warning(f"[{node_id}] 서명 검증 실패")
+                    await websocket.send_json(
+                        build_error("AUTH_FAILED", "Invalid signature", message_id)
+                    )
+                    await websocket.close(code=4004, reason="AUTH_FAILED")
+                    return
             elif signature:
                 if not verify_signature(payload, signature, secret):
                     logger.warning(f"[{node_id}] 서명 검증 실패")
@@ -697,6 +1977,18 @@ async def websocket_node(websocket: WebSocket):
                 await websocket.close(code=4005, reason="Signature required")
                 return
 
+        # ═══ 세션 재개 (게이트웨이 재시작 전 세션) ═══
+        resumed = warm_restart.claim_session(node_id, payload.get("resume_session_id"))
+        if resumed:
+            session_id = resumed["session_id"]
+
+        # ═══ 프레임 인코딩 / 세션 MAC 협상 (HELLO_ACK까지는 JSON, 서명 없음) ═══
+        encoding = negotiate_encoding(payload.get("encodings"))
+        websocket = NodeSocket(websocket)
+        session_mac = None
+        if secret and payload.get("session_mac"):
+            session_mac = {"nonce": secrets.token_hex(16)}
+
         # ═══ 연결 풀에 추가 ═══
         conn = await pool.add(node_id, websocket, session_id)
         conn.hostname = payload.get("hostname", "")
@@ -705,25 +1997,49 @@ async def websocket_node(websocket: WebSocket):
         conn.device_count = payload.get("device_count", 0)
         conn.runner_version = payload.get("runner_version", "")
 
-        # ═══ DB에 연결 등록 ═══
-        db_result = await db_register_node_connection(
-            node_id=node_id,
-            session_id=session_id,
-            hostname=conn.hostname,
-            ip_address=conn.ip_address,
-            runner_version=conn.runner_version,
-            capabilities=conn.capabilities,
-        )
+        if resumed:
+            # DB에는 이전 세션이 그대로 남아 있으므로 재등록 생략
+            conn.node_uuid = resumed.get("node_uuid")
+            logger.info(f"[{node_id}] 세션 재개 (session={session_id})")
+        else:
+            # ═══ DB에 연결 등록 ═══
+            db_result = await db_register_node_connection(
+                node_id=node_id,
+                session_id=session_id,
+                hostname=conn.hostname,
+                ip_address=conn.ip_address,
+                runner_version=conn.runner_version,
+                capabilities=conn.capabilities,
+            )
+            warm_restart.sessions_registered += 1
 
-        if db_result.get("success"):
-            conn.node_uuid = db_result.get("node_uuid")
-            if db_result.get("is_new"):
-                logger.info(f"[{node_id}] 새 노드 등록됨 (uuid={conn.node_uuid})")
+            if db_result.get("success"):
+                conn.node_uuid = db_result.get("node_uuid")
+                if db_result.get("is_new"):
+                    logger.info(f"[{node_id}] 새 노드 등록됨 (uuid={conn.node_uuid})")
+
+        # ═══ 노드 소유권 등록 (멀티 인스턴스) ═══
+        await cluster.register(conn)
 
         # ═══ HELLO_ACK 응답 ═══
-        await websocket.send_json(build_hello_ack(session_id))
+        await websocket.send_json(
+            build_hello_ack(
+                session_id,
+                resumed=resumed is not None,
+                encoding=encoding,
+                session_mac=session_mac,
+            )
+        )
+        websocket.encoding = encoding
+        if session_mac:
+            nonce = session_mac["nonce"]
+            websocket.signer_in = FrameSigner.for_session(secret, session_id, nonce, "node")
+            websocket.signer_out = FrameSigner.for_session(secret, session_id, nonce, "gateway")
 
-        logger.info(f"[{node_id}] HELLO 완료 (session={session_id}, devices={conn.device_count})")
+        logger.info(
+            f"[{node_id}] HELLO 완료 (session={session_id}, devices={conn.device_count}, "
+            f"encoding={encoding})"
+        )
 
         # 대시보드에 노드 연결 알림
         await broadcast_to_dashboards(
@@ -774,11 +2090,20 @@ async def websocket_node(websocket: WebSocket):
 
     except WebSocketDisconnect:
         logger.info(f"[{node_id or 'unknown'}] 연결 끊김")
+    except FrameAuthError:
+        logger.warning(f"[{node_id}] 세션 MAC 검증 실패 - 연결 종료")
+        await websocket.close(code=4004, reason="AUTH_FAILED")
     except Exception as e:
         logger.error(f"[{node_id or 'unknown'}] 에러: {e}", exc_info=True)
     finally:
         if node_id:
-            await pool.remove(node_id)
+            # 드레인 중 종료된 세션은 다음 인스턴스에서 재개하므로 DB 연결 유지
+            removed = await pool.remove(
+                node_id, mark_disconnected=not warm_restart.draining, websocket=websocket
+            )
+            if removed:
+                scheduler.forget(node_id)
+                await cluster.release(node_id)
 
 
 async def handle_heartbeat(node_id: str, conn: NodeConnection, websocket: WebSocket, message: dict):
@@ -787,27 +2112,36 @@ async def handle_heartbeat(node_id: str, conn: NodeConnection, websocket: WebSoc
 
     # Protocol v1.0 필드
     status = msg_payload.get("status", "READY")
-    device_snapshot = msg_payload.get("device_snapshot", [])
     active_tasks = msg_payload.get("active_tasks", 0)
     resources = msg_payload.get("resources", {})
-    msg_payload.get("queue_depth", 0)
+    queue_depth = msg_payload.get("queue_depth", 0)
 
     # 확장 필드 (기존 NodeRunner 호환)
     metrics = message.get("metrics", {})
     devices = message.get("devices", [])
-    device_count = len(device_snapshot) or len(devices) or metrics.get("device_count", 0)
+
+    # 디바이스 스냅샷 / 델타 → 노드별 상태 반영, 바뀐 디바이스만 DB로 전달
+    if "device_snapshot" in msg_payload or "device_delta" in msg_payload:
+        device_changes, resync = conn.devices.apply(msg_payload)
+    else:
+        device_changes, resync = devices, False
+    if resync:
+        logger.info(f"[{node_id}] 디바이스 델타 seq 불일치 → 전체 스냅샷 요청")
+    device_count = len(conn.devices) or len(devices) or metrics.get("device_count", 0)
 
     # 메모리 상태 업데이트
     await pool.update_heartbeat(node_id, device_count, status)
     await pool.update_status(node_id, status, active_tasks)
+    scheduler.observe(node_id, active_tasks)
     conn.resources = resources
+    await cluster.register(conn)
 
     # ═══ DB 처리 (HEARTBEAT + Pull-based Push) ═══
     db_result = await db_process_heartbeat(
         node_id=node_id,
         status=status,
         resources=resources,
-        device_snapshot=device_snapshot or devices,
+        device_snapshot=device_changes,
         active_tasks=active_tasks,
         session_id=conn.session_id,
     )
@@ -842,12 +2176,16 @@ async def handle_heartbeat(node_id: str, conn: NodeConnection, websocket: WebSoc
             "uptime_sec": metrics.get("uptime_sec", 0),
             "laixi_restarts": metrics.get("laixi_restarts", 0),
             "resources": resources,
+            "queue_depth": queue_depth,
+            "executor": msg_payload.get("executor", {}),
         },
     )
 
     # ═══ HEARTBEAT_ACK 응답 (+ 대기 명령) ═══
     await websocket.send_json(
-        build_heartbeat_ack(pending_commands=pending_commands if status == "READY" else [])
+        build_heartbeat_ack(
+            pending_commands=pending_commands if status == "READY" else [], resync=resync
+        )
     )
 
     if pending_commands:
@@ -866,6 +2204,17 @@ async def handle_heartbeat(node_id: str, conn: NodeConnection, websocket: WebSoc
     )
 
 
+# RESULT status → command_queue status (그 외는 FAILED)
+RESULT_DB_STATUS = {
+    "SUCCESS": "COMPLETED",
+    "PARTIAL_SUCCESS": "COMPLETED",
+    # 취소는 retry_failed_commands() 재배정 대상이 아니므로 FAILED와 구분
+    "CANCELLED": "CANCELLED",
+    # 노드 대기열 초과로 실행 전 거부 → FAILED로 두어 재시도 한도 내에서 재배정
+    "REJECTED": "FAILED",
+}
+
+
 async def handle_result(node_id: str, message: dict):
     """RESULT 메시지 처리"""
     msg_payload = message.get("payload", {})
@@ -881,14 +2230,22 @@ async def handle_result(node_id: str, message: dict):
         f"({summary.get('success_count', 0)}/{summary.get('total_devices', 0)} devices)"
     )
 
+    # ═══ 스케줄러 배치 해제 (지연 EWMA 갱신) ═══
+    if command_id:
+        scheduler.completed(command_id, node_id)
+
     # ═══ Pending Future 해결 (동기 API용) ═══
     if command_id and command_id in pending_commands:
         pending_commands[command_id].set_result(msg_payload)
+    elif command_id and await cluster.forward_result(command_id, msg_payload, node_id):
+        logger.debug(f"[{node_id}] RESULT 요청 인스턴스로 전달: {command_id}")
+    elif command_id and warm_restart.claim_orphaned_result(command_id):
+        logger.info(f"[{node_id}] 재시작 전 명령 결과 수신: {command_id}")
 
     # ═══ DB 명령 완료 처리 ═══
     if command_id:
         # status 매핑: RESULT status → DB status
-        db_status = "COMPLETED" if result_status in ["SUCCESS", "PARTIAL_SUCCESS"] else "FAILED"
+        db_status = RESULT_DB_STATUS.get(result_status, "FAILED")
 
         await db_complete_command(
             command_id=command_id,
@@ -933,6 +2290,28 @@ async def forward_metrics_to_oob(node_id: str, metrics: dict):
         logger.debug(f"[{node_id}] OOB forward error: {e}")
 
 
+async def forward_heartbeat_timeout_to_oob(node_id: str):
+    """OOB 시스템에 HEARTBEAT 타임아웃 통보 (HealthCollector.mark_heartbeat_timeout)"""
+    try:
+        import aiohttp
+
+        timeout_url = os.getenv("OOB_HEARTBEAT_TIMEOUT_URL")
+
+        if not timeout_url:
+            return
+
+        async with aiohttp.ClientSession() as session:
+            async with session.post(
+                timeout_url, json={"node_id": node_id}, timeout=aiohttp.ClientTimeout(total=5)
+            ) as resp:
+                if resp.status != 200:
+                    logger.debug(f"[{node_id}] OOB heartbeat timeout forward: {resp.status}")
+    except ImportError:
+        pass
+    except Exception as e:
+        logger.debug(f"[{node_id}] OOB forward error: {e}")
+
+
 # ============================================================
 # REST API: 동기 명령 전송
 # ============================================================
@@ -941,7 +2320,7 @@ async def forward_metrics_to_oob(node_id: str, metrics: dict):
 class CommandRequest(BaseModel):
     """명령 요청"""
 
-    node_id: str
+    node_id: Optional[str] = None  # 없으면 스케줄러가 여유 노드 선택
     action: str
     device_id: str = "all"
     params: Dict[str, Any] = Field(default_factory=dict)
@@ -954,6 +2333,7 @@ class CommandResponse(BaseModel):
 
     success: bool
     command_id: str
+    node_id: Optional[str] = None
     result: Optional[dict] = None
     error: Optional[str] = None
 
@@ -965,11 +2345,18 @@ async def send_command(request: CommandRequest):
 
     프론트엔드 → Gateway → Node → Laixi → Gateway → 프론트엔드
     """
-    conn = await pool.get(request.node_id)
-    if not conn:
-        raise HTTPException(
-            status_code=404, detail=f"Node not found or not connected: {request.node_id}"
-        )
+    if warm_restart.draining:
+        raise HTTPException(status_code=503, detail="Gateway draining")
+
+    node_id = request.node_id
+    if node_id is None:
+        # 용량 기반 노드 선택
+        node = scheduler.select(await schedulable_nodes())
+        if node is None:
+            raise HTTPException(status_code=503, detail="No available nodes")
+        node_id = NodeScheduler._field(node, "node_id")
+    elif not await pool.get(node_id) and not await cluster.get_node(node_id):
+        raise HTTPException(status_code=404, detail=f"Node not found or not connected: {node_id}")
 
     command_id = str(uuid.uuid4())
 
@@ -993,11 +2380,13 @@ async def send_command(request: CommandRequest):
     # Future 생성 (응답 대기용)
     future = asyncio.get_event_loop().create_future()
     pending_commands[command_id] = future
+    warm_restart.track_command(command_id, node_id)
 
     try:
-        success = await pool.send_to_node(request.node_id, command)
+        success = await send_to_any_node(node_id, command, track_result=True)
         if not success:
             raise HTTPException(status_code=500, detail="Failed to send command")
+        scheduler.assigned(command_id, node_id)
 
         # 응답 대기
         try:
@@ -1005,15 +2394,22 @@ async def send_command(request: CommandRequest):
             return CommandResponse(
                 success=result.get("status") in ["SUCCESS", "PARTIAL_SUCCESS"],
                 command_id=command_id,
+                node_id=node_id,
                 result=result,
                 error=result.get("error_message"),
             )
         except asyncio.TimeoutError:
+            # 타임아웃도 지연으로 반영 (느린 노드 회피)
+            scheduler.completed(command_id, node_id)
             return CommandResponse(
-                success=False, command_id=command_id, error=f"Command timeout ({request.timeout}s)"
+                success=False,
+                command_id=command_id,
+                node_id=node_id,
+                error=f"Command timeout ({request.timeout}s)",
             )
     finally:
         pending_commands.pop(command_id, None)
+        warm_restart.untrack_command(command_id)
 
 
 # ============================================================
@@ -1030,6 +2426,7 @@ class QueueCommandRequest(BaseModel):
     params: Dict[str, Any] = Field(default_factory=dict)
     priority: str = "NORMAL"
     scheduled_at: Optional[str] = None
+    auto_assign: bool = False  # target_node_id가 없으면 스케줄러가 노드 지정
 
 
 class QueueCommandResponse(BaseModel):
@@ -1037,6 +2434,7 @@ class QueueCommandResponse(BaseModel):
 
     queued: bool
     command_id: Optional[str] = None
+    target_node_id: Optional[str] = None
     error: Optional[str] = None
 
 
@@ -1053,6 +2451,16 @@ async def queue_command(request: QueueCommandRequest):
         conn = await pool.get(request.target_node_id)
         if conn and conn.node_uuid:
             node_uuid = conn.node_uuid
+        else:
+            entry = await cluster.get_node(request.target_node_id)
+            node_uuid = entry.get("node_uuid") if entry else None
+
+    assigned_node = request.target_node_id
+    if not assigned_node and request.auto_assign:
+        node = scheduler.select(await schedulable_nodes())
+        if node is not None:
+            assigned_node = NodeScheduler._field(node, "node_id")
+            node_uuid = NodeScheduler._field(node, "node_uuid")
 
     command_id = await db_enqueue_command(
         command_type=request.command_type,
@@ -1068,7 +2476,11 @@ async def queue_command(request: QueueCommandRequest):
         logger.info(
             f"[QUEUE] 명령 추가: {request.command_type} (id={command_id}, priority={request.priority})"
         )
-        return QueueCommandResponse(queued=True, command_id=command_id)
+        if assigned_node and node_uuid and request.auto_assign:
+            scheduler.assigned(command_id, assigned_node)
+        return QueueCommandResponse(
+            queued=True, command_id=command_id, target_node_id=assigned_node
+        )
     else:
         return QueueCommandResponse(queued=False, error="Failed to enqueue command")
 
@@ -1081,7 +2493,7 @@ async def queue_command(request: QueueCommandRequest):
 @app.get("/api/nodes")
 async def list_nodes():
     """연결된 노드 목록"""
-    nodes = pool.list_nodes()
+    nodes = await fleet_nodes()
     return {
         "nodes": nodes,
         "total": len(nodes),
@@ -1095,7 +2507,11 @@ async def get_node(node_id: str):
     """특정 노드 상태"""
     conn = await pool.get(node_id)
     if not conn:
-        raise HTTPException(status_code=404, detail="Node not found")
+        # 다른 인스턴스 소유 노드 (요약 정보)
+        entry = await cluster.get_node(node_id)
+        if not entry:
+            raise HTTPException(status_code=404, detail="Node not found")
+        return entry
 
     return {
         "node_id": conn.node_id,
@@ -1118,7 +2534,7 @@ async def get_node(node_id: str):
 async def send_command_to_node(node_id: str, request: dict):
     """특정 노드에 직접 명령 전송"""
     conn = await pool.get(node_id)
-    if not conn:
+    if not conn and not await cluster.get_node(node_id):
         raise HTTPException(status_code=404, detail="Node not found")
 
     command_id = str(uuid.uuid4())
@@ -1131,11 +2547,23 @@ async def send_command_to_node(node_id: str, request: dict):
         timeout=request.get("timeout", 60),
     )
 
-    success = await pool.send_to_node(node_id, command)
+    success = await send_to_any_node(node_id, command)
+    if success:
+        scheduler.assigned(command_id, node_id)
 
     return {"sent": success, "command_id": command_id, "node_id": node_id}
 
 
+@app.post("/api/nodes/{node_id}/commands/{command_id}/cancel")
+async def cancel_node_command(node_id: str, command_id: str):
+    """노드의 대기 / 실행 중 명령 취소 (노드가 CANCELLED RESULT 전송)"""
+    if not await pool.get(node_id) and not await cluster.get_node(node_id):
+        raise HTTPException(status_code=404, detail="Node not found")
+
+    sent = await send_to_any_node(node_id, build_message("CANCEL", {"command_id": command_id}))
+    return {"sent": sent, "command_id": command_id, "node_id": node_id}
+
+
 # ============================================================
 # REST API: 브로드캐스트 (Control Room용)
 # ============================================================
@@ -1179,13 +2607,11 @@ async def broadcast_command(request: BroadcastRequest):
         # 특정 노드 지정
         target_nodes = request.target_node_ids
     else:
-        # 연결된 모든 READY 노드
-        ready_nodes = pool.get_ready_nodes()
-        target_nodes = [n.node_id for n in ready_nodes]
-
-        # 노드 수 제한
-        if request.target_node_count > 0:
-            target_nodes = target_nodes[: request.target_node_count]
+        # 여유 있는 READY 노드 (멀티 인스턴스 모드면 전체 인스턴스), 부하 낮은 노드 우선
+        target_nodes = [
+            NodeScheduler._field(n, "node_id")
+            for n in scheduler.pick(await schedulable_nodes(), request.target_node_count)
+        ]
 
     if not target_nodes:
         return BroadcastResponse(
@@ -1213,9 +2639,10 @@ async def broadcast_command(request: BroadcastRequest):
 
     # 각 노드에 전송
     for node_id in target_nodes:
-        success = await pool.send_to_node(node_id, command)
+        success = await send_to_any_node(node_id, command)
         if success:
             sent_count += 1
+            scheduler.assigned(command_id, node_id)
             logger.info(f"[BROADCAST:{broadcast_id}] → {node_id} 전송 완료")
         else:
             errors.append(f"Failed to send to {node_id}")
@@ -1252,7 +2679,13 @@ dashboard_connections: List[WebSocket] = []
 
 
 async def broadcast_to_dashboards(message: dict):
-    """대시보드들에 메시지 브로드캐스트"""
+    """대시보드들에 메시지 브로드캐스트 (멀티 인스턴스 모드면 다른 인스턴스 대시보드 포함)"""
+    await send_to_local_dashboards(message)
+    await cluster.publish_dashboard(message)
+
+
+async def send_to_local_dashboards(message: dict):
+    """이 인스턴스에 연결된 대시보드들에 전송"""
     disconnected = []
     for ws in dashboard_connections:
         try:
@@ -1278,7 +2711,7 @@ async def websocket_dashboard(websocket: WebSocket):
 
     try:
         # 초기 상태 전송
-        nodes = pool.list_nodes()
+        nodes = await fleet_nodes()
         await websocket.send_json(
             {
                 "type": "INIT",
@@ -1298,7 +2731,7 @@ async def websocket_dashboard(websocket: WebSocket):
                     await websocket.send_json({"type": "PONG"})
 
                 elif msg_type == "GET_STATUS":
-                    nodes = pool.list_nodes()
+                    nodes = await fleet_nodes()
                     await websocket.send_json(
                         {
                             "type": "STATUS",
@@ -1333,12 +2766,14 @@ async def health():
     sb = get_supabase()
 
     return {
-        "status": "ok",
+        "status": "draining" if warm_restart.draining else "ok",
         "protocol_version": Config.PROTOCOL_VERSION,
         "nodes_connected": len(nodes),
         "nodes_ready": len([n for n in nodes if n["status"] == "READY"]),
         "supabase_connected": sb is not None,
         "signature_verification": Config.VERIFY_SIGNATURE,
+        "instance_id": Config.INSTANCE_ID,
+        "cluster": cluster.enabled,
     }
 
 
@@ -1357,13 +2792,13 @@ async def system_status():
         except Exception as e:
             logger.error(f"DB status 조회 실패: {e}")
 
-    nodes = pool.list_nodes()
+    nodes = await fleet_nodes()
 
     return {
         "gateway": {
             "protocol_version": Config.PROTOCOL_VERSION,
             "uptime": "N/A",
-            "memory_nodes": len(nodes),
+            "memory_nodes": len(pool._nodes),
         },
         "nodes": {
             "connected": len(nodes),
@@ -1371,9 +2806,44 @@ async def system_status():
             "busy": len([n for n in nodes if n["status"] == "BUSY"]),
         },
         "database": db_stats,
+        "warm_restart": warm_restart.get_stats(),
+        "cluster": cluster.get_stats(),
+        "scheduler": scheduler.get_stats(),
     }
 
 
+# ============================================================
+# REST API: 드레인 (배포 전 세션 이관)
+# ============================================================
+
+
+@app.post("/api/admin/drain")
+async def drain_gateway(reason: str = "deploy"):
+    """
+    드레인 모드 진입
+
+    새 연결/동기 명령을 거부하고, 진행 중 명령을 기다린 뒤 스냅샷을 저장하고
+    노드들에 분산된 재접속 지연을 안내한다. 배포 스크립트에서 종료 전에 호출.
+    멀티 인스턴스 모드면 다른 인스턴스도 함께 드레인한다.
+    """
+    if warm_restart.draining:
+        return {"draining": True, "nodes_notified": 0}
+    await cluster.publish_drain(reason)
+    return await warm_restart.drain(reason)
+
+
+@app.post("/api/admin/undrain")
+async def undrain_gateway():
+    """
+    드레인 취소 (배포 중단 / 롤백 시)
+
+    새 연결 / 동기 명령 수락을 재개한다. 이미 재접속 안내를 받은 노드는
+    돌아오면 스냅샷 세션으로 재개된다. 멀티 인스턴스 모드면 다른 인스턴스도 함께 해제한다.
+    """
+    await cluster.publish_undrain()
+    return {"draining": False, "undrained": warm_restart.undrain()}
+
+
 # ============================================================
 # 메인
 # ============================================================
@@ -1384,4 +2854,14 @@ if __name__ == "__main__":
     port = int(os.getenv("PORT", "8000"))
     host = os.getenv("HOST", "0.0.0.0")
 
-    uvicorn.run("main:app", host=host, port=port, reload=False, log_level="info")
+    # GATEWAY_WORKERS > 1은 GATEWAY_REDIS_URL 필요 (워커 간 노드 라우팅)
+    workers = Config.WORKERS if cluster.enabled else 1
+    uvicorn.run(
+        "main:app",
+        host=host,
+        port=port,
+        reload=False,
+        log_level="info",
+        workers=workers,
+        ws_per_message_deflate=True,  # 노드가 제안하면 permessage-deflate 사용
+    )
@@ -2,22 +2,47 @@
 Shared 모듈
 
 공용 라이브러리, 클라이언트, 스키마
+
+하위 모듈은 처음 접근할 때 import (PEP 562, shared.lazy_import 참고)
+→ `import shared.schemas`가 supabase 등을 끌어오지 않음
 """
 
+from .lazy_import import lazy_exports
+
 # Laixi Client는 websockets 없이도 import 가능
-from .laixi_client import LaixiClient, LaixiConfig, get_laixi_client
+_getattr, _dir = lazy_exports(
+    __name__,
+    {".laixi_client": ("LaixiClient", "LaixiConfig", "get_laixi_client")},
+)
 
 # Supabase Client는 선택적 (supabase 패키지 필요)
-try:
-    from .supabase_client import DeviceSync, JobSync, get_client
-
-    HAS_SUPABASE = True
-except ImportError:
-    # supabase 미설치 시 None으로 대체
-    get_client = None
-    DeviceSync = None
-    JobSync = None
-    HAS_SUPABASE = False
+_SUPABASE_EXPORTS = ("get_client", "DeviceSync", "JobSync", "HAS_SUPABASE")
+
+
+def __getattr__(name: str):
+    if name not in _SUPABASE_EXPORTS:
+        return _getattr(name)
+
+    try:
+        from .supabase_client import DeviceSync, JobSync, get_client
+
+        HAS_SUPABASE = True
+    except ImportError:
+        # supabase 미설치 시 None으로 대체
+        get_client = None
+        DeviceSync = None
+        JobSync = None
+        HAS_SUPABASE = False
+
+    globals().update(
+        get_client=get_client, DeviceSync=DeviceSync, JobSync=JobSync, HAS_SUPABASE=HAS_SUPABASE
+    )
+    return globals()[name]
+
+
+def __dir__():
+    return sorted(set(_dir()) | set(_SUPABASE_EXPORTS))
+
 
 __all__ = [
     # Laixi Client
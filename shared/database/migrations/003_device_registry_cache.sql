@@ -0,0 +1,42 @@
+-- =====================================================
+-- DeviceRegistryCache 지원 (shared/device_cache.py)
+-- 1. devices.updated_at 자동 갱신 (체크섬 기준)
+-- 2. Realtime 발행 대상에 devices 추가
+-- 3. 체크섬 RPC: 캐시와 DB 내용 비교용
+-- =====================================================
+
+-- 1. updated_at 자동 갱신
+DROP TRIGGER IF EXISTS devices_updated_at ON devices;
+CREATE TRIGGER devices_updated_at
+    BEFORE UPDATE ON devices
+    FOR EACH ROW EXECUTE FUNCTION update_updated_at();
+
+-- 2. Realtime (postgres_changes) 발행
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_publication WHERE pubname = 'supabase_realtime')
+       AND NOT EXISTS (
+           SELECT 1 FROM pg_publication_tables
+           WHERE pubname = 'supabase_realtime' AND tablename = 'devices'
+       ) THEN
+        ALTER PUBLICATION supabase_realtime ADD TABLE devices;
+    END IF;
+END $$;
+
+-- 3. 체크섬: 행마다 md5("<id>:<updated_at epoch 마이크로초>") 앞 60비트의 합
+--    (순서 무관 → 캐시는 변경 이벤트마다 증분 갱신)
+CREATE OR REPLACE FUNCTION device_registry_checksum()
+RETURNS TABLE (row_count BIGINT, checksum TEXT) AS $$
+    SELECT
+        COUNT(*),
+        COALESCE(
+            SUM(
+                ('x' || substr(md5(
+                    id::text || ':' ||
+                    COALESCE((extract(epoch FROM updated_at) * 1000000)::bigint::text, '')
+                ), 1, 15))::bit(60)::bigint::numeric
+            ),
+            0
+        )::text
+    FROM devices;
+$$ LANGUAGE sql STABLE;
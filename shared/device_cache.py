@@ -0,0 +1,382 @@
+"""
+DeviceRegistryCache - devices 테이블 인메모리 캐시
+
+DeviceRegistry 조회(get_devices / get_device_by_serial / get_device_by_hierarchy)를
+매번 Supabase select("*")로 처리하지 않고 프로세스 내 색인으로 처리합니다.
+
+- 전체 테이블을 한 번 로드 (read-through: 첫 조회 시 자동 로드, 캐시에 없는 단건은 DB 조회 후 적재)
+- 행은 DeviceTable(열 지향)에 보관하고 조회 결과는 DeviceRow 뷰로 반환
+- 보조 색인: serial / hierarchy_id (단건), workstation / phoneboard / status / group (집합)
+- 필터 조회 = 색인 집합 교집합 (작은 집합부터)
+- Supabase Realtime(postgres_changes) 이벤트로 변경 반영
+- 주기적으로 DB 체크섬(device_registry_checksum RPC)과 비교해 불일치 시 재로드
+  (shared/database/migrations/003_device_registry_cache.sql)
+  start() 없이 쓰면 reconcile_interval이 지난 뒤 첫 조회에서 비교
+
+Usage:
+    cache = DeviceRegistryCache(realtime_client=await acreate_client(url, key))
+    await cache.start()
+    registry = DeviceRegistry(cache=cache)
+"""
+
+import asyncio
+import hashlib
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+try:
+    from loguru import logger
+except ImportError:
+    import logging
+
+    logger = logging.getLogger(__name__)
+
+from shared.device_table import DeviceRow, DeviceTable
+from shared.supabase_client import get_client
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def row_hash(device_id: str, updated_at: Optional[str]) -> int:
+    """
+    행 체크섬 (DB의 device_registry_checksum()과 동일한 계산)
+
+    md5("<id>:<updated_at epoch 마이크로초>")의 앞 60비트
+    """
+    micros = ""
+    if updated_at:
+        dt = datetime.fromisoformat(updated_at)
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=timezone.utc)
+        micros = str((dt - _EPOCH) // _MICROSECOND)
+    digest = hashlib.md5(f"{device_id}:{micros}".encode()).hexdigest()
+    return int(digest[:15], 16)
+
+
+class DeviceRegistryCache:
+    """
+    devices 테이블 read-through 캐시
+
+    색인 갱신은 이벤트 루프 안에서만 일어나므로 별도 잠금 없음.
+    전체 재로드는 DB 조회가 끝난 뒤 색인을 다시 만든다 (조회 실패 시 기존 색인 유지).
+    """
+
+    # 집합 색인 대상 (DeviceRegistry.get_devices 필터)
+    INDEXED_FIELDS = ("workstation_id", "phoneboard_id", "status", "device_group")
+    PAGE_SIZE = 1000  # PostgREST 기본 최대 행 수
+    CHANNEL = "device-registry-cache"
+
+    def __init__(
+        self,
+        client=None,
+        realtime_client=None,
+        reconcile_interval: float = 300.0,
+        clock=time.monotonic,
+    ):
+        """
+        Args:
+            client: Supabase 클라이언트 (기본: shared.supabase_client.get_client())
+            realtime_client: Realtime 구독용 async Supabase 클라이언트 (없으면 체크섬 재동기화만)
+            reconcile_interval: 체크섬 비교 주기 (초)
+        """
+        self.client = client or get_client()
+        self.realtime_client = realtime_client
+        self.reconcile_interval = reconcile_interval
+        self._clock = clock
+
+        self._reset()
+        self.loaded = False
+        self._checked_at = 0.0  # 마지막 로드 / 체크섬 비교 시각
+
+        self._channel = None
+        self._task: Optional[asyncio.Task] = None
+
+        # 통계
+        self.reloads = 0
+        self.changes_applied = 0
+        self.misses = 0
+
+    def _reset(self):
+        self._table = DeviceTable()
+        self._devices: Dict[str, DeviceRow] = {}  # id → 행 뷰
+        self._by_serial: Dict[str, str] = {}
+        self._by_hierarchy: Dict[str, str] = {}
+        self._indexes: Dict[str, Dict[Any, Set[str]]] = {f: {} for f in self.INDEXED_FIELDS}
+        self._row_hash: Dict[str, int] = {}
+        self._checksum = 0
+
+    # =========================================
+    # 로드 / 변경 반영
+    # =========================================
+
+    def _fetch_all(self) -> List[Dict[str, Any]]:
+        rows: List[Dict[str, Any]] = []
+        start = 0
+        while True:
+            result = (
+                self.client.table("devices")
+                .select("*")
+                .order("id")
+                .range(start, start + self.PAGE_SIZE - 1)
+                .execute()
+            )
+            page = result.data or []
+            rows.extend(page)
+            if len(page) < self.PAGE_SIZE:
+                return rows
+            start += self.PAGE_SIZE
+
+    def load(self) -> int:
+        """전체 테이블 로드 (기존 색인 교체)"""
+        rows = self._fetch_all()
+
+        self._reset()
+        for row in rows:
+            self.upsert_row(row)
+
+        self.loaded = True
+        self._checked_at = self._clock()
+        self.reloads += 1
+        logger.info(f"디바이스 캐시 로드: {len(self._devices)}대")
+        return len(self._devices)
+
+    def ensure_loaded(self):
+        """첫 조회 시 로드, 백그라운드 재동기화가 없으면 주기가 지난 조회에서 체크섬 비교"""
+        if not self.loaded:
+            self.load()
+        elif self._task is None and self._clock() - self._checked_at >= self.reconcile_interval:
+            self.reconcile()
+
+    def upsert_row(self, row: Dict[str, Any]) -> DeviceRow:
+        """DB 행 반영 (추가 또는 제자리 갱신)"""
+        self._unindex(row["id"])
+        device = self._table.view(self._table.upsert(row))
+
+        self._devices[device.id] = device
+        if device.serial_number:
+            self._by_serial[device.serial_number] = device.id
+        if device.hierarchy_id:
+            self._by_hierarchy[device.hierarchy_id] = device.id
+        for field in self.INDEXED_FIELDS:
+            self._indexes[field].setdefault(getattr(device, field), set()).add(device.id)
+
+        digest = row_hash(device.id, row.get("updated_at"))
+        self._row_hash[device.id] = digest
+        self._checksum += digest
+        return device
+
+    def remove(self, device_id: str):
+        """행 삭제 반영"""
+        self._unindex(device_id)
+        self._table.delete(device_id)
+
+    def _unindex(self, device_id: str):
+        device = self._devices.pop(device_id, None)
+        if device is None:
+            return
+        if self._by_serial.get(device.serial_number) == device_id:
+            del self._by_serial[device.serial_number]
+        if self._by_hierarchy.get(device.hierarchy_id) == device_id:
+            del self._by_hierarchy[device.hierarchy_id]
+        for field in self.INDEXED_FIELDS:
+            bucket = self._indexes[field].get(getattr(device, field))
+            if bucket is not None:
+                bucket.discard(device_id)
+                if not bucket:
+                    del self._indexes[field][getattr(device, field)]
+        self._checksum -= self._row_hash.pop(device_id, 0)
+
+    def apply_change(self, payload: Dict[str, Any]):
+        """
+        Realtime postgres_changes 이벤트 반영
+
+        payload: {"data": {"type": "INSERT|UPDATE|DELETE", "record": {...}, "old_record": {...}}}
+        """
+        data = payload.get("data", payload)
+        event = data.get("type") or data.get("eventType")
+        if event == "DELETE":
+            old = data.get("old_record") or data.get("old") or {}
+            if old.get("id"):
+                self.remove(old["id"])
+        else:
+            record = data.get("record") or data.get("new")
+            if record and record.get("id"):
+                self.upsert_row(record)
+        self.changes_applied += 1
+
+    # =========================================
+    # 조회
+    # =========================================
+
+    def get(self, device_id: str) -> Optional[DeviceRow]:
+        self.ensure_loaded()
+        return self._devices.get(device_id)
+
+    def get_by_serial(self, serial: str) -> Optional[DeviceRow]:
+        self.ensure_loaded()
+        device_id = self._by_serial.get(serial)
+        if device_id is None:
+            self.misses += 1
+            return None
+        return self._devices[device_id]
+
+    def get_by_hierarchy(self, hierarchy_id: str) -> Optional[DeviceRow]:
+        self.ensure_loaded()
+        device_id = self._by_hierarchy.get(hierarchy_id)
+        if device_id is None:
+            self.misses += 1
+            return None
+        return self._devices[device_id]
+
+    def _match_ids(self, filters: Dict[str, Any]) -> Optional[Set[str]]:
+        """필터 색인 교집합 (필터가 없으면 None = 전체)"""
+        buckets = [self._indexes[field].get(value, set()) for field, value in filters.items()]
+        if not buckets:
+            return None
+        buckets.sort(key=len)
+        ids = set(buckets[0])
+        for bucket in buckets[1:]:
+            if not ids:
+                break
+            ids &= bucket
+        return ids
+
+    def query(
+        self,
+        workstation_id: Optional[str] = None,
+        phoneboard_id: Optional[str] = None,
+        status: Optional[str] = None,
+        group: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[DeviceRow]:
+        """DeviceRegistry.get_devices와 같은 필터 / hierarchy_id 정렬"""
+        self.ensure_loaded()
+        filters = {
+            field: value
+            for field, value in (
+                ("workstation_id", workstation_id),
+                ("phoneboard_id", phoneboard_id),
+                ("status", status),
+                ("device_group", group),
+            )
+            if value
+        }
+        ids = self._match_ids(filters)
+        devices = (
+            list(self._devices.values())
+            if ids is None
+            else [self._devices[device_id] for device_id in ids]
+        )
+        devices.sort(key=lambda d: d.hierarchy_id)
+        return devices[:limit] if limit else devices
+
+    def status_counts(self, workstation_id: Optional[str] = None) -> Dict[str, int]:
+        """상태별 디바이스 수"""
+        self.ensure_loaded()
+        statuses = self._indexes["status"]
+        if workstation_id is None:
+            counts = {status: len(ids) for status, ids in statuses.items()}
+        else:
+            scope = self._indexes["workstation_id"].get(workstation_id, set())
+            counts = {status: len(ids & scope) for status, ids in statuses.items()}
+        counts["total"] = sum(counts.values())
+        return counts
+
+    def __len__(self) -> int:
+        return len(self._devices)
+
+    # =========================================
+    # 체크섬 재동기화
+    # =========================================
+
+    def checksum(self) -> Tuple[int, int]:
+        """(행 수, 행 체크섬 합)"""
+        return len(self._devices), self._checksum
+
+    def remote_checksum(self) -> Tuple[int, int]:
+        result = self.client.rpc("device_registry_checksum").execute()
+        row = result.data[0] if isinstance(result.data, list) else result.data
+        return int(row["row_count"]), int(row["checksum"])
+
+    def reconcile(self) -> bool:
+        """DB 체크섬과 비교 → 불일치 시 재로드 (재로드 여부 반환)"""
+        if not self.loaded:
+            self.load()
+            return True
+
+        self._checked_at = self._clock()
+        try:
+            remote = self.remote_checksum()
+        except Exception as e:
+            # RPC 미설치 등 → 체크섬 없이 재로드
+            logger.warning(f"디바이스 체크섬 조회 실패, 전체 재로드: {e}")
+            self.load()
+            return True
+
+        if remote == self.checksum():
+            return False
+
+        logger.warning(f"디바이스 캐시 불일치 (local={self.checksum()}, remote={remote}) → 재로드")
+        self.load()
+        return True
+
+    # =========================================
+    # 라이프사이클
+    # =========================================
+
+    async def start(self):
+        """Realtime 구독 + 초기 로드 + 주기 재동기화 시작 (이미 시작했으면 무시)"""
+        if self._task is not None:
+            return
+
+        if self.realtime_client is not None:
+            try:
+                self._channel = self.realtime_client.channel(self.CHANNEL)
+                self._channel.on_postgres_changes(
+                    "*", schema="public", table="devices", callback=self.apply_change
+                )
+                await self._channel.subscribe()
+            except Exception as e:
+                logger.warning(f"디바이스 Realtime 구독 실패 (체크섬 재동기화만 사용): {e}")
+                self._channel = None
+
+        # 구독 후 로드 → 로드 중 누락된 변경은 다음 체크섬 비교에서 복구
+        self.load()
+        self._task = asyncio.create_task(self._reconcile_loop())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._channel is not None:
+            try:
+                await self._channel.unsubscribe()
+            except Exception:
+                pass
+            self._channel = None
+
+    async def _reconcile_loop(self):
+        while True:
+            try:
+                await asyncio.sleep(self.reconcile_interval)
+                self.reconcile()
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"디바이스 캐시 재동기화 실패: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "devices": len(self._devices),
+            "loaded": self.loaded,
+            "realtime": self._channel is not None,
+            "reloads": self.reloads,
+            "changes_applied": self.changes_applied,
+            "misses": self.misses,
+        }
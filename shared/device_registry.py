@@ -12,10 +12,11 @@ DeviceRegistry - 폰보드-슬롯 기반 디바이스 관리
 - 5 워크스테이션 × 3 폰보드 × 20 슬롯 = 300대
 """
 
+import os
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from enum import Enum
-from typing import Any, Dict, List, Optional, Tuple
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 
 try:
     from loguru import logger
@@ -24,7 +25,10 @@ except ImportError:
 
     logger = logging.getLogger(__name__)
 
-from shared.supabase_client import get_client
+from shared.supabase_client import bulk_upsert_rows, get_async_client, get_client
+
+if TYPE_CHECKING:
+    from shared.device_cache import DeviceRegistryCache
 
 
 class DeviceStatus(str, Enum):
@@ -45,7 +49,7 @@ class DeviceGroup(str, Enum):
     B = "B"
 
 
-@dataclass
+@dataclass(slots=True)
 class DeviceInfo:
     """디바이스 정보"""
 
@@ -61,7 +65,25 @@ class DeviceInfo:
     last_heartbeat: Optional[datetime] = None
 
 
-@dataclass
+def device_info_from_row(data: Dict[str, Any]) -> DeviceInfo:
+    """DB 레코드를 DeviceInfo로 변환"""
+    return DeviceInfo(
+        id=data["id"],
+        serial_number=data["serial_number"],
+        hierarchy_id=data.get("hierarchy_id", ""),
+        workstation_id=data.get("workstation_id", ""),
+        phoneboard_id=data.get("phoneboard_id", ""),
+        slot_number=data.get("slot_number", 0),
+        device_group=data.get("device_group", "A"),
+        status=data["status"],
+        model=data.get("model"),
+        last_heartbeat=(
+            datetime.fromisoformat(data["last_heartbeat"]) if data.get("last_heartbeat") else None
+        ),
+    )
+
+
+@dataclass(slots=True)
 class PhoneboardInfo:
     """폰보드 정보"""
 
@@ -73,7 +95,7 @@ class PhoneboardInfo:
     status: str
 
 
-@dataclass
+@dataclass(slots=True)
 class WorkstationInfo:
     """워크스테이션 정보"""
 
@@ -110,11 +132,24 @@ class DeviceRegistry:
 
         # 배치 실행용 디바이스 분할
         batch_a, batch_b = await registry.get_batch_groups()
+
+    cache(DeviceRegistryCache)를 지정하면 디바이스 조회는 인메모리 색인으로 처리하고,
+    변경 결과 행은 캐시에도 바로 반영합니다 (write-through).
+    조회 결과는 캐시 행 뷰가 아닌 DeviceInfo 사본이므로 이후 캐시 변경에 영향받지 않습니다.
     """
 
-    def __init__(self):
+    def __init__(self, cache: Optional["DeviceRegistryCache"] = None):
         """DeviceRegistry 초기화"""
         self.client = get_client()
+        self.cache = cache
+
+    def _cache_rows(self, rows: Optional[List[Dict[str, Any]]]):
+        """변경 결과 행을 캐시에 반영"""
+        if self.cache is None or not self.cache.loaded:
+            return
+        for row in rows or []:
+            if row.get("id"):
+                self.cache.upsert_row(row)
 
     # =========================================
     # 워크스테이션 관리
@@ -267,6 +302,28 @@ class DeviceRegistry:
     # 디바이스 등록/관리
     # =========================================
 
+    @staticmethod
+    def _device_row(
+        serial: str, workstation: str, board: int, slot: int, model: Optional[str], now: str
+    ) -> Dict[str, Any]:
+        """등록용 devices 행 (계층 ID / 그룹 계산)"""
+        phoneboard_id = f"{workstation}-PB{board:02d}"
+        data = {
+            "serial_number": serial,
+            "pc_id": workstation,  # 레거시 호환
+            "workstation_id": workstation,
+            "phoneboard_id": phoneboard_id,
+            "slot_number": slot,
+            "hierarchy_id": f"{phoneboard_id}-S{slot:02d}",
+            # 그룹 할당 (홀수/짝수)
+            "device_group": "A" if slot % 2 == 1 else "B",
+            "status": "idle",
+            "last_heartbeat": now,
+        }
+        if model:
+            data["model"] = model
+        return data
+
     async def register_device(
         self, serial: str, workstation: str, board: int, slot: int, model: Optional[str] = None
     ) -> Optional[DeviceInfo]:
@@ -284,28 +341,9 @@ class DeviceRegistry:
             등록된 디바이스 정보 또는 None
         """
         try:
-            phoneboard_id = f"{workstation}-PB{board:02d}"
-            hierarchy_id = f"{phoneboard_id}-S{slot:02d}"
-
-            # 그룹 할당 (홀수/짝수)
-            device_group = "A" if slot % 2 == 1 else "B"
-
             now = datetime.now(timezone.utc).isoformat()
-
-            data = {
-                "serial_number": serial,
-                "pc_id": workstation,  # 레거시 호환
-                "workstation_id": workstation,
-                "phoneboard_id": phoneboard_id,
-                "slot_number": slot,
-                "hierarchy_id": hierarchy_id,
-                "device_group": device_group,
-                "status": "idle",
-                "last_heartbeat": now,
-            }
-
-            if model:
-                data["model"] = model
+            data = self._device_row(serial, workstation, board, slot, model, now)
+            hierarchy_id = data["hierarchy_id"]
 
             result = (
                 self.client.table("devices").upsert(data, on_conflict="serial_number").execute()
@@ -313,6 +351,7 @@ class DeviceRegistry:
 
             if result.data and len(result.data) > 0:
                 device = result.data[0]
+                self._cache_rows(result.data)
                 logger.info(f"디바이스 등록: {hierarchy_id} (serial={serial})")
 
                 return DeviceInfo(
@@ -320,9 +359,9 @@ class DeviceRegistry:
                     serial_number=device["serial_number"],
                     hierarchy_id=device.get("hierarchy_id", hierarchy_id),
                     workstation_id=workstation,
-                    phoneboard_id=phoneboard_id,
+                    phoneboard_id=data["phoneboard_id"],
                     slot_number=slot,
-                    device_group=device_group,
+                    device_group=data["device_group"],
                     status=device["status"],
                     model=device.get("model"),
                     last_heartbeat=datetime.fromisoformat(now),
@@ -337,24 +376,37 @@ class DeviceRegistry:
         """
         여러 디바이스 일괄 등록
 
+        serial_number 기준 일괄 upsert (chunk 단위 요청, 부팅 시 수백 대도 몇 번의 요청)
+
         Args:
             devices: [{"serial": "xxx", "workstation": "WS01", "board": 1, "slot": 5}, ...]
 
         Returns:
-            등록된 디바이스 목록
+            등록된 디바이스 목록 (입력 순서, 같은 시리얼은 마지막 항목 기준)
         """
-        results = []
-
-        for device in devices:
-            result = await self.register_device(
-                serial=device["serial"],
-                workstation=device["workstation"],
-                board=device["board"],
-                slot=device["slot"],
-                model=device.get("model"),
+        now = datetime.now(timezone.utc).isoformat()
+        rows = [
+            self._device_row(
+                d["serial"], d["workstation"], d["board"], d["slot"], d.get("model"), now
             )
-            if result:
-                results.append(result)
+            for d in devices
+        ]
+        if not rows:
+            return []
+
+        try:
+            upserted = bulk_upsert_rows(self.client, "devices", rows, on_conflict="serial_number")
+        except Exception as e:
+            logger.error(f"디바이스 일괄 등록 실패: {len(rows)}대 - {e}")
+            return []
+
+        self._cache_rows(upserted)
+        by_serial = {row["serial_number"]: row for row in upserted}
+        results = []
+        for serial in dict.fromkeys(row["serial_number"] for row in rows):
+            row = by_serial.get(serial)
+            if row:
+                results.append(self._to_device_info(row))
 
         logger.info(f"{len(results)}대 디바이스 일괄 등록 완료")
         return results
@@ -366,6 +418,11 @@ class DeviceRegistry:
     async def get_device_by_serial(self, serial: str) -> Optional[DeviceInfo]:
         """시리얼 번호로 디바이스 조회"""
         try:
+            if self.cache is not None:
+                device = self.cache.get_by_serial(serial)
+                if device is not None:
+                    return device.to_info()
+
             result = (
                 self.client.table("devices")
                 .select("*")
@@ -375,6 +432,7 @@ class DeviceRegistry:
             )
 
             if result.data:
+                self._cache_rows([result.data])
                 return self._to_device_info(result.data)
             return None
         except Exception:
@@ -383,6 +441,11 @@ class DeviceRegistry:
     async def get_device_by_hierarchy(self, hierarchy_id: str) -> Optional[DeviceInfo]:
         """계층 ID로 디바이스 조회 (예: WS01-PB01-S05)"""
         try:
+            if self.cache is not None:
+                device = self.cache.get_by_hierarchy(hierarchy_id)
+                if device is not None:
+                    return device.to_info()
+
             result = (
                 self.client.table("devices")
                 .select("*")
@@ -392,6 +455,7 @@ class DeviceRegistry:
             )
 
             if result.data:
+                self._cache_rows([result.data])
                 return self._to_device_info(result.data)
             return None
         except Exception:
@@ -419,6 +483,16 @@ class DeviceRegistry:
             디바이스 목록
         """
         try:
+            if self.cache is not None:
+                devices = self.cache.query(
+                    workstation_id=workstation_id,
+                    phoneboard_id=phoneboard_id,
+                    status=status,
+                    group=group,
+                    limit=limit,
+                )
+                return [device.to_info() for device in devices]
+
             query = self.client.table("devices").select("*")
 
             if workstation_id:
@@ -523,6 +597,7 @@ class DeviceRegistry:
                 )
 
             result = query.execute()
+            self._cache_rows(result.data)
             return bool(result.data)
         except Exception as e:
             logger.error(f"디바이스 상태 변경 실패: {device_id} - {e}")
@@ -565,6 +640,7 @@ class DeviceRegistry:
                 .execute()
             )
 
+            self._cache_rows(result.data)
             count = len(result.data) if result.data else 0
             if count > 0:
                 logger.warning(f"{count}대 디바이스 offline 처리 (stale)")
@@ -593,9 +669,13 @@ class DeviceRegistry:
             if result:
                 update_data["last_command_result"] = result
 
-            self.client.table("devices").update(update_data).eq(
-                "serial_number" if "-" not in device_id else "hierarchy_id", device_id
-            ).execute()
+            result = (
+                self.client.table("devices")
+                .update(update_data)
+                .eq("serial_number" if "-" not in device_id else "hierarchy_id", device_id)
+                .execute()
+            )
+            self._cache_rows(result.data)
 
             return True
         except Exception as e:
@@ -614,6 +694,13 @@ class DeviceRegistry:
             {"total": 300, "idle": 250, "busy": 30, "offline": 15, "error": 5}
         """
         try:
+            if self.cache is not None:
+                counts = self.cache.status_counts(workstation_id)
+                return {
+                    "total": counts["total"],
+                    **{s: counts.get(s, 0) for s in ("idle", "busy", "offline", "error")},
+                }
+
             query = self.client.table("devices").select("status")
 
             if workstation_id:
@@ -640,22 +727,7 @@ class DeviceRegistry:
 
     def _to_device_info(self, data: Dict[str, Any]) -> DeviceInfo:
         """DB 레코드를 DeviceInfo로 변환"""
-        return DeviceInfo(
-            id=data["id"],
-            serial_number=data["serial_number"],
-            hierarchy_id=data.get("hierarchy_id", ""),
-            workstation_id=data.get("workstation_id", ""),
-            phoneboard_id=data.get("phoneboard_id", ""),
-            slot_number=data.get("slot_number", 0),
-            device_group=data.get("device_group", "A"),
-            status=data["status"],
-            model=data.get("model"),
-            last_heartbeat=(
-                datetime.fromisoformat(data["last_heartbeat"])
-                if data.get("last_heartbeat")
-                else None
-            ),
-        )
+        return device_info_from_row(data)
 
     @staticmethod
     def parse_hierarchy_id(hierarchy_id: str) -> Optional[Dict[str, Any]]:
@@ -691,9 +763,54 @@ class DeviceRegistry:
 _registry: Optional[DeviceRegistry] = None
 
 
+def _cache_enabled() -> bool:
+    return os.getenv("DEVICE_REGISTRY_CACHE", "").lower() in ("1", "true", "yes")
+
+
 def get_device_registry() -> DeviceRegistry:
-    """DeviceRegistry 싱글톤 반환"""
+    """
+    DeviceRegistry 싱글톤 반환 (DEVICE_REGISTRY_CACHE=true면 인메모리 캐시 사용)
+
+    캐시는 start_device_registry() 전까지 read-through + 체크섬 재동기화로만 동작
+    """
     global _registry
     if _registry is None:
-        _registry = DeviceRegistry()
+        cache = None
+        if _cache_enabled():
+            from shared.device_cache import DeviceRegistryCache
+
+            cache = DeviceRegistryCache()
+        _registry = DeviceRegistry(cache=cache)
     return _registry
+
+
+async def start_device_registry() -> Optional[DeviceRegistry]:
+    """
+    디바이스 캐시 시작 (앱 startup에서 호출, 캐시 미사용 시 아무것도 하지 않음)
+
+    Realtime 구독용 async 클라이언트를 붙여 cache.start()
+    → 초기 로드 + Realtime 변경 반영 + 주기 체크섬 재동기화
+    """
+    if not _cache_enabled():
+        return None
+
+    registry = get_device_registry()
+    cache = registry.cache
+    if cache.realtime_client is None:
+        try:
+            cache.realtime_client = await get_async_client()
+        except Exception as e:
+            logger.warning(f"Realtime 클라이언트 생성 실패 (체크섬 재동기화만 사용): {e}")
+
+    try:
+        await cache.start()
+    except Exception as e:
+        # 초기 로드 실패로 앱이 뜨지 않는 일은 없도록 → 첫 조회 시 다시 로드
+        logger.error(f"디바이스 캐시 시작 실패: {e}")
+    return registry
+
+
+async def stop_device_registry():
+    """디바이스 캐시 중지 (앱 shutdown에서 호출)"""
+    if _registry is not None and _registry.cache is not None:
+        await _registry.cache.stop()
@@ -0,0 +1,250 @@
+"""
+DeviceTable - 디바이스 열 지향(struct-of-arrays) 저장소
+
+수천 대 디바이스를 DeviceInfo 객체 대신 열 배열로 보관합니다.
+
+- 반복되는 문자열(워크스테이션 / 폰보드 / 상태 / 그룹 / 모델)은 인턴 후 정수 코드로 저장
+- 슬롯 번호 / 코드는 array("H"/"I"), last_heartbeat는 epoch 초 array("d") (없으면 NaN)
+- DeviceRow: (테이블, 위치)만 가진 행 뷰 → 복사 없이 DeviceInfo와 같은 속성으로 읽기
+- 같은 id의 행은 제자리 갱신, 삭제는 표시만 (위치 재사용 없음 → 기존 뷰가 다른 디바이스를 가리키지 않음)
+
+Usage:
+    table = DeviceTable.from_rows(result.data)
+    device = table.view(table.position(device_id))
+    device.hierarchy_id, device.status, device.last_heartbeat
+"""
+
+import math
+import sys
+from array import array
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from shared.device_registry import DeviceInfo
+
+
+def _epoch(value: Optional[str]) -> float:
+    """ISO 8601 → epoch 초 (시간대 없으면 UTC, 값 없으면 NaN)"""
+    if not value:
+        return math.nan
+    dt = datetime.fromisoformat(value)
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
+class _Interner:
+    """문자열 ↔ 정수 코드 (코드 0 = None)"""
+
+    __slots__ = ("values", "codes")
+
+    def __init__(self):
+        self.values: List[Optional[str]] = [None]
+        self.codes: Dict[Optional[str], int] = {None: 0}
+
+    def code(self, value: Optional[str]) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = len(self.values)
+            value = sys.intern(value)
+            self.values.append(value)
+            self.codes[value] = code
+        return code
+
+
+class DeviceRow:
+    """DeviceTable 행 뷰 (DeviceInfo와 같은 속성, 읽기 전용)"""
+
+    __slots__ = ("_table", "_pos")
+
+    def __init__(self, table: "DeviceTable", pos: int):
+        self._table = table
+        self._pos = pos
+
+    @property
+    def id(self) -> str:
+        return self._table.ids[self._pos]
+
+    @property
+    def serial_number(self) -> str:
+        return self._table.serials[self._pos]
+
+    @property
+    def hierarchy_id(self) -> str:
+        return self._table.hierarchy_ids[self._pos]
+
+    @property
+    def workstation_id(self) -> str:
+        return self._table.workstations.values[self._table.workstation_codes[self._pos]]
+
+    @property
+    def phoneboard_id(self) -> str:
+        return self._table.phoneboards.values[self._table.phoneboard_codes[self._pos]]
+
+    @property
+    def slot_number(self) -> int:
+        return self._table.slot_numbers[self._pos]
+
+    @property
+    def device_group(self) -> str:
+        return self._table.groups.values[self._table.group_codes[self._pos]]
+
+    @property
+    def status(self) -> str:
+        return self._table.statuses.values[self._table.status_codes[self._pos]]
+
+    @property
+    def model(self) -> Optional[str]:
+        return self._table.models.values[self._table.model_codes[self._pos]]
+
+    @property
+    def last_heartbeat(self) -> Optional[datetime]:
+        ts = self._table.heartbeats[self._pos]
+        return None if math.isnan(ts) else datetime.fromtimestamp(ts, timezone.utc)
+
+    def to_info(self) -> DeviceInfo:
+        """독립된 DeviceInfo 사본"""
+        return DeviceInfo(
+            id=self.id,
+            serial_number=self.serial_number,
+            hierarchy_id=self.hierarchy_id,
+            workstation_id=self.workstation_id,
+            phoneboard_id=self.phoneboard_id,
+            slot_number=self.slot_number,
+            device_group=self.device_group,
+            status=self.status,
+            model=self.model,
+            last_heartbeat=self.last_heartbeat,
+        )
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, DeviceRow):
+            return self._table is other._table and self._pos == other._pos
+        if isinstance(other, DeviceInfo):
+            return self.to_info() == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"DeviceRow({self.hierarchy_id or self.serial_number}, status={self.status})"
+
+
+class DeviceTable:
+    """디바이스 열 지향 저장소"""
+
+    def __init__(self):
+        self.ids: List[str] = []
+        self.serials: List[str] = []
+        self.hierarchy_ids: List[str] = []
+        self.workstation_codes = array("I")
+        self.phoneboard_codes = array("I")
+        self.slot_numbers = array("H")
+        self.group_codes = array("H")
+        self.status_codes = array("H")
+        self.model_codes = array("I")
+        self.heartbeats = array("d")
+        self.alive = bytearray()
+
+        self.workstations = _Interner()
+        self.phoneboards = _Interner()
+        self.groups = _Interner()
+        self.statuses = _Interner()
+        self.models = _Interner()
+
+        self._positions: Dict[str, int] = {}
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Dict[str, Any]]) -> "DeviceTable":
+        """DB 행 목록 → 테이블 (열 단위 일괄 변환)"""
+        rows = list(rows)
+        table = cls()
+        ids = [r["id"] for r in rows]
+        positions = {device_id: pos for pos, device_id in enumerate(ids)}
+        if len(positions) != len(ids):
+            # 중복 id → 행 단위 upsert (마지막 행 우선)
+            for row in rows:
+                table.upsert(row)
+            return table
+
+        ws, pb, grp = table.workstations.code, table.phoneboards.code, table.groups.code
+        st, mdl = table.statuses.code, table.models.code
+
+        table.ids = ids
+        table._positions = positions
+        table.serials = [r["serial_number"] for r in rows]
+        table.hierarchy_ids = [r.get("hierarchy_id") or "" for r in rows]
+        table.workstation_codes = array("I", [ws(r.get("workstation_id") or "") for r in rows])
+        table.phoneboard_codes = array("I", [pb(r.get("phoneboard_id") or "") for r in rows])
+        table.slot_numbers = array("H", [r.get("slot_number") or 0 for r in rows])
+        table.group_codes = array("H", [grp(r.get("device_group") or "A") for r in rows])
+        table.status_codes = array("H", [st(r["status"]) for r in rows])
+        table.model_codes = array("I", [mdl(r.get("model")) for r in rows])
+        table.heartbeats = array("d", [_epoch(r.get("last_heartbeat")) for r in rows])
+        table.alive = bytearray(b"\x01") * len(ids)
+        return table
+
+    def upsert(self, data: Dict[str, Any]) -> int:
+        """DB 행 반영 (같은 id면 제자리 갱신) → 행 위치"""
+        device_id = data["id"]
+        serial = data["serial_number"]
+        hierarchy_id = data.get("hierarchy_id") or ""
+        workstation = self.workstations.code(data.get("workstation_id") or "")
+        phoneboard = self.phoneboards.code(data.get("phoneboard_id") or "")
+        slot = data.get("slot_number") or 0
+        group = self.groups.code(data.get("device_group") or "A")
+        status = self.statuses.code(data["status"])
+        model = self.models.code(data.get("model"))
+        heartbeat = _epoch(data.get("last_heartbeat"))
+
+        pos = self._positions.get(device_id)
+        if pos is None:
+            pos = len(self.ids)
+            self._positions[device_id] = pos
+            self.ids.append(device_id)
+            self.serials.append(serial)
+            self.hierarchy_ids.append(hierarchy_id)
+            self.workstation_codes.append(workstation)
+            self.phoneboard_codes.append(phoneboard)
+            self.slot_numbers.append(slot)
+            self.group_codes.append(group)
+            self.status_codes.append(status)
+            self.model_codes.append(model)
+            self.heartbeats.append(heartbeat)
+            self.alive.append(1)
+            return pos
+
+        self.serials[pos] = serial
+        self.hierarchy_ids[pos] = hierarchy_id
+        self.workstation_codes[pos] = workstation
+        self.phoneboard_codes[pos] = phoneboard
+        self.slot_numbers[pos] = slot
+        self.group_codes[pos] = group
+        self.status_codes[pos] = status
+        self.model_codes[pos] = model
+        self.heartbeats[pos] = heartbeat
+        self.alive[pos] = 1
+        return pos
+
+    def delete(self, device_id: str) -> bool:
+        """삭제 표시 (열 데이터는 남겨 기존 뷰 유지)"""
+        pos = self._positions.pop(device_id, None)
+        if pos is None:
+            return False
+        self.alive[pos] = 0
+        return True
+
+    def position(self, device_id: str) -> Optional[int]:
+        return self._positions.get(device_id)
+
+    def view(self, pos: int) -> DeviceRow:
+        return DeviceRow(self, pos)
+
+    def rows(self) -> Iterator[DeviceRow]:
+        """살아 있는 행 뷰"""
+        for pos, alive in enumerate(self.alive):
+            if alive:
+                yield DeviceRow(self, pos)
+
+    def __len__(self) -> int:
+        return len(self._positions)
@@ -0,0 +1,51 @@
+"""
+지연 import (PEP 562)
+
+패키지 __init__에서 공개 이름을 처음 접근할 때 하위 모듈을 import합니다.
+`import shared.schemas`만으로 supabase / aiohttp / prometheus 등 무거운 의존성을
+끌어오지 않아 노드 러너 / API 재시작 시 기동 시간이 줄어듭니다.
+
+Usage:
+    # shared/schemas/__init__.py
+    __getattr__, __dir__ = lazy_exports(
+        __name__,
+        {
+            ".device": ("DeviceCreate", "DeviceStatus"),
+            ".gateway": ("NodeStatus as GatewayNodeStatus",),
+        },
+    )
+"""
+
+import importlib
+import sys
+from typing import Callable, Dict, Iterable, List, Tuple
+
+
+def lazy_exports(
+    package: str, modules: Dict[str, Iterable[str]]
+) -> Tuple[Callable[[str], object], Callable[[], List[str]]]:
+    """
+    (__getattr__, __dir__) 생성
+
+    modules: 상대 모듈 경로 → 공개 이름 목록 ("원래이름 as 공개이름"으로 별칭)
+    처음 접근한 값은 패키지 전역에 저장되어 이후에는 일반 속성 조회
+    """
+    targets: Dict[str, Tuple[str, str]] = {}
+    for module, names in modules.items():
+        for name in names:
+            attr, _, alias = name.partition(" as ")
+            targets[alias or attr] = (module, attr)
+
+    def __getattr__(name: str) -> object:
+        target = targets.get(name)
+        if target is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        module, attr = target
+        value = getattr(importlib.import_module(module, package), attr)
+        setattr(sys.modules[package], name, value)
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(vars(sys.modules[package])) | set(targets))
+
+    return __getattr__, __dir__
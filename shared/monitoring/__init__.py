@@ -1,24 +1,35 @@
 """
 📊 DoAi.Me 모니터링 모듈
 Prometheus 메트릭 및 헬스체크
+
+하위 모듈은 처음 접근할 때 import (PEP 562)
 """
 
-from .health import HealthChecker, HealthCheckResult, HealthStatus, ComponentHealth
-from .log_collector import (
-    LogCollector,
-    LogLevel,
-    get_log_collector,
-    get_log_stats,
-    reset_log_collector,
-    search_logs,
-)
-from .metrics import (
-    agent_task_duration,
-    agent_tasks_total,
-    active_agents,
-    device_status,
-    device_tasks_total,
-    system_info,
+from shared.lazy_import import lazy_exports
+
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        ".device_metrics": ("DeviceMetrics", "get_device_metrics"),
+        ".exposition": ("MetricsExposition", "get_metrics_exposition"),
+        ".health": ("HealthChecker", "HealthCheckResult", "HealthStatus", "ComponentHealth"),
+        ".log_collector": (
+            "LogCollector",
+            "LogLevel",
+            "get_log_collector",
+            "get_log_stats",
+            "reset_log_collector",
+            "search_logs",
+        ),
+        ".metrics": (
+            "agent_task_duration",
+            "agent_tasks_total",
+            "active_agents",
+            "device_status",
+            "device_tasks_total",
+            "system_info",
+        ),
+    },
 )
 
 __all__ = [
@@ -29,6 +40,12 @@ __all__ = [
     "device_status",
     "device_tasks_total",
     "system_info",
+    # Device Metrics
+    "DeviceMetrics",
+    "get_device_metrics",
+    # Exposition
+    "MetricsExposition",
+    "get_metrics_exposition",
     # Health
     "HealthChecker",
     "HealthCheckResult",
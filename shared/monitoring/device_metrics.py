@@ -0,0 +1,446 @@
+"""
+📱 DoAi.Me Device Metrics
+기기 메트릭 집계 (노드 / 워크스테이션 / VLAN 단위)
+
+왜 집계인가?
+- serial_number 라벨 메트릭은 기기 수만큼 시계열이 늘어남 (Histogram은 x 버킷 수)
+- Prometheus에는 그룹 단위 집계만 노출 → 스크래핑 크기가 기기 수와 무관
+- 기기별 상세는 메모리 내 컴팩트 테이블에서 JSON으로 온디맨드 조회
+
+사용 예:
+    from shared.monitoring.device_metrics import get_device_metrics
+
+    metrics = get_device_metrics()
+    metrics.update("R58M12ABC01", node_id="PC01", status="idle", battery_level=85)
+    metrics.record_task("R58M12ABC01", "youtube_watch", "success", duration_sec=42.0)
+
+    metrics.get_device("R58M12ABC01")   # 기기 상세 (dict)
+    metrics.summarize("node")           # 노드별 집계 (dict)
+"""
+
+import threading
+import time
+from array import array
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from prometheus_client import REGISTRY, CollectorRegistry, Counter, Histogram
+from prometheus_client.core import GaugeHistogramMetricFamily, GaugeMetricFamily, Metric
+
+# 상태 코드 (테이블에는 1바이트 코드로 저장)
+DEVICE_STATUSES: Tuple[str, ...] = ("unknown", "online", "idle", "busy", "offline", "error")
+_STATUS_CODES = {name: code for code, name in enumerate(DEVICE_STATUSES)}
+
+# 집계 단위 (Prometheus scope 라벨)
+SCOPES: Tuple[str, ...] = ("node", "workstation", "vlan")
+
+# 분포 버킷 (상한, 포함)
+BATTERY_BUCKETS: Tuple[float, ...] = (10, 20, 30, 50, 80, 100)
+TEMPERATURE_BUCKETS: Tuple[float, ...] = (25, 30, 35, 40, 45, 50)
+TASK_DURATION_BUCKETS: Tuple[float, ...] = (1.0, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0)
+
+_UNKNOWN_GROUP = "unknown"
+_NO_BATTERY = -1
+_NO_TEMP = -32768  # 0.1°C 단위 저장
+
+
+def _bucket_index(value: float, bounds: Sequence[float]) -> int:
+    """value가 속하는 버킷 인덱스 (len(bounds) = +Inf)"""
+    for i, bound in enumerate(bounds):
+        if value <= bound:
+            return i
+    return len(bounds)
+
+
+def _cumulative(counts: List[int], bounds: Sequence[float]) -> List[Tuple[str, float]]:
+    """버킷별 개수 -> Prometheus 누적 버킷"""
+    buckets = []
+    total = 0
+    for bound, count in zip(list(bounds) + [float("inf")], counts):
+        total += count
+        buckets.append(("+Inf" if bound == float("inf") else str(float(bound)), total))
+    return buckets
+
+
+class _GroupAggregate:
+    """그룹 하나의 집계값"""
+
+    __slots__ = ("status_counts", "battery_counts", "battery_sum", "temp_counts", "temp_sum")
+
+    def __init__(self):
+        self.status_counts = [0] * len(DEVICE_STATUSES)
+        self.battery_counts = [0] * (len(BATTERY_BUCKETS) + 1)
+        self.battery_sum = 0.0
+        self.temp_counts = [0] * (len(TEMPERATURE_BUCKETS) + 1)
+        self.temp_sum = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        battery_n = sum(self.battery_counts)
+        temp_n = sum(self.temp_counts)
+        return {
+            "total": sum(self.status_counts),
+            "status": {
+                name: count for name, count in zip(DEVICE_STATUSES, self.status_counts) if count
+            },
+            "battery_avg": round(self.battery_sum / battery_n, 1) if battery_n else None,
+            "temperature_avg": round(self.temp_sum / temp_n, 1) if temp_n else None,
+        }
+
+
+class DeviceMetrics:
+    """
+    기기 메트릭 테이블 + Prometheus 집계 Collector
+
+    테이블 구조 (행 = 기기, 열 = array):
+    - status: 상태 코드 (int8)
+    - battery: 배터리 % (int8, -1 = 미수집)
+    - temp: 배터리 온도 0.1°C (int16)
+    - node / workstation / vlan: 그룹 이름 인터닝 인덱스 (uint32)
+    - last_seen: 마지막 갱신 시각 (epoch, double)
+
+    Prometheus 노출 (모두 scope/group 단위):
+    - device_group_count{scope, group, status}
+    - device_group_battery_percent (GaugeHistogram)
+    - device_group_temperature_celsius (GaugeHistogram)
+    - device_group_tasks_total{node_id, task_type, status}
+    - device_group_task_duration_seconds{task_type}
+
+    워크스테이션 / VLAN이 없는 기기는 해당 scope에서 제외 (node scope에는 포함)
+    → 소속 정보가 없는 환경에서 "unknown" 시계열이 영구히 남지 않음
+    """
+
+    def __init__(self, registry: Optional[CollectorRegistry] = REGISTRY):
+        """
+        Args:
+            registry: 등록할 Prometheus 레지스트리 (None이면 등록하지 않음)
+        """
+        self._lock = threading.Lock()
+
+        self._index: Dict[str, int] = {}
+        self._serials: List[Optional[str]] = []
+        self._free: List[int] = []
+
+        self._status = array("b")
+        self._battery = array("b")
+        self._temp = array("h")
+        self._node = array("I")
+        self._workstation = array("I")
+        self._vlan = array("I")
+        self._last_seen = array("d")
+
+        # 그룹 이름 인터닝 (0 = unknown)
+        self._group_names: List[str] = [_UNKNOWN_GROUP]
+        self._group_ids: Dict[str, int] = {_UNKNOWN_GROUP: 0}
+
+        self.tasks_total = Counter(
+            "device_group_tasks_total",
+            "Total tasks executed on devices, aggregated per node",
+            ["node_id", "task_type", "status"],
+            registry=registry,
+        )
+        self.task_duration = Histogram(
+            "device_group_task_duration_seconds",
+            "Task execution duration on devices",
+            ["task_type"],
+            buckets=TASK_DURATION_BUCKETS,
+            registry=registry,
+        )
+
+        if registry is not None:
+            registry.register(self)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    # =========================================
+    # 테이블 갱신
+    # =========================================
+
+    def _intern(self, name: Optional[Any]) -> int:
+        if name is None or name == "":
+            return 0
+        key = str(name)
+        group_id = self._group_ids.get(key)
+        if group_id is None:
+            group_id = len(self._group_names)
+            self._group_names.append(key)
+            self._group_ids[key] = group_id
+        return group_id
+
+    def _allocate(self, serial: str) -> int:
+        if self._free:
+            row = self._free.pop()
+            self._serials[row] = serial
+            self._status[row] = 0
+            self._battery[row] = _NO_BATTERY
+            self._temp[row] = _NO_TEMP
+            self._node[row] = 0
+            self._workstation[row] = 0
+            self._vlan[row] = 0
+        else:
+            row = len(self._serials)
+            self._serials.append(serial)
+            self._status.append(0)
+            self._battery.append(_NO_BATTERY)
+            self._temp.append(_NO_TEMP)
+            self._node.append(0)
+            self._workstation.append(0)
+            self._vlan.append(0)
+            self._last_seen.append(0.0)
+        self._index[serial] = row
+        return row
+
+    def update(
+        self,
+        serial_number: str,
+        *,
+        node_id: Optional[Any] = None,
+        workstation_id: Optional[Any] = None,
+        vlan_id: Optional[Any] = None,
+        status: Optional[str] = None,
+        battery_level: Optional[float] = None,
+        battery_temp: Optional[float] = None,
+    ) -> None:
+        """
+        기기 상태 갱신 (None인 필드는 기존 값 유지)
+
+        Args:
+            serial_number: ADB 시리얼 번호
+            node_id: 노드 (PC) ID
+            workstation_id: 워크스테이션 ID
+            vlan_id: VLAN ID
+            status: 상태 (online, idle, busy, offline, error)
+            battery_level: 배터리 잔량 (%)
+            battery_temp: 배터리 온도 (°C)
+        """
+        with self._lock:
+            row = self._index.get(serial_number)
+            if row is None:
+                row = self._allocate(serial_number)
+
+            if node_id is not None:
+                self._node[row] = self._intern(node_id)
+            if workstation_id is not None:
+                self._workstation[row] = self._intern(workstation_id)
+            if vlan_id is not None:
+                self._vlan[row] = self._intern(vlan_id)
+            if status is not None:
+                self._status[row] = _STATUS_CODES.get(status.lower(), 0)
+            if battery_level is not None:
+                self._battery[row] = max(0, min(100, int(battery_level)))
+            if battery_temp is not None:
+                self._temp[row] = max(-3276, min(3276, int(round(battery_temp * 10))))
+            self._last_seen[row] = time.time()
+
+    def remove(self, serial_number: str) -> bool:
+        """기기 제거"""
+        with self._lock:
+            row = self._index.pop(serial_number, None)
+            if row is None:
+                return False
+            self._serials[row] = None
+            self._free.append(row)
+            return True
+
+    def record_task(
+        self,
+        serial_number: str,
+        task_type: str,
+        status: str,
+        duration_sec: Optional[float] = None,
+    ) -> None:
+        """
+        태스크 실행 결과 기록 (기기가 속한 노드 단위로 집계)
+
+        Args:
+            serial_number: ADB 시리얼 번호
+            task_type: 태스크 유형 (youtube_watch, app_install, etc.)
+            status: 결과 상태 (success, failure)
+            duration_sec: 실행 시간 (초)
+        """
+        with self._lock:
+            row = self._index.get(serial_number)
+            node = self._group_names[self._node[row]] if row is not None else _UNKNOWN_GROUP
+
+        self.tasks_total.labels(node_id=node, task_type=task_type, status=status).inc()
+        if duration_sec is not None:
+            self.task_duration.labels(task_type=task_type).observe(duration_sec)
+
+    # =========================================
+    # 조회 (JSON)
+    # =========================================
+
+    def _row_dict(self, row: int) -> Dict[str, Any]:
+        names = self._group_names
+        battery = self._battery[row]
+        temp = self._temp[row]
+        return {
+            "serial_number": self._serials[row],
+            "node_id": names[self._node[row]],
+            "workstation_id": names[self._workstation[row]],
+            "vlan_id": names[self._vlan[row]],
+            "status": DEVICE_STATUSES[self._status[row]],
+            "battery_level": None if battery == _NO_BATTERY else battery,
+            "battery_temp": None if temp == _NO_TEMP else temp / 10,
+            "last_seen": self._last_seen[row],
+        }
+
+    def get_device(self, serial_number: str) -> Optional[Dict[str, Any]]:
+        """기기 상세"""
+        with self._lock:
+            row = self._index.get(serial_number)
+            return self._row_dict(row) if row is not None else None
+
+    def list_devices(
+        self,
+        node_id: Optional[str] = None,
+        status: Optional[str] = None,
+        limit: int = 100,
+        offset: int = 0,
+    ) -> List[Dict[str, Any]]:
+        """
+        기기 목록 (시리얼 순)
+
+        Args:
+            node_id: 노드 필터
+            status: 상태 필터
+            limit: 최대 결과 수
+            offset: 건너뛸 개수
+        """
+        with self._lock:
+            node_code = self._group_ids.get(node_id) if node_id is not None else None
+            status_code = _STATUS_CODES.get(status) if status is not None else None
+            if (node_id is not None and node_code is None) or (
+                status is not None and status_code is None
+            ):
+                return []
+
+            rows = [
+                row
+                for serial, row in sorted(self._index.items())
+                if (node_code is None or self._node[row] == node_code)
+                and (status_code is None or self._status[row] == status_code)
+            ]
+            return [self._row_dict(row) for row in rows[offset : offset + limit]]
+
+    def _aggregate(self, scopes: Sequence[str]) -> Dict[str, Dict[str, _GroupAggregate]]:
+        """테이블 1회 순회로 scope별 그룹 집계"""
+        columns = {"node": self._node, "workstation": self._workstation, "vlan": self._vlan}
+        result: Dict[str, Dict[int, _GroupAggregate]] = {scope: {} for scope in scopes}
+
+        with self._lock:
+            for row in self._index.values():
+                status = self._status[row]
+                battery = self._battery[row]
+                temp = self._temp[row]
+                battery_idx = (
+                    _bucket_index(battery, BATTERY_BUCKETS) if battery != _NO_BATTERY else None
+                )
+                temp_idx = (
+                    _bucket_index(temp / 10, TEMPERATURE_BUCKETS) if temp != _NO_TEMP else None
+                )
+
+                for scope in scopes:
+                    group_id = columns[scope][row]
+                    agg = result[scope].get(group_id)
+                    if agg is None:
+                        agg = result[scope][group_id] = _GroupAggregate()
+                    agg.status_counts[status] += 1
+                    if battery_idx is not None:
+                        agg.battery_counts[battery_idx] += 1
+                        agg.battery_sum += battery
+                    if temp_idx is not None:
+                        agg.temp_counts[temp_idx] += 1
+                        agg.temp_sum += temp / 10
+
+            names = list(self._group_names)
+
+        return {
+            scope: {names[group_id]: agg for group_id, agg in groups.items()}
+            for scope, groups in result.items()
+        }
+
+    def summarize(self, scope: str = "node") -> Dict[str, Dict[str, Any]]:
+        """
+        그룹별 집계 요약
+
+        Args:
+            scope: node, workstation, vlan
+        """
+        if scope not in SCOPES:
+            raise ValueError(f"Unknown scope: {scope}")
+        groups = self._aggregate([scope])[scope]
+        return {name: agg.to_dict() for name, agg in sorted(groups.items())}
+
+    # =========================================
+    # Prometheus Collector
+    # =========================================
+
+    def describe(self) -> Iterator[Metric]:
+        """등록 시 테이블을 순회하지 않도록 빈 메트릭 패밀리만 반환"""
+        yield GaugeMetricFamily("device_group_count", "", labels=["scope", "group", "status"])
+        yield GaugeHistogramMetricFamily(
+            "device_group_battery_percent", "", labels=["scope", "group"]
+        )
+        yield GaugeHistogramMetricFamily(
+            "device_group_temperature_celsius", "", labels=["scope", "group"]
+        )
+
+    def collect(self) -> Iterator[Metric]:
+        """스크래핑 시 그룹 집계 메트릭 생성"""
+        count = GaugeMetricFamily(
+            "device_group_count",
+            "Number of devices per group and status",
+            labels=["scope", "group", "status"],
+        )
+        battery = GaugeHistogramMetricFamily(
+            "device_group_battery_percent",
+            "Current battery level distribution per group",
+            labels=["scope", "group"],
+        )
+        temperature = GaugeHistogramMetricFamily(
+            "device_group_temperature_celsius",
+            "Current battery temperature distribution per group",
+            labels=["scope", "group"],
+        )
+
+        for scope, groups in self._aggregate(SCOPES).items():
+            for name, agg in groups.items():
+                if scope != "node" and name == _UNKNOWN_GROUP:
+                    continue
+                for status, value in zip(DEVICE_STATUSES, agg.status_counts):
+                    if value:
+                        count.add_metric([scope, name, status], value)
+                if sum(agg.battery_counts):
+                    battery.add_metric(
+                        [scope, name],
+                        _cumulative(agg.battery_counts, BATTERY_BUCKETS),
+                        agg.battery_sum,
+                    )
+                if sum(agg.temp_counts):
+                    temperature.add_metric(
+                        [scope, name],
+                        _cumulative(agg.temp_counts, TEMPERATURE_BUCKETS),
+                        agg.temp_sum,
+                    )
+
+        yield count
+        yield battery
+        yield temperature
+
+
+# ===========================================
+# 싱글톤
+# ===========================================
+
+_device_metrics: Optional[DeviceMetrics] = None
+_device_metrics_lock = threading.Lock()
+
+
+def get_device_metrics() -> DeviceMetrics:
+    """전역 DeviceMetrics (기본 Prometheus 레지스트리에 등록)"""
+    global _device_metrics
+    if _device_metrics is None:
+        with _device_metrics_lock:
+            if _device_metrics is None:
+                _device_metrics = DeviceMetrics()
+    return _device_metrics
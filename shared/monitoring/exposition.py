@@ -0,0 +1,175 @@
+"""
+📤 DoAi.Me Metrics Exposition
+Prometheus /metrics 응답 캐싱 및 사전 렌더링
+
+왜 캐싱하는가?
+- generate_latest()는 레지스트리 전체 시계열을 직렬화 (fleet 규모에 비례)
+- 이벤트 루프에서 직접 호출하면 스크래핑 동안 API 요청이 대기
+- 여러 Prometheus 레플리카가 동시에 스크래핑하면 같은 작업을 반복
+
+동작:
+- 렌더링은 스레드에서 수행 (asyncio.to_thread)
+- 포맷별로 ttl_sec 동안 결과를 재사용, 동시 요청은 한 번의 렌더링을 공유
+- gzip 본문은 렌더링 시 함께 생성
+- PROMETHEUS_MULTIPROC_DIR 설정 시 multiprocess 레지스트리 사용 (uvicorn --workers)
+  (이 경우 프로세스 메모리에만 있는 커스텀 Collector는 워커별 값만 노출)
+
+사용 예:
+    from shared.monitoring.exposition import get_metrics_exposition
+
+    rendered = await get_metrics_exposition().render(openmetrics=False)
+    body = rendered.gzip_body if accepts_gzip else rendered.body
+"""
+
+import asyncio
+import gzip
+import os
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, generate_latest
+from prometheus_client.openmetrics.exposition import (
+    CONTENT_TYPE_LATEST as OPENMETRICS_CONTENT_TYPE,
+)
+from prometheus_client.openmetrics.exposition import generate_latest as generate_openmetrics
+
+DEFAULT_TTL_SEC = 5.0
+
+
+@dataclass(frozen=True)
+class RenderedMetrics:
+    """렌더링된 메트릭 응답"""
+
+    body: bytes
+    gzip_body: bytes
+    content_type: str
+    rendered_at: float
+    render_duration_sec: float
+
+
+def _default_registry() -> CollectorRegistry:
+    """기본 레지스트리 (multiprocess 모드면 워커 집계 레지스트리)"""
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return registry
+    return REGISTRY
+
+
+class MetricsExposition:
+    """
+    /metrics 응답 캐시
+
+    Features:
+    - 텍스트 / OpenMetrics 포맷별 캐시
+    - 스크래핑 간격당 최대 1회 렌더링 (이벤트 루프 밖에서)
+    - 동시 스크래핑 요청은 진행 중인 렌더링 결과를 공유
+    """
+
+    def __init__(
+        self,
+        registry: Optional[CollectorRegistry] = None,
+        ttl_sec: Optional[float] = None,
+        gzip_level: int = 6,
+    ):
+        """
+        Args:
+            registry: 노출할 레지스트리 (None이면 기본/multiprocess 레지스트리)
+            ttl_sec: 캐시 유지 시간 (None이면 METRICS_CACHE_TTL_SEC 또는 5초)
+            gzip_level: gzip 압축 레벨
+        """
+        self.registry = registry if registry is not None else _default_registry()
+        self.ttl_sec = (
+            ttl_sec
+            if ttl_sec is not None
+            else float(os.getenv("METRICS_CACHE_TTL_SEC", DEFAULT_TTL_SEC))
+        )
+        self.gzip_level = gzip_level
+
+        self._cache: Dict[bool, RenderedMetrics] = {}
+        self._locks: Dict[bool, asyncio.Lock] = {True: asyncio.Lock(), False: asyncio.Lock()}
+
+        # 통계
+        self.renders = 0
+        self.cache_hits = 0
+
+    def _render(self, openmetrics: bool) -> RenderedMetrics:
+        """레지스트리 직렬화 + gzip (스레드에서 실행)"""
+        start = time.perf_counter()
+        if openmetrics:
+            body = generate_openmetrics(self.registry)
+            content_type = OPENMETRICS_CONTENT_TYPE
+        else:
+            body = generate_latest(self.registry)
+            content_type = CONTENT_TYPE_LATEST
+
+        return RenderedMetrics(
+            body=body,
+            gzip_body=gzip.compress(body, compresslevel=self.gzip_level),
+            content_type=content_type,
+            rendered_at=time.monotonic(),
+            render_duration_sec=time.perf_counter() - start,
+        )
+
+    def _fresh(self, openmetrics: bool) -> Optional[RenderedMetrics]:
+        cached = self._cache.get(openmetrics)
+        if cached is not None and time.monotonic() - cached.rendered_at < self.ttl_sec:
+            return cached
+        return None
+
+    async def render(self, openmetrics: bool = False) -> RenderedMetrics:
+        """
+        캐시된 메트릭 반환 (만료 시 재렌더링)
+
+        Args:
+            openmetrics: OpenMetrics 포맷 여부 (False면 Prometheus 텍스트 포맷)
+        """
+        cached = self._fresh(openmetrics)
+        if cached is not None:
+            self.cache_hits += 1
+            return cached
+
+        async with self._locks[openmetrics]:
+            # 대기하는 동안 다른 요청이 렌더링을 끝냈으면 그 결과를 공유
+            cached = self._fresh(openmetrics)
+            if cached is not None:
+                self.cache_hits += 1
+                return cached
+
+            rendered = await asyncio.to_thread(self._render, openmetrics)
+            self._cache[openmetrics] = rendered
+            self.renders += 1
+            return rendered
+
+    def invalidate(self) -> None:
+        """캐시 무효화"""
+        self._cache.clear()
+
+    def get_stats(self) -> Dict[str, float]:
+        """캐시 통계"""
+        latest = self._cache.get(False)
+        return {
+            "ttl_sec": self.ttl_sec,
+            "renders": self.renders,
+            "cache_hits": self.cache_hits,
+            "last_render_duration_sec": latest.render_duration_sec if latest else 0.0,
+            "last_body_bytes": len(latest.body) if latest else 0,
+        }
+
+
+# ===========================================
+# 싱글톤
+# ===========================================
+
+_exposition: Optional[MetricsExposition] = None
+
+
+def get_metrics_exposition() -> MetricsExposition:
+    """전역 MetricsExposition"""
+    global _exposition
+    if _exposition is None:
+        _exposition = MetricsExposition()
+    return _exposition
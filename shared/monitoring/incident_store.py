@@ -0,0 +1,336 @@
+"""
+인시던트 저장소
+
+IncidentTracker의 영속 계층 (재시작/배포 후에도 인시던트 이력 유지)
+- SQLiteIncidentStore: 로컬 파일 (기본)
+- SupabaseIncidentStore: Supabase incidents / incident_events 테이블 (선택)
+
+저장소 API는 동기 함수이며 IncidentTracker가 asyncio.to_thread로 호출
+행 형식은 Incident.to_dict() / TimelineEvent.to_dict()와 동일한 dict
+
+Usage:
+    from shared.monitoring.incident_store import SQLiteIncidentStore
+    from shared.monitoring.runbook import IncidentTracker
+
+    tracker = IncidentTracker(store=SQLiteIncidentStore("data/incidents.db"))
+    await tracker.start()   # 저장된 활성/최근 인시던트 로드 + write-behind 시작
+"""
+
+import json
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+INCIDENT_COLUMNS = (
+    "id",
+    "seq",
+    "title",
+    "description",
+    "status",
+    "level",
+    "created_at",
+    "updated_at",
+    "resolved_at",
+    "affected_services",
+    "root_cause",
+    "resolution",
+    "assignee",
+)
+
+EVENT_COLUMNS = ("incident_id", "seq", "timestamp", "event_type", "message", "level", "metadata")
+
+
+class IncidentStore(ABC):
+    """인시던트 저장소 인터페이스"""
+
+    @abstractmethod
+    def save(self, incidents: List[Dict[str, Any]], events: List[Dict[str, Any]]) -> None:
+        """인시던트 upsert + 타임라인 이벤트 추가 (같은 incident_id/seq는 무시)"""
+
+    @abstractmethod
+    def get(self, incident_id: str) -> Optional[Dict[str, Any]]:
+        """인시던트 1건 (timeline 포함)"""
+
+    @abstractmethod
+    def query(
+        self,
+        status: Optional[str] = None,
+        active: Optional[bool] = None,
+        since: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        인시던트 조회 (created_at 내림차순, timeline 포함)
+
+        Args:
+            status: 상태 필터
+            active: True면 resolved 제외, False면 resolved만
+            since: created_at 하한 (ISO 8601)
+            limit: 최대 결과 수
+        """
+
+    @abstractmethod
+    def max_sequence(self) -> int:
+        """저장된 인시던트 ID의 최대 순번 (INC-YYYYMMDD-NNNN의 NNNN)"""
+
+    def close(self) -> None:
+        """저장소 종료"""
+
+
+def _attach_timelines(
+    incidents: List[Dict[str, Any]], events: List[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    by_id: Dict[str, List[Dict[str, Any]]] = {inc["id"]: [] for inc in incidents}
+    for event in events:
+        by_id[event["incident_id"]].append(
+            {
+                "timestamp": event["timestamp"],
+                "event_type": event["event_type"],
+                "message": event["message"],
+                "level": event["level"],
+                "metadata": event["metadata"] or {},
+            }
+        )
+    for inc in incidents:
+        inc["timeline"] = by_id[inc["id"]]
+    return incidents
+
+
+# =========================================
+# SQLite
+# =========================================
+
+
+class SQLiteIncidentStore(IncidentStore):
+    """
+    SQLite 인시던트 저장소
+
+    - WAL 모드, 연결 1개를 잠금으로 직렬화
+    - status / created_at 인덱스
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS incidents (
+            id TEXT PRIMARY KEY,
+            seq INTEGER NOT NULL,
+            title TEXT NOT NULL,
+            description TEXT,
+            status TEXT NOT NULL,
+            level TEXT NOT NULL,
+            created_at TEXT NOT NULL,
+            updated_at TEXT NOT NULL,
+            resolved_at TEXT,
+            affected_services TEXT,
+            root_cause TEXT,
+            resolution TEXT,
+            assignee TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_incidents_status ON incidents(status, created_at);
+        CREATE INDEX IF NOT EXISTS idx_incidents_created_at ON incidents(created_at);
+        CREATE INDEX IF NOT EXISTS idx_incidents_seq ON incidents(seq);
+
+        CREATE TABLE IF NOT EXISTS incident_events (
+            incident_id TEXT NOT NULL,
+            seq INTEGER NOT NULL,
+            timestamp TEXT NOT NULL,
+            event_type TEXT NOT NULL,
+            message TEXT,
+            level TEXT,
+            metadata TEXT,
+            PRIMARY KEY (incident_id, seq)
+        );
+    """
+
+    def __init__(self, path: str = "incidents.db"):
+        """
+        Args:
+            path: DB 파일 경로 (":memory:" 가능)
+        """
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(self.SCHEMA)
+
+    def save(self, incidents: List[Dict[str, Any]], events: List[Dict[str, Any]]) -> None:
+        incident_rows = [
+            tuple(
+                json.dumps(inc.get(col) or []) if col == "affected_services" else inc.get(col)
+                for col in INCIDENT_COLUMNS
+            )
+            for inc in incidents
+        ]
+        event_rows = [
+            tuple(
+                json.dumps(event.get(col) or {}) if col == "metadata" else event.get(col)
+                for col in EVENT_COLUMNS
+            )
+            for event in events
+        ]
+
+        placeholders = ", ".join("?" for _ in INCIDENT_COLUMNS)
+        updates = ", ".join(f"{col} = excluded.{col}" for col in INCIDENT_COLUMNS[1:])
+
+        with self._lock, self._conn:
+            self._conn.executemany(
+                f"INSERT INTO incidents ({', '.join(INCIDENT_COLUMNS)}) VALUES ({placeholders}) "
+                f"ON CONFLICT(id) DO UPDATE SET {updates}",
+                incident_rows,
+            )
+            self._conn.executemany(
+                f"INSERT OR IGNORE INTO incident_events ({', '.join(EVENT_COLUMNS)}) "
+                f"VALUES ({', '.join('?' for _ in EVENT_COLUMNS)})",
+                event_rows,
+            )
+
+    def _load(self, where: str, params: List[Any], limit: Optional[int]) -> List[Dict[str, Any]]:
+        sql = f"SELECT * FROM incidents {where} ORDER BY created_at DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params = params + [limit]
+
+        with self._lock:
+            incidents = [dict(row) for row in self._conn.execute(sql, params)]
+            if not incidents:
+                return []
+
+            ids = [inc["id"] for inc in incidents]
+            events = [
+                dict(row)
+                for row in self._conn.execute(
+                    f"SELECT * FROM incident_events WHERE incident_id IN "
+                    f"({', '.join('?' for _ in ids)}) ORDER BY incident_id, seq",
+                    ids,
+                )
+            ]
+
+        for inc in incidents:
+            inc["affected_services"] = json.loads(inc["affected_services"] or "[]")
+        for event in events:
+            event["metadata"] = json.loads(event["metadata"] or "{}")
+        return _attach_timelines(incidents, events)
+
+    def get(self, incident_id: str) -> Optional[Dict[str, Any]]:
+        rows = self._load("WHERE id = ?", [incident_id], limit=None)
+        return rows[0] if rows else None
+
+    def query(
+        self,
+        status: Optional[str] = None,
+        active: Optional[bool] = None,
+        since: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        clauses, params = [], []
+        if status is not None:
+            clauses.append("status = ?")
+            params.append(status)
+        if active is True:
+            clauses.append("status != 'resolved'")
+        elif active is False:
+            clauses.append("status = 'resolved'")
+        if since is not None:
+            clauses.append("created_at >= ?")
+            params.append(since)
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        return self._load(where, params, limit)
+
+    def max_sequence(self) -> int:
+        with self._lock:
+            row = self._conn.execute("SELECT MAX(seq) FROM incidents").fetchone()
+        return row[0] or 0
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+# =========================================
+# Supabase
+# =========================================
+
+
+class SupabaseIncidentStore(IncidentStore):
+    """
+    Supabase 인시던트 저장소
+
+    supabase/migrations/20260121_incidents.sql 의 테이블 사용
+    """
+
+    def __init__(
+        self,
+        supabase_client,
+        incidents_table: str = "incidents",
+        events_table: str = "incident_events",
+    ):
+        self._supabase = supabase_client
+        self.incidents_table = incidents_table
+        self.events_table = events_table
+
+    def save(self, incidents: List[Dict[str, Any]], events: List[Dict[str, Any]]) -> None:
+        if incidents:
+            rows = [{col: inc.get(col) for col in INCIDENT_COLUMNS} for inc in incidents]
+            self._supabase.table(self.incidents_table).upsert(rows, on_conflict="id").execute()
+        if events:
+            rows = [{col: event.get(col) for col in EVENT_COLUMNS} for event in events]
+            self._supabase.table(self.events_table).upsert(
+                rows, on_conflict="incident_id,seq", ignore_duplicates=True
+            ).execute()
+
+    def _with_timelines(self, incidents: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        if not incidents:
+            return []
+        result = (
+            self._supabase.table(self.events_table)
+            .select("*")
+            .in_("incident_id", [inc["id"] for inc in incidents])
+            .order("seq")
+            .execute()
+        )
+        return _attach_timelines(incidents, result.data or [])
+
+    def get(self, incident_id: str) -> Optional[Dict[str, Any]]:
+        result = (
+            self._supabase.table(self.incidents_table).select("*").eq("id", incident_id).execute()
+        )
+        rows = self._with_timelines(result.data or [])
+        return rows[0] if rows else None
+
+    def query(
+        self,
+        status: Optional[str] = None,
+        active: Optional[bool] = None,
+        since: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        q = self._supabase.table(self.incidents_table).select("*")
+        if status is not None:
+            q = q.eq("status", status)
+        if active is True:
+            q = q.neq("status", "resolved")
+        elif active is False:
+            q = q.eq("status", "resolved")
+        if since is not None:
+            q = q.gte("created_at", since)
+        q = q.order("created_at", desc=True)
+        if limit is not None:
+            q = q.limit(limit)
+        return self._with_timelines(q.execute().data or [])
+
+    def max_sequence(self) -> int:
+        result = (
+            self._supabase.table(self.incidents_table)
+            .select("seq")
+            .order("seq", desc=True)
+            .limit(1)
+            .execute()
+        )
+        return result.data[0]["seq"] if result.data else 0
@@ -58,6 +58,10 @@ Labels:
 
 # ===========================================
 # Device 메트릭 (DoAi.Me 전용)
+#
+# serial_number 라벨 메트릭은 기기 수에 비례해 시계열이 늘어나므로
+# 호환용으로만 유지. 신규 코드는 shared.monitoring.device_metrics의
+# 노드/워크스테이션/VLAN 집계 메트릭을 사용
 # ===========================================
 
 device_status = Gauge(
@@ -157,3 +161,46 @@ Labels:
     queue_name: 큐 이름
     status: 처리 결과 (success, failure)
 """
+
+# ===========================================
+# 알림 전송 메트릭
+# ===========================================
+
+alert_notifications_total = Counter(
+    "alert_notifications_total",
+    "Alert notifications processed by the alert pipeline",
+    ["channel", "level", "outcome"],
+)
+"""
+알림 파이프라인 처리 건수
+
+Labels:
+    channel: 전송 채널 (slack, discord) / 채널 이전 단계는 pipeline
+    level: 알림 레벨 (info, warning, error, critical)
+    outcome: 결과 (sent, failed, deduplicated, grouped, dropped)
+"""
+
+alert_delivery_seconds = Histogram(
+    "alert_delivery_seconds",
+    "Time from alert submission to webhook delivery",
+    ["channel"],
+    buckets=[0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0],
+)
+"""
+알림 접수부터 웹훅 전송 완료까지 걸린 시간 (큐 대기 포함)
+
+Labels:
+    channel: 전송 채널
+"""
+
+alert_queue_depth = Gauge(
+    "alert_queue_depth",
+    "Alerts waiting for delivery",
+    ["channel"],
+)
+"""
+채널별 전송 대기 중인 알림 수
+
+Labels:
+    channel: 전송 채널
+"""
@@ -17,9 +17,10 @@ Usage:
 """
 
 import ipaddress
+from collections import Counter
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Set
 
 try:
     from loguru import logger
@@ -210,6 +211,10 @@ class NetworkHealthChecker:
     네트워크 헬스 체커
 
     VLAN, AP, DHCP 상태를 모니터링하고 알림 생성
+
+    상태별 카운터와 VLAN/AP별 디바이스 집합을 update_* 호출 시점에
+    증분 갱신하므로 요약 조회는 전체 순회 없이 계산된다.
+    요약/스냅샷은 변경 시마다 증가하는 버전 번호로 캐시된다.
     """
 
     def __init__(
@@ -235,6 +240,22 @@ class NetworkHealthChecker:
         # 콜백
         self._on_alert_callbacks: List[Callable] = []
 
+        # 증분 집계 (update_* 에서 갱신)
+        self._vlan_status_counts: Counter = Counter()
+        self._ap_status_counts: Counter = Counter()
+        self._dhcp_status_counts: Counter = Counter()
+        self._device_totals = {"total": 0, "online": 0, "offline": 0}
+        self._vlan_devices: Dict[int, Set[str]] = {}
+        self._ap_devices: Dict[str, Set[str]] = {}
+        self._connected_devices = 0
+
+        # 변경 버전 (요약/스냅샷 캐시 무효화)
+        self._version = 0
+        self._summary_cache: Optional[NetworkHealthSummary] = None
+        self._summary_version = -1
+        self._snapshot_cache: Optional[NetworkHealthSnapshot] = None
+        self._snapshot_version = -1
+
         # 초기화
         self._initialize_statuses()
 
@@ -262,6 +283,33 @@ class NetworkHealthChecker:
                 max_clients=config.max_clients,
             )
 
+        for status in self._vlan_statuses.values():
+            self._count_vlan(status, 1)
+        for status in self._ap_statuses.values():
+            self._ap_status_counts[status.status] += 1
+        for status in self._dhcp_statuses.values():
+            self._dhcp_status_counts[status.status] += 1
+
+    # =========================================
+    # 증분 집계
+    # =========================================
+
+    @property
+    def version(self) -> int:
+        """상태 변경 버전 (변경 시마다 증가)"""
+        return self._version
+
+    def _touch(self) -> None:
+        """상태 변경 기록 (캐시 무효화)"""
+        self._version += 1
+
+    def _count_vlan(self, status: VLANStatus, sign: int) -> None:
+        """VLAN 상태/디바이스 수를 집계에 반영 (sign: +1 추가, -1 제거)"""
+        self._vlan_status_counts[status.status] += sign
+        self._device_totals["total"] += sign * status.total_devices
+        self._device_totals["online"] += sign * status.online_devices
+        self._device_totals["offline"] += sign * status.offline_devices
+
     # =========================================
     # VLAN 관리
     # =========================================
@@ -289,6 +337,8 @@ class NetworkHealthChecker:
         if not status:
             return None
 
+        self._count_vlan(status, -1)
+
         status.total_devices = total
         status.online_devices = online
         status.offline_devices = total - online
@@ -304,22 +354,38 @@ class NetworkHealthChecker:
         else:
             status.status = NetworkStatus.HEALTHY
 
+        self._count_vlan(status, 1)
+        self._touch()
         return status
 
     def get_vlan_device_distribution(
         self,
-        devices: List[DeviceNetworkInfo],
+        devices: Optional[List[DeviceNetworkInfo]] = None,
     ) -> List[VLANDeviceDistribution]:
-        """VLAN별 디바이스 분포 계산"""
-        distribution: Dict[int, List[str]] = {}
+        """
+        VLAN별 디바이스 분포 계산
+
+        Args:
+            devices: 대상 디바이스 목록 (None이면 등록된 디바이스의 VLAN 인덱스 사용)
+        """
+        if devices is None:
+            distribution = {
+                vlan_id: list(device_ids)
+                for vlan_id, device_ids in self._vlan_devices.items()
+                if device_ids
+            }
+            total_devices = len(self._device_network_info)
+        else:
+            distribution: Dict[int, List[str]] = {}
+
+            for device in devices:
+                if device.vlan_id:
+                    if device.vlan_id not in distribution:
+                        distribution[device.vlan_id] = []
+                    distribution[device.vlan_id].append(device.device_id)
 
-        for device in devices:
-            if device.vlan_id:
-                if device.vlan_id not in distribution:
-                    distribution[device.vlan_id] = []
-                distribution[device.vlan_id].append(device.device_id)
+            total_devices = len(devices)
 
-        total_devices = len(devices)
         result = []
 
         for vlan_id, device_ids in distribution.items():
@@ -365,6 +431,8 @@ class NetworkHealthChecker:
         if not status:
             return None
 
+        self._ap_status_counts[status.status] -= 1
+
         status.connected_clients = connected_clients
         status.calculate_usage()
 
@@ -400,13 +468,15 @@ class NetworkHealthChecker:
         else:
             status.status = APStatusValue.ONLINE
 
+        self._ap_status_counts[status.status] += 1
+        self._touch()
         return status
 
     def get_ap_client_distribution(self) -> List[APClientInfo]:
         """AP별 클라이언트 분포"""
         result = []
         for ap_id, status in self._ap_statuses.items():
-            clients = [d.device_id for d in self._device_network_info.values() if d.ap_id == ap_id]
+            clients = list(self._ap_devices.get(ap_id, ()))
             result.append(
                 APClientInfo(
                     ap_id=ap_id,
@@ -446,6 +516,10 @@ class NetworkHealthChecker:
         status.calculate_status()
         status.last_updated = datetime.now(timezone.utc)
 
+        self._dhcp_status_counts[old_status] -= 1
+        self._dhcp_status_counts[status.status] += 1
+        self._touch()
+
         # 상태 변경 시 알림
         if status.status != old_status:
             if status.status == DHCPStatus.CRITICAL:
@@ -492,11 +566,11 @@ class NetworkHealthChecker:
         try:
             network = ipaddress.ip_network(config.subnet, strict=False)
             start = ipaddress.ip_address(config.dhcp_pool_start)
-            used_ips = {
-                ipaddress.ip_address(d.ip_address)
-                for d in self._device_network_info.values()
-                if d.ip_address and d.vlan_id == vlan_id
-            }
+            used_ips = set()
+            for device_id in self._vlan_devices.get(vlan_id, ()):
+                device = self._device_network_info[device_id]
+                if device.ip_address:
+                    used_ips.add(ipaddress.ip_address(device.ip_address))
 
             for ip in network.hosts():
                 if ip >= start and ip not in used_ips:
@@ -519,6 +593,10 @@ class NetworkHealthChecker:
         ap_id: Optional[str] = None,
     ) -> DeviceNetworkInfo:
         """디바이스 네트워크 정보 등록"""
+        previous = self._device_network_info.get(device_id)
+        if previous:
+            self._unindex_device(previous)
+
         info = DeviceNetworkInfo(
             device_id=device_id,
             ip_address=ip_address,
@@ -529,8 +607,28 @@ class NetworkHealthChecker:
             last_seen=datetime.now(timezone.utc),
         )
         self._device_network_info[device_id] = info
+        self._index_device(info)
+        self._touch()
         return info
 
+    def _index_device(self, info: DeviceNetworkInfo) -> None:
+        """VLAN/AP 디바이스 인덱스에 추가"""
+        if info.vlan_id:
+            self._vlan_devices.setdefault(info.vlan_id, set()).add(info.device_id)
+        if info.ap_id:
+            self._ap_devices.setdefault(info.ap_id, set()).add(info.device_id)
+        if info.is_connected:
+            self._connected_devices += 1
+
+    def _unindex_device(self, info: DeviceNetworkInfo) -> None:
+        """VLAN/AP 디바이스 인덱스에서 제거"""
+        if info.vlan_id:
+            self._vlan_devices.get(info.vlan_id, set()).discard(info.device_id)
+        if info.ap_id:
+            self._ap_devices.get(info.ap_id, set()).discard(info.device_id)
+        if info.is_connected:
+            self._connected_devices -= 1
+
     def update_device_connection(
         self,
         device_id: str,
@@ -539,11 +637,18 @@ class NetworkHealthChecker:
         """디바이스 연결 상태 업데이트"""
         info = self._device_network_info.get(device_id)
         if info:
+            if info.is_connected != is_connected:
+                self._connected_devices += 1 if is_connected else -1
+                self._touch()
             info.is_connected = is_connected
             if is_connected:
                 info.last_seen = datetime.now(timezone.utc)
         return info
 
+    def get_connected_device_count(self) -> int:
+        """연결된 디바이스 수"""
+        return self._connected_devices
+
     def get_device_network_info(self, device_id: str) -> Optional[DeviceNetworkInfo]:
         """디바이스 네트워크 정보 조회"""
         return self._device_network_info.get(device_id)
@@ -557,57 +662,65 @@ class NetworkHealthChecker:
     # =========================================
 
     async def get_health_summary(self) -> NetworkHealthSummary:
-        """네트워크 헬스 요약 조회"""
-        summary = NetworkHealthSummary()
-
-        # VLAN 요약
-        summary.total_vlans = len(self._vlan_statuses)
-        for status in self._vlan_statuses.values():
-            if status.status == NetworkStatus.HEALTHY:
-                summary.healthy_vlans += 1
-            elif status.status == NetworkStatus.WARNING:
-                summary.warning_vlans += 1
-            elif status.status in (NetworkStatus.CRITICAL, NetworkStatus.DOWN):
-                summary.critical_vlans += 1
-
-            summary.total_devices += status.total_devices
-            summary.online_devices += status.online_devices
-            summary.offline_devices += status.offline_devices
-
-        # AP 요약
-        summary.total_aps = len(self._ap_statuses)
-        for status in self._ap_statuses.values():
-            if status.status == APStatusValue.ONLINE:
-                summary.online_aps += 1
-            elif status.status == APStatusValue.OFFLINE:
-                summary.offline_aps += 1
-            elif status.status == APStatusValue.OVERLOADED:
-                summary.overloaded_aps += 1
-
-        # DHCP 요약
-        summary.total_dhcp_pools = len(self._dhcp_statuses)
-        for status in self._dhcp_statuses.values():
-            if status.status == DHCPStatus.NORMAL:
-                summary.dhcp_normal += 1
-            elif status.status == DHCPStatus.WARNING:
-                summary.dhcp_warning += 1
-            elif status.status in (DHCPStatus.CRITICAL, DHCPStatus.EXHAUSTED):
-                summary.dhcp_critical += 1
-
-        # 세부 상태
-        summary.vlan_statuses = list(self._vlan_statuses.values())
-        summary.ap_statuses = list(self._ap_statuses.values())
-        summary.dhcp_statuses = list(self._dhcp_statuses.values())
+        """
+        네트워크 헬스 요약 조회
+
+        증분 카운터로 계산하며, 상태가 변경되지 않았으면 캐시된 요약을 반환
+        """
+        if self._summary_cache is not None and self._summary_version == self._version:
+            return self._summary_cache
+
+        vlan_counts = self._vlan_status_counts
+        ap_counts = self._ap_status_counts
+        dhcp_counts = self._dhcp_status_counts
+
+        summary = NetworkHealthSummary(
+            # VLAN 요약
+            total_vlans=len(self._vlan_statuses),
+            healthy_vlans=vlan_counts[NetworkStatus.HEALTHY],
+            warning_vlans=vlan_counts[NetworkStatus.WARNING],
+            critical_vlans=vlan_counts[NetworkStatus.CRITICAL] + vlan_counts[NetworkStatus.DOWN],
+            total_devices=self._device_totals["total"],
+            online_devices=self._device_totals["online"],
+            offline_devices=self._device_totals["offline"],
+            # AP 요약
+            total_aps=len(self._ap_statuses),
+            online_aps=ap_counts[APStatusValue.ONLINE],
+            offline_aps=ap_counts[APStatusValue.OFFLINE],
+            overloaded_aps=ap_counts[APStatusValue.OVERLOADED],
+            # DHCP 요약
+            total_dhcp_pools=len(self._dhcp_statuses),
+            dhcp_normal=dhcp_counts[DHCPStatus.NORMAL],
+            dhcp_warning=dhcp_counts[DHCPStatus.WARNING],
+            dhcp_critical=dhcp_counts[DHCPStatus.CRITICAL] + dhcp_counts[DHCPStatus.EXHAUSTED],
+            # 세부 상태
+            vlan_statuses=list(self._vlan_statuses.values()),
+            ap_statuses=list(self._ap_statuses.values()),
+            dhcp_statuses=list(self._dhcp_statuses.values()),
+        )
 
-        # 이슈 수집
-        summary.issues = self._collect_issues()
+        # 이슈 수집 (정상 상태만 있으면 순회 생략)
+        if self._has_issues():
+            summary.issues = self._collect_issues()
 
         # 전체 상태 계산
         summary.calculate_overall_status()
         summary.last_updated = datetime.now(timezone.utc)
 
+        self._summary_cache = summary
+        self._summary_version = self._version
         return summary
 
+    def _has_issues(self) -> bool:
+        """이슈 대상 상태가 하나라도 있는지 (카운터 기준)"""
+        return bool(
+            self._dhcp_status_counts[DHCPStatus.CRITICAL]
+            or self._dhcp_status_counts[DHCPStatus.EXHAUSTED]
+            or self._ap_status_counts[APStatusValue.OFFLINE]
+            or self._ap_status_counts[APStatusValue.OVERLOADED]
+            or self._vlan_status_counts[NetworkStatus.CRITICAL]
+        )
+
     def _collect_issues(self) -> List[str]:
         """이슈 수집"""
         issues = []
@@ -640,10 +753,13 @@ class NetworkHealthChecker:
         return issues
 
     async def create_snapshot(self) -> NetworkHealthSnapshot:
-        """헬스 스냅샷 생성"""
+        """헬스 스냅샷 생성 (상태가 변경되지 않았으면 캐시된 스냅샷 반환)"""
+        if self._snapshot_cache is not None and self._snapshot_version == self._version:
+            return self._snapshot_cache
+
         summary = await self.get_health_summary()
 
-        return NetworkHealthSnapshot(
+        snapshot = NetworkHealthSnapshot(
             overall_status=summary.overall_status,
             total_devices=summary.total_devices,
             online_devices=summary.online_devices,
@@ -678,6 +794,10 @@ class NetworkHealthChecker:
             issues=summary.issues,
         )
 
+        self._snapshot_cache = snapshot
+        self._snapshot_version = self._version
+        return snapshot
+
     # =========================================
     # 알림
     # =========================================
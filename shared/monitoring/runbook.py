@@ -3,7 +3,7 @@
 
 PR #5: 장애 대응 런북 자동화
 - L1 Soft Reset 자동 실행 조건 정의
-- Slack/Discord 알림 통합
+- Slack/Discord 알림 통합 (중복 제거 / 그룹핑 / 채널별 전송률 제한)
 - 인시던트 타임라인 자동 생성
 
 Usage:
@@ -20,6 +20,10 @@ Usage:
         discord_webhook="https://discord.com/api/webhooks/...",
     )
 
+    # 알림 파이프라인 시작 (중복 제거 + 그룹핑 + 전송률 제한)
+    await alert_manager.start()
+    alert_manager.submit("Node down: PC01", "Heartbeat timeout", AlertLevel.ERROR)
+
     # 런북 실행기
     executor = RunbookExecutor(alert_manager=alert_manager)
 
@@ -28,12 +32,19 @@ Usage:
 """
 
 import asyncio
+import hashlib
+import heapq
+import os
+import re
+import time
+from collections import defaultdict
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
 from enum import Enum
-from typing import Any, Awaitable, Callable, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, List, Optional, Set
 
-import aiohttp
+from .incident_store import IncidentStore, SQLiteIncidentStore
+from .metrics import alert_delivery_seconds, alert_notifications_total, alert_queue_depth
 
 try:
     from loguru import logger
@@ -42,6 +53,11 @@ except ImportError:
 
     logger = logging.getLogger(__name__)
 
+if TYPE_CHECKING:
+    import aiohttp
+
+    from .network import NetworkHealthChecker
+
 
 # =========================================
 # Enums
@@ -101,6 +117,14 @@ class AlertConfig:
     slack_channel: Optional[str] = None
     timeout_seconds: int = 10
 
+    # 알림 파이프라인 (start() 이후 submit()/notify()에 적용)
+    dedup_window_seconds: float = 300.0  # 같은 fingerprint 재전송 억제 시간
+    group_window_seconds: float = 10.0  # 유사 알림을 묶는 시간 (CRITICAL은 즉시)
+    group_max_items: int = 20  # 다이제스트 메시지에 나열할 최대 알림 수
+    rate_per_minute: float = 20.0  # 채널별 전송률 (token bucket)
+    burst: int = 5  # 채널별 최대 연속 전송 수
+    max_queue: int = 1000  # 채널별 대기열 최대 크기 (초과 시 낮은 우선순위부터 폐기)
+
 
 @dataclass
 class TimelineEvent:
@@ -121,6 +145,16 @@ class TimelineEvent:
             "metadata": self.metadata,
         }
 
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TimelineEvent":
+        return cls(
+            timestamp=datetime.fromisoformat(data["timestamp"]),
+            event_type=data["event_type"],
+            message=data["message"],
+            level=AlertLevel(data.get("level") or AlertLevel.INFO.value),
+            metadata=data.get("metadata") or {},
+        )
+
 
 @dataclass
 class Incident:
@@ -203,6 +237,29 @@ class Incident:
             "assignee": self.assignee,
         }
 
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Incident":
+        """to_dict() 또는 저장소 행으로부터 복원"""
+
+        def _dt(value: Optional[str]) -> Optional[datetime]:
+            return datetime.fromisoformat(value) if value else None
+
+        return cls(
+            id=data["id"],
+            title=data["title"],
+            description=data.get("description") or "",
+            status=IncidentStatus(data["status"]),
+            level=RecoveryLevel(data["level"]),
+            created_at=_dt(data["created_at"]),
+            updated_at=_dt(data["updated_at"]),
+            resolved_at=_dt(data.get("resolved_at")),
+            timeline=[TimelineEvent.from_dict(e) for e in data.get("timeline") or []],
+            affected_services=list(data.get("affected_services") or []),
+            root_cause=data.get("root_cause"),
+            resolution=data.get("resolution"),
+            assignee=data.get("assignee"),
+        )
+
 
 @dataclass
 class RunbookAction:
@@ -246,11 +303,85 @@ class L1TriggerCondition:
     cooldown_seconds: int = 300  # 5분 쿨다운
     max_attempts: int = 3  # 최대 시도 횟수
     enabled: bool = True
+    timeout_seconds: float = 5.0  # check_fn 최대 실행 시간
 
     # 상태 추적
     last_triggered_at: Optional[datetime] = None
     trigger_count: int = 0
 
+    # 마지막 평가 결과 (타임아웃/오류 시 last_result는 유지, last_error에 기록)
+    last_result: Optional[bool] = None
+    last_checked_at: Optional[datetime] = None
+    last_error: Optional[str] = None
+    last_duration_ms: Optional[int] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "description": self.description,
+            "enabled": self.enabled,
+            "last_result": self.last_result,
+            "last_checked_at": self.last_checked_at.isoformat() if self.last_checked_at else None,
+            "last_error": self.last_error,
+            "last_duration_ms": self.last_duration_ms,
+            "last_triggered_at": (
+                self.last_triggered_at.isoformat() if self.last_triggered_at else None
+            ),
+            "trigger_count": self.trigger_count,
+        }
+
+
+# 알림 우선순위 (작을수록 먼저 전송)
+ALERT_PRIORITY = {
+    AlertLevel.CRITICAL: 0,
+    AlertLevel.ERROR: 1,
+    AlertLevel.WARNING: 2,
+    AlertLevel.INFO: 3,
+}
+
+
+@dataclass(order=True)
+class QueuedAlert:
+    """전송 대기 중인 알림 (우선순위 큐 항목)"""
+
+    priority: int
+    seq: int
+    title: str = field(compare=False)
+    message: str = field(compare=False)
+    level: AlertLevel = field(compare=False)
+    fields: Dict[str, str] = field(default_factory=dict, compare=False)
+    submitted_at: float = field(default_factory=time.monotonic, compare=False)
+
+
+@dataclass
+class TokenBucket:
+    """채널별 전송률 제한"""
+
+    rate_per_sec: float
+    capacity: float
+    tokens: float = -1.0
+    updated_at: float = field(default_factory=time.monotonic)
+
+    def __post_init__(self):
+        if self.tokens < 0:
+            self.tokens = self.capacity
+
+    def acquire(self, now: Optional[float] = None) -> float:
+        """
+        토큰 1개 획득 시도
+
+        Returns:
+            0이면 획득 성공, 아니면 다음 토큰까지 대기 시간 (초)
+        """
+        now = time.monotonic() if now is None else now
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate_per_sec)
+        self.updated_at = now
+
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate_per_sec
+
 
 # =========================================
 # AlertManager
@@ -262,14 +393,38 @@ class AlertManager:
     알림 매니저
 
     Slack/Discord 웹훅으로 알림 전송
+
+    send_*()는 즉시 전송. start() 이후 submit()/notify()는 파이프라인을 거침:
+    fingerprint 중복 제거 -> 유사 알림 그룹핑(다이제스트) -> 채널별 우선순위 큐
+    -> token bucket 전송률 제한 (CRITICAL 우선)
     """
 
+    CHANNELS = ("slack", "discord")
+
     def __init__(self, config: Optional[AlertConfig] = None):
         self.config = config or AlertConfig()
-        self._session: Optional[aiohttp.ClientSession] = None
+        self._session: Optional["aiohttp.ClientSession"] = None
+
+        # 파이프라인 상태
+        self._running = False
+        self._tasks: List[asyncio.Task] = []
+        self._seq = 0
+        self._recent: Dict[str, float] = {}  # fingerprint -> 마지막 접수 시각
+        self._groups: Dict[str, List[QueuedAlert]] = {}
+        self._group_started: Dict[str, float] = {}
+        self._queues: Dict[str, List[QueuedAlert]] = {ch: [] for ch in self.CHANNELS}
+        self._wakeup: Dict[str, asyncio.Event] = {ch: asyncio.Event() for ch in self.CHANNELS}
+        self._buckets: Dict[str, TokenBucket] = {
+            ch: TokenBucket(self.config.rate_per_minute / 60.0, float(self.config.burst))
+            for ch in self.CHANNELS
+        }
+        self._stats: Dict[str, int] = defaultdict(int)
 
-    async def _get_session(self) -> aiohttp.ClientSession:
+    async def _get_session(self) -> "aiohttp.ClientSession":
         if self._session is None or self._session.closed:
+            # aiohttp는 첫 전송 시 import (모듈 import 시간 단축)
+            import aiohttp
+
             self._session = aiohttp.ClientSession(
                 timeout=aiohttp.ClientTimeout(total=self.config.timeout_seconds)
             )
@@ -420,6 +575,248 @@ class AlertManager:
 
         return results
 
+    # =========================================
+    # 알림 파이프라인
+    # =========================================
+
+    @property
+    def is_running(self) -> bool:
+        return self._running
+
+    def _enabled_channels(self) -> List[str]:
+        """활성화 + 웹훅 설정된 채널"""
+        channels = []
+        if self.config.enable_slack and self.config.slack_webhook:
+            channels.append("slack")
+        if self.config.enable_discord and self.config.discord_webhook:
+            channels.append("discord")
+        return channels
+
+    @staticmethod
+    def _fingerprint(title: str, message: str, level: AlertLevel) -> str:
+        return hashlib.sha1(f"{level.value}|{title}|{message}".encode()).hexdigest()
+
+    @staticmethod
+    def _group_key(title: str, level: AlertLevel) -> str:
+        """숫자만 다른 제목은 같은 그룹 (예: Node down: PC01 / PC02)"""
+        return f"{level.value}|{re.sub(r'[0-9]+', '#', title)}"
+
+    def submit(
+        self,
+        title: str,
+        message: str,
+        level: AlertLevel = AlertLevel.INFO,
+        fields: Optional[Dict[str, str]] = None,
+        fingerprint: Optional[str] = None,
+        group_key: Optional[str] = None,
+    ) -> bool:
+        """
+        파이프라인에 알림 접수 (논블로킹)
+
+        Args:
+            fingerprint: 중복 판정 키 (기본: level + title + message)
+            group_key: 그룹핑 키 (기본: level + 숫자를 제거한 title)
+
+        Returns:
+            접수 여부 (dedup_window 내 중복이면 False)
+        """
+        now = time.monotonic()
+        fingerprint = fingerprint or self._fingerprint(title, message, level)
+
+        last = self._recent.get(fingerprint)
+        if last is not None and now - last < self.config.dedup_window_seconds:
+            self._record("pipeline", level, "deduplicated")
+            return False
+        self._recent[fingerprint] = now
+        if len(self._recent) > 10000:
+            self._prune_recent(now)
+
+        self._seq += 1
+        alert = QueuedAlert(
+            priority=ALERT_PRIORITY.get(level, 3),
+            seq=self._seq,
+            title=title,
+            message=message,
+            level=level,
+            fields=dict(fields or {}),
+            submitted_at=now,
+        )
+
+        if level == AlertLevel.CRITICAL or self.config.group_window_seconds <= 0:
+            self._enqueue(alert)
+        else:
+            key = group_key or self._group_key(title, level)
+            self._groups.setdefault(key, []).append(alert)
+            self._group_started.setdefault(key, now)
+
+        return True
+
+    async def notify(
+        self,
+        title: str,
+        message: str,
+        level: AlertLevel = AlertLevel.INFO,
+        fields: Optional[Dict[str, str]] = None,
+        fingerprint: Optional[str] = None,
+    ) -> Dict[str, bool]:
+        """파이프라인 실행 중이면 submit(), 아니면 즉시 send_alert()"""
+        if not self._running:
+            return await self.send_alert(title, message, level, fields)
+
+        accepted = self.submit(title, message, level, fields, fingerprint=fingerprint)
+        channels = self._enabled_channels()
+        return {ch: accepted and ch in channels for ch in self.CHANNELS}
+
+    def _prune_recent(self, now: float) -> None:
+        window = self.config.dedup_window_seconds
+        self._recent = {fp: ts for fp, ts in self._recent.items() if now - ts < window}
+
+    def _record(self, channel: str, level: AlertLevel, outcome: str, count: int = 1) -> None:
+        self._stats[outcome] += count
+        alert_notifications_total.labels(channel=channel, level=level.value, outcome=outcome).inc(
+            count
+        )
+
+    def _flush_groups(self, force: bool = False) -> int:
+        """그룹 창이 지난 알림을 큐로 이동 (2건 이상이면 다이제스트)"""
+        now = time.monotonic()
+        flushed = 0
+
+        for key in list(self._groups):
+            if not force and now - self._group_started[key] < self.config.group_window_seconds:
+                continue
+
+            alerts = self._groups.pop(key)
+            del self._group_started[key]
+            if len(alerts) == 1:
+                self._enqueue(alerts[0])
+            else:
+                self._record("pipeline", alerts[0].level, "grouped", len(alerts) - 1)
+                self._enqueue(self._build_digest(alerts))
+            flushed += 1
+
+        return flushed
+
+    def _build_digest(self, alerts: List[QueuedAlert]) -> QueuedAlert:
+        """유사 알림 다이제스트"""
+        first = min(alerts)
+        limit = self.config.group_max_items
+        lines = [f"• {a.title}: {a.message}" for a in alerts[:limit]]
+        if len(alerts) > limit:
+            lines.append(f"… and {len(alerts) - limit} more")
+
+        return QueuedAlert(
+            priority=first.priority,
+            seq=first.seq,
+            title=f"{alerts[0].title} (+{len(alerts) - 1} similar)",
+            message="\n".join(lines),
+            level=first.level,
+            fields={**alerts[0].fields, "Grouped": str(len(alerts))},
+            submitted_at=min(a.submitted_at for a in alerts),
+        )
+
+    def _enqueue(self, alert: QueuedAlert) -> None:
+        for channel in self._enabled_channels():
+            queue = self._queues[channel]
+            heapq.heappush(queue, alert)
+
+            if len(queue) > self.config.max_queue:
+                # 가장 낮은 우선순위(가장 최근) 알림 폐기
+                dropped = max(queue)
+                queue.remove(dropped)
+                heapq.heapify(queue)
+                self._record(channel, dropped.level, "dropped")
+
+            alert_queue_depth.labels(channel=channel).set(len(queue))
+            self._wakeup[channel].set()
+
+    async def start(self):
+        """파이프라인 시작 (그룹 flush 루프 + 채널별 전송 워커)"""
+        if self._running:
+            return
+
+        self._running = True
+        self._tasks = [asyncio.create_task(self._group_loop())]
+        for channel in self._enabled_channels():
+            self._tasks.append(asyncio.create_task(self._channel_worker(channel)))
+
+        logger.info(f"AlertManager pipeline started (channels={self._enabled_channels()})")
+
+    async def stop(self, timeout: float = 10.0):
+        """
+        파이프라인 중지
+
+        대기 중인 그룹을 모두 큐로 옮기고 timeout 동안 전송을 마무리
+        """
+        if not self._running:
+            return
+
+        self._running = False
+        self._flush_groups(force=True)
+        for event in self._wakeup.values():
+            event.set()
+
+        done, pending = await asyncio.wait(self._tasks, timeout=timeout)
+        for task in pending:
+            task.cancel()
+        self._tasks = []
+
+        if pending:
+            logger.warning(f"AlertManager pipeline stopped with {len(pending)} workers cancelled")
+        else:
+            logger.info("AlertManager pipeline stopped")
+
+    async def _group_loop(self):
+        """그룹 창 만료 확인 루프"""
+        interval = max(0.05, min(1.0, self.config.group_window_seconds / 2))
+        while self._running:
+            await asyncio.sleep(interval)
+            self._flush_groups()
+
+    async def _channel_worker(self, channel: str):
+        """채널별 전송 워커 (우선순위 순, token bucket 적용)"""
+        queue = self._queues[channel]
+        bucket = self._buckets[channel]
+        send = self.send_slack if channel == "slack" else self.send_discord
+
+        while self._running or queue:
+            if not queue:
+                self._wakeup[channel].clear()
+                await self._wakeup[channel].wait()
+                continue
+
+            wait = bucket.acquire()
+            if wait > 0:
+                await asyncio.sleep(wait)
+                continue
+
+            alert = heapq.heappop(queue)
+            alert_queue_depth.labels(channel=channel).set(len(queue))
+
+            try:
+                ok = await send(alert.title, alert.message, alert.level, alert.fields)
+            except Exception as e:
+                logger.error(f"{channel} 알림 전송 오류: {e}")
+                ok = False
+
+            self._record(channel, alert.level, "sent" if ok else "failed")
+            if ok:
+                alert_delivery_seconds.labels(channel=channel).observe(
+                    time.monotonic() - alert.submitted_at
+                )
+
+    def get_pipeline_stats(self) -> Dict[str, Any]:
+        """파이프라인 통계"""
+        return {
+            "running": self._running,
+            "pending_groups": sum(len(alerts) for alerts in self._groups.values()),
+            "queued": {ch: len(self._queues[ch]) for ch in self._enabled_channels()},
+            **{
+                outcome: self._stats.get(outcome, 0)
+                for outcome in ("sent", "failed", "deduplicated", "grouped", "dropped")
+            },
+        }
+
     async def send_incident_alert(self, incident: Incident) -> Dict[str, bool]:
         """인시던트 알림 전송"""
         level_map = {
@@ -439,11 +836,12 @@ class AlertManager:
         if incident.duration:
             fields["Duration"] = f"{int(incident.duration.total_seconds())}s"
 
-        return await self.send_alert(
+        return await self.notify(
             title=f"[{incident.level.value}] {incident.title}",
             message=incident.description,
             level=alert_level,
             fields=fields,
+            fingerprint=f"incident:{incident.id}:{incident.status.value}:{incident.level.value}",
         )
 
 
@@ -457,19 +855,180 @@ class IncidentTracker:
     인시던트 추적기
 
     인시던트 생성, 업데이트, 타임라인 관리
+
+    store 지정 시:
+    - start()에서 ID 순번과 활성/최근 인시던트를 저장소에서 복원
+    - 변경된 인시던트와 새 타임라인 이벤트를 write-behind로 일괄 저장
+    - 메모리에는 활성 인시던트 + 최근 인시던트만 유지 (hot_limit)
     """
 
-    def __init__(self, alert_manager: Optional[AlertManager] = None):
+    def __init__(
+        self,
+        alert_manager: Optional[AlertManager] = None,
+        store: Optional[IncidentStore] = None,
+        hot_limit: int = 1000,
+        flush_interval_seconds: float = 2.0,
+    ):
+        """
+        Args:
+            alert_manager: 알림 매니저
+            store: 인시던트 저장소 (None이면 메모리 전용)
+            hot_limit: 메모리에 유지할 최대 인시던트 수 (활성 인시던트는 제외 불가)
+            flush_interval_seconds: write-behind 주기
+        """
         self.alert_manager = alert_manager
-        self._incidents: Dict[str, Incident] = {}
+        self.store = store
+        self.hot_limit = hot_limit
+        self.flush_interval_seconds = flush_interval_seconds
+
+        self._incidents: Dict[str, Incident] = {}  # 생성 순서 유지 (hot set)
+        self._active_ids: Set[str] = set()
         self._incident_counter = 0
 
+        # write-behind 상태
+        self._dirty: Set[str] = set()
+        self._persisted_events: Dict[str, int] = {}
+        self._flush_lock = asyncio.Lock()
+        self._flush_task: Optional[asyncio.Task] = None
+        self._running = False
+
     def _generate_id(self) -> str:
         """인시던트 ID 생성"""
         self._incident_counter += 1
         now = datetime.now(timezone.utc)
         return f"INC-{now.strftime('%Y%m%d')}-{self._incident_counter:04d}"
 
+    # =========================================
+    # Hot set / write-behind
+    # =========================================
+
+    def _remember(self, incident: Incident) -> None:
+        """메모리 hot set에 추가 (초과 시 오래된 해결 인시던트부터 제거)"""
+        self._incidents[incident.id] = incident
+        if incident.status != IncidentStatus.RESOLVED:
+            self._active_ids.add(incident.id)
+
+        if self.store is None or len(self._incidents) <= self.hot_limit:
+            return
+
+        for incident_id in list(self._incidents):
+            if len(self._incidents) <= self.hot_limit:
+                break
+            candidate = self._incidents[incident_id]
+            if candidate.status == IncidentStatus.RESOLVED and incident_id not in self._dirty:
+                del self._incidents[incident_id]
+                self._active_ids.discard(incident_id)
+                self._persisted_events.pop(incident_id, None)
+
+    def _mark_dirty(self, incident: Incident) -> None:
+        if incident.status == IncidentStatus.RESOLVED:
+            self._active_ids.discard(incident.id)
+        else:
+            self._active_ids.add(incident.id)
+        if self.store is not None:
+            self._dirty.add(incident.id)
+
+    @staticmethod
+    def _incident_row(incident: Incident) -> Dict[str, Any]:
+        row = incident.to_dict()
+        row.pop("timeline")
+        row.pop("duration_seconds")
+        row["seq"] = int(incident.id.rsplit("-", 1)[-1])
+        return row
+
+    async def flush(self) -> int:
+        """
+        변경된 인시던트 저장
+
+        Returns:
+            int: 저장된 인시던트 수
+        """
+        if self.store is None:
+            return 0
+
+        async with self._flush_lock:
+            if not self._dirty:
+                return 0
+
+            ids, self._dirty = self._dirty, set()
+            incidents = [self._incidents[i] for i in ids if i in self._incidents]
+
+            rows, events, event_counts = [], [], {}
+            for incident in incidents:
+                rows.append(self._incident_row(incident))
+                start = self._persisted_events.get(incident.id, 0)
+                for seq, event in enumerate(incident.timeline[start:], start=start):
+                    events.append({"incident_id": incident.id, "seq": seq, **event.to_dict()})
+                event_counts[incident.id] = len(incident.timeline)
+
+            try:
+                await asyncio.to_thread(self.store.save, rows, events)
+            except Exception as e:
+                # 다음 flush에서 재시도
+                self._dirty |= ids
+                logger.error(f"인시던트 저장 실패 ({len(rows)}건): {e}")
+                return 0
+
+            self._persisted_events.update(event_counts)
+            return len(rows)
+
+    async def load(self, recent_hours: int = 24) -> int:
+        """
+        저장소에서 ID 순번과 활성/최근 인시던트 복원
+
+        Returns:
+            int: 메모리로 로드된 인시던트 수
+        """
+        if self.store is None:
+            return 0
+
+        since = (datetime.now(timezone.utc) - timedelta(hours=recent_hours)).isoformat()
+        max_seq, active, recent = await asyncio.gather(
+            asyncio.to_thread(self.store.max_sequence),
+            asyncio.to_thread(self.store.query, active=True),
+            asyncio.to_thread(self.store.query, since=since, limit=self.hot_limit),
+        )
+        self._incident_counter = max(self._incident_counter, max_seq)
+
+        rows = {row["id"]: row for row in recent + active}
+        loaded = 0
+        for row in sorted(rows.values(), key=lambda r: r["created_at"]):
+            if row["id"] in self._incidents:
+                continue
+            incident = Incident.from_dict(row)
+            self._persisted_events[incident.id] = len(incident.timeline)
+            self._remember(incident)
+            loaded += 1
+
+        logger.info(f"인시던트 복원: {loaded}건 (다음 순번 {self._incident_counter + 1})")
+        return loaded
+
+    async def start(self) -> None:
+        """저장소 복원 + write-behind 루프 시작"""
+        if self.store is None or self._running:
+            return
+
+        await self.load()
+        self._running = True
+        self._flush_task = asyncio.create_task(self._flush_loop())
+
+    async def stop(self) -> None:
+        """write-behind 루프 중지 + 잔여 변경분 저장"""
+        self._running = False
+        if self._flush_task:
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+            self._flush_task = None
+        await self.flush()
+
+    async def _flush_loop(self) -> None:
+        while self._running:
+            await asyncio.sleep(self.flush_interval_seconds)
+            await self.flush()
+
     async def create_incident(
         self,
         title: str,
@@ -496,7 +1055,8 @@ class IncidentTracker:
         # 감지 이벤트 추가
         incident.add_event("detected", f"Incident detected: {title}", AlertLevel.WARNING)
 
-        self._incidents[incident_id] = incident
+        self._remember(incident)
+        self._mark_dirty(incident)
 
         logger.warning(f"Incident created: {incident_id} - {title}")
 
@@ -511,15 +1071,74 @@ class IncidentTracker:
         return self._incidents.get(incident_id)
 
     def get_active_incidents(self) -> List[Incident]:
-        """활성 인시던트 목록"""
-        return [
-            inc for inc in self._incidents.values() if inc.status not in (IncidentStatus.RESOLVED,)
-        ]
+        """활성 인시던트 목록 (활성 ID 인덱스 기반)"""
+        active = []
+        for incident_id in sorted(self._active_ids):
+            inc = self._incidents.get(incident_id)
+            if inc is None or inc.status == IncidentStatus.RESOLVED:
+                # Incident.resolve()가 직접 호출된 경우 인덱스 정리
+                self._active_ids.discard(incident_id)
+                continue
+            active.append(inc)
+        return active
 
     def get_recent_incidents(self, hours: int = 24) -> List[Incident]:
-        """최근 인시던트 목록"""
+        """최근 인시던트 목록 (hot set, 생성 순서 역순으로 cutoff까지만 탐색)"""
         cutoff = datetime.now(timezone.utc) - timedelta(hours=hours)
-        return [inc for inc in self._incidents.values() if inc.created_at >= cutoff]
+        recent = []
+        for inc in reversed(self._incidents.values()):
+            if inc.created_at < cutoff:
+                break
+            recent.append(inc)
+        recent.reverse()
+        return recent
+
+    async def query_incidents(
+        self,
+        status: Optional[IncidentStatus] = None,
+        hours: Optional[int] = None,
+        limit: int = 100,
+    ) -> List[Incident]:
+        """
+        인시던트 이력 조회 (저장소 인덱스 사용, hot set 밖의 인시던트 포함)
+
+        Args:
+            status: 상태 필터
+            hours: 최근 N시간 이내 생성분
+            limit: 최대 결과 수 (created_at 내림차순)
+        """
+        since = (
+            (datetime.now(timezone.utc) - timedelta(hours=hours)).isoformat()
+            if hours is not None
+            else None
+        )
+
+        if self.store is None:
+            return [
+                inc
+                for inc in reversed(self._incidents.values())
+                if (status is None or inc.status == status)
+                and (since is None or inc.created_at.isoformat() >= since)
+            ][:limit]
+
+        await self.flush()
+        rows = await asyncio.to_thread(
+            self.store.query,
+            status=status.value if status else None,
+            since=since,
+            limit=limit,
+        )
+        # 메모리에 있는 인시던트는 같은 객체 반환
+        return [self._incidents.get(row["id"]) or Incident.from_dict(row) for row in rows]
+
+    async def fetch_incident(self, incident_id: str) -> Optional[Incident]:
+        """인시던트 조회 (메모리에 없으면 저장소)"""
+        incident = self._incidents.get(incident_id)
+        if incident is not None or self.store is None:
+            return incident
+
+        row = await asyncio.to_thread(self.store.get, incident_id)
+        return Incident.from_dict(row) if row else None
 
     async def update_incident(
         self,
@@ -541,6 +1160,7 @@ class IncidentTracker:
             incident.add_event(event_type, event_message)
 
         incident.updated_at = datetime.now(timezone.utc)
+        self._mark_dirty(incident)
 
         if send_alert and self.alert_manager:
             await self.alert_manager.send_incident_alert(incident)
@@ -560,11 +1180,12 @@ class IncidentTracker:
             return None
 
         incident.resolve(resolution, root_cause)
+        self._mark_dirty(incident)
 
         logger.info(f"Incident resolved: {incident_id} - {resolution}")
 
         if send_alert and self.alert_manager:
-            await self.alert_manager.send_alert(
+            await self.alert_manager.notify(
                 title=f"[RESOLVED] {incident.title}",
                 message=f"Resolution: {resolution}",
                 level=AlertLevel.INFO,
@@ -590,6 +1211,7 @@ class IncidentTracker:
 
         old_level = incident.level
         incident.escalate(new_level, reason)
+        self._mark_dirty(incident)
 
         logger.warning(f"Incident escalated: {incident_id} {old_level.value} -> {new_level.value}")
 
@@ -631,9 +1253,19 @@ class RunbookExecutor:
         self,
         alert_manager: Optional[AlertManager] = None,
         incident_tracker: Optional[IncidentTracker] = None,
+        on_l1_transition: Optional[
+            Callable[[L1TriggerCondition, Optional[bool], bool], Awaitable[None]]
+        ] = None,
     ):
+        """
+        Args:
+            alert_manager: 알림 매니저
+            incident_tracker: 인시던트 추적기
+            on_l1_transition: L1 조건 결과 변경 시 콜백 (condition, old, new)
+        """
         self.alert_manager = alert_manager or AlertManager()
         self.incident_tracker = incident_tracker or IncidentTracker(self.alert_manager)
+        self.on_l1_transition = on_l1_transition
 
         # L1 조건 추적
         self._l1_conditions: Dict[str, L1TriggerCondition] = {}
@@ -642,6 +1274,10 @@ class RunbookExecutor:
         self._last_l1_execution: Optional[datetime] = None
         self._l1_cooldown_seconds = 300  # 5분
 
+        # 연속 평가 루프
+        self._evaluator_task: Optional[asyncio.Task] = None
+        self._evaluator_running = False
+
     def register_l1_condition(
         self,
         name: str,
@@ -649,6 +1285,7 @@ class RunbookExecutor:
         description: str = "",
         cooldown_seconds: int = 300,
         max_attempts: int = 3,
+        timeout_seconds: float = 5.0,
     ) -> None:
         """L1 자동 실행 조건 등록"""
         condition = L1TriggerCondition(
@@ -657,40 +1294,174 @@ class RunbookExecutor:
             check_fn=check_fn,
             cooldown_seconds=cooldown_seconds,
             max_attempts=max_attempts,
+            timeout_seconds=timeout_seconds,
         )
         self._l1_conditions[name] = condition
         logger.debug(f"L1 조건 등록: {name}")
 
+    def _is_l1_condition_eligible(self, condition: L1TriggerCondition, now: datetime) -> bool:
+        """평가 대상 여부 (활성화, 쿨다운, 최대 시도 횟수)"""
+        if not condition.enabled:
+            return False
+
+        # 쿨다운 확인
+        if condition.last_triggered_at:
+            elapsed = (now - condition.last_triggered_at).total_seconds()
+            if elapsed < condition.cooldown_seconds:
+                return False
+
+        # 최대 시도 횟수 확인
+        if condition.trigger_count >= condition.max_attempts:
+            logger.warning(f"L1 조건 {condition.name}: 최대 시도 횟수 초과")
+            return False
+
+        return True
+
+    async def _evaluate_l1_condition(self, condition: L1TriggerCondition) -> Optional[bool]:
+        """
+        조건 1개 평가 (timeout_seconds 데드라인)
+
+        Returns:
+            평가 결과 (타임아웃/오류 시 None)
+        """
+        started = time.perf_counter()
+        result: Optional[bool] = None
+
+        try:
+            result = bool(
+                await asyncio.wait_for(condition.check_fn(), timeout=condition.timeout_seconds)
+            )
+            condition.last_error = None
+        except asyncio.TimeoutError:
+            condition.last_error = f"timeout after {condition.timeout_seconds}s"
+            logger.warning(
+                f"L1 조건 체크 타임아웃 ({condition.name}): {condition.timeout_seconds}s"
+            )
+        except Exception as e:
+            condition.last_error = str(e)
+            logger.error(f"L1 조건 체크 오류 ({condition.name}): {e}")
+
+        condition.last_checked_at = datetime.now(timezone.utc)
+        condition.last_duration_ms = int((time.perf_counter() - started) * 1000)
+
+        if result is not None and result != condition.last_result:
+            previous = condition.last_result
+            condition.last_result = result
+            await self._publish_l1_transition(condition, previous, result)
+
+        return result
+
+    async def _publish_l1_transition(
+        self, condition: L1TriggerCondition, old: Optional[bool], new: bool
+    ) -> None:
+        """조건 결과 변경 알림"""
+        logger.info(f"L1 조건 변경: {condition.name} {old} -> {new}")
+
+        if self.on_l1_transition:
+            try:
+                await self.on_l1_transition(condition, old, new)
+            except Exception as e:
+                logger.error(f"L1 transition 콜백 오류 ({condition.name}): {e}")
+
+    async def evaluate_l1_conditions(self) -> Dict[str, Optional[bool]]:
+        """
+        평가 대상 L1 조건을 동시에 평가
+
+        느린 check_fn은 자신의 timeout_seconds에서 끊기므로
+        다른 조건의 감지를 지연시키지 않음
+
+        Returns:
+            조건 이름 -> 결과 (등록 순서, 타임아웃/오류는 None)
+        """
+        now = datetime.now(timezone.utc)
+        eligible = [
+            c for c in self._l1_conditions.values() if self._is_l1_condition_eligible(c, now)
+        ]
+        if not eligible:
+            return {}
+
+        results = await asyncio.gather(*(self._evaluate_l1_condition(c) for c in eligible))
+        return {condition.name: result for condition, result in zip(eligible, results)}
+
     async def check_l1_conditions(self) -> Optional[str]:
         """
         L1 조건 확인
 
         Returns:
-            트리거된 조건 이름 (없으면 None)
+            트리거된 조건 이름 (없으면 None, 여러 개면 등록 순서상 첫 번째)
         """
-        for name, condition in self._l1_conditions.items():
-            if not condition.enabled:
-                continue
+        for name, triggered in (await self.evaluate_l1_conditions()).items():
+            if triggered:
+                logger.info(f"L1 조건 트리거됨: {name}")
+                return name
 
-            # 쿨다운 확인
-            if condition.last_triggered_at:
-                elapsed = (datetime.now(timezone.utc) - condition.last_triggered_at).total_seconds()
-                if elapsed < condition.cooldown_seconds:
-                    continue
+        return None
 
-            # 최대 시도 횟수 확인
-            if condition.trigger_count >= condition.max_attempts:
-                logger.warning(f"L1 조건 {name}: 최대 시도 횟수 초과")
-                continue
+    def get_l1_condition_states(self) -> Dict[str, Dict[str, Any]]:
+        """조건별 마지막 평가 결과 (캐시, check_fn 호출 없음)"""
+        return {name: c.to_dict() for name, c in self._l1_conditions.items()}
+
+    async def start_l1_evaluator(
+        self,
+        interval_seconds: float = 10.0,
+        auto_execute: bool = False,
+        service: str = "orchestrator",
+    ) -> None:
+        """
+        L1 조건 연속 평가 루프 시작
+
+        Args:
+            interval_seconds: 평가 주기
+            auto_execute: 조건 트리거 시 L1 Soft Reset 자동 실행
+            service: 자동 실행 대상 서비스
+        """
+        if self._evaluator_running:
+            return
+
+        self._evaluator_running = True
+        self._evaluator_task = asyncio.create_task(
+            self._l1_evaluator_loop(interval_seconds, auto_execute, service)
+        )
+        logger.info(f"L1 evaluator started (interval={interval_seconds}s)")
+
+    async def stop_l1_evaluator(self) -> None:
+        """L1 조건 연속 평가 루프 중지"""
+        self._evaluator_running = False
+
+        if self._evaluator_task:
+            self._evaluator_task.cancel()
+            try:
+                await self._evaluator_task
+            except asyncio.CancelledError:
+                pass
+            self._evaluator_task = None
+
+        logger.info("L1 evaluator stopped")
+
+    async def _l1_evaluator_loop(
+        self, interval_seconds: float, auto_execute: bool, service: str
+    ) -> None:
+        """평가 루프 (평가 시간을 제외한 나머지만큼 대기)"""
+        while self._evaluator_running:
+            started = time.monotonic()
 
             try:
-                if await condition.check_fn():
-                    logger.info(f"L1 조건 트리거됨: {name}")
-                    return name
+                triggered = await self.check_l1_conditions()
+
+                if triggered and auto_execute:
+                    condition = self._l1_conditions[triggered]
+                    condition.last_triggered_at = datetime.now(timezone.utc)
+                    condition.trigger_count += 1
+                    await self.execute_l1_soft_reset(
+                        service=service,
+                        reason=f"Auto-triggered by L1 condition: {condition.description}",
+                    )
+            except asyncio.CancelledError:
+                raise
             except Exception as e:
-                logger.error(f"L1 조건 체크 오류 ({name}): {e}")
+                logger.error(f"L1 evaluator loop error: {e}")
 
-        return None
+            await asyncio.sleep(max(0.0, interval_seconds - (time.monotonic() - started)))
 
     def record_health_check_failure(self) -> int:
         """헬스 체크 실패 기록"""
@@ -838,6 +1609,7 @@ class RunbookExecutor:
             "l1_execution_count": len(self._l1_execution_history),
             "active_incidents": len(self.incident_tracker.get_active_incidents()),
             "registered_conditions": list(self._l1_conditions.keys()),
+            "l1_evaluator_running": self._evaluator_running,
         }
 
 
@@ -851,18 +1623,65 @@ _runbook_executor: Optional[RunbookExecutor] = None
 
 
 def get_alert_manager() -> AlertManager:
-    """AlertManager 싱글톤"""
+    """
+    AlertManager 싱글톤
+
+    SLACK_WEBHOOK_URL / DISCORD_WEBHOOK_URL 환경변수로 채널 설정
+    """
     global _alert_manager
     if _alert_manager is None:
-        _alert_manager = AlertManager()
+        _alert_manager = AlertManager(
+            AlertConfig(
+                slack_webhook=os.getenv("SLACK_WEBHOOK_URL") or None,
+                discord_webhook=os.getenv("DISCORD_WEBHOOK_URL") or None,
+            )
+        )
     return _alert_manager
 
 
+def forward_network_alerts(
+    checker: "NetworkHealthChecker", manager: Optional[AlertManager] = None
+) -> None:
+    """
+    NetworkHealthChecker 알림을 AlertManager 파이프라인으로 전달
+
+    fingerprint는 alert_type:source (체커 쿨다운과 같은 키),
+    같은 alert_type은 하나의 다이제스트로 묶음
+    """
+    manager = manager or get_alert_manager()
+
+    def _forward(alert) -> None:
+        if not manager.is_running:
+            return
+        try:
+            level = AlertLevel(alert.severity)
+        except ValueError:
+            level = AlertLevel.WARNING
+        manager.submit(
+            alert.title,
+            alert.message,
+            level,
+            fields={"Type": alert.alert_type, "Source": alert.source},
+            fingerprint=f"{alert.alert_type}:{alert.source}",
+            group_key=f"network|{alert.alert_type}|{level.value}",
+        )
+
+    checker.on_alert(_forward)
+
+
 def get_incident_tracker() -> IncidentTracker:
-    """IncidentTracker 싱글톤"""
+    """
+    IncidentTracker 싱글톤
+
+    INCIDENT_DB_PATH 환경변수가 있으면 SQLite 저장소 사용
+    """
     global _incident_tracker
     if _incident_tracker is None:
-        _incident_tracker = IncidentTracker(get_alert_manager())
+        store = None
+        db_path = os.getenv("INCIDENT_DB_PATH")
+        if db_path:
+            store = SQLiteIncidentStore(db_path)
+        _incident_tracker = IncidentTracker(get_alert_manager(), store=store)
     return _incident_tracker
 
 
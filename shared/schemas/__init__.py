@@ -2,110 +2,78 @@
 Shared Schemas
 
 Pydantic 모델 정의
+
+하위 모듈은 처음 접근할 때 import (PEP 562)
 """
 
-from .device import (
-    DeviceBase,
-    DeviceCreate,
-    DeviceHeartbeat,
-    DeviceInDB,
-    DeviceListResponse,
-    DeviceResponse,
-    DeviceStatus,
-    DeviceUpdate,
-)
-from .network import (
-    APClientInfo,
-    APConfig,
-    APListResponse,
-    APStatus,
-    DHCPLease,
-    DHCPPoolConfig,
-    DHCPPoolListResponse,
-    DHCPPoolStatus,
-    DHCPStatus,
-    NetworkAlertCreate,
-    NetworkAlertResponse,
-    NetworkHealthConfig,
-    NetworkHealthResponse,
-    NetworkHealthSnapshot,
-    NetworkHealthSummary,
-    NetworkStatus,
-    VLANConfig,
-    VLANDeviceDistribution,
-    VLANListResponse,
-    VLANStatus,
-)
-from .pattern import (
-    HumanPatternConfig,
-    InteractionPatternConfig,
-    ScrollPatternConfig,
-    TouchPatternConfig,
-    TypingPatternConfig,
-    WatchPatternConfig,
-)
-from .persona import (
-    ATTENTION_REWARDS,
-    ActivityType,
-    ExistenceState,
-    PersonaBase,
-    PersonaCreate,
-    PersonaExistence,
-    PersonaInDB,
-    PersonaResponse,
-    PersonaTraits,
-)
-from .result import (
-    AggregatedStats,
-    ResultBase,
-    ResultCreate,
-    ResultInDB,
-)
-from .task import (
-    SearchType,
-    TaskBase,
-    TaskCreate,
-    TaskInDB,
-    TaskResponse,
-    TaskResultMessage,
-    TaskStatus,
-)
-from .video import (
-    VideoBase,
-    VideoCreate,
-    VideoInDB,
-    VideoResponse,
-    VideoStatus,
-)
-from .gateway import (
-    NodeStatus as GatewayNodeStatus,
-    CommandPriority,
-    CommandStatus,
-    TargetType,
-    NodeBase,
-    NodeConnection as GatewayNodeConnection,
-    NodeHeartbeat,
-    NodeListResponse,
-    CommandTarget,
-    CommandRequest,
-    CommandResponse,
-    QueueCommandRequest,
-    QueueCommandResponse,
-    BroadcastRequest,
-    BroadcastResponse,
-    ProtocolMessage,
-    HelloMessage,
-    HelloAckPayload,
-    HeartbeatAckPayload,
-    ResultPayload,
-    ErrorPayload,
-    HealthResponse,
-    SystemStatusResponse,
-    DashboardInitMessage,
-    DashboardNodeUpdate,
-    DashboardNodeConnected,
-    DashboardNodeDisconnected,
-    DashboardCommandResult,
+from shared.lazy_import import lazy_exports
+
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        ".device": (
+            "DeviceBase",
+            "DeviceCreate",
+            "DeviceHeartbeat",
+            "DeviceInDB",
+            "DeviceListResponse",
+            "DeviceResponse",
+            "DeviceStatus",
+            "DeviceUpdate",
+        ),
+        ".network": (
+            "APClientInfo",
+            "APConfig",
+            "APListResponse",
+            "APStatus",
+            "DHCPLease",
+            "DHCPPoolConfig",
+            "DHCPPoolListResponse",
+            "DHCPPoolStatus",
+            "DHCPStatus",
+            "NetworkAlertCreate",
+            "NetworkAlertResponse",
+            "NetworkHealthConfig",
+            "NetworkHealthResponse",
+            "NetworkHealthSnapshot",
+            "NetworkHealthSummary",
+            "NetworkStatus",
+            "VLANConfig",
+            "VLANDeviceDistribution",
+            "VLANListResponse",
+            "VLANStatus",
+        ),
+        ".pattern": (
+            "HumanPatternConfig",
+            "InteractionPatternConfig",
+            "ScrollPatternConfig",
+            "TouchPatternConfig",
+            "TypingPatternConfig",
+            "WatchPatternConfig",
+        ),
+        ".persona": (
+            "ATTENTION_REWARDS",
+            "ActivityType",
+            "ExistenceState",
+            "PersonaBase",
+            "PersonaCreate",
+            "PersonaExistence",
+            "PersonaInDB",
+            "PersonaResponse",
+            "PersonaTraits",
+        ),
+        ".result": ("AggregatedStats", "ResultBase", "ResultCreate", "ResultInDB"),
+        ".task": (
+            "SearchType",
+            "TaskBase",
+            "TaskCreate",
+            "TaskInDB",
+            "TaskResponse",
+            "TaskResultMessage",
+            "TaskStatus",
+        ),
+        ".video": ("VideoBase", "VideoCreate", "VideoInDB", "VideoResponse", "VideoStatus"),
+    },
 )
 
 __all__ = [
@@ -175,33 +143,4 @@ __all__ = [
     "DHCPPoolListResponse",
     "NetworkAlertCreate",
     "NetworkAlertResponse",
-    # Gateway
-    "GatewayNodeStatus",
-    "CommandPriority",
-    "CommandStatus",
-    "TargetType",
-    "NodeBase",
-    "GatewayNodeConnection",
-    "NodeHeartbeat",
-    "NodeListResponse",
-    "CommandTarget",
-    "CommandRequest",
-    "CommandResponse",
-    "QueueCommandRequest",
-    "QueueCommandResponse",
-    "BroadcastRequest",
-    "BroadcastResponse",
-    "ProtocolMessage",
-    "HelloMessage",
-    "HelloAckPayload",
-    "HeartbeatAckPayload",
-    "ResultPayload",
-    "ErrorPayload",
-    "HealthResponse",
-    "SystemStatusResponse",
-    "DashboardInitMessage",
-    "DashboardNodeUpdate",
-    "DashboardNodeConnected",
-    "DashboardNodeDisconnected",
-    "DashboardCommandResult",
 ]
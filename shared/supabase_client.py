@@ -11,7 +11,7 @@ PC Agent, Worker 등에서 직접 Supabase에 접근할 때 사용
 import asyncio
 import os
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 # 로거 설정 (loguru가 없으면 기본 logging 사용)
 try:
@@ -24,7 +24,7 @@ except ImportError:
 
 # Supabase 클라이언트
 try:
-    from supabase import Client, create_client
+    from supabase import AsyncClient, Client, acreate_client, create_client
 except ImportError:
     raise ImportError("supabase 패키지가 필요합니다. 설치: pip install supabase")
 
@@ -72,6 +72,63 @@ def get_client() -> Client:
     return _client
 
 
+_async_client: Optional[AsyncClient] = None
+
+
+async def get_async_client() -> AsyncClient:
+    """
+    async Supabase 클라이언트 싱글톤 (Realtime 구독용)
+
+    환경 변수는 get_client()와 동일
+
+    Returns:
+        Supabase AsyncClient
+    """
+    global _async_client
+
+    if _async_client is None:
+        url = _get_env("SUPABASE_URL", required=True)
+        key = _get_env("SUPABASE_SERVICE_ROLE_KEY", required=True)
+
+        _async_client = await acreate_client(url, key)
+        logger.info(f"Supabase async 연결 완료: {url[:30]}...")
+
+    return _async_client
+
+
+UPSERT_CHUNK_SIZE = int(os.getenv("SUPABASE_UPSERT_CHUNK_SIZE", "500"))
+
+
+def bulk_upsert_rows(
+    client: Client,
+    table: str,
+    rows: Iterable[Dict[str, Any]],
+    on_conflict: str,
+    chunk_size: int = UPSERT_CHUNK_SIZE,
+) -> List[Dict[str, Any]]:
+    """
+    여러 행 일괄 Upsert (요청 수 = 컬럼 구성별 chunk 수)
+
+    - 충돌 키가 반복되면 마지막 행만 전송 (한 문장에서 같은 행을 두 번 갱신할 수 없음)
+    - 컬럼 구성이 같은 행끼리 묶어 전송 (PostgREST 일괄 upsert는 빠진 컬럼을 NULL로 덮어씀)
+
+    Returns:
+        Upsert된 행 목록 (DB 반환 순서)
+    """
+    unique = {row[on_conflict]: row for row in rows}
+    groups: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+    for row in unique.values():
+        groups.setdefault(tuple(sorted(row)), []).append(row)
+
+    upserted: List[Dict[str, Any]] = []
+    for group in groups.values():
+        for start in range(0, len(group), chunk_size):
+            chunk = group[start : start + chunk_size]
+            result = client.table(table).upsert(chunk, on_conflict=on_conflict).execute()
+            upserted.extend(result.data or [])
+    return upserted
+
+
 # ===========================================
 # Device Sync Functions
 # ===========================================
@@ -144,7 +201,7 @@ class DeviceSync:
 
     async def bulk_upsert(self, devices: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
-        여러 기기 일괄 Upsert
+        여러 기기 일괄 Upsert (serial_number 기준, chunk 단위 요청)
 
         Args:
             devices: [{"serial_number": "xxx", "model": "Galaxy S9"}, ...]
@@ -152,17 +209,32 @@ class DeviceSync:
         Returns:
             Upsert된 기기 목록
         """
-        results = []
+        now = datetime.now(timezone.utc).isoformat()
+        rows = []
 
         for device in devices:
             serial = device.get("serial_number")
-            model = device.get("model")
-            status = device.get("status", "idle")
+            if not serial:
+                continue
+
+            data = {
+                "serial_number": serial,
+                "pc_id": self.pc_id,
+                "status": device.get("status", "idle"),
+                "last_seen": now,
+            }
+            if device.get("model"):
+                data["model"] = device["model"]
+            rows.append(data)
 
-            if serial:
-                result = await self.upsert_device(serial, status, model)
-                if result:
-                    results.append(result)
+        if not rows:
+            return []
+
+        try:
+            results = bulk_upsert_rows(self.client, self.table, rows, on_conflict="serial_number")
+        except Exception as e:
+            logger.error(f"[PC{self.pc_id}] 기기 일괄 동기화 실패: {len(rows)}대 - {e}")
+            raise
 
         logger.info(f"[PC{self.pc_id}] {len(results)}대 기기 일괄 동기화 완료")
         return results
@@ -457,22 +529,22 @@ async def sync_devices_from_adb(pc_id: int) -> List[Dict]:
         result = subprocess.run(["adb", "devices"], capture_output=True, text=True, timeout=10)
 
         lines = result.stdout.strip().split("\n")[1:]  # 헤더 제외
-        devices = []
-
-        for line in lines:
-            if "\tdevice" in line:
-                serial = line.split("\t")[0]
-
-                # 모델명 가져오기
-                model_result = subprocess.run(
-                    ["adb", "-s", serial, "shell", "getprop", "ro.product.model"],
-                    capture_output=True,
-                    text=True,
-                    timeout=5,
-                )
-                model = model_result.stdout.strip() or "Unknown"
+        serials = [line.split("\t")[0] for line in lines if "\tdevice" in line]
+
+        def get_model(serial: str) -> str:
+            model_result = subprocess.run(
+                ["adb", "-s", serial, "shell", "getprop", "ro.product.model"],
+                capture_output=True,
+                text=True,
+                timeout=5,
+            )
+            return model_result.stdout.strip() or "Unknown"
 
-                devices.append({"serial_number": serial, "model": model})
+        # 모델명 가져오기 (기기별 adb 호출은 스레드에서 동시 실행)
+        models = await asyncio.gather(*(asyncio.to_thread(get_model, s) for s in serials))
+        devices = [
+            {"serial_number": serial, "model": model} for serial, model in zip(serials, models)
+        ]
 
         if not devices:
             logger.warning(f"[PC{pc_id}] ADB 연결된 기기 없음")
@@ -0,0 +1,125 @@
+-- =============================================
+-- OOB 노드 헬스 로그 + 다운샘플링
+-- Strategos Security Design v1
+--
+-- 보관 정책:
+--   raw (node_health_logs)            : 1시간
+--   1분 롤업 (node_health_rollups_1m) : 24시간
+-- =============================================
+
+-- =============================================
+-- Raw 메트릭 테이블 (MetricsPersister bulk insert 대상)
+-- =============================================
+CREATE TABLE IF NOT EXISTS node_health_logs (
+    id BIGSERIAL PRIMARY KEY,
+    node_id VARCHAR(50) NOT NULL,
+    status VARCHAR(20) NOT NULL,
+    device_count_adb INTEGER DEFAULT 0,
+    device_count_expected INTEGER DEFAULT 0,
+    adb_server_ok BOOLEAN DEFAULT FALSE,
+    unauthorized_count INTEGER DEFAULT 0,
+    collected_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_node_health_logs_node_collected
+    ON node_health_logs(node_id, collected_at DESC);
+CREATE INDEX IF NOT EXISTS idx_node_health_logs_collected_at
+    ON node_health_logs(collected_at);
+
+-- =============================================
+-- 1분 롤업 테이블
+-- =============================================
+CREATE TABLE IF NOT EXISTS node_health_rollups_1m (
+    node_id VARCHAR(50) NOT NULL,
+    bucket TIMESTAMPTZ NOT NULL,
+    samples INTEGER NOT NULL,
+    worst_status VARCHAR(20) NOT NULL,
+    device_count_adb_min INTEGER,
+    device_count_adb_avg DECIMAL(8,2),
+    device_count_expected INTEGER,
+    adb_server_ok BOOLEAN,
+    unauthorized_count_max INTEGER,
+    PRIMARY KEY (node_id, bucket)
+);
+
+CREATE INDEX IF NOT EXISTS idx_node_health_rollups_1m_bucket
+    ON node_health_rollups_1m(bucket);
+
+-- =============================================
+-- RPC 함수: raw -> 1분 롤업, 보관 기간 초과분 삭제
+-- MetricsPersister가 주기적으로 호출 (또는 pg_cron)
+-- =============================================
+CREATE OR REPLACE FUNCTION rollup_node_health_logs(
+    raw_retention INTERVAL DEFAULT '1 hour',
+    rollup_retention INTERVAL DEFAULT '24 hours'
+)
+RETURNS INTEGER AS $$
+DECLARE
+    cutoff TIMESTAMPTZ := date_trunc('minute', NOW() - raw_retention);
+    rolled INTEGER;
+BEGIN
+    INSERT INTO node_health_rollups_1m (
+        node_id, bucket, samples, worst_status,
+        device_count_adb_min, device_count_adb_avg, device_count_expected,
+        adb_server_ok, unauthorized_count_max
+    )
+    SELECT
+        node_id,
+        date_trunc('minute', collected_at) AS bucket,
+        COUNT(*),
+        (ARRAY['connected', 'unknown', 'degraded', 'disconnected'])[
+            MAX(CASE status
+                WHEN 'disconnected' THEN 4
+                WHEN 'degraded' THEN 3
+                WHEN 'unknown' THEN 2
+                ELSE 1
+            END)
+        ],
+        MIN(device_count_adb),
+        ROUND(AVG(device_count_adb), 2),
+        MAX(device_count_expected),
+        BOOL_AND(adb_server_ok),
+        MAX(unauthorized_count)
+    FROM node_health_logs
+    WHERE collected_at < cutoff
+    GROUP BY node_id, date_trunc('minute', collected_at)
+    ON CONFLICT (node_id, bucket) DO UPDATE SET
+        samples = node_health_rollups_1m.samples + EXCLUDED.samples,
+        -- 기존 롤업과 병합: 더 나쁜 상태 유지 (SELECT와 같은 순위)
+        worst_status = CASE
+            WHEN (CASE EXCLUDED.worst_status
+                    WHEN 'disconnected' THEN 4
+                    WHEN 'degraded' THEN 3
+                    WHEN 'unknown' THEN 2
+                    ELSE 1
+                END) > (CASE node_health_rollups_1m.worst_status
+                    WHEN 'disconnected' THEN 4
+                    WHEN 'degraded' THEN 3
+                    WHEN 'unknown' THEN 2
+                    ELSE 1
+                END)
+            THEN EXCLUDED.worst_status
+            ELSE node_health_rollups_1m.worst_status
+        END,
+        device_count_adb_min = LEAST(node_health_rollups_1m.device_count_adb_min, EXCLUDED.device_count_adb_min),
+        -- samples 가중 평균 (한쪽이 NULL이면 다른 쪽 값)
+        device_count_adb_avg = ROUND(
+            (COALESCE(node_health_rollups_1m.device_count_adb_avg, EXCLUDED.device_count_adb_avg) * node_health_rollups_1m.samples
+             + COALESCE(EXCLUDED.device_count_adb_avg, node_health_rollups_1m.device_count_adb_avg) * EXCLUDED.samples)
+            / (node_health_rollups_1m.samples + EXCLUDED.samples),
+            2
+        ),
+        device_count_expected = GREATEST(node_health_rollups_1m.device_count_expected, EXCLUDED.device_count_expected),
+        adb_server_ok = node_health_rollups_1m.adb_server_ok AND EXCLUDED.adb_server_ok,
+        unauthorized_count_max = GREATEST(node_health_rollups_1m.unauthorized_count_max, EXCLUDED.unauthorized_count_max);
+
+    GET DIAGNOSTICS rolled = ROW_COUNT;
+
+    DELETE FROM node_health_logs WHERE collected_at < cutoff;
+    DELETE FROM node_health_rollups_1m WHERE bucket < NOW() - rollup_retention;
+
+    RETURN rolled;
+END;
+$$ LANGUAGE plpgsql;
+
+COMMENT ON FUNCTION rollup_node_health_logs(INTERVAL, INTERVAL) IS 'MetricsPersister 또는 Cron Job (pg_cron)에서 5분마다 호출하여 raw 로그를 1분 롤업으로 다운샘플링';
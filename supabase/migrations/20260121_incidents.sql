@@ -0,0 +1,38 @@
+-- =============================================
+-- 인시던트 이력 (IncidentTracker 영속 저장소)
+-- SupabaseIncidentStore 대상 테이블
+-- =============================================
+
+CREATE TABLE IF NOT EXISTS incidents (
+    id VARCHAR(32) PRIMARY KEY,            -- INC-YYYYMMDD-NNNN
+    seq INTEGER NOT NULL,                  -- ID 순번 (재시작 후 이어서 발급)
+    title TEXT NOT NULL,
+    description TEXT,
+    status VARCHAR(20) NOT NULL,
+    level VARCHAR(4) NOT NULL,
+    created_at TIMESTAMPTZ NOT NULL,
+    updated_at TIMESTAMPTZ NOT NULL,
+    resolved_at TIMESTAMPTZ,
+    affected_services JSONB DEFAULT '[]'::jsonb,
+    root_cause TEXT,
+    resolution TEXT,
+    assignee TEXT
+);
+
+CREATE INDEX IF NOT EXISTS idx_incidents_status ON incidents(status, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_incidents_created_at ON incidents(created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_incidents_seq ON incidents(seq DESC);
+
+-- =============================================
+-- 타임라인 이벤트 (append-only, write-behind)
+-- =============================================
+CREATE TABLE IF NOT EXISTS incident_events (
+    incident_id VARCHAR(32) NOT NULL REFERENCES incidents(id) ON DELETE CASCADE,
+    seq INTEGER NOT NULL,
+    timestamp TIMESTAMPTZ NOT NULL,
+    event_type VARCHAR(50) NOT NULL,
+    message TEXT,
+    level VARCHAR(20),
+    metadata JSONB DEFAULT '{}'::jsonb,
+    PRIMARY KEY (incident_id, seq)
+);
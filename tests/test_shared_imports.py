@@ -4,8 +4,37 @@ Shared 모듈 Import 테스트
 실행: pytest tests/test_shared_imports.py -v
 """
 
+import subprocess
+import sys
+from pathlib import Path
+
 import pytest
 
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+# 패키지 import 시간 상한 (ms, -X importtime 누적값)
+# 지연 import 기준 수 ms, 무거운 의존성이 다시 끌려오면 수백 ms
+IMPORT_BUDGET_MS = 50
+HEAVY_MODULES = ("supabase", "aiohttp", "prometheus_client", "websockets", "pydantic")
+
+
+def _importtime(statement: str) -> dict:
+    """새 인터프리터에서 -X importtime 실행 → {모듈: 누적 µs}"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = (part.strip() for part in line.split("|"))
+        modules[name] = int(cumulative)
+    return modules
+
 
 class TestSharedImports:
     """shared 모듈 import 테스트"""
@@ -136,5 +165,29 @@ class TestPatternConfig:
         assert config.seek_enabled is False
 
 
+class TestLazyImports:
+    """지연 import (PEP 562) 테스트"""
+
+    @pytest.mark.parametrize("package", ["shared", "shared.monitoring", "shared.schemas"])
+    def test_exports_resolve_lazily(self, package):
+        """__all__ 이름이 모두 접근 가능하고 dir()에 노출"""
+        module = __import__(package, fromlist=["__all__"])
+
+        for name in module.__all__:
+            getattr(module, name)
+        assert set(module.__all__) <= set(dir(module))
+        with pytest.raises(AttributeError):
+            module.DoesNotExist
+
+    def test_cold_import_within_budget(self):
+        """패키지 import가 무거운 의존성 없이 시간 상한 이내"""
+        packages = ("shared", "shared.monitoring", "shared.schemas")
+        modules = _importtime("import " + ", ".join(packages))
+
+        assert not [m for m in modules if m.split(".")[0] in HEAVY_MODULES]
+        for package in packages:
+            assert modules[package] / 1000 < IMPORT_BUDGET_MS, package
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,784 @@
+"""
+Cloud Gateway 단위 테스트
+
+- 상태 스냅샷 저장 / 복원 (Warm Restart)
+- HELLO 세션 재개 시 DB 재등록 생략
+- 드레인: 재접속 힌트 전송, DB 연결 해제 표시 생략
+- 멀티 인스턴스 라우팅: Fleet 뷰, 인스턴스 간 명령 전달 / RESULT 반환
+- ConnectionPool: copy-on-write 스냅샷, READY 슬롯 색인
+- NodeScheduler: 배치 후 미완료 집계, 용량 상한, 부하 기반 선택
+- HeartbeatWheel: HEARTBEAT 마감 만료
+- DeviceSnapshotState: HEARTBEAT 디바이스 델타 적용 / resync
+- 프레임 인코딩 협상 (json / msgpack)
+- HELLO 프레임 서명 / 세션 MAC
+"""
+
+import asyncio
+import importlib.util
+import json
+import os
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+
+GATEWAY_MAIN = Path(__file__).resolve().parents[2] / "services" / "cloud-gateway" / "main.py"
+
+
+class FakeWebSocket:
+    """send_json / close 기록용"""
+
+    def __init__(self):
+        self.sent = []
+        self.closed = None
+
+    async def send_json(self, message):
+        self.sent.append(message)
+
+    async def close(self, code=1000, reason=None):
+        self.closed = code
+
+
+class FakeRedis:
+    """해시 + pub/sub 최소 구현 (채널 구독자에게 즉시 전달)"""
+
+    def __init__(self):
+        self.hashes = {}
+        self.subscribers = {}
+
+    def subscribe(self, router):
+        for channel in (router.instance_channel(router.instance_id), router.DASHBOARD_CHANNEL):
+            self.subscribers.setdefault(channel, []).append(router)
+
+    async def hset(self, key, field, value):
+        self.hashes.setdefault(key, {})[field] = value
+
+    async def hget(self, key, field):
+        return self.hashes.get(key, {}).get(field)
+
+    async def hgetall(self, key):
+        return dict(self.hashes.get(key, {}))
+
+    async def hdel(self, key, *fields):
+        for field in fields:
+            self.hashes.get(key, {}).pop(field, None)
+
+    async def publish(self, channel, data):
+        for router in self.subscribers.get(channel, []):
+            await router.handle(json.loads(data))
+
+
+@pytest.fixture(scope="module")
+def gateway_module():
+    spec = importlib.util.spec_from_file_location("cloud_gateway_main", GATEWAY_MAIN)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def gw(gateway_module, monkeypatch, tmp_path):
+    """DB 없이 격리된 게이트웨이 상태"""
+    monkeypatch.setattr(gateway_module, "get_supabase", lambda: None)
+    monkeypatch.setattr(gateway_module.Config, "VERIFY_SIGNATURE", False)
+    monkeypatch.setattr(gateway_module.Config, "RECONNECT_JITTER", 5)
+    monkeypatch.setattr(gateway_module, "pool", gateway_module.ConnectionPool())
+    monkeypatch.setattr(gateway_module, "pending_commands", {})
+    monkeypatch.setattr(gateway_module, "dashboard_connections", [])
+    monkeypatch.setattr(gateway_module, "cluster", gateway_module.ClusterRouter())
+    monkeypatch.setattr(gateway_module, "scheduler", gateway_module.NodeScheduler())
+    monkeypatch.setattr(
+        gateway_module,
+        "warm_restart",
+        gateway_module.WarmRestart(gateway_module.FileSnapshotStore(str(tmp_path / "gw.json"))),
+    )
+    return gateway_module
+
+
+def _hello(node_id, **payload):
+    return {"type": "HELLO", "node_id": node_id, "message_id": "m1", "payload": payload}
+
+
+def _write_snapshot(gw, nodes, saved_at=None):
+    saved_at = saved_at or datetime.now(timezone.utc)
+    gw.warm_restart.store.path.write_text(
+        json.dumps({"saved_at": saved_at.isoformat(), "nodes": nodes, "inflight_commands": {}})
+    )
+
+
+class TestConnectionPool:
+    """ConnectionPool 테스트"""
+
+    async def test_ready_index_orders_by_free_slots(self, gw):
+        pool = gw.ConnectionPool()
+        for node_id in ("n1", "n2", "n3"):
+            await pool.add(node_id, FakeWebSocket(), "s")
+
+        await pool.update_status("n1", "READY", active_tasks=3)
+        await pool.update_status("n2", "BUSY", active_tasks=1)
+        await pool.update_heartbeat("n3", device_count=10, status="READY")
+
+        assert [c.node_id for c in pool.get_ready_nodes()] == ["n3", "n1"]
+        assert [c.node_id for c in pool.get_ready_nodes(limit=1)] == ["n3"]
+
+        await pool.update_status("n3", "READY", active_tasks=gw.Config.MAX_TASKS_PER_NODE)
+        assert [c.node_id for c in pool.get_ready_nodes()] == ["n1"]
+        assert pool.ready_count() == 1
+
+        await pool.remove("n1")
+        assert pool.get_ready_nodes() == []
+
+    async def test_copy_on_write_snapshot(self, gw):
+        pool = gw.ConnectionPool()
+        await pool.add("n1", FakeWebSocket(), "s")
+
+        snapshot = pool.connections()
+        await pool.add("n2", FakeWebSocket(), "s")
+        await pool.remove("n1")
+
+        assert [c.node_id for c in snapshot] == ["n1"]
+        assert [c.node_id for c in pool.connections()] == ["n2"]
+
+    async def test_remove_ignores_replaced_connection(self, gw):
+        pool = gw.ConnectionPool()
+        old_ws, new_ws = FakeWebSocket(), FakeWebSocket()
+        await pool.add("n1", old_ws, "s1")
+        await pool.add("n1", new_ws, "s2")
+
+        # 대체된 이전 연결의 종료 처리가 새 연결을 지우지 않음
+        assert await pool.remove("n1", websocket=old_ws) is False
+        assert (await pool.get("n1")).session_id == "s2"
+        assert old_ws.closed is not None
+
+        assert await pool.remove("n1", websocket=new_ws) is True
+        assert await pool.get("n1") is None
+
+
+class TestHeartbeatWheel:
+    """HeartbeatWheel 테스트"""
+
+    def test_expires_within_one_tick(self, gw):
+        clock = [1000.5]
+        wheel = gw.HeartbeatWheel(timeout=90, slots=16, clock=lambda: clock[0])
+        wheel.touch("n1")
+        wheel.touch("n2")
+
+        clock[0] = 1060.5
+        wheel.touch("n2")  # 마감 연장
+        assert wheel.advance() == []
+
+        clock[0] = 1090.5
+        assert wheel.advance() == []
+        clock[0] = 1091.0
+        assert wheel.advance() == ["n1"]
+
+        clock[0] = 1151.0
+        assert wheel.advance() == ["n2"]
+        assert len(wheel) == 0
+
+    def test_discard_and_stalled_loop(self, gw):
+        clock = [0.0]
+        wheel = gw.HeartbeatWheel(timeout=5, slots=4, clock=lambda: clock[0])
+        wheel.touch("n1")
+        wheel.touch("n2")
+        wheel.discard("n2")
+
+        # 한 바퀴 이상 밀려도 만료 누락 없음
+        clock[0] = 50.0
+        assert wheel.advance() == ["n1"]
+
+    async def test_expired_connection_removed(self, gw, monkeypatch):
+        notified = []
+
+        async def fake_forward(node_id):
+            notified.append(node_id)
+
+        monkeypatch.setattr(gw, "forward_heartbeat_timeout_to_oob", fake_forward)
+        clock = [0.0]
+        gw.pool.deadlines = gw.HeartbeatWheel(timeout=90, clock=lambda: clock[0])
+        ws = FakeWebSocket()
+        await gw.pool.add("n1", ws, "s")
+        await gw.pool.add("n2", FakeWebSocket(), "s")
+
+        clock[0] = 60.0
+        await gw.pool.update_heartbeat("n2", device_count=1)
+        clock[0] = 91.0
+        for conn in gw.pool.expired():
+            await gw.expire_connection(conn)
+
+        assert ws.closed == 4008
+        assert await gw.pool.get("n1") is None
+        assert await gw.pool.get("n2") is not None
+        assert notified == ["n1"]
+
+
+def _node(node_id, active_tasks=0, **fields):
+    return {
+        "node_id": node_id,
+        "status": "READY",
+        "active_tasks": active_tasks,
+        "device_count": 10,
+        **fields,
+    }
+
+
+class TestNodeScheduler:
+    """NodeScheduler 테스트"""
+
+    def test_inflight_counted_until_result(self, gw):
+        clock = [0.0]
+        scheduler = gw.NodeScheduler(policy="least", max_tasks=2, clock=lambda: clock[0])
+        nodes = [_node("n1"), _node("n2", active_tasks=1)]
+
+        # HEARTBEAT 전이라도 배치한 명령 수만큼 부하 반영
+        assert scheduler.select(nodes)["node_id"] == "n1"
+        scheduler.assigned("c1", "n1")
+        scheduler.assigned("c2", "n1")
+        assert scheduler.select(nodes)["node_id"] == "n2"
+        scheduler.assigned("c3", "n2")
+        scheduler.assigned("c4", "n2")
+        assert scheduler.select(nodes) is None
+        assert scheduler.rejections == 1
+
+        clock[0] = 4.0
+        assert scheduler.completed("c1", "n1") == 4.0
+        assert scheduler.completed("c1", "n1") is None
+        assert scheduler.select(nodes)["node_id"] == "n1"
+
+    def test_observe_discards_stale_active_tasks(self, gw):
+        scheduler = gw.NodeScheduler(policy="least", max_tasks=2)
+        scheduler.assigned("c1", "n1")
+        scheduler.observe("n1", active_tasks=2)  # c1 + 외부 작업 1개
+        scheduler.completed("c1", "n1")
+
+        # 다음 HEARTBEAT 전까지 active_tasks=2가 남아 있어도 외부 작업 1개만 반영
+        assert scheduler.free_slots(_node("n1", active_tasks=2)) == 1
+
+    def test_expire_releases_lost_results(self, gw):
+        clock = [0.0]
+        scheduler = gw.NodeScheduler(max_tasks=1, clock=lambda: clock[0])
+        scheduler.assigned("c1", "n1")
+        assert scheduler.free_slots(_node("n1")) == 0
+
+        clock[0] = 100.0
+        assert scheduler.expire(max_age=50) == 1
+        assert scheduler.free_slots(_node("n1")) == 1
+
+    def test_p2c_prefers_lighter_node(self, gw):
+        scheduler = gw.NodeScheduler(policy="p2c", max_tasks=5)
+        nodes = [
+            _node("idle"),
+            _node("loaded", active_tasks=4, resources={"cpu_percent": 100}),
+            _node("empty", device_count=0),
+        ]
+
+        picks = [scheduler.select(nodes)["node_id"] for _ in range(50)]
+
+        assert "loaded" not in picks
+        assert picks.count("idle") > picks.count("empty")
+        assert [n["node_id"] for n in scheduler.pick(nodes, 0)] == ["idle", "empty", "loaded"]
+
+    async def test_broadcast_targets_least_loaded(self, gw):
+        for node_id, active_tasks in (("n1", 3), ("n2", 0), ("n3", gw.Config.MAX_TASKS_PER_NODE)):
+            await gw.pool.add(node_id, FakeWebSocket(), "s")
+            await gw.pool.update_status(node_id, "READY", active_tasks)
+
+        response = await gw.broadcast_command(
+            gw.BroadcastRequest(video_url="https://youtu.be/x", target_node_count=1)
+        )
+
+        assert response.sent_nodes == 1
+        assert len((await gw.pool.get("n2")).websocket.sent) == 1
+        assert gw.scheduler.get_stats()["inflight"] == 1
+
+    async def test_cancel_forwarded_to_node(self, gw):
+        ws = FakeWebSocket()
+        await gw.pool.add("n1", ws, "s")
+
+        result = await gw.cancel_node_command("n1", "cmd-1")
+
+        assert result["sent"] is True
+        assert ws.sent[-1]["type"] == "CANCEL"
+        assert ws.sent[-1]["payload"] == {"command_id": "cmd-1"}
+        with pytest.raises(gw.HTTPException):
+            await gw.cancel_node_command("missing", "cmd-1")
+
+    async def test_cancelled_result_not_marked_failed(self, gw, monkeypatch):
+        completed = []
+
+        async def fake_complete(command_id, status, result=None, error=None):
+            completed.append((command_id, status))
+            return True
+
+        monkeypatch.setattr(gw, "db_complete_command", fake_complete)
+        for command_id, status in (("c1", "CANCELLED"), ("c2", "REJECTED"), ("c3", "SUCCESS")):
+            message = {"payload": {"command_id": command_id, "status": status}}
+            await gw.handle_result("n1", message)
+
+        # CANCELLED는 재시도 대상(FAILED)이 아님, REJECTED는 재시도
+        assert completed == [("c1", "CANCELLED"), ("c2", "FAILED"), ("c3", "COMPLETED")]
+
+
+def _device(slot, status="idle"):
+    return {"slot": slot, "serial": f"SER{slot:03d}", "status": status, "battery_level": None}
+
+
+class TestDeviceSnapshotState:
+    """DeviceSnapshotState 테스트"""
+
+    def test_full_snapshot_forwards_only_changes(self, gw):
+        state = gw.DeviceSnapshotState()
+        devices = [_device(1), _device(2), _device(3)]
+
+        changes, resync = state.apply({"snapshot_seq": 1, "device_snapshot": devices})
+        assert len(changes) == 3 and resync is False
+
+        changes, _ = state.apply(
+            {"snapshot_seq": 2, "device_snapshot": [_device(1), _device(2, "busy")]}
+        )
+        assert [(d["serial"], d["status"]) for d in changes] == [
+            ("SER002", "busy"),
+            ("SER003", "disconnected"),
+        ]
+        assert len(state) == 2
+
+    def test_delta_applied_in_order(self, gw):
+        state = gw.DeviceSnapshotState()
+        state.apply({"snapshot_seq": 5, "device_snapshot": [_device(1), _device(2)]})
+
+        delta = {"base_seq": 5, "added": [_device(3)], "changed": [], "removed": ["SER001"]}
+        changes, resync = state.apply({"snapshot_seq": 6, "device_delta": delta})
+
+        assert resync is False
+        assert [(d["slot"], d["status"]) for d in changes] == [(1, "disconnected"), (3, "idle")]
+        assert sorted(state.devices) == ["SER002", "SER003"]
+
+        # 재전송된 델타는 무시
+        assert state.apply({"snapshot_seq": 6, "device_delta": delta}) == ([], False)
+
+    def test_gap_requests_resync_until_full_snapshot(self, gw):
+        state = gw.DeviceSnapshotState()
+        state.apply({"snapshot_seq": 1, "device_snapshot": [_device(1)]})
+
+        delta = {"base_seq": 2, "added": [], "changed": [_device(1, "busy")], "removed": []}
+        changes, resync = state.apply({"snapshot_seq": 3, "device_delta": delta})
+
+        # 절대 상태인 changed는 반영, 이후 델타도 전체 스냅샷 전까지 resync
+        assert resync is True and changes == [_device(1, "busy")]
+        delta = {"base_seq": 3, "added": [], "changed": [], "removed": []}
+        assert state.apply({"snapshot_seq": 4, "device_delta": delta}) == ([], True)
+
+        state.apply({"snapshot_seq": 5, "device_snapshot": [_device(1, "busy")]})
+        delta = {"base_seq": 5, "added": [], "changed": [], "removed": []}
+        assert state.apply({"snapshot_seq": 6, "device_delta": delta}) == ([], False)
+
+    def test_heartbeat_ack_requests_resync(self, gw, monkeypatch):
+        forwarded = []
+
+        async def fake_heartbeat(node_id, device_snapshot, **kwargs):
+            forwarded.append([d["serial"] for d in device_snapshot])
+            return {"success": True, "pending_commands": []}
+
+        monkeypatch.setattr(gw, "db_process_heartbeat", fake_heartbeat)
+
+        def heartbeat(ws, **payload):
+            ws.send_json({"type": "HEARTBEAT", "payload": {"status": "BUSY", **payload}})
+            return ws.receive_json()["payload"]
+
+        with TestClient(gw.app) as client:
+            with client.websocket_connect("/ws/node") as ws:
+                ws.send_json(_hello("node-1"))
+                assert ws.receive_json()["payload"]["device_delta"] is True
+
+                # 세션 시작 직후 상태 없음 → 델타 거부
+                delta = {"base_seq": 0, "added": [], "changed": [], "removed": []}
+                assert heartbeat(ws, snapshot_seq=1, device_delta=delta)["resync"] is True
+
+                ack = heartbeat(ws, snapshot_seq=2, device_snapshot=[_device(1), _device(2)])
+                assert "resync" not in ack
+                delta = {"base_seq": 2, "added": [], "changed": [_device(2, "busy")], "removed": []}
+                assert "resync" not in heartbeat(ws, snapshot_seq=3, device_delta=delta)
+                assert gw.pool._nodes["node-1"].device_count == 2
+
+        assert forwarded == [[], ["SER001", "SER002"], ["SER002"]]
+
+
+class TestFrameEncoding:
+    """HELLO 프레임 인코딩 협상 테스트"""
+
+    def test_negotiation_falls_back_to_json(self, gw, monkeypatch):
+        monkeypatch.setattr(gw, "MSGPACK_AVAILABLE", False)
+        assert gw.negotiate_encoding(["msgpack", "json"]) == "json"
+        assert gw.negotiate_encoding(None) == "json"
+
+        monkeypatch.setattr(gw, "MSGPACK_AVAILABLE", True)
+        assert gw.negotiate_encoding(["json", "msgpack"]) == "msgpack"  # Gateway 선호 순서
+        monkeypatch.setattr(gw.Config, "FRAME_ENCODINGS", ["json"])
+        assert gw.negotiate_encoding(["msgpack", "json"]) == "json"
+
+    def test_msgpack_frames_after_hello_ack(self, gw, monkeypatch):
+        msgpack = pytest.importorskip("msgpack")
+        monkeypatch.setattr(gw, "MSGPACK_AVAILABLE", True)
+        monkeypatch.setattr(gw, "msgpack", msgpack)
+
+        with TestClient(gw.app) as client:
+            with client.websocket_connect("/ws/node") as ws:
+                ws.send_json(_hello("node-1", encodings=["msgpack", "json"]))
+                assert ws.receive_json()["payload"]["encoding"] == "msgpack"
+
+                heartbeat = {"type": "HEARTBEAT", "payload": {"status": "BUSY"}}
+                ws.send_bytes(msgpack.packb(heartbeat, use_bin_type=True))
+                ack = msgpack.unpackb(ws.receive_bytes(), raw=False)
+                assert ack["type"] == "HEARTBEAT_ACK"
+
+                # JSON 텍스트 프레임도 계속 수신
+                ws.send_json(heartbeat)
+                assert msgpack.unpackb(ws.receive_bytes(), raw=False)["type"] == "HEARTBEAT_ACK"
+
+
+SECRET = "c2VjcmV0LWtleS1mb3ItdGVzdHM="  # Base64
+
+
+class TestFrameSigning:
+    """HELLO 프레임 서명 / 세션 MAC 테스트"""
+
+    @pytest.fixture
+    def signed_gw(self, gw, monkeypatch):
+        lookups = []
+
+        async def fake_secret(node_id):
+            lookups.append(node_id)
+            return SECRET
+
+        monkeypatch.setattr(gw.Config, "VERIFY_SIGNATURE", True)
+        monkeypatch.setattr(gw, "db_get_node_secret", fake_secret)
+        gw.lookups = lookups
+        return gw
+
+    def test_signer_roundtrip(self, gw):
+        signer = gw.FrameSigner(gw.secret_key_bytes(SECRET))
+        body = json.dumps({"type": "HEARTBEAT", "payload": {"status": "한글"}}, ensure_ascii=False)
+
+        frame = signer.sign_text(body)
+        assert json.loads(frame)["mac"]
+        assert signer.verify_text(frame) == body
+        assert signer.verify_text(frame.replace("HEARTBEAT", "HEARTBEAX")) is None
+        assert gw.FrameSigner(b"other").verify_text(frame) is None
+        assert signer.verify_bytes(signer.sign_bytes(b"\x81\xa1a\x01")) == b"\x81\xa1a\x01"
+
+        # 방향별 세션 키 분리
+        node = gw.FrameSigner.for_session(SECRET, "s1", "n1", "node")
+        gateway = gw.FrameSigner.for_session(SECRET, "s1", "n1", "gateway")
+        assert gateway.verify_text(node.sign_text(body)) is None
+
+    def test_session_mac_after_signed_hello(self, signed_gw):
+        gw = signed_gw
+        hello = json.dumps(_hello("node-1", session_mac=True), separators=(",", ":"))
+
+        with TestClient(gw.app) as client:
+            with client.websocket_connect("/ws/node") as ws:
+                ws.send_text(gw.FrameSigner(gw.secret_key_bytes(SECRET)).sign_text(hello))
+                ack = ws.receive_json()["payload"]
+                nonce = ack["session_mac"]["nonce"]
+                node = gw.FrameSigner.for_session(SECRET, ack["session_id"], nonce, "node")
+                gateway = gw.FrameSigner.for_session(SECRET, ack["session_id"], nonce, "gateway")
+
+                heartbeat = json.dumps({"type": "HEARTBEAT", "payload": {"status": "BUSY"}})
+                ws.send_text(node.sign_text(heartbeat))
+                reply = gateway.verify_text(ws.receive_text())
+                assert json.loads(reply)["type"] == "HEARTBEAT_ACK"
+
+                # MAC 없는 프레임 → 연결 종료
+                ws.send_text(heartbeat)
+                with pytest.raises(WebSocketDisconnect) as exc:
+                    ws.receive_text()
+                assert exc.value.code == 4004
+
+        # 시크릿 조회는 HELLO 1회
+        assert gw.lookups == ["node-1"]
+
+    def test_tampered_hello_rejected_and_legacy_accepted(self, signed_gw):
+        gw = signed_gw
+        signer = gw.FrameSigner(gw.secret_key_bytes(SECRET))
+        hello = json.dumps(_hello("node-1"), separators=(",", ":"))
+
+        with TestClient(gw.app) as client:
+            with client.websocket_connect("/ws/node") as ws:
+                ws.send_text(signer.sign_text(hello).replace("node-1", "node-2"))
+                assert ws.receive_json()["payload"]["error_code"] == "AUTH_FAILED"
+
+            # 이전 방식 (payload 서명)
+            legacy = _hello("node-1", hostname="pc")
+            legacy["signature"] = gw.generate_signature(legacy["payload"], SECRET)
+            with client.websocket_connect("/ws/node") as ws:
+                ws.send_json(legacy)
+                ack = ws.receive_json()
+                assert ack["type"] == "HELLO_ACK"
+                assert "session_mac" not in ack["payload"]
+
+
+class TestWarmRestartSnapshot:
+    """스냅샷 저장 / 복원 테스트"""
+
+    async def test_snapshot_roundtrip_and_claim(self, gw):
+        conn = await gw.pool.add("node-1", FakeWebSocket(), "sess-1")
+        conn.node_uuid = "uuid-1"
+        gw.warm_restart.track_command("cmd-1", "node-1")
+        await gw.warm_restart.save()
+
+        restarted = gw.WarmRestart(gw.warm_restart.store)
+        assert await restarted.restore() == 1
+
+        assert restarted.claim_session("node-1", "other") is None
+        entry = restarted.claim_session("node-1", "sess-1")
+        assert entry["node_uuid"] == "uuid-1"
+        assert restarted.claim_session("node-1", "sess-1") is None  # 1회만 재개
+
+        assert restarted.claim_orphaned_result("cmd-1")["node_id"] == "node-1"
+        assert restarted.claim_orphaned_result("cmd-1") is None
+
+    async def test_expired_snapshot_ignored(self, gw):
+        old = datetime.now(timezone.utc) - timedelta(seconds=gw.Config.SESSION_RESUME_TTL + 1)
+        _write_snapshot(gw, [{"node_id": "node-1", "session_id": "sess-1"}], saved_at=old)
+
+        assert await gw.warm_restart.restore() == 0
+        assert gw.warm_restart.claim_session("node-1", "sess-1") is None
+
+    async def test_unclaimed_sessions_disconnected_after_ttl(self, gw, monkeypatch):
+        disconnected = []
+
+        async def fake_disconnect(node_id):
+            disconnected.append(node_id)
+
+        monkeypatch.setattr(gw, "db_disconnect_node", fake_disconnect)
+        nodes = [{"node_id": n, "session_id": f"sess-{n}"} for n in ("node-1", "node-2", "node-3")]
+        _write_snapshot(gw, nodes)
+        await gw.warm_restart.restore()
+        gw.warm_restart.claim_session("node-1", "sess-node-1")
+        await gw.pool.add("node-2", FakeWebSocket(), "new-session")  # 재개 없이 재등록
+
+        assert await gw.warm_restart.expire_sessions() == 0
+
+        gw.warm_restart._resumable_since -= timedelta(seconds=gw.Config.SESSION_RESUME_TTL + 1)
+        assert await gw.warm_restart.expire_sessions() == 1
+        assert disconnected == ["node-3"]
+        assert await gw.warm_restart.expire_sessions() == 0
+
+    async def test_expired_snapshot_nodes_disconnected(self, gw, monkeypatch):
+        disconnected = []
+
+        async def fake_disconnect(node_id):
+            disconnected.append(node_id)
+
+        monkeypatch.setattr(gw, "db_disconnect_node", fake_disconnect)
+        old = datetime.now(timezone.utc) - timedelta(seconds=gw.Config.SESSION_RESUME_TTL + 1)
+        _write_snapshot(gw, [{"node_id": "node-1", "session_id": "sess-1"}], saved_at=old)
+        await gw.warm_restart.restore()
+
+        # 드레인 중에는 다음 인스턴스에 맡김
+        gw.warm_restart.draining = True
+        assert await gw.warm_restart.expire_sessions() == 0
+
+        gw.warm_restart.draining = False
+        assert await gw.warm_restart.expire_sessions() == 1
+        assert disconnected == ["node-1"]
+
+    async def test_unclaimed_sessions_kept_in_next_snapshot(self, gw):
+        _write_snapshot(gw, [{"node_id": "node-1", "session_id": "sess-1"}])
+        await gw.warm_restart.restore()
+
+        snapshot = gw.warm_restart.build_snapshot()
+
+        assert [n["node_id"] for n in snapshot["nodes"]] == ["node-1"]
+
+
+class TestSessionResume:
+    """HELLO 세션 재개 테스트"""
+
+    def test_resume_skips_registration(self, gw, monkeypatch):
+        registered = []
+
+        async def fake_register(node_id, session_id, **kwargs):
+            registered.append(node_id)
+            return {"success": True, "node_uuid": f"uuid-{node_id}"}
+
+        monkeypatch.setattr(gw, "db_register_node_connection", fake_register)
+        _write_snapshot(gw, [{"node_id": "node-1", "session_id": "sess-1", "node_uuid": "u1"}])
+
+        with TestClient(gw.app) as client:
+            with client.websocket_connect("/ws/node") as ws:
+                ws.send_json(_hello("node-1", resume_session_id="sess-1"))
+                ack = ws.receive_json()
+                assert ack["payload"] == {**ack["payload"], "session_id": "sess-1", "resumed": True}
+                assert gw.pool._nodes["node-1"].node_uuid == "u1"
+
+            with client.websocket_connect("/ws/node") as ws:
+                ws.send_json(_hello("node-2", resume_session_id="sess-x"))
+                ack = ws.receive_json()
+                assert ack["payload"]["resumed"] is False
+
+        assert registered == ["node-2"]
+        assert gw.warm_restart.sessions_resumed == 1
+
+
+class TestDrain:
+    """드레인 모드 테스트"""
+
+    def test_drain_hands_off_sessions(self, gw, monkeypatch):
+        disconnected = []
+
+        async def fake_disconnect(node_id):
+            disconnected.append(node_id)
+
+        monkeypatch.setattr(gw, "db_disconnect_node", fake_disconnect)
+
+        with TestClient(gw.app) as client:
+            with client.websocket_connect("/ws/node") as ws:
+                ws.send_json(_hello("node-1"))
+                session_id = ws.receive_json()["payload"]["session_id"]
+
+                result = client.post("/api/admin/drain").json()
+                assert result["nodes_notified"] == 1
+
+                hint = ws.receive_json()
+                assert hint["type"] == "RECONNECT"
+                assert hint["payload"]["session_id"] == session_id
+                assert 1000 <= hint["payload"]["reconnect_after_ms"] <= 6000
+
+            # 드레인 중에는 새 연결/동기 명령 거부
+            with client.websocket_connect("/ws/node") as ws:
+                assert ws.receive_json()["type"] == "RECONNECT"
+            response = client.post("/api/command", json={"node_id": "node-1", "action": "PING"})
+            assert response.status_code == 503
+            assert client.get("/health").json()["status"] == "draining"
+
+        assert disconnected == []
+        snapshot = json.loads(gw.warm_restart.store.path.read_text())
+        assert [n["session_id"] for n in snapshot["nodes"]] == [session_id]
+
+    def test_undrain_resumes_accepting(self, gw):
+        with TestClient(gw.app) as client:
+            with client.websocket_connect("/ws/node") as ws:
+                ws.send_json(_hello("node-1"))
+                session_id = ws.receive_json()["payload"]["session_id"]
+
+                client.post("/api/admin/drain")
+                assert ws.receive_json()["type"] == "RECONNECT"
+
+            assert client.post("/api/admin/undrain").json() == {
+                "draining": False,
+                "undrained": True,
+            }
+            assert client.get("/health").json()["status"] == "ok"
+
+            # RECONNECT를 받은 노드는 돌아오면 세션 재개
+            with client.websocket_connect("/ws/node") as ws:
+                ws.send_json(_hello("node-1", resume_session_id=session_id))
+                ack = ws.receive_json()
+                assert ack["type"] == "HELLO_ACK"
+                assert ack["payload"]["resumed"] is True
+
+            assert client.post("/api/admin/undrain").json()["undrained"] is False
+
+
+class TestClusterRouter:
+    """멀티 인스턴스 라우팅 테스트"""
+
+    @pytest.fixture
+    def routers(self, gw):
+        redis = FakeRedis()
+        a = gw.ClusterRouter(redis, instance_id="a")
+        b = gw.ClusterRouter(redis, instance_id="b")
+        redis.subscribe(a)
+        redis.subscribe(b)
+        return a, b
+
+    async def test_fleet_view_and_ownership(self, gw, routers):
+        a, b = routers
+        conn = await gw.pool.add("node-1", FakeWebSocket(), "sess-1")
+        await b.register(conn)
+
+        stale = gw.NodeConnection("node-2", FakeWebSocket(), "sess-2")
+        stale.last_heartbeat -= timedelta(seconds=gw.Config.HEARTBEAT_TIMEOUT + 1)
+        await a.register(stale)
+
+        nodes = await a.list_nodes()
+        assert [(n["node_id"], n["instance_id"]) for n in nodes] == [("node-1", "b")]
+        assert await a.get_node("node-2") is None
+
+        await a.release("node-1")  # 소유자가 아니면 유지
+        assert await a.get_node("node-1") is not None
+        await b.release("node-1")
+        assert await a.get_node("node-1") is None
+
+    async def test_command_routed_to_owner_and_result_returned(self, gw, routers):
+        a, b = routers
+        ws = FakeWebSocket()
+        conn = await gw.pool.add("node-1", ws, "sess-1")
+        await b.register(conn)
+
+        command = gw.build_command("cmd-1", "PING", {"type": "ALL_DEVICES"}, {})
+        future = asyncio.get_event_loop().create_future()
+        gw.pending_commands["cmd-1"] = future
+
+        assert await a.send("node-1", command, track_result=True) is True
+        assert ws.sent == [command]
+        assert a.routed_out == 1 and b.routed_in == 1
+
+        # 소유 인스턴스가 받은 RESULT는 요청 인스턴스의 pending future로 전달
+        assert await b.forward_result("cmd-1", {"command_id": "cmd-1", "status": "SUCCESS"})
+        assert future.result()["status"] == "SUCCESS"
+        assert await b.forward_result("cmd-1", {}) is False
+
+    async def test_remote_commands_dropped_on_disconnect_or_expiry(self, gw, routers):
+        a, b = routers
+        for node_id in ("node-1", "node-2"):
+            await b.register(await gw.pool.add(node_id, FakeWebSocket(), f"sess-{node_id}"))
+
+        for command_id, node_id, timeout in (("c1", "node-1", 300), ("c2", "node-2", 10)):
+            command = gw.build_command(
+                command_id, "PING", {"type": "ALL_DEVICES"}, {}, timeout=timeout
+            )
+            assert await a.send(node_id, command, track_result=True)
+        assert set(b._remote_commands) == {"c1", "c2"}
+
+        # 응답 전에 노드가 끊기면 기록 제거
+        await b.release("node-1")
+        assert set(b._remote_commands) == {"c2"}
+        assert await b.forward_result("c1", {}) is False
+
+        # 요청 측 대기 시간이 지난 기록은 다음 전달 때 정리
+        origin, node_id, expires_at = b._remote_commands["c2"]
+        assert expires_at - gw.time.monotonic() <= 10 + gw.Config.ROUTE_TIMEOUT
+        b._remote_commands["c2"] = (origin, node_id, gw.time.monotonic() - 1)
+        command = gw.build_command("c3", "PING", {"type": "ALL_DEVICES"}, {})
+        assert await a.send("node-2", command, track_result=True)
+        assert set(b._remote_commands) == {"c3"}
+
+    def test_instance_id_unique_per_worker(self, gw, monkeypatch):
+        monkeypatch.setenv("GATEWAY_INSTANCE_ID", "gw-1")
+        monkeypatch.setenv("GATEWAY_WORKERS", "1")
+        assert gw._instance_id() == "gw-1"
+
+        monkeypatch.setenv("GATEWAY_WORKERS", "4")
+        assert gw._instance_id() == f"gw-1-{os.getpid()}"
+
+    async def test_send_to_unknown_node_fails(self, gw, routers):
+        a, _ = routers
+        assert await a.send("missing", {"type": "COMMAND"}) is False
+
+    async def test_dashboard_events_fan_out(self, gw, routers):
+        a, b = routers
+        dashboard = FakeWebSocket()
+        gw.dashboard_connections.append(dashboard)
+
+        await b.publish_dashboard({"type": "NODE_UPDATE", "node_id": "node-1"})
+        await a.publish_dashboard({"type": "NODE_UPDATE", "node_id": "node-2"})
+
+        # 자기 인스턴스 이벤트는 broadcast_to_dashboards가 직접 전송하므로 중복 전달하지 않음
+        assert dashboard.sent == [
+            {"type": "NODE_UPDATE", "node_id": "node-1"},
+            {"type": "NODE_UPDATE", "node_id": "node-2"},
+        ]
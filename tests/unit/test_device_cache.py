@@ -0,0 +1,279 @@
+"""
+DeviceRegistryCache 단위 테스트
+
+- 전체 로드 (페이지 단위) 및 색인 교집합 조회
+- Realtime 변경 이벤트 반영
+- 체크섬 재동기화
+- DeviceRegistry 캐시 연동 (read-through / write-through)
+- start_device_registry() / stop_device_registry() 라이프사이클
+"""
+
+import pytest
+
+import shared.device_cache as device_cache
+import shared.device_registry as device_registry
+from shared.device_cache import DeviceRegistryCache, row_hash
+from shared.device_registry import DeviceInfo, DeviceRegistry
+
+
+class FakeResult:
+    def __init__(self, data):
+        self.data = data
+
+
+class FakeQuery:
+    """select / eq / order / range / update / single 최소 구현"""
+
+    def __init__(self, db, table):
+        self.db = db
+        self.table = table
+        self.filters = []
+        self.window = None
+        self.update_data = None
+        self.one = False
+
+    def select(self, *_):
+        return self
+
+    def eq(self, column, value):
+        self.filters.append((column, value))
+        return self
+
+    def order(self, column):
+        self.order_by = column
+        return self
+
+    def range(self, start, end):
+        self.window = (start, end)
+        return self
+
+    def single(self):
+        self.one = True
+        return self
+
+    def update(self, data):
+        self.update_data = data
+        return self
+
+    def execute(self):
+        self.db.calls += 1
+        rows = [r for r in self.db.rows if all(r.get(col) == val for col, val in self.filters)]
+        if self.update_data is not None:
+            for row in rows:
+                row.update(self.update_data)
+        rows = sorted(rows, key=lambda r: r["id"])
+        if self.window:
+            rows = rows[self.window[0] : self.window[1] + 1]
+        if self.one:
+            return FakeResult(dict(rows[0]) if rows else None)
+        return FakeResult([dict(r) for r in rows])
+
+
+class FakeSupabase:
+    def __init__(self, rows):
+        self.rows = rows
+        self.calls = 0
+
+    def table(self, name):
+        return FakeQuery(self, name)
+
+    def rpc(self, name):
+        """device_registry_checksum()"""
+        checksum = sum(row_hash(r["id"], r.get("updated_at")) for r in self.rows)
+        return FakeRpc([{"row_count": len(self.rows), "checksum": str(checksum)}])
+
+
+class FakeRpc:
+    def __init__(self, data):
+        self.data = data
+
+    def execute(self):
+        return FakeResult(self.data)
+
+
+def _row(i, status="idle", ws="WS01", board=1):
+    slot = i % 20 + 1
+    return {
+        "id": f"00000000-0000-0000-0000-{i:012d}",
+        "serial_number": f"SER{i:05d}",
+        "hierarchy_id": f"{ws}-PB{board:02d}-S{slot:02d}",
+        "workstation_id": ws,
+        "phoneboard_id": f"{ws}-PB{board:02d}",
+        "slot_number": slot,
+        "device_group": "A" if slot % 2 else "B",
+        "status": status,
+        "updated_at": "2026-01-21T03:04:05.123456+00:00",
+    }
+
+
+@pytest.fixture
+def db():
+    rows = [_row(i, status="busy" if i % 3 == 0 else "idle", board=1 + i // 20) for i in range(40)]
+    rows.append(_row(99, status="idle", ws="WS02"))
+    return FakeSupabase(rows)
+
+
+class TestDeviceRegistryCache:
+    """DeviceRegistryCache 테스트"""
+
+    def test_load_pages_and_query(self, db):
+        cache = DeviceRegistryCache(client=db)
+        cache.PAGE_SIZE = 16
+
+        devices = cache.query(workstation_id="WS01", status="idle", group="A")
+
+        assert len(cache) == 41
+        assert db.calls == 3  # 16 + 16 + 9
+        expected = sorted(
+            r["hierarchy_id"]
+            for r in db.rows
+            if r["workstation_id"] == "WS01" and r["status"] == "idle" and r["device_group"] == "A"
+        )
+        assert [d.hierarchy_id for d in devices] == expected
+        assert cache.query(phoneboard_id="WS01-PB02", limit=3)[0].hierarchy_id == "WS01-PB02-S01"
+        assert cache.get_by_serial("SER00099").workstation_id == "WS02"
+        assert cache.status_counts("WS02") == {"idle": 1, "busy": 0, "total": 1}
+
+    def test_realtime_changes_update_indexes(self, db):
+        cache = DeviceRegistryCache(client=db)
+        cache.load()
+
+        updated = {**_row(1), "status": "busy", "updated_at": "2026-01-21T04:00:00+00:00"}
+        cache.apply_change({"data": {"type": "UPDATE", "record": updated, "old_record": {}}})
+        cache.apply_change({"data": {"type": "DELETE", "old_record": {"id": _row(2)["id"]}}})
+        cache.apply_change({"data": {"type": "INSERT", "record": _row(500, ws="WS03")}})
+
+        busy_ids = {d.id for d in cache.query(status="busy")}
+        assert _row(1)["id"] in busy_ids
+        assert cache.get_by_serial("SER00002") is None
+        assert [d.serial_number for d in cache.query(workstation_id="WS03")] == ["SER00500"]
+
+    def test_reconcile_reloads_only_on_mismatch(self, db):
+        cache = DeviceRegistryCache(client=db)
+        cache.load()
+
+        assert cache.reconcile() is False
+
+        # Realtime으로 전달되지 않은 변경
+        db.rows[0]["status"] = "offline"
+        db.rows[0]["updated_at"] = "2026-01-22T00:00:00+00:00"
+        assert cache.reconcile() is True
+        assert cache.get(db.rows[0]["id"]).status == "offline"
+        assert cache.reloads == 2
+
+    def test_lazy_reconcile_without_background_task(self, db):
+        clock = [0.0]
+        cache = DeviceRegistryCache(client=db, reconcile_interval=60, clock=lambda: clock[0])
+        cache.query()
+        db.rows.append(_row(600, ws="WS04"))
+
+        clock[0] = 30.0
+        assert cache.query(workstation_id="WS04") == []
+        clock[0] = 61.0
+        assert len(cache.query(workstation_id="WS04")) == 1
+
+
+class TestDeviceRegistryWithCache:
+    """DeviceRegistry 캐시 연동 테스트"""
+
+    @pytest.fixture
+    def registry(self, db, monkeypatch):
+        monkeypatch.setattr(device_registry, "get_client", lambda: db)
+        return DeviceRegistry(cache=DeviceRegistryCache(client=db))
+
+    async def test_reads_served_from_cache(self, registry, db):
+        await registry.get_devices(status="idle")
+        calls = db.calls
+
+        device = await registry.get_device_by_hierarchy("WS01-PB01-S02")
+        group_a, group_b = await registry.get_batch_groups(workstation_id="WS01")
+
+        assert device.serial_number == "SER00001"
+        assert group_a and group_b
+        assert db.calls == calls
+
+    async def test_reads_return_detached_device_info(self, registry):
+        device = await registry.get_device_by_serial("SER00001")
+        devices = await registry.get_devices(workstation_id="WS02")
+
+        registry.cache.apply_change(
+            {"data": {"type": "UPDATE", "record": {**_row(1), "status": "busy"}, "old_record": {}}}
+        )
+
+        assert type(device) is DeviceInfo
+        assert all(type(d) is DeviceInfo for d in devices)
+        assert device.status == "idle"
+        assert (await registry.get_device_by_hierarchy(device.hierarchy_id)).status == "busy"
+
+    async def test_status_change_written_through(self, registry):
+        await registry.get_devices()
+
+        assert await registry.set_device_status("SER00001", "busy")
+
+        device = await registry.get_device_by_serial("SER00001")
+        assert device.status == "busy"
+        assert (await registry.get_device_stats())["busy"] == 15
+
+
+class FakeChannel:
+    def __init__(self):
+        self.callback = None
+        self.subscribed = False
+
+    def on_postgres_changes(self, event, schema, table, callback):
+        self.callback = callback
+
+    async def subscribe(self):
+        self.subscribed = True
+
+    async def unsubscribe(self):
+        self.subscribed = False
+
+
+class FakeRealtime:
+    def __init__(self):
+        self.channels = []
+
+    def channel(self, name):
+        self.channels.append(FakeChannel())
+        return self.channels[-1]
+
+
+class TestRegistryLifecycle:
+    """start_device_registry() / stop_device_registry() 테스트"""
+
+    @pytest.fixture
+    def realtime(self, db, monkeypatch):
+        realtime = FakeRealtime()
+
+        async def get_async_client():
+            return realtime
+
+        monkeypatch.setattr(device_registry, "_registry", None)
+        monkeypatch.setattr(device_registry, "get_client", lambda: db)
+        monkeypatch.setattr(device_registry, "get_async_client", get_async_client)
+        monkeypatch.setattr(device_cache, "get_client", lambda: db)
+        return realtime
+
+    async def test_start_subscribes_and_loads(self, realtime, monkeypatch):
+        monkeypatch.setenv("DEVICE_REGISTRY_CACHE", "true")
+
+        registry = await device_registry.start_device_registry()
+        cache = registry.cache
+
+        assert registry is device_registry.get_device_registry()
+        assert cache.loaded and cache.get_stats()["realtime"]
+        channel = realtime.channels[0]
+        assert channel.subscribed and channel.callback == cache.apply_change
+
+        await device_registry.stop_device_registry()
+
+        assert not channel.subscribed
+        assert not cache.get_stats()["realtime"]
+
+    async def test_noop_without_cache(self, realtime, monkeypatch):
+        monkeypatch.delenv("DEVICE_REGISTRY_CACHE", raising=False)
+
+        assert await device_registry.start_device_registry() is None
+        await device_registry.stop_device_registry()
+        assert realtime.channels == []
@@ -0,0 +1,262 @@
+"""
+DeviceMetrics 단위 테스트
+
+- 컴팩트 테이블 갱신 / 조회 / 제거
+- 노드 / 워크스테이션 / VLAN 집계
+- Prometheus 노출 크기가 기기 수와 무관
+"""
+
+from unittest.mock import MagicMock
+
+import pytest
+from prometheus_client import CollectorRegistry, generate_latest
+
+from shared.monitoring.device_metrics import DeviceMetrics
+
+
+def _fill(metrics: DeviceMetrics, count: int, nodes: int = 4) -> None:
+    for i in range(count):
+        metrics.update(
+            f"SERIAL{i:05d}",
+            node_id=f"PC{i % nodes:02d}",
+            workstation_id=f"WS{i % nodes:02d}",
+            vlan_id=10 + i % 2,
+            status="busy" if i % 3 == 0 else "idle",
+            battery_level=(i * 7) % 101,
+            battery_temp=25 + (i % 20),
+        )
+
+
+class TestDeviceTable:
+    """기기 테이블 테스트"""
+
+    def test_update_and_get(self):
+        metrics = DeviceMetrics(registry=None)
+
+        metrics.update("S1", node_id="PC01", status="idle", battery_level=85)
+        metrics.update("S1", battery_temp=36.5)
+
+        device = metrics.get_device("S1")
+        assert device["node_id"] == "PC01"
+        assert device["status"] == "idle"
+        assert device["battery_level"] == 85
+        assert device["battery_temp"] == 36.5
+        assert device["vlan_id"] == "unknown"
+
+    def test_remove_reuses_row(self):
+        metrics = DeviceMetrics(registry=None)
+        metrics.update("S1", node_id="PC01", battery_level=50)
+
+        assert metrics.remove("S1") is True
+        assert metrics.get_device("S1") is None
+        assert metrics.remove("S1") is False
+
+        metrics.update("S2", status="online")
+        assert len(metrics) == 1
+        assert len(metrics._serials) == 1
+        assert metrics.get_device("S2")["battery_level"] is None
+
+    def test_list_devices_filters(self):
+        metrics = DeviceMetrics(registry=None)
+        _fill(metrics, 12)
+
+        busy = metrics.list_devices(node_id="PC00", status="busy")
+
+        assert [d["serial_number"] for d in busy] == ["SERIAL00000"]
+        assert metrics.list_devices(node_id="PC99") == []
+        assert len(metrics.list_devices(limit=5, offset=10)) == 2
+
+
+class TestAggregation:
+    """그룹 집계 테스트"""
+
+    def test_summarize_by_node(self):
+        metrics = DeviceMetrics(registry=None)
+        metrics.update("S1", node_id="PC01", status="idle", battery_level=80)
+        metrics.update("S2", node_id="PC01", status="busy", battery_level=40)
+        metrics.update("S3", node_id="PC02", status="offline")
+
+        summary = metrics.summarize("node")
+
+        assert summary["PC01"] == {
+            "total": 2,
+            "status": {"idle": 1, "busy": 1},
+            "battery_avg": 60.0,
+            "temperature_avg": None,
+        }
+        assert summary["PC02"]["status"] == {"offline": 1}
+
+    def test_unknown_scope(self):
+        with pytest.raises(ValueError):
+            DeviceMetrics(registry=None).summarize("rack")
+
+    def test_record_task_uses_node_label(self):
+        registry = CollectorRegistry()
+        metrics = DeviceMetrics(registry=registry)
+        metrics.update("S1", node_id="PC01")
+
+        metrics.record_task("S1", "youtube_watch", "success", duration_sec=12.0)
+        metrics.record_task("S9", "youtube_watch", "failure")
+
+        assert (
+            registry.get_sample_value(
+                "device_group_tasks_total",
+                {"node_id": "PC01", "task_type": "youtube_watch", "status": "success"},
+            )
+            == 1
+        )
+        assert (
+            registry.get_sample_value(
+                "device_group_tasks_total",
+                {"node_id": "unknown", "task_type": "youtube_watch", "status": "failure"},
+            )
+            == 1
+        )
+        assert (
+            registry.get_sample_value(
+                "device_group_task_duration_seconds_count", {"task_type": "youtube_watch"}
+            )
+            == 1
+        )
+
+
+class TestPrometheusExposition:
+    """Prometheus 노출 테스트"""
+
+    def test_gauge_histogram_buckets(self):
+        registry = CollectorRegistry()
+        metrics = DeviceMetrics(registry=registry)
+        metrics.update("S1", node_id="PC01", battery_level=5, battery_temp=41.0)
+        metrics.update("S2", node_id="PC01", battery_level=90, battery_temp=30.0)
+
+        labels = {"scope": "node", "group": "PC01"}
+        assert (
+            registry.get_sample_value(
+                "device_group_battery_percent_bucket", {**labels, "le": "10.0"}
+            )
+            == 1
+        )
+        assert (
+            registry.get_sample_value(
+                "device_group_battery_percent_bucket", {**labels, "le": "+Inf"}
+            )
+            == 2
+        )
+        assert registry.get_sample_value("device_group_battery_percent_gsum", labels) == 95
+        assert (
+            registry.get_sample_value(
+                "device_group_temperature_celsius_bucket", {**labels, "le": "30.0"}
+            )
+            == 1
+        )
+        assert registry.get_sample_value("device_group_count", {**labels, "status": "unknown"}) == 2
+
+    def test_scrape_size_independent_of_fleet(self):
+        """기기 수가 늘어도 그룹 수가 같으면 노출 시계열 수는 동일"""
+        small, large = CollectorRegistry(), CollectorRegistry()
+        _fill(DeviceMetrics(registry=small), 40)
+        _fill(DeviceMetrics(registry=large), 4000)
+
+        small_lines = generate_latest(small).count(b"\n")
+        large_lines = generate_latest(large).count(b"\n")
+
+        assert small_lines == large_lines
+        assert b"SERIAL" not in generate_latest(large)
+
+    def test_unassigned_devices_skip_workstation_and_vlan_scopes(self):
+        registry = CollectorRegistry()
+        metrics = DeviceMetrics(registry=registry)
+        metrics.update("S1", node_id="PC01", status="idle")
+        metrics.update("S2", node_id="PC01", workstation_id="WS01", vlan_id=3, status="idle")
+
+        def count(scope, group):
+            return registry.get_sample_value(
+                "device_group_count", {"scope": scope, "group": group, "status": "idle"}
+            )
+
+        assert count("node", "PC01") == 2
+        assert count("workstation", "WS01") == 1
+        assert count("vlan", "3") == 1
+        assert count("workstation", "unknown") is None
+        assert count("vlan", "unknown") is None
+
+
+class TestRepositoryFeeds:
+    """services/api DeviceRepository / JobRepository → DeviceMetrics 연동 테스트"""
+
+    @pytest.fixture
+    def db(self, monkeypatch):
+        from services.api.api import db
+
+        client = MagicMock()
+        tables = {}
+
+        def table(name):
+            return tables.setdefault(name, MagicMock())
+
+        client.table.side_effect = table
+        client.tables = tables
+        metrics = DeviceMetrics(registry=None)
+        monkeypatch.setattr(db, "get_supabase_client", lambda: client)
+        monkeypatch.setattr(db, "get_device_metrics", lambda: metrics)
+        db.client, db.metrics = client, metrics
+        return db
+
+    async def test_upsert_feeds_workstation_and_vlan(self, db):
+        db.client.table("devices").upsert.return_value.execute.return_value = MagicMock(
+            data=[{"serial_number": "S1", "pc_id": 1, "workstation_id": "WS01"}]
+        )
+        db.client.table("workstations").select.return_value.execute.return_value = MagicMock(
+            data=[{"id": "WS01", "vlan_id": 3}]
+        )
+
+        await db.DeviceRepository().upsert("S1", pc_id=1)
+
+        device = db.metrics.get_device("S1")
+        assert (device["node_id"], device["workstation_id"], device["vlan_id"]) == (
+            "1",
+            "WS01",
+            "3",
+        )
+
+    async def test_heartbeat_unknown_serial_not_tracked(self, db):
+        update = db.client.table("devices").update.return_value
+        update.eq.return_value.execute.return_value = MagicMock(data=[])
+
+        assert await db.DeviceRepository().heartbeat("GHOST", {"battery_level": 50}) is False
+        assert db.metrics.get_device("GHOST") is None
+
+        update.eq.return_value.execute.return_value = MagicMock(
+            data=[{"serial_number": "S1", "pc_id": 1}]
+        )
+
+        assert await db.DeviceRepository().heartbeat("S1", {"battery_level": 50}) is True
+        assert db.metrics.get_device("S1")["battery_level"] == 50
+
+    async def test_job_results_recorded_per_node(self, db):
+        db.metrics.update("S1", node_id="PC01")
+        db.client.table("devices").select.return_value.eq.return_value.execute.return_value = (
+            MagicMock(data=[{"serial_number": "S1"}])
+        )
+        db.client.table("jobs").update.return_value.eq.return_value.execute.return_value = (
+            MagicMock(
+                data=[
+                    {
+                        "id": 7,
+                        "device_id": 42,
+                        "started_at": "2026-01-20T12:00:00+00:00",
+                        "completed_at": "2026-01-20T12:00:30+00:00",
+                    }
+                ]
+            )
+        )
+
+        jobs = db.JobRepository()
+        assert await jobs.complete(7, watch_time=30)
+        assert await jobs.fail(7, "timeout")
+
+        labels = {"node_id": "PC01", "task_type": "youtube_watch"}
+        tasks = db.metrics.tasks_total
+        assert tasks.labels(**labels, status="success")._value.get() == 1
+        assert tasks.labels(**labels, status="failure")._value.get() == 1
+        assert db.metrics.task_duration.labels(task_type="youtube_watch")._sum.get() == 60
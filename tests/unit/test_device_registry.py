@@ -6,10 +6,15 @@ DeviceRegistry 단위 테스트
 - _generate_hierarchy_id() - ID 생성
 - DeviceInfo, PhoneboardInfo, WorkstationInfo 데이터클래스
 - DeviceStatus 상태 전이
+- bulk_register_devices() - 일괄 upsert (chunk / 컬럼 구성별 요청)
 """
 
+import functools
 from datetime import datetime, timezone
 
+import pytest
+
+import shared.device_registry as device_registry
 from shared.device_registry import (
     DeviceGroup,
     DeviceInfo,
@@ -20,6 +25,25 @@ from shared.device_registry import (
 )
 
 
+class FakeUpsertClient:
+    """table().upsert(rows).execute() 기록 (id 부여 후 행 반환)"""
+
+    def __init__(self):
+        self.requests = []
+
+    def table(self, name):
+        return self
+
+    def upsert(self, rows, on_conflict=None):
+        rows = rows if isinstance(rows, list) else [rows]
+        self.requests.append((on_conflict, [dict(r) for r in rows]))
+        self._data = [{"id": f"id-{r['serial_number']}", **r} for r in rows]
+        return self
+
+    def execute(self):
+        return type("Result", (), {"data": self._data})()
+
+
 class TestDeviceInfo:
     """DeviceInfo 데이터클래스 테스트"""
 
@@ -333,3 +357,50 @@ class TestDeviceCapacity:
 
         per_ws = phoneboards * slots
         assert per_ws == 60
+
+
+class TestBulkRegister:
+    """bulk_register_devices() 일괄 upsert 테스트"""
+
+    @pytest.fixture
+    def client(self, monkeypatch):
+        client = FakeUpsertClient()
+        monkeypatch.setattr(device_registry, "get_client", lambda: client)
+        return client
+
+    async def test_single_request_per_chunk(self, client, monkeypatch):
+        """수백 대 등록이 chunk 수만큼의 요청으로 처리"""
+        chunked = functools.partial(device_registry.bulk_upsert_rows, chunk_size=100)
+        monkeypatch.setattr(device_registry, "bulk_upsert_rows", chunked)
+        devices = [
+            {
+                "serial": f"SER{i:04d}",
+                "workstation": "WS01",
+                "board": i // 20 + 1,
+                "slot": i % 20 + 1,
+            }
+            for i in range(250)
+        ]
+
+        results = await DeviceRegistry().bulk_register_devices(devices)
+
+        assert [len(rows) for _, rows in client.requests] == [100, 100, 50]
+        assert {conflict for conflict, _ in client.requests} == {"serial_number"}
+        assert [d.serial_number for d in results] == [d["serial"] for d in devices]
+        assert results[21].hierarchy_id == "WS01-PB02-S02"
+        assert results[21].device_group == "B"
+        assert results[0].id == "id-SER0000"
+
+    async def test_groups_by_columns_and_dedupes_serials(self, client):
+        """model 유무로 요청 분리 (빠진 컬럼 NULL 덮어쓰기 방지), 중복 시리얼은 마지막 항목"""
+        devices = [
+            {"serial": "A", "workstation": "WS01", "board": 1, "slot": 1, "model": "SM-G960N"},
+            {"serial": "B", "workstation": "WS01", "board": 1, "slot": 2},
+            {"serial": "A", "workstation": "WS01", "board": 1, "slot": 3, "model": "SM-G960N"},
+        ]
+
+        results = await DeviceRegistry().bulk_register_devices(devices)
+
+        assert len(client.requests) == 2
+        assert all(len({tuple(sorted(row)) for row in rows}) == 1 for _, rows in client.requests)
+        assert [(d.serial_number, d.slot_number) for d in results] == [("A", 3), ("B", 2)]
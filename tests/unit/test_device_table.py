@@ -0,0 +1,81 @@
+"""
+DeviceTable 단위 테스트
+
+- 일괄 변환 / 행 단위 upsert 결과 일치
+- 제자리 갱신 / 삭제 표시와 기존 뷰
+- 문자열 인턴
+"""
+
+from datetime import datetime, timezone
+
+from shared.device_registry import device_info_from_row
+from shared.device_table import DeviceTable
+
+
+def _row(i, status="idle", heartbeat="2026-01-21T03:04:05.123456+00:00"):
+    slot = i % 20 + 1
+    return {
+        "id": f"00000000-0000-0000-0000-{i:012d}",
+        "serial_number": f"SER{i:05d}",
+        "hierarchy_id": f"WS01-PB01-S{slot:02d}",
+        "workstation_id": "WS01",
+        "phoneboard_id": "WS01-PB01",
+        "slot_number": slot,
+        "device_group": "A" if slot % 2 else "B",
+        "status": status,
+        "model": "SM-G960N" if i % 2 else None,
+        "last_heartbeat": heartbeat if i % 3 else None,
+    }
+
+
+class TestDeviceTable:
+    """DeviceTable 테스트"""
+
+    def test_bulk_build_matches_upsert_and_dataclass(self):
+        rows = [_row(i) for i in range(10)]
+        bulk = DeviceTable.from_rows(rows)
+        incremental = DeviceTable()
+        for row in rows:
+            incremental.upsert(row)
+
+        for row in rows:
+            expected = device_info_from_row(row)
+            assert bulk.view(bulk.position(row["id"])).to_info() == expected
+            assert incremental.view(incremental.position(row["id"])) == expected
+
+        assert len(bulk) == len(incremental) == 10
+
+    def test_duplicate_ids_keep_last_row(self):
+        table = DeviceTable.from_rows([_row(1), _row(1, status="busy")])
+
+        assert len(table) == 1
+        assert [d.status for d in table.rows()] == ["busy"]
+
+    def test_update_in_place_and_delete_keep_views(self):
+        table = DeviceTable.from_rows([_row(1), _row(2)])
+        view = table.view(table.position(_row(1)["id"]))
+
+        pos = table.upsert(_row(1, status="busy", heartbeat="2026-01-21T04:00:00"))
+
+        assert pos == view._pos
+        assert view.status == "busy"
+        assert view.last_heartbeat == datetime(2026, 1, 21, 4, 0, tzinfo=timezone.utc)
+
+        assert table.delete(_row(1)["id"]) is True
+        assert table.delete(_row(1)["id"]) is False
+        assert table.position(_row(1)["id"]) is None
+        assert view.serial_number == "SER00001"
+        assert [d.serial_number for d in table.rows()] == ["SER00002"]
+
+        # 재삽입은 새 위치 (삭제된 뷰가 다른 디바이스를 가리키지 않음)
+        assert table.upsert(_row(1)) == 2
+
+    def test_repeated_strings_are_interned(self):
+        rows = [_row(i) for i in range(40)]
+        table = DeviceTable.from_rows(rows)
+
+        assert table.statuses.values == [None, "idle"]
+        assert table.groups.values == [None, "A", "B"]
+        assert table.workstations.values[1:] == ["WS01"]
+        assert table.view(0).model is None
+        assert table.view(1).model == "SM-G960N"
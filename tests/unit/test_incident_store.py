@@ -0,0 +1,155 @@
+"""
+인시던트 저장소 단위 테스트
+
+- SQLiteIncidentStore 저장 / 조회 / 인덱스 쿼리
+- IncidentTracker write-behind 및 재시작 후 복원
+- hot set 크기 제한
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from shared.monitoring.incident_store import SQLiteIncidentStore
+from shared.monitoring.runbook import (
+    AlertLevel,
+    IncidentStatus,
+    IncidentTracker,
+    RecoveryLevel,
+)
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "incidents.db")
+
+
+class TestSQLiteIncidentStore:
+    """SQLiteIncidentStore 테스트"""
+
+    def test_save_and_get_roundtrip(self):
+        store = SQLiteIncidentStore(":memory:")
+        now = datetime.now(timezone.utc).isoformat()
+        incident = {
+            "id": "INC-20260121-0007",
+            "seq": 7,
+            "title": "Node down",
+            "description": "PC01",
+            "status": "detected",
+            "level": "L1",
+            "created_at": now,
+            "updated_at": now,
+            "affected_services": ["node-runner"],
+        }
+        event = {
+            "incident_id": incident["id"],
+            "seq": 0,
+            "timestamp": now,
+            "event_type": "detected",
+            "message": "Incident detected",
+            "level": "warning",
+            "metadata": {"node": "PC01"},
+        }
+
+        store.save([incident], [event])
+        store.save([incident], [event])  # 재시도해도 이벤트 중복 없음
+
+        row = store.get(incident["id"])
+        assert row["affected_services"] == ["node-runner"]
+        assert len(row["timeline"]) == 1
+        assert row["timeline"][0]["metadata"] == {"node": "PC01"}
+        assert store.max_sequence() == 7
+
+    def test_query_filters(self):
+        store = SQLiteIncidentStore(":memory:")
+        base = datetime.now(timezone.utc)
+        rows = []
+        for i, status in enumerate(["detected", "resolved", "escalated", "resolved"]):
+            ts = (base - timedelta(hours=i * 10)).isoformat()
+            rows.append(
+                {
+                    "id": f"INC-X-{i:04d}",
+                    "seq": i,
+                    "title": f"t{i}",
+                    "status": status,
+                    "level": "L1",
+                    "created_at": ts,
+                    "updated_at": ts,
+                }
+            )
+        store.save(rows, [])
+
+        assert [r["id"] for r in store.query(active=True)] == ["INC-X-0000", "INC-X-0002"]
+        assert [r["id"] for r in store.query(status="resolved", limit=1)] == ["INC-X-0001"]
+        since = (base - timedelta(hours=15)).isoformat()
+        assert [r["id"] for r in store.query(since=since)] == ["INC-X-0000", "INC-X-0001"]
+
+
+class TestPersistentIncidentTracker:
+    """저장소 기반 IncidentTracker 테스트"""
+
+    async def test_history_survives_restart(self, db_path):
+        tracker = IncidentTracker(store=SQLiteIncidentStore(db_path))
+        await tracker.start()
+        active = await tracker.create_incident("Active", "x", send_alert=False)
+        done = await tracker.create_incident("Done", "x", send_alert=False)
+        await tracker.resolve_incident(done.id, "fixed", send_alert=False)
+        await tracker.stop()
+
+        restarted = IncidentTracker(store=SQLiteIncidentStore(db_path))
+        await restarted.start()
+
+        assert [i.id for i in restarted.get_active_incidents()] == [active.id]
+        restored = restarted.get_incident(done.id)
+        assert restored.status == IncidentStatus.RESOLVED
+        assert [e.event_type for e in restored.timeline] == ["detected", "resolved"]
+
+        # ID 순번은 이어서 발급
+        new = await restarted.create_incident("New", "x", send_alert=False)
+        assert new.id.endswith("-0003")
+        await restarted.stop()
+
+    async def test_write_behind_appends_only_new_events(self, db_path):
+        store = SQLiteIncidentStore(db_path)
+        tracker = IncidentTracker(store=store)
+        incident = await tracker.create_incident("Test", "x", send_alert=False)
+
+        assert await tracker.flush() == 1
+        assert await tracker.flush() == 0
+
+        await tracker.update_incident(
+            incident.id,
+            status=IncidentStatus.INVESTIGATING,
+            event_type="investigate",
+            event_message="Looking",
+        )
+        await tracker.flush()
+
+        row = store.get(incident.id)
+        assert row["status"] == "investigating"
+        assert [e["event_type"] for e in row["timeline"]] == ["detected", "investigate"]
+
+    async def test_hot_set_bounded_keeps_active(self, db_path):
+        tracker = IncidentTracker(store=SQLiteIncidentStore(db_path), hot_limit=3)
+        active = await tracker.create_incident("Active", "x", send_alert=False)
+        for i in range(5):
+            inc = await tracker.create_incident(f"Done {i}", "x", send_alert=False)
+            await tracker.resolve_incident(inc.id, "fixed", send_alert=False)
+            await tracker.flush()
+
+        assert len(tracker._incidents) == 3
+        assert tracker.get_incident(active.id) is active
+
+        history = await tracker.query_incidents(status=IncidentStatus.RESOLVED)
+        assert len(history) == 5
+        evicted = await tracker.fetch_incident(history[-1].id)
+        assert evicted.resolution == "fixed"
+        assert evicted.timeline[-1].level == AlertLevel.INFO
+
+    async def test_memory_only_query(self):
+        tracker = IncidentTracker()
+        await tracker.create_incident("A", "x", level=RecoveryLevel.L2, send_alert=False)
+
+        result = await tracker.query_incidents(status=IncidentStatus.DETECTED, hours=1)
+
+        assert [i.title for i in result] == ["A"]
@@ -0,0 +1,78 @@
+"""
+MetricsExposition 단위 테스트
+
+- TTL 동안 렌더링 결과 재사용
+- 동시 스크래핑 요청의 렌더링 공유
+- gzip / OpenMetrics 포맷
+- multiprocess 레지스트리 선택
+"""
+
+import asyncio
+import gzip
+
+from prometheus_client import CollectorRegistry, Counter
+
+from shared.monitoring import exposition
+from shared.monitoring.exposition import MetricsExposition
+
+
+def _registry():
+    registry = CollectorRegistry()
+    counter = Counter("exposition_test_total", "test counter", registry=registry)
+    return registry, counter
+
+
+class TestMetricsExposition:
+    """MetricsExposition 테스트"""
+
+    async def test_cached_within_ttl(self):
+        registry, counter = _registry()
+        cache = MetricsExposition(registry=registry, ttl_sec=60)
+
+        first = await cache.render()
+        counter.inc()
+        second = await cache.render()
+
+        assert second is first
+        assert cache.renders == 1
+        assert cache.cache_hits == 1
+
+    async def test_rerender_after_ttl(self):
+        registry, counter = _registry()
+        cache = MetricsExposition(registry=registry, ttl_sec=0)
+
+        await cache.render()
+        counter.inc()
+        rendered = await cache.render()
+
+        assert b"exposition_test_total 1.0" in rendered.body
+        assert cache.renders == 2
+
+    async def test_concurrent_scrapes_share_render(self):
+        registry, _ = _registry()
+        cache = MetricsExposition(registry=registry, ttl_sec=60)
+
+        results = await asyncio.gather(*(cache.render() for _ in range(10)))
+
+        assert cache.renders == 1
+        assert all(r is results[0] for r in results)
+
+    async def test_gzip_and_openmetrics(self):
+        registry, _ = _registry()
+        cache = MetricsExposition(registry=registry, ttl_sec=60)
+
+        text = await cache.render()
+        openmetrics = await cache.render(openmetrics=True)
+
+        assert gzip.decompress(text.gzip_body) == text.body
+        assert text.content_type.startswith("text/plain")
+        assert openmetrics.content_type.startswith("application/openmetrics-text")
+        assert openmetrics.body.endswith(b"# EOF\n")
+        assert cache.renders == 2
+
+    def test_multiprocess_registry(self, monkeypatch, tmp_path):
+        monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(tmp_path))
+
+        registry = exposition._default_registry()
+
+        assert registry is not exposition.REGISTRY
@@ -842,3 +842,91 @@ class TestEdgeCases:
         result = checker.update_device_connection("nonexistent", is_connected=True)
 
         assert result is None
+
+
+# =========================================
+# 증분 집계 / 캐시 테스트
+# =========================================
+
+
+class TestIncrementalAggregates:
+    """증분 카운터 및 버전 캐시 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_summary_cached_until_mutation(self):
+        checker = NetworkHealthChecker()
+
+        first = await checker.get_health_summary()
+        second = await checker.get_health_summary()
+        assert first is second
+
+        checker.update_vlan_device_count(10, total=50, online=45)
+        third = await checker.get_health_summary()
+
+        assert third is not first
+        assert third.total_devices == 50
+
+    @pytest.mark.asyncio
+    async def test_counters_follow_status_transitions(self):
+        checker = NetworkHealthChecker()
+
+        checker.update_vlan_device_count(10, total=50, online=20)  # critical
+        checker.update_vlan_device_count(10, total=40, online=40)  # healthy
+        checker.update_ap_status("ap-1", connected_clients=0, is_online=False)
+        checker.update_ap_status("ap-1", connected_clients=10)
+        checker.update_dhcp_usage(10, used_addresses=240)  # exhausted
+        checker.update_dhcp_usage(10, used_addresses=10)  # normal
+
+        summary = await checker.get_health_summary()
+
+        assert summary.total_devices == 40
+        assert summary.online_devices == 40
+        assert summary.offline_devices == 0
+        assert summary.critical_vlans == 0
+        assert summary.healthy_vlans == len(DEFAULT_VLAN_CONFIGS)
+        assert summary.offline_aps == 0
+        assert summary.online_aps == len(DEFAULT_AP_CONFIGS)
+        assert summary.dhcp_critical == 0
+        assert summary.issues == []
+        assert summary.overall_status == NetworkStatus.HEALTHY
+
+    @pytest.mark.asyncio
+    async def test_snapshot_cached_until_mutation(self):
+        checker = NetworkHealthChecker()
+
+        first = await checker.create_snapshot()
+        assert await checker.create_snapshot() is first
+
+        checker.update_dhcp_usage(20, used_addresses=200)
+
+        second = await checker.create_snapshot()
+        assert second is not first
+        assert second.dhcp_data["20"]["used_addresses"] == 200
+
+    def test_device_indexes(self):
+        checker = NetworkHealthChecker()
+        checker.register_device("d1", vlan_id=10, ap_id="ap-1")
+        checker.register_device("d2", vlan_id=10, ap_id="ap-2")
+        checker.register_device("d3", vlan_id=20, ap_id="ap-1")
+
+        # 재등록 시 이전 VLAN/AP 인덱스에서 제거
+        checker.register_device("d2", vlan_id=20, ap_id="ap-1")
+
+        distribution = {d.vlan_id: sorted(d.devices) for d in checker.get_vlan_device_distribution()}
+        assert distribution == {10: ["d1"], 20: ["d2", "d3"]}
+
+        ap_clients = {a.ap_id: sorted(a.client_device_ids) for a in checker.get_ap_client_distribution()}
+        assert ap_clients["ap-1"] == ["d1", "d2", "d3"]
+        assert ap_clients["ap-2"] == []
+
+    def test_connected_device_count(self):
+        checker = NetworkHealthChecker()
+        checker.register_device("d1", vlan_id=10)
+        checker.register_device("d2", vlan_id=10)
+        version = checker.version
+
+        checker.update_device_connection("d1", is_connected=False)
+        checker.update_device_connection("d1", is_connected=False)
+
+        assert checker.get_connected_device_count() == 1
+        assert checker.version == version + 1
@@ -0,0 +1,291 @@
+"""
+NodeRunner (apps/node-runner) 단위 테스트
+
+- CommandExecutor: 시작 전 취소 / 연결 해제 시 워커 반환
+- ResourceSampler: window 평균 / p95, 디스크·프로세스 갱신 주기
+- DeviceSnapshotTracker: 전체 스냅샷 / 델타 (base_seq, added / changed / removed)
+"""
+
+import asyncio
+import contextlib
+import importlib.util
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+NODE_RUNNER_MAIN = Path(__file__).resolve().parents[2] / "apps" / "node-runner" / "main.py"
+
+
+@pytest.fixture(scope="module")
+def runner_module():
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("NODE_SECRET_KEY", "dGVzdC1zZWNyZXQ=")
+        spec = importlib.util.spec_from_file_location("node_runner_main", NODE_RUNNER_MAIN)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    return module
+
+
+def _command(command_id, command_type="PING", **extra):
+    return {"command_id": command_id, "command_type": command_type, **extra}
+
+
+class TestCommandExecutor:
+    """CommandExecutor 테스트"""
+
+    @pytest.fixture
+    def executor(self, runner_module):
+        executed, reports = [], []
+
+        async def execute(command):
+            executed.append(command["command_id"])
+            await asyncio.sleep(0)
+
+        async def report(command, status, reason):
+            reports.append((command["command_id"], status))
+
+        executor = runner_module.CommandExecutor(execute, report, workers=2, max_queue=10)
+        executor.executed, executor.reports = executed, reports
+        return executor
+
+    async def test_cancel_before_start_frees_worker(self, executor):
+        await executor.submit(_command("a"))
+
+        assert await executor.cancel("a") == "running"
+
+        assert executor.running == 0
+        assert executor.executed == []
+        assert executor.reports == [("a", "CANCELLED")]
+
+        # 같은 command_id 재전달은 중복으로 무시되지 않음
+        await executor.submit(_command("a"))
+        await asyncio.sleep(0.01)
+        assert executor.executed == ["a"]
+        assert executor.running == 0
+
+    async def test_abort_before_start_frees_workers(self, executor):
+        await executor.submit(_command("a"))
+        await executor.submit(_command("b"))
+        await executor.submit(_command("c"))
+        executor.pause()
+
+        await executor.abort_running()
+
+        assert executor.running == 0
+        assert executor.queued == 1
+        assert executor.executed == []
+
+        executor.resume()
+        await asyncio.sleep(0.01)
+        assert executor.executed == ["c"]
+        assert executor.get_stats()["running"] == 0
+
+
+class _FakeProcess:
+    def __init__(self, pid, name, cpu=5.0, rss_mb=100):
+        self.pid = pid
+        self.info = {"name": name}
+        self.cpu = cpu
+        self.rss = rss_mb * 1024**2
+        self.dead = False
+
+    def oneshot(self):
+        return contextlib.nullcontext()
+
+    def cpu_percent(self, interval=None):
+        if self.dead:
+            raise _FakePsutil.Error()
+        return self.cpu
+
+    def memory_info(self):
+        return SimpleNamespace(rss=self.rss)
+
+
+class _FakePsutil:
+    """sample()이 사용하는 psutil API만 흉내"""
+
+    class Error(Exception):
+        pass
+
+    def __init__(self, cpu_values, processes=()):
+        self.cpu_values = iter(cpu_values)
+        self.processes = list(processes)
+        self.disk_calls = 0
+        self.scan_calls = 0
+        self.bytes_sent = 0
+
+    def cpu_percent(self, interval=None):
+        return next(self.cpu_values)
+
+    def disk_usage(self, path):
+        self.disk_calls += 1
+        return SimpleNamespace(free=50 * 1024**3)
+
+    def net_io_counters(self):
+        self.bytes_sent += 1000
+        return SimpleNamespace(bytes_sent=self.bytes_sent, bytes_recv=0)
+
+    def virtual_memory(self):
+        return SimpleNamespace(percent=42.0)
+
+    def process_iter(self, attrs=None):
+        self.scan_calls += 1
+        return iter(self.processes)
+
+
+class TestResourceSampler:
+    """ResourceSampler 테스트 (psutil 대체)"""
+
+    @pytest.fixture
+    def make_sampler(self, runner_module, monkeypatch):
+        def make(cpu_values, processes=(), window=20.0):
+            fake = _FakePsutil(cpu_values, processes)
+            monkeypatch.setattr(runner_module, "psutil", fake, raising=False)
+            return runner_module.ResourceSampler(interval=1.0, window=window), fake
+
+        return make
+
+    def test_window_mean_and_p95(self, make_sampler):
+        sampler, _ = make_sampler([float(v) for v in range(25, 0, -1)])
+
+        for _ in range(20):
+            sampler.sample()
+        summary = sampler.snapshot()
+
+        # 25..6 → 평균 15.5, p95 = 정렬 후 cpu[ceil(20*0.95)-1] = cpu[18]
+        assert summary["cpu_percent"] == 15.5
+        assert summary["cpu_p95"] == 24.0
+        assert summary["cpu_last"] == 6.0
+        assert summary["memory_percent"] == 42.0
+
+        # window(20 샘플)를 넘으면 오래된 값부터 빠짐
+        for _ in range(5):
+            sampler.sample()
+        summary = sampler.snapshot()
+
+        assert summary["cpu_percent"] == 10.5
+        assert summary["cpu_p95"] == 19.0
+        assert summary["cpu_last"] == 1.0
+
+    def test_disk_and_process_scan_cadence(self, runner_module, make_sampler, monkeypatch):
+        monkeypatch.setattr(runner_module.Config, "RESOURCE_DISK_EVERY", 3)
+        monkeypatch.setattr(runner_module.Config, "RESOURCE_PROCESS_SCAN_EVERY", 2)
+        sampler, fake = make_sampler([10.0] * 6)
+
+        for _ in range(6):
+            sampler.sample()
+
+        assert fake.disk_calls == 2  # 샘플 0, 3
+        assert fake.scan_calls == 3  # 샘플 0, 2, 4
+        assert sampler.snapshot()["disk_free_gb"] == 50.0
+
+    def test_dead_process_dropped(self, runner_module, make_sampler, monkeypatch):
+        monkeypatch.setattr(runner_module.Config, "RESOURCE_PROCESS_SCAN_EVERY", 100)
+        adb = _FakeProcess(1, "adb.exe", cpu=2.0, rss_mb=10)
+        laixi = _FakeProcess(2, "touping.exe", cpu=7.5, rss_mb=200)
+        sampler, _ = make_sampler([10.0] * 2, processes=[adb, laixi, _FakeProcess(3, "chrome")])
+
+        sampler.sample()
+        processes = sampler.snapshot()["processes"]
+
+        assert processes["adb"] == {"count": 1, "cpu_percent": 2.0, "memory_mb": 10.0}
+        assert processes["laixi"] == {"count": 1, "cpu_percent": 7.5, "memory_mb": 200.0}
+
+        # 재탐색 전에 종료된 프로세스는 샘플 시 제거
+        adb.dead = True
+        sampler.sample()
+        processes = sampler.snapshot()["processes"]
+
+        assert processes["adb"]["count"] == 0
+        assert processes["laixi"]["count"] == 1
+        assert set(sampler._processes) == {2}
+
+    def test_snapshot_returns_copy(self, make_sampler):
+        sampler, _ = make_sampler([10.0])
+        sampler.sample()
+
+        snapshot = sampler.snapshot()
+        snapshot["cpu_percent"] = 99.0
+
+        assert sampler.snapshot()["cpu_percent"] == 10.0
+
+
+def _device(serial, status="ONLINE", battery=80):
+    return {"serial": serial, "status": status, "battery": battery}
+
+
+class TestDeviceSnapshotTracker:
+    """DeviceSnapshotTracker 테스트"""
+
+    @pytest.fixture
+    def tracker(self, runner_module):
+        tracker = runner_module.DeviceSnapshotTracker(full_every=3)
+        tracker.reset(delta_enabled=True)
+        return tracker
+
+    def test_full_snapshot_after_reset(self, tracker):
+        payload = tracker.build([_device("A"), _device("B")])
+
+        assert payload == {
+            "snapshot_seq": 1,
+            "device_snapshot": [_device("A"), _device("B")],
+        }
+
+        tracker.build([_device("A")])
+        tracker.reset(delta_enabled=True)
+        payload = tracker.build([_device("A")])
+
+        assert payload["snapshot_seq"] == 3
+        assert "device_snapshot" in payload
+
+    def test_full_snapshot_without_delta_support(self, tracker):
+        tracker.reset(delta_enabled=False)
+        tracker.build([_device("A")])
+
+        assert "device_snapshot" in tracker.build([_device("A")])
+
+    def test_delta_against_last_sent_state(self, tracker):
+        tracker.build([_device("A"), _device("B"), _device("C")])
+
+        payload = tracker.build([_device("A"), _device("B", battery=50), _device("D")])
+
+        assert payload["snapshot_seq"] == 2
+        assert payload["device_delta"] == {
+            "base_seq": 1,
+            "added": [_device("D")],
+            "changed": [_device("B", battery=50)],
+            "removed": ["C"],
+        }
+
+        # 다음 델타는 직전 전송 상태(A, B(50), D) 기준
+        payload = tracker.build([_device("A"), _device("B", battery=50), _device("D")])
+
+        assert payload["device_delta"] == {
+            "base_seq": 2,
+            "added": [],
+            "changed": [],
+            "removed": [],
+        }
+
+    def test_full_snapshot_every_n_deltas(self, tracker):
+        devices = [_device("A")]
+        kinds = ["device_delta" in tracker.build(devices) for _ in range(8)]
+
+        # full_every=3: 전체 → 델타 3회 → 전체 → ...
+        assert kinds == [False, True, True, True, False, True, True, True]
+
+    def test_request_full(self, tracker):
+        tracker.build([_device("A")])
+        tracker.build([_device("A")])
+        tracker.request_full()
+
+        payload = tracker.build([_device("A", status="OFFLINE")])
+
+        assert payload["device_snapshot"] == [_device("A", status="OFFLINE")]
+
+        # resync 이후 델타는 전체 스냅샷 기준
+        payload = tracker.build([_device("A", status="OFFLINE")])
+
+        assert payload["device_delta"]["base_seq"] == 3
+        assert payload["device_delta"]["changed"] == []
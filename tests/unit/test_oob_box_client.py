@@ -0,0 +1,225 @@
+"""
+OOB BoxClient / BoxSession 단위 테스트
+
+로컬 TCP 서버로 박스를 흉내내어 테스트
+- 영속 세션 연결 재사용
+- 연결 끊김 후 자동 재연결
+- 여러 슬롯 일괄 전원 순환
+- 종료 시 처리 중인 명령 실패 처리 / 남은 응답 바이트 제거
+"""
+
+import asyncio
+
+import pytest
+
+# 테스트 대상 임포트
+from services.api.api.services.oob.box_client import (
+    BoxClient,
+    BoxSession,
+    close_all_box_sessions,
+)
+
+PACKET_SIZE = 7  # AA 01 88 84 XX XX DD
+
+
+class FakeBox:
+    """수신한 명령 바이트와 연결 수를 기록하는 가짜 박스"""
+
+    def __init__(self, respond: bool = False, echo: bool = False, delay: float = 0):
+        self.respond = respond
+        self.echo = echo  # 응답으로 0x55 대신 패킷의 슬롯 바이트 반환
+        self.delay = delay  # 응답 지연
+        self.connections = 0
+        self.packets = []
+        self.writers = []
+        self.server = None
+
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        self.writers.append(writer)
+        buffer = b""
+        try:
+            while True:
+                data = await reader.read(1024)
+                if not data:
+                    break
+                buffer += data
+                while len(buffer) >= PACKET_SIZE:
+                    packet, buffer = buffer[:PACKET_SIZE], buffer[PACKET_SIZE:]
+                    self.packets.append(packet.hex(" ").upper())
+                    if self.respond:
+                        if self.delay:
+                            await asyncio.sleep(self.delay)
+                        writer.write(packet[4:5] if self.echo else b"\x55")
+                        await writer.drain()
+        finally:
+            writer.close()
+
+    async def start(self) -> int:
+        self.server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        return self.server.sockets[0].getsockname()[1]
+
+    def drop_connections(self):
+        for writer in self.writers:
+            writer.close()
+        self.writers = []
+
+    async def stop(self):
+        self.drop_connections()
+        self.server.close()
+        await self.server.wait_closed()
+
+
+@pytest.fixture
+async def fake_box():
+    box = FakeBox()
+    port = await box.start()
+    yield box, port
+    await close_all_box_sessions()
+    await box.stop()
+
+
+async def _wait_for(predicate, timeout=1.0):
+    for _ in range(int(timeout / 0.01)):
+        if predicate():
+            return
+        await asyncio.sleep(0.01)
+
+
+class TestBoxSession:
+    """BoxSession 테스트"""
+
+    async def test_reuses_single_connection(self, fake_box):
+        box, port = fake_box
+        session = BoxSession("127.0.0.1", port)
+
+        results = await asyncio.gather(
+            *(session.send(BoxClient.hex_to_bytes(f"AA 01 88 84 {i:02X} 00 DD")) for i in range(10))
+        )
+        await _wait_for(lambda: len(box.packets) == 10)
+        await session.close()
+
+        assert all(r.success for r in results)
+        assert box.connections == 1
+        assert len(box.packets) == 10
+        stats = session.get_stats()
+        assert stats["commands"] == 10
+        assert stats["failures"] == 0
+
+    async def test_reconnects_after_drop(self, fake_box):
+        box, port = fake_box
+        session = BoxSession("127.0.0.1", port)
+
+        assert (await session.send(BoxClient.hex_to_bytes("AA 01 88 84 01 00 DD"))).success
+        await _wait_for(lambda: len(box.packets) == 1)
+        box.drop_connections()
+        await asyncio.sleep(0.05)
+
+        result = await session.send(BoxClient.hex_to_bytes("AA 01 88 84 02 00 DD"))
+        await _wait_for(lambda: len(box.packets) == 2)
+        await session.close()
+
+        assert result.success
+        assert box.connections == 2
+        assert box.packets[-1] == "AA 01 88 84 02 00 DD"
+        assert session.get_stats()["reconnects"] == 1
+
+    async def test_unreachable_box_fails(self):
+        session = BoxSession("127.0.0.1", 1, timeout_sec=0.5, max_reconnect_attempts=0)
+
+        result = await session.send(b"\xaa")
+        await session.close()
+
+        assert result.success is False
+        assert session.get_stats()["failures"] == 1
+
+    async def test_expect_response(self):
+        box = FakeBox(respond=True)
+        port = await box.start()
+        session = BoxSession("127.0.0.1", port)
+
+        result = await session.send(
+            BoxClient.hex_to_bytes("AA 01 88 84 01 00 DD"), expect_response=True
+        )
+        await session.close()
+        await box.stop()
+
+        assert result.success
+        assert result.raw_data == b"\x55"
+
+    async def test_close_fails_in_flight_batch(self, monkeypatch):
+        session = BoxSession("127.0.0.1", 1)
+        started = asyncio.Event()
+
+        async def stuck(batch):
+            started.set()
+            await asyncio.sleep(60)
+
+        monkeypatch.setattr(session, "_process", stuck)
+        sends = [
+            asyncio.create_task(session.send(b"\x01")),
+            asyncio.create_task(session.send(b"\x02", expect_response=True)),  # look-ahead
+            asyncio.create_task(session.send(b"\x03")),
+        ]
+        await asyncio.wait_for(started.wait(), 1.0)
+
+        await session.close()
+        results = await asyncio.wait_for(asyncio.gather(*sends), 1.0)
+
+        assert [r.error for r in results] == ["Box session closed"] * 3
+
+    async def test_expect_response_skips_stale_bytes(self):
+        box = FakeBox(respond=True, echo=True)
+        port = await box.start()
+        session = BoxSession("127.0.0.1", port)
+
+        # 응답을 읽지 않는 명령 → 0x01이 수신 버퍼에 남음
+        await session.send(BoxClient.hex_to_bytes("AA 01 88 84 01 00 DD"))
+        await asyncio.sleep(0.05)
+        result = await session.send(
+            BoxClient.hex_to_bytes("AA 01 88 84 02 00 DD"), expect_response=True
+        )
+        await session.close()
+        await box.stop()
+
+        assert result.raw_data == b"\x02"
+
+    async def test_expect_response_skips_late_stale_reply(self):
+        box = FakeBox(respond=True, echo=True, delay=0.02)
+        port = await box.start()
+        session = BoxSession("127.0.0.1", port)
+
+        # 0x01 응답이 아직 도착하지 않은 상태에서 응답 대기 명령 전송
+        await session.send(BoxClient.hex_to_bytes("AA 01 88 84 01 00 DD"))
+        result = await session.send(
+            BoxClient.hex_to_bytes("AA 01 88 84 02 00 DD"), expect_response=True
+        )
+        await session.close()
+        await box.stop()
+
+        assert result.raw_data == b"\x02"
+        assert session._unread_replies == 0
+
+
+class TestPowerCycleSlots:
+    """power_cycle_slots() 테스트"""
+
+    async def test_batched_power_cycle(self, fake_box):
+        box, port = fake_box
+        client = BoxClient("127.0.0.1", port, persistent=True)
+
+        results = await client.power_cycle_slots([1, 2, 3, 2], delay_sec=0, stagger_sec=0.01)
+        await _wait_for(lambda: len(box.packets) == 6)
+
+        assert results == {1: True, 2: True, 3: True}
+        assert box.connections == 1
+        # OFF 3개가 모두 ON보다 먼저, ON은 슬롯 순서대로
+        assert box.packets[3:] == [
+            "AA 01 88 84 01 01 DD",
+            "AA 01 88 84 02 01 DD",
+            "AA 01 88 84 03 01 DD",
+        ]
+        assert client.get_stats()["commands"] == 6
+
+    async def test_non_persistent_client_has_no_stats(self):
+        assert BoxClient("127.0.0.1").get_stats() is None
@@ -0,0 +1,234 @@
+"""
+OOB HealthCollector / MetricsPersister 단위 테스트
+
+- register_nodes() 일괄 등록
+- persist_metrics() 버퍼 적재
+- MetricsPersister 배치 flush / 재시도 / 버퍼 상한
+- get_health_collector() 팩토리의 Supabase 연결
+- warm_recovery_connections() 시작 시 SSH 연결 예열
+"""
+
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+
+# 테스트 대상 임포트
+from services.api.api.routers import oob as oob_router
+from services.api.api.services.oob.health_collector import HealthCollector
+from services.api.api.services.oob.metrics_persister import MetricsPersister
+
+
+def _mock_supabase(fail_times: int = 0):
+    """insert 호출을 기록하는 Mock Supabase (처음 fail_times회 실패)"""
+    client = MagicMock()
+    client.inserted = []
+    state = {"failures": 0}
+
+    def insert(rows):
+        query = MagicMock()
+
+        def execute():
+            if state["failures"] < fail_times:
+                state["failures"] += 1
+                raise RuntimeError("insert failed")
+            client.inserted.append(list(rows))
+            return MagicMock(data=rows)
+
+        query.execute.side_effect = execute
+        return query
+
+    client.table.return_value.insert.side_effect = insert
+    return client
+
+
+class TestRegisterNodes:
+    """register_nodes() 테스트"""
+
+    async def test_bulk_register(self):
+        collector = HealthCollector()
+
+        count = await collector.register_nodes(
+            [
+                {"node_id": "n1", "expected_devices": 20, "tailscale_ip": "100.0.0.1"},
+                {"node_id": "n2", "expected_devices": 10},
+                {"node_id": None},
+            ]
+        )
+
+        assert count == 2
+        assert collector.get_node("n1").tailscale_ip == "100.0.0.1"
+        assert collector.get_node("n2").metrics.device_count_expected == 10
+
+    async def test_sync_from_database_uses_bulk_register(self):
+        supabase = MagicMock()
+        supabase.table.return_value.select.return_value.execute.return_value = MagicMock(
+            data=[{"node_id": f"n{i}", "capacity": 20} for i in range(5)]
+        )
+        collector = HealthCollector(supabase_client=supabase)
+
+        await collector.sync_from_database()
+
+        assert len(collector.get_all_nodes()) == 5
+
+
+class TestPersistMetrics:
+    """persist_metrics() 테스트"""
+
+    async def test_enqueue_without_io(self):
+        supabase = _mock_supabase()
+        collector = HealthCollector(supabase_client=supabase)
+        await collector.update_node_metrics("n1", {"device_count": 20, "laixi_connected": True})
+
+        await collector.persist_metrics("n1")
+
+        assert supabase.inserted == []
+        assert collector.get_persister_stats()["pending"] == 1
+
+    async def test_no_persister_without_supabase(self):
+        collector = HealthCollector()
+        await collector.update_node_metrics("n1", {"device_count": 20})
+
+        await collector.persist_metrics("n1")
+
+        assert collector.get_persister_stats() is None
+
+
+class TestMetricsPersister:
+    """MetricsPersister 테스트"""
+
+    async def test_flush_in_batches(self):
+        supabase = _mock_supabase()
+        persister = MetricsPersister(supabase, batch_size=10)
+        for i in range(25):
+            persister.enqueue({"node_id": f"n{i}"})
+
+        written = await persister.flush()
+
+        assert written == 25
+        assert [len(batch) for batch in supabase.inserted] == [10, 10, 5]
+        assert persister.pending == 0
+
+    async def test_retry_then_success(self):
+        supabase = _mock_supabase(fail_times=2)
+        persister = MetricsPersister(supabase, max_retries=3, retry_backoff_sec=0)
+        persister.enqueue({"node_id": "n1"})
+
+        assert await persister.flush() == 1
+        assert persister.batch_failures == 0
+
+    async def test_failed_batch_is_requeued(self):
+        supabase = _mock_supabase(fail_times=10)
+        persister = MetricsPersister(supabase, max_retries=1, retry_backoff_sec=0)
+        persister.enqueue({"node_id": "n1"})
+        persister.enqueue({"node_id": "n2"})
+
+        assert await persister.flush() == 0
+        assert persister.pending == 2
+        assert persister.batch_failures == 1
+        assert [row["node_id"] for row in persister._buffer] == ["n1", "n2"]
+
+    def test_buffer_bound_drops_oldest(self):
+        persister = MetricsPersister(MagicMock(), max_buffer=3, batch_size=100)
+        for i in range(5):
+            persister.enqueue({"node_id": f"n{i}"})
+
+        assert persister.pending == 3
+        assert persister.rows_dropped == 2
+        assert persister._buffer[0]["node_id"] == "n2"
+
+    async def test_size_trigger_flushes_in_background(self):
+        supabase = _mock_supabase()
+        persister = MetricsPersister(
+            supabase, batch_size=5, flush_interval_sec=60, rollup_interval_sec=None
+        )
+        await persister.start()
+        for i in range(5):
+            persister.enqueue({"node_id": f"n{i}"})
+
+        for _ in range(50):
+            if persister.rows_written:
+                break
+            await asyncio.sleep(0.01)
+        await persister.stop()
+
+        assert persister.rows_written == 5
+
+    async def test_stop_flushes_remaining(self):
+        supabase = _mock_supabase()
+        persister = MetricsPersister(supabase, flush_interval_sec=60, rollup_interval_sec=None)
+        await persister.start()
+        persister.enqueue({"node_id": "n1"})
+
+        await persister.stop()
+
+        assert persister.rows_written == 1
+        assert persister.pending == 0
+
+
+class TestHealthCollectorFactory:
+    """get_health_collector() 테스트"""
+
+    @pytest.fixture(autouse=True)
+    def _reset_singleton(self, monkeypatch):
+        monkeypatch.setattr(oob_router, "_health_collector", None)
+
+    def test_uses_supabase_client_for_persister(self, monkeypatch):
+        supabase = _mock_supabase()
+        monkeypatch.setattr(oob_router, "get_supabase_client", lambda: supabase)
+
+        collector = oob_router.get_health_collector()
+
+        assert collector._supabase is supabase
+        assert isinstance(collector._persister, MetricsPersister)
+        assert oob_router.get_health_collector() is collector
+
+    def test_without_supabase_collects_in_memory(self, monkeypatch):
+        def missing():
+            raise ValueError("SUPABASE_URL missing")
+
+        monkeypatch.setattr(oob_router, "get_supabase_client", missing)
+
+        collector = oob_router.get_health_collector()
+
+        assert collector._persister is None
+        assert collector.get_persister_stats() is None
+
+
+class TestWarmRecoveryConnections:
+    """warm_recovery_connections() 테스트"""
+
+    @pytest.fixture
+    def dispatcher(self, monkeypatch):
+        supabase = _mock_supabase()
+        supabase.table.return_value.select.return_value.execute.return_value = MagicMock(
+            data=[
+                {"node_id": "n1", "capacity": 20, "tailscale_ip": "100.64.0.1"},
+                {"node_id": "n2", "capacity": 20, "tailscale_ip": "100.64.0.2"},
+                {"node_id": "n3", "capacity": 20, "tailscale_ip": None},
+            ]
+        )
+        dispatcher = MagicMock(control_persist_sec=600)
+        dispatcher.warmed = []
+
+        async def warm_connections(ips):
+            dispatcher.warmed.append(list(ips))
+            return {ip: True for ip in ips}
+
+        dispatcher.warm_connections = warm_connections
+        monkeypatch.setattr(oob_router, "_health_collector", HealthCollector(supabase))
+        monkeypatch.setattr(oob_router, "get_recovery_dispatcher", lambda: dispatcher)
+        return dispatcher
+
+    async def test_warms_synced_node_ips(self, dispatcher):
+        results = await oob_router.warm_recovery_connections()
+
+        assert dispatcher.warmed == [["100.64.0.1", "100.64.0.2"]]
+        assert results == {"100.64.0.1": True, "100.64.0.2": True}
+        assert set(oob_router.get_health_collector().get_all_nodes()) == {"n1", "n2", "n3"}
+
+    async def test_skipped_without_control_master(self, dispatcher):
+        dispatcher.control_persist_sec = 0
+
+        assert await oob_router.warm_recovery_connections() == {}
+        assert dispatcher.warmed == []
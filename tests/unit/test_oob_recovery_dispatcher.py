@@ -0,0 +1,150 @@
+"""
+OOB RecoveryDispatcher 단위 테스트
+
+- ControlMaster SSH 인자
+- stdout/stderr 스트리밍
+- 일괄 복구 동시성 제한 (전체 / 랙별)
+- 복구 결과 알림
+"""
+
+import asyncio
+
+import pytest
+
+# 테스트 대상 임포트
+from services.api.api.services.oob.recovery_dispatcher import (
+    RecoveryDispatcher,
+    RecoveryResult,
+    RecoveryStatus,
+    RecoveryTarget,
+)
+from services.api.api.services.oob.rule_engine import RecoveryAction
+from shared.monitoring.runbook import AlertLevel
+
+
+class _FakeShellDispatcher(RecoveryDispatcher):
+    """ssh 대신 로컬 sh로 스크립트를 실행하는 디스패처"""
+
+    def __init__(self, script: str, **kwargs):
+        super().__init__(**kwargs)
+        self.script = script
+
+    def _ssh_args(self, tailscale_ip, connect_timeout=None):
+        return ["sh", "-c", self.script]
+
+
+class TestSSHArgs:
+    """SSH 인자 테스트"""
+
+    def test_control_master_enabled(self, tmp_path):
+        dispatcher = RecoveryDispatcher(control_dir=str(tmp_path), control_persist_sec=300)
+
+        args = dispatcher._ssh_args("100.64.0.1")
+
+        assert "ControlMaster=auto" in args
+        assert f"ControlPath={tmp_path}/%C" in args
+        assert "ControlPersist=300" in args
+        assert args[-1] == "doaiops@100.64.0.1"
+
+    def test_control_master_disabled(self):
+        dispatcher = RecoveryDispatcher(control_persist_sec=0)
+
+        args = dispatcher._ssh_args("100.64.0.1")
+
+        assert not any(arg.startswith("ControlMaster") for arg in args)
+
+
+class TestExecuteRecovery:
+    """execute_recovery() 스트리밍 테스트"""
+
+    async def test_streams_output(self):
+        dispatcher = _FakeShellDispatcher("echo line1; echo warn >&2; echo line2")
+        received = []
+
+        result = await dispatcher.execute_recovery(
+            "n1",
+            "100.64.0.1",
+            RecoveryAction.SOFT,
+            on_output=lambda node_id, stream, line: received.append((node_id, stream, line)),
+        )
+
+        assert result.status == RecoveryStatus.SUCCESS
+        assert result.stdout == "line1\nline2"
+        assert result.stderr == "warn"
+        assert ("n1", "stdout", "line1") in received
+        assert ("n1", "stderr", "warn") in received
+
+    async def test_nonzero_exit_is_failure(self):
+        dispatcher = _FakeShellDispatcher("echo boom >&2; exit 3")
+
+        result = await dispatcher.execute_recovery("n1", "100.64.0.1", RecoveryAction.RESTART)
+
+        assert result.status == RecoveryStatus.FAILED
+        assert result.exit_code == 3
+        assert result.stderr == "boom"
+
+    async def test_failure_notifies_alert_manager(self):
+        notified = []
+
+        class _AlertManager:
+            async def notify(self, title, message, level, fields=None, fingerprint=None):
+                notified.append((title, message, level, fields, fingerprint))
+
+        dispatcher = _FakeShellDispatcher("echo boom >&2; exit 3", alert_manager=_AlertManager())
+
+        await dispatcher.execute_recovery("PC01", "100.64.0.1", RecoveryAction.RESTART)
+
+        title, message, level, fields, fingerprint = notified[0]
+        assert title == "OOB recovery failed: PC01"
+        assert message == "boom"
+        assert level == AlertLevel.ERROR
+        assert fields["Exit code"] == "3"
+        assert fingerprint == "oob_recovery:PC01:restart:failed"
+
+
+class TestExecuteRecoveries:
+    """execute_recoveries() 동시성 테스트"""
+
+    async def _run_batch(self, dispatcher, targets):
+        active = {"total": 0, "max_total": 0, "racks": {}, "max_rack": 0}
+
+        async def fake_execute(node_id, tailscale_ip, action, dry_run=False, on_output=None):
+            rack = node_id.split("-")[0]
+            active["total"] += 1
+            active["racks"][rack] = active["racks"].get(rack, 0) + 1
+            active["max_total"] = max(active["max_total"], active["total"])
+            active["max_rack"] = max(active["max_rack"], active["racks"][rack])
+            await asyncio.sleep(0.01)
+            active["total"] -= 1
+            active["racks"][rack] -= 1
+            return RecoveryResult(node_id=node_id, action=action, status=RecoveryStatus.SUCCESS)
+
+        dispatcher.execute_recovery = fake_execute
+        results = await dispatcher.execute_recoveries(targets)
+        return results, active
+
+    async def test_global_and_rack_limits(self):
+        dispatcher = RecoveryDispatcher(max_concurrency=5, per_rack_limit=2)
+        targets = [
+            RecoveryTarget(f"r{r}-n{i}", f"100.64.{r}.{i}", RecoveryAction.SOFT, rack_id=f"r{r}")
+            for r in range(4)
+            for i in range(4)
+        ]
+
+        results, active = await self._run_batch(dispatcher, targets)
+
+        assert [r.node_id for r in results] == [t.node_id for t in targets]
+        assert active["max_total"] == 5
+        assert active["max_rack"] == 2
+        assert all(r.time_to_recover_sec is not None for r in results)
+
+    async def test_runs_in_parallel(self):
+        dispatcher = RecoveryDispatcher(max_concurrency=50)
+        targets = [
+            RecoveryTarget(f"r0-n{i}", f"100.64.0.{i}", RecoveryAction.SOFT) for i in range(20)
+        ]
+
+        results, active = await self._run_batch(dispatcher, targets)
+
+        assert active["max_total"] == 20
+        assert max(r.time_to_recover_sec for r in results) < 0.2
@@ -0,0 +1,151 @@
+"""
+OOB RuleEngine 단위 테스트
+
+- evaluate() 단일 노드 평가
+- evaluate_batch() fleet 일괄 평가 (evaluate()와 결과 일치)
+"""
+
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+# 테스트 대상 임포트
+from services.api.api.services.oob.health_collector import NodeHealth, NodeMetrics
+from services.api.api.services.oob.rule_engine import (
+    FailureLevel,
+    FleetMetricColumns,
+    RecoveryAction,
+    RuleEngine,
+    ThresholdConfig,
+)
+
+NOW = datetime(2026, 1, 15, 12, 0, 0)
+
+
+def _make_node(node_id: str, samples: list, interval_sec: int = 30) -> NodeHealth:
+    """(heartbeat_age, adb, expected, adb_ok, unauthorized, ws) 튜플 목록으로 노드 생성"""
+    node = NodeHealth(node_id=node_id)
+    start = NOW - timedelta(seconds=interval_sec * len(samples))
+    for i, (age, count, expected, adb_ok, unauthorized, ws) in enumerate(samples):
+        node.update_metrics(
+            NodeMetrics(
+                node_heartbeat_age_sec=age,
+                device_count_adb=count,
+                device_count_expected=expected,
+                adb_server_ok=adb_ok,
+                unauthorized_count=unauthorized,
+                ws_connected=ws,
+                box_tcp_ok=True,
+                collected_at=start + timedelta(seconds=interval_sec * (i + 1)),
+            )
+        )
+    return node
+
+
+def _random_node(rng: random.Random, node_id: str) -> NodeHealth:
+    samples = []
+    for _ in range(rng.randint(0, 20)):
+        samples.append(
+            (
+                rng.choice([0.0, 10.0, 50.0, 120.0]),
+                rng.choice([20, 19, 17, 10]),
+                20,
+                rng.random() > 0.2,
+                rng.choice([0, 1, 3, 5]),
+                rng.random() > 0.1,
+            )
+        )
+    return _make_node(node_id, samples, interval_sec=rng.choice([10, 30, 60]))
+
+
+class TestRuleEngineEvaluate:
+    """evaluate() 테스트"""
+
+    def test_healthy_node(self):
+        engine = RuleEngine()
+        node = _make_node("n1", [(0.0, 20, 20, True, 0, True)] * 3)
+
+        result = engine.evaluate(node, now=NOW)
+
+        assert result.failure_level == FailureLevel.NONE
+        assert result.recommended_action == RecoveryAction.NONE
+        assert result.can_execute is True
+        assert result.evaluated_at == NOW
+
+    def test_heartbeat_timeout_is_p0(self):
+        engine = RuleEngine()
+        node = _make_node("n1", [(60.0, 20, 20, True, 0, True)] * 2)
+
+        result = engine.evaluate(node, now=NOW)
+
+        assert result.failure_level == FailureLevel.P0_CRITICAL
+        assert result.recommended_action == RecoveryAction.SOFT
+
+    def test_cooldown_blocks_execution(self):
+        engine = RuleEngine()
+        node = _make_node("n1", [(0.0, 20, 20, False, 0, True)] * 2)
+        engine._last_recovery["n1"] = {
+            "action": RecoveryAction.SOFT,
+            "timestamp": NOW - timedelta(minutes=1),
+        }
+
+        result = engine.evaluate(node, now=NOW)
+
+        assert result.recommended_action == RecoveryAction.RESTART
+        assert result.can_execute is False
+        assert result.cooldown_remaining_sec == 14 * 60
+
+
+class TestRuleEngineEvaluateBatch:
+    """evaluate_batch() 테스트"""
+
+    def test_columns_single_scan(self):
+        node = _make_node(
+            "n1",
+            [
+                (0.0, 20, 20, True, 0, True),
+                (50.0, 15, 20, False, 3, True),
+                (50.0, 15, 20, False, 0, True),
+            ],
+        )
+
+        columns = FleetMetricColumns.from_nodes([node], ThresholdConfig())
+
+        assert columns.heartbeat_streak == [2]
+        assert columns.device_loss_streak == [2]
+        assert columns.adb_streak == [2]
+        assert columns.unauthorized_streak == [0]
+        assert columns.warning_since == [node.metrics_history[1].collected_at]
+
+    def test_empty_fleet(self):
+        assert RuleEngine().evaluate_batch([]) == []
+
+    def test_preserves_input_order(self):
+        engine = RuleEngine()
+        nodes = [_make_node(f"n{i}", [(0.0, 20, 20, True, 0, True)]) for i in range(5)]
+
+        results = engine.evaluate_batch(nodes, now=NOW)
+
+        assert [r.node_id for r in results] == [n.node_id for n in nodes]
+
+    @pytest.mark.parametrize("seed", [1, 2, 3])
+    def test_matches_per_node_evaluate(self, seed):
+        """일괄 평가 결과가 노드별 evaluate()와 동일"""
+        rng = random.Random(seed)
+        engine = RuleEngine()
+        nodes = [_random_node(rng, f"node-{i}") for i in range(300)]
+        for node in nodes[::7]:
+            engine._last_recovery[node.node_id] = {
+                "action": rng.choice(
+                    [RecoveryAction.SOFT, RecoveryAction.RESTART, RecoveryAction.BOX_RESET]
+                ),
+                "timestamp": NOW - timedelta(minutes=rng.randint(0, 40)),
+            }
+
+        batch = engine.evaluate_batch(nodes, now=NOW)
+        single = [engine.evaluate(node, now=NOW) for node in nodes]
+
+        assert batch == single
+        assert any(r.failure_level == FailureLevel.P0_CRITICAL for r in batch)
+        assert any(r.failure_level == FailureLevel.P1_WARNING for r in batch)
@@ -8,10 +8,14 @@ PR #5: 장애 대응 런북 자동화
 - L1 자동 실행 조건 테스트
 """
 
+import asyncio
+import time
 from datetime import datetime, timedelta, timezone
 
 import pytest
 
+from shared.monitoring.network import NetworkHealthChecker
+
 # 테스트 대상 임포트
 from shared.monitoring.runbook import (
     ActionResult,
@@ -25,12 +29,15 @@ from shared.monitoring.runbook import (
     IncidentStatus,
     IncidentTracker,
     L1TriggerCondition,
+    QueuedAlert,
     RecoveryLevel,
     RunbookAction,
     RunbookExecutor,
     RunbookResult,
     TimelineEvent,
+    TokenBucket,
     # Singletons
+    forward_network_alerts,
     get_alert_manager,
     get_incident_tracker,
     get_runbook_executor,
@@ -475,6 +482,152 @@ class TestAlertManager:
         assert "discord" in result
 
 
+# =========================================
+# 알림 파이프라인 테스트
+# =========================================
+
+
+def _pipeline_manager(**overrides) -> AlertManager:
+    """전송 내역을 기록하는 Slack 전용 AlertManager"""
+    options = dict(slack_webhook="https://hooks.slack.com/test", enable_discord=False)
+    options.update(overrides)
+    manager = AlertManager(config=AlertConfig(**options))
+    manager.sent = []
+
+    async def fake_send(title, message, level=AlertLevel.INFO, fields=None):
+        manager.sent.append((title, level, fields))
+        return True
+
+    manager.send_slack = fake_send
+    return manager
+
+
+class TestTokenBucket:
+    """TokenBucket 테스트"""
+
+    def test_burst_then_wait(self):
+        bucket = TokenBucket(rate_per_sec=1.0, capacity=2, updated_at=0.0)
+
+        assert bucket.acquire(now=0.0) == 0
+        assert bucket.acquire(now=0.0) == 0
+        assert bucket.acquire(now=0.0) == pytest.approx(1.0)
+        assert bucket.acquire(now=1.0) == 0
+
+
+class TestAlertPipeline:
+    """AlertManager 파이프라인 테스트"""
+
+    def test_dedup_within_window(self):
+        manager = _pipeline_manager()
+
+        assert manager.submit("Node down: PC01", "timeout", AlertLevel.ERROR) is True
+        assert manager.submit("Node down: PC01", "timeout", AlertLevel.ERROR) is False
+        assert manager.get_pipeline_stats()["deduplicated"] == 1
+
+    def test_similar_alerts_grouped_into_digest(self):
+        manager = _pipeline_manager()
+        for i in range(5):
+            manager.submit(f"Node down: PC{i:02d}", "timeout", AlertLevel.ERROR)
+
+        manager._flush_groups(force=True)
+
+        queue = manager._queues["slack"]
+        assert len(queue) == 1
+        assert queue[0].title == "Node down: PC00 (+4 similar)"
+        assert queue[0].fields["Grouped"] == "5"
+        assert manager.get_pipeline_stats()["grouped"] == 4
+
+    def test_critical_skips_grouping_and_goes_first(self):
+        manager = _pipeline_manager(group_window_seconds=0)
+        manager.submit("Disk usage", "80%", AlertLevel.WARNING)
+        manager.submit("Rack power lost", "rack-1", AlertLevel.CRITICAL)
+
+        first = min(manager._queues["slack"])
+
+        assert isinstance(first, QueuedAlert)
+        assert first.level == AlertLevel.CRITICAL
+
+    def test_queue_bound_drops_lowest_priority(self):
+        manager = _pipeline_manager(group_window_seconds=0, max_queue=2)
+        manager.submit("a", "x", AlertLevel.INFO)
+        manager.submit("b", "x", AlertLevel.CRITICAL)
+        manager.submit("c", "x", AlertLevel.ERROR)
+
+        titles = sorted(a.title for a in manager._queues["slack"])
+
+        assert titles == ["b", "c"]
+        assert manager.get_pipeline_stats()["dropped"] == 1
+
+    @pytest.mark.asyncio
+    async def test_rate_limited_delivery_in_priority_order(self):
+        manager = _pipeline_manager(group_window_seconds=0, burst=1, rate_per_minute=6000)
+        manager.submit("info", "x", AlertLevel.INFO)
+        manager.submit("warning", "x", AlertLevel.WARNING)
+        manager.submit("critical", "x", AlertLevel.CRITICAL)
+
+        await manager.start()
+        await manager.stop(timeout=2)
+
+        assert [title for title, _, _ in manager.sent] == ["critical", "warning", "info"]
+        assert manager.get_pipeline_stats()["sent"] == 3
+
+    @pytest.mark.asyncio
+    async def test_notify_without_pipeline_sends_directly(self):
+        manager = _pipeline_manager()
+
+        result = await manager.notify("Direct", "x", AlertLevel.INFO)
+
+        assert result["slack"] is True
+        assert manager.sent[0][0] == "Direct"
+
+    @pytest.mark.asyncio
+    async def test_network_alert_storm_one_digest_per_channel(self):
+        manager = AlertManager(
+            config=AlertConfig(
+                slack_webhook="https://hooks.slack.com/test",
+                discord_webhook="https://discord.com/api/webhooks/test",
+                group_window_seconds=60,
+            )
+        )
+        sent = {"slack": [], "discord": []}
+
+        def fake_sender(channel):
+            async def send(title, message, level=AlertLevel.INFO, fields=None):
+                sent[channel].append((title, level, fields))
+                return True
+
+            return send
+
+        manager.send_slack = fake_sender("slack")
+        manager.send_discord = fake_sender("discord")
+
+        checker = NetworkHealthChecker()
+        forward_network_alerts(checker, manager)
+        await manager.start()
+
+        # 체커 쿨다운이 풀려 같은 AP가 다시 알림을 내도 fingerprint로 중복 제거
+        for _ in range(3):
+            checker._last_alert_time.clear()
+            for i in range(20):
+                checker._create_alert(
+                    alert_type="ap_overloaded",
+                    severity="warning",
+                    title=f"AP Overloaded: AP-{i:02d}",
+                    message="too many clients",
+                    source=f"ap-{i:02d}",
+                )
+
+        await manager.stop(timeout=2)
+
+        for channel in ("slack", "discord"):
+            assert len(sent[channel]) == 1
+            title, level, fields = sent[channel][0]
+            assert title == "AP Overloaded: AP-00 (+19 similar)"
+            assert level == AlertLevel.WARNING
+            assert fields["Grouped"] == "20"
+        assert manager.get_pipeline_stats()["deduplicated"] == 40
+
+
 # =========================================
 # IncidentTracker 테스트
 # =========================================
@@ -856,6 +1009,19 @@ class TestSingletons:
 
         assert manager1 is manager2
 
+    def test_get_alert_manager_webhooks_from_env(self, monkeypatch):
+        """AlertManager 싱글톤 웹훅 환경변수"""
+        monkeypatch.setenv("SLACK_WEBHOOK_URL", "https://hooks.slack.com/env")
+        monkeypatch.setenv("DISCORD_WEBHOOK_URL", "")
+        reset_runbook_module()
+
+        manager = get_alert_manager()
+
+        assert manager.config.slack_webhook == "https://hooks.slack.com/env"
+        assert manager.config.discord_webhook is None
+        assert manager._enabled_channels() == ["slack"]
+        reset_runbook_module()
+
     def test_get_incident_tracker_singleton(self):
         """IncidentTracker 싱글톤"""
         reset_runbook_module()
@@ -927,6 +1093,85 @@ class TestL1TriggerCondition:
         assert condition.max_attempts == 3
 
 
+# =========================================
+# L1 조건 동시 평가 테스트
+# =========================================
+
+
+class TestL1ConditionEvaluation:
+    """L1 조건 동시 평가 / 데드라인 / 연속 평가 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_slow_condition_does_not_delay_others(self):
+        """느린 조건은 데드라인에서 끊기고 나머지는 동시에 평가"""
+        executor = RunbookExecutor()
+
+        async def slow():
+            await asyncio.sleep(5)
+            return True
+
+        async def fast():
+            return True
+
+        executor.register_l1_condition("slow", slow, timeout_seconds=0.05)
+        executor.register_l1_condition("fast", fast)
+
+        started = time.monotonic()
+        results = await executor.evaluate_l1_conditions()
+        elapsed = time.monotonic() - started
+
+        assert results == {"slow": None, "fast": True}
+        assert elapsed < 1
+        assert executor._l1_conditions["slow"].last_error.startswith("timeout")
+
+    @pytest.mark.asyncio
+    async def test_cached_state_and_transitions(self):
+        """마지막 결과 캐시 및 변경 시에만 콜백"""
+        transitions = []
+
+        async def on_transition(condition, old, new):
+            transitions.append((condition.name, old, new))
+
+        executor = RunbookExecutor(on_l1_transition=on_transition)
+        state = {"value": False}
+
+        async def check():
+            return state["value"]
+
+        executor.register_l1_condition("flag", check)
+
+        await executor.check_l1_conditions()
+        await executor.check_l1_conditions()
+        state["value"] = True
+        assert await executor.check_l1_conditions() == "flag"
+
+        assert transitions == [("flag", None, False), ("flag", False, True)]
+        cached = executor.get_l1_condition_states()["flag"]
+        assert cached["last_result"] is True
+        assert cached["last_checked_at"] is not None
+
+    @pytest.mark.asyncio
+    async def test_evaluator_auto_executes_l1(self):
+        """연속 평가 루프에서 트리거 시 L1 자동 실행 + 쿨다운 적용"""
+        executor = RunbookExecutor()
+
+        async def always_true():
+            return True
+
+        executor.register_l1_condition("always", always_true, cooldown_seconds=300)
+
+        await executor.start_l1_evaluator(interval_seconds=0.01, auto_execute=True, service="api")
+        for _ in range(100):
+            if executor.get_l1_execution_history():
+                break
+            await asyncio.sleep(0.01)
+        await executor.stop_l1_evaluator()
+
+        assert len(executor.get_l1_execution_history()) == 1
+        assert executor._l1_conditions["always"].trigger_count == 1
+        assert executor.get_runbook_status()["l1_evaluator_running"] is False
+
+
 # =========================================
 # 통합 시나리오 테스트
 # =========================================
@@ -0,0 +1,102 @@
+"""
+Task API (services/api) 단위 테스트
+
+- SQLitePool: 연결 재사용, WAL / synchronous=NORMAL
+- /api/tasks/next: 우선순위 순 할당, 동시 폴링 중복 할당 없음
+- 대기 작업 없는 폴링은 쓰기 잠금 없이 응답
+- 할당 쿼리의 (status, priority, created_at) 인덱스 사용
+"""
+
+import importlib.util
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+API_MAIN = Path(__file__).resolve().parents[2] / "services" / "api" / "main.py"
+
+
+@pytest.fixture
+def api(tmp_path, monkeypatch):
+    """임시 DB로 services/api/main.py 로드"""
+    monkeypatch.setenv("DB_PATH", str(tmp_path / "tasks.db"))
+    monkeypatch.setenv("DB_POOL_SIZE", "4")
+    spec = importlib.util.spec_from_file_location("task_api_main", API_MAIN)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    module.init_db()
+    yield module
+    module.db_pool.close()
+
+
+def _add(api, title, priority=5):
+    return api.create_task(api.TaskCreate(title=title, keyword=title, priority=priority))["task_id"]
+
+
+class TestSQLitePool:
+    """SQLitePool 테스트"""
+
+    def test_connections_reused_with_wal(self, api):
+        with api.get_db() as first:
+            pass
+        with api.get_db() as second:
+            assert second is first
+            assert second.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+            assert second.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+
+    def test_rollback_on_error_returns_clean_connection(self, api):
+        with pytest.raises(RuntimeError):
+            with api.db_transaction(immediate=True) as conn:
+                conn.execute("INSERT INTO tasks (title) VALUES ('x')")
+                raise RuntimeError
+
+        with api.get_db() as conn:
+            assert not conn.in_transaction
+            assert conn.execute("SELECT COUNT(*) FROM tasks").fetchone()[0] == 0
+
+
+class TestNextTask:
+    """/api/tasks/next 테스트"""
+
+    def test_claims_by_priority_then_age(self, api):
+        low = _add(api, "low", priority=1)
+        first = _add(api, "first", priority=9)
+        second = _add(api, "second", priority=9)
+
+        claimed = [api.get_next_task(device_id="d1")["task"]["task_id"] for _ in range(3)]
+
+        assert claimed == [first, second, low]
+        assert api.get_next_task(device_id="d1")["task"] is None
+        assert api.list_devices()["devices"][0]["device_id"] == "d1"
+
+    def test_concurrent_polls_never_share_a_task(self, api):
+        ids = {_add(api, f"t{i}") for i in range(20)}
+
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            results = list(pool.map(lambda i: api.get_next_task(device_id=f"d{i}"), range(60)))
+
+        claimed = [r["task"]["task_id"] for r in results if r["task"]]
+        assert sorted(claimed) == sorted(ids)
+
+    def test_empty_poll_does_not_wait_for_writer(self, api):
+        writer = sqlite3.connect(api.DB_PATH, timeout=0)
+        writer.execute("BEGIN IMMEDIATE")
+        try:
+            api.db_pool.timeout = 0.1
+            assert api.get_next_task(device_id="d1")["task"] is None
+        finally:
+            writer.rollback()
+            writer.close()
+
+    def test_claim_uses_status_priority_index(self, api):
+        with api.get_db() as conn:
+            plan = conn.execute(
+                "EXPLAIN QUERY PLAN "
+                "SELECT id FROM tasks WHERE status = 'pending' "
+                "ORDER BY priority DESC, created_at ASC LIMIT 1"
+            ).fetchall()
+
+        details = " ".join(row["detail"] for row in plan)
+        assert "idx_tasks_status_priority" in details
+        assert "TEMP B-TREE" not in details